@@ -27,6 +27,7 @@ ReservationItem = get_model('helpdesk', 'ReservationItem')
 Attachment = get_model('helpdesk', 'Attachment')
 Invoice = get_model('helpdesk', 'Invoice')
 InvoiceItem = get_model('helpdesk', 'InvoiceItem')
+ScheduleOccurrence = get_model('helpdesk', 'ScheduleOccurrence')
 
 
 # Extend Schedule
@@ -101,3 +102,4 @@ admin.site.register(ReservationItem)
 admin.site.register(Attachment)
 admin.site.register(Invoice)
 admin.site.register(InvoiceItem)
+admin.site.register(ScheduleOccurrence)
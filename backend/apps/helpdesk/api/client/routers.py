@@ -4,12 +4,14 @@ from rest_framework.routers import DefaultRouter
 
 from .v1.issue.views import IssueAPIView
 from .v1.consultation.views import ReservationApiView, ReservationItemAPIView
+from .v1.availability.views import AvailabilityApiView
 
 # Create a router and register our viewsets with it.
 router = DefaultRouter()
 router.register('issues', IssueAPIView, basename='issue')
 router.register('reservations', ReservationApiView, basename='reservation')
 router.register('reservationsitem', ReservationItemAPIView, basename='reservation_item')
+router.register('availabilities', AvailabilityApiView, basename='availability')
 
 app_name = 'client'
 
@@ -0,0 +1,25 @@
+from rest_framework import serializers
+
+from utils.generals import get_model
+from utils.mixin.api import DynamicFieldsModelSerializer
+
+ScheduleOccurrence = get_model('helpdesk', 'ScheduleOccurrence')
+
+
+""" AVAILABILITY """
+class AvailabilitySerializer(DynamicFieldsModelSerializer, serializers.ModelSerializer):
+    consultant = serializers.SlugRelatedField(slug_field='uuid', read_only=True, source='user')
+    consultant_username = serializers.CharField(source='user.username', read_only=True)
+    consultant_name = serializers.CharField(source='user.first_name', read_only=True)
+    schedule = serializers.SlugRelatedField(slug_field='uuid', read_only=True)
+    schedule_label = serializers.CharField(source='schedule.label', read_only=True)
+    segment = serializers.SlugRelatedField(slug_field='uuid', read_only=True)
+    canal = serializers.CharField(source='segment.canal', read_only=True)
+    canal_label = serializers.CharField(source='segment.canal_label', read_only=True)
+    remaining = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = ScheduleOccurrence
+        fields = ('uuid', 'date', 'open_hour', 'close_hour', 'quota', 'remaining',
+                  'consultant', 'consultant_username', 'consultant_name',
+                  'schedule', 'schedule_label', 'segment', 'canal', 'canal_label',)
@@ -0,0 +1,100 @@
+import datetime
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import viewsets, status as response_status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import NotAcceptable
+from rest_framework.response import Response
+
+from utils.generals import get_model
+from utils.pagination import PaginationMixin
+from apps.helpdesk.utils.permissions import IsClientOnly
+
+from .serializers import AvailabilitySerializer
+
+ScheduleExpertise = get_model('helpdesk', 'ScheduleExpertise')
+ScheduleOccurrence = get_model('helpdesk', 'ScheduleOccurrence')
+
+
+class AvailabilityApiView(PaginationMixin, viewsets.ViewSet):
+    """
+    GET
+    ------------
+
+    Find consultants free for a topic in date range,
+    ranked by nearest date, earliest hour then most remaining quota
+
+    Params;
+
+        {
+            "topic_uuid": "uuid v4",
+            "date_start": "2021-01-01",
+            "date_end": "2021-01-31"
+        }
+    """
+    permission_classes = (IsAuthenticated, IsClientOnly,)
+
+    def initialize_request(self, request, *args, **kwargs):
+        self.user = request.user
+        return super().initialize_request(request, *args, **kwargs)
+
+    @property
+    def queryset(self):
+        q = ScheduleOccurrence.objects \
+            .select_related('user', 'schedule', 'segment') \
+            .annotate(remaining_quota=F('quota') - F('used')) \
+            .filter(is_active=True, used__lt=F('quota'))
+        return q
+
+    def get_date_range(self, request):
+        date_start = request.query_params.get('date_start', None)
+        date_end = request.query_params.get('date_end', None)
+
+        try:
+            date_start = parse_date(date_start) if date_start else timezone.localdate()
+            date_end = parse_date(date_end) if date_end \
+                else date_start + datetime.timedelta(days=settings.SCHEDULE_OCCURRENCE_HORIZON)
+        except (ValueError, TypeError) as e:
+            raise NotAcceptable(detail=str(e))
+
+        if date_start is None or date_end is None:
+            raise NotAcceptable(detail=_("Param date_start or date_end invalid"))
+        return date_start, date_end
+
+    def get_objects(self, topic_uuid, date_start, date_end):
+        # resolve topic to schedule ids first, avoid duplicate rows from the join
+        schedule_ids = ScheduleExpertise.objects \
+            .filter(expertise__topic__uuid=topic_uuid, schedule__is_active=True) \
+            .values('schedule_id')
+
+        try:
+            queryset = self.queryset \
+                .filter(schedule_id__in=schedule_ids, date__gte=date_start, date__lte=date_end) \
+                .order_by('date', 'open_hour', '-remaining_quota', 'id')
+        except ValidationError as e:
+            raise NotAcceptable(detail=str(e))
+        return queryset
+
+    def list(self, request, format=None):
+        context = {'request': request}
+        topic_uuid = request.query_params.get('topic_uuid', None)
+        if not topic_uuid:
+            raise NotAcceptable(detail=_("Param topic_uuid required"))
+
+        date_start, date_end = self.get_date_range(request)
+        queryset = self.get_objects(topic_uuid, date_start, date_end)
+
+        try:
+            queryset_paginator = self.paginate_queryset(queryset)
+        except ValidationError as e:
+            raise NotAcceptable(detail=str(e))
+
+        serializer = AvailabilitySerializer(queryset_paginator, many=True, context=context)
+        pagination_result = self.get_pagination_result(serializer)
+        return Response(pagination_result, status=response_status.HTTP_200_OK)
@@ -1,12 +1,24 @@
+import itertools
+import collections
+
+from django.utils.translation import gettext_lazy as _
+
 from rest_framework import serializers
 
 from utils.generals import get_model
 from utils.mixin.validators import CleanValidateMixin
+from utils.projection import Projection, datetime_value, group_rows, uuid_value
+from utils.urls import url_template
 from utils.mixin.api import (
     DynamicFieldsModelSerializer, 
     ListSerializerUpdateMappingField, 
-    WritetableFieldPutMethod
+    WritetableFieldPutMethod,
+    TemplateHyperlinkedIdentityField,
+    AbsoluteURLField
 )
+from apps.helpdesk.utils import admission
+from apps.helpdesk.utils.constants import PUSH
+from apps.helpdesk.utils.occurrence import occurrence_key
 from ..issue.serializers import IssueSerializer
 from ....consultant.v1.priority.serializers import PrioritySerializer
 from ....consultant.v1.sla.serializers import SLASerializer
@@ -25,14 +37,49 @@ User = get_model('person', 'User')
 
 
 class ReservationItemCreateListSerializer(ListSerializerUpdateMappingField, serializers.ListSerializer):
-    pass
+    def admit(self, created, updated):
+        """
+        Seats of all items, one conditional UPDATE each slot (utils/admission.py),
+        item moved or not pushed anymore give it's old seat back
+        """
+        current = dict()
+        if updated:
+            current = {item[0]: item[1:] for item in ReservationItem.objects
+                       .filter(pk__in=[obj.pk for obj in updated])
+                       .values_list('id', 'segment_id', 'datetime', 'status')}
+
+        delta = collections.Counter()
+        for obj in itertools.chain(created, updated):
+            old = current.get(obj.pk)
+            if old is not None and old[2] == PUSH:
+                delta[occurrence_key(old[0], old[1])] -= 1
+
+            # deferred field not sent, as before
+            new = [obj.__dict__[name] if name in obj.__dict__ else old[index]
+                   for index, name in enumerate(('segment_id', 'datetime', 'status'))]
+            if new[2] == PUSH:
+                delta[occurrence_key(new[0], new[1])] += 1
+
+        delta.pop(None, None)
+        for key, count in delta.items():
+            if count > 0 and not admission.admit(*key, count=count):
+                raise serializers.ValidationError({'datetime': _("Segment full or closed on {0}").format(key[1])})
+
+        for key, count in delta.items():
+            if count < 0:
+                admission.release(*key, count=-count)
+
+    def perform_bulk(self, model, created, updated, fields, deleted):
+        if created or {'segment', 'datetime', 'status'} & fields:
+            self.admit(created, updated)
+        super().perform_bulk(model, created, updated, fields, deleted)
 
 
 """ RESERVATION ITEM: CREATE/UPDATE """
 class ReservationItemCreateSerializer(DynamicFieldsModelSerializer, CleanValidateMixin,
                                       WritetableFieldPutMethod, serializers.ModelSerializer):
-    url = serializers.HyperlinkedIdentityField(view_name='helpdesk_api:client:reservation_item-detail',
-                                               lookup_field='uuid', read_only=True)
+    url = TemplateHyperlinkedIdentityField(view_name='helpdesk_api:client:reservation_item-detail',
+                                           lookup_field='uuid', read_only=True)
 
     reservation = serializers.SlugRelatedField(slug_field='uuid', queryset=Reservation.objects.all())
     issue = serializers.SlugRelatedField(slug_field='uuid', queryset=Issue.objects.all())
@@ -46,6 +93,35 @@ class ReservationItemCreateSerializer(DynamicFieldsModelSerializer, CleanValidat
         list_serializer_class = ReservationItemCreateListSerializer
         fields = '__all__'
 
+    def admit(self, validated_data, instance=None):
+        """Seat of the (segment, date) slot taken by one conditional UPDATE, or rejected"""
+        def value(field, default=None):
+            return validated_data.get(field, getattr(instance, field, default))
+
+        segment = value('segment')
+        key = None
+        if value('status', PUSH) == PUSH and segment is not None:
+            key = occurrence_key(segment.id, value('datetime'))
+
+        old_key = None
+        if instance is not None and instance.status == PUSH:
+            old_key = occurrence_key(instance.segment_id, instance.datetime)
+
+        if key is None or key == old_key:
+            return None
+
+        if not admission.admit(*key):
+            raise serializers.ValidationError({'datetime': _("Segment full or closed on {0}").format(key[1])})
+        return key
+
+    def create(self, validated_data):
+        with admission.admitted(self.admit(validated_data)):
+            return super().create(validated_data)
+
+    def update(self, instance, validated_data):
+        with admission.admitted(self.admit(validated_data, instance=instance)):
+            return super().update(instance, validated_data)
+
 
 """ RESERVATION ITEM: RETRIEVE """
 class ReservationItemRetrieveSerializer(DynamicFieldsModelSerializer, serializers.ModelSerializer):
@@ -75,46 +151,38 @@ class ReservationItemListSerializer(DynamicFieldsModelSerializer, serializers.Mo
 
 """ CREATE / UPDATE: RESERVATION """
 class ReservationCreateSerializer(DynamicFieldsModelSerializer, serializers.ModelSerializer):
-    url = serializers.HyperlinkedIdentityField(view_name='helpdesk_api:client:reservation-detail',
-                                               lookup_field='uuid', read_only=True)
+    url = TemplateHyperlinkedIdentityField(view_name='helpdesk_api:client:reservation-detail',
+                                           lookup_field='uuid', read_only=True)
     client = serializers.HiddenField(default=serializers.CurrentUserDefault())
     consultant = serializers.SlugRelatedField(slug_field='uuid', queryset=User.objects.all())
 
-    permalink = serializers.SerializerMethodField(read_only=True)
+    permalink = AbsoluteURLField(source='permalink_for_client')
 
     class Meta:
         model = Reservation
         fields = '__all__'
 
-    def get_permalink(self, obj):
-        request = self.context.get('request')
-        return request.build_absolute_uri(obj.permalink_for_client)
-
 
 """ RETRIEVE: RESERVATION """
 class ReservationRetrieveSerializer(DynamicFieldsModelSerializer, serializers.ModelSerializer):
-    url = serializers.HyperlinkedIdentityField(view_name='helpdesk_api:client:reservation-detail',
-                                               lookup_field='uuid', read_only=True)
+    url = TemplateHyperlinkedIdentityField(view_name='helpdesk_api:client:reservation-detail',
+                                           lookup_field='uuid', read_only=True)
     reservation_item = ReservationItemRetrieveSerializer(many=True, read_only=True)
     total_cost = serializers.IntegerField(read_only=True)
-    permalink = serializers.SerializerMethodField(read_only=True)
+    permalink = AbsoluteURLField(source='permalink_for_client')
 
     class Meta:
         model = Reservation
         fields = '__all__'
 
-    def get_permalink(self, obj):
-        request = self.context.get('request')
-        return request.build_absolute_uri(obj.permalink_for_client)
-
 
 """ LIST: RESERVATION """
 class ReservationListSerializer(DynamicFieldsModelSerializer, serializers.ModelSerializer):
-    url = serializers.HyperlinkedIdentityField(view_name='helpdesk_api:client:reservation-detail',
-                                               lookup_field='uuid', read_only=True)
+    url = TemplateHyperlinkedIdentityField(view_name='helpdesk_api:client:reservation-detail',
+                                           lookup_field='uuid', read_only=True)
     consultant = serializers.CharField(read_only=True, source='consultant.first_name')
     total_cost = serializers.IntegerField(read_only=True)
-    permalink = serializers.SerializerMethodField(read_only=True)
+    permalink = AbsoluteURLField(source='permalink_for_client')
     reservation_item = ReservationItemListSerializer(many=True, read_only=True,
                                                      fields_used=('uuid', 'datetime', 'status',
                                                                   'issue_label', 'assign_status', 
@@ -125,6 +193,46 @@ class ReservationListSerializer(DynamicFieldsModelSerializer, serializers.ModelS
         fields = ('uuid', 'url', 'total_cost', 'permalink',
                   'reservation_item', 'consultant',)
 
-    def get_permalink(self, obj):
-        request = self.context.get('request')
-        return request.build_absolute_uri(obj.permalink_for_client)
+
+""" LIST: RESERVATION, read only projection """
+class ReservationListProjection(Projection):
+    """
+    As ReservationListSerializer, context `reservation_item_filter`
+    is the Q of the prefetched reservation item (None for all)
+    """
+    serializer_class = ReservationListSerializer
+    values = ('id', 'uuid', 'create_date', 'total_cost', 'consultant__first_name')
+    item_values = ('reservation_id', 'uuid', 'datetime', 'number', 'status', 'issue__label',
+                   'assign__status')
+
+    url = url_template('helpdesk_api:client:reservation-detail')
+    permalink = url_template('helpdesk_view:client:reservation_detail')
+
+    def prepare(self, rows):
+        items = ReservationItem.objects.filter(reservation_id__in=[row['id'] for row in rows])
+        item_filter = self.context.get('reservation_item_filter')
+        if item_filter is not None:
+            items = items.filter(item_filter)
+        self.items = group_rows(items.values(*self.item_values), 'reservation_id')
+
+    def represent_item(self, row):
+        return {
+            # null without assign (left join)
+            'assign_status': row['assign__status'],
+            'issue_label': row['issue__label'],
+            'uuid': uuid_value(row['uuid']),
+            'datetime': datetime_value(row['datetime']),
+            'number': row['number'],
+            'status': row['status'],
+        }
+
+    def represent(self, row):
+        uuid = uuid_value(row['uuid'])
+        return {
+            'uuid': uuid,
+            'url': self.hyperlink(self.url.path(uuid)),
+            'total_cost': row['total_cost'],
+            'permalink': self.absolute_url(self.permalink.path(uuid)),
+            'reservation_item': [self.represent_item(item) for item in self.items.get(row['id'], ())],
+            'consultant': row['consultant__first_name'],
+        }
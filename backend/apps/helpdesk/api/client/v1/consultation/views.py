@@ -9,10 +9,13 @@ from rest_framework import viewsets, status as response_status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import NotAcceptable
 from rest_framework.response import Response
-from rest_framework.pagination import LimitOffsetPagination
 
+from utils.asynchronous import AsyncReadMixin
+from utils.conditional import ConditionalGetMixin
 from utils.generals import get_model
-from utils.pagination import build_result_pagination
+from utils.ownership import OwnerScopeMixin
+from utils.pagination import KeysetPagination, PaginationMixin
+from apps.helpdesk.utils import booking
 from apps.helpdesk.utils.constants import PULL, PUSH, WAITING
 from apps.helpdesk.utils.permissions import (
     IsClientOnly,
@@ -26,19 +29,24 @@ from .serializers import (
     ReservationItemListSerializer,
     ReservationRetrieveSerializer, 
     ReservationCreateSerializer, 
-    ReservationListSerializer
+    ReservationListProjection
 )
 
 Reservation = get_model('helpdesk', 'Reservation')
 ReservationItem = get_model('helpdesk', 'ReservationItem')
 Assign = get_model('helpdesk', 'Assign')
 
-# Define to avoid used ...().paginate__
-_PAGINATOR = LimitOffsetPagination()
 
-
-class ReservationApiView(viewsets.ViewSet):
+class ReservationApiView(ConditionalGetMixin, AsyncReadMixin, PaginationMixin, OwnerScopeMixin, viewsets.ViewSet):
+    pagination_class = KeysetPagination
     lookup_field = 'uuid'
+    owner_field = 'client'
+    # status page polled, mostly answered 304
+    conditional_relations = ('reservation_item', 'reservation_item__assign', 'reservation_item__issue',)
+    conditional_fields = {
+        'list': ReservationListProjection.values,
+        'retrieve': ('__all__',),
+    }
     permission_classes = (IsAuthenticated, IsClientOnly,)
     permission_action = {
         'destroy': [IsReservationOwnerOrReject,],
@@ -66,34 +74,44 @@ class ReservationApiView(viewsets.ViewSet):
         return super().initialize_request(request, *args, **kwargs)
 
     @property
-    def queryset(self):
-        rsv_item_prefetch = None
+    def reservation_item_filter(self):
+        if self.assign_status is None:
+            return None
 
-        if self.assign_status is not None:
-            q = Q(assign__status=self.assign_status) & Q(status=PUSH)
+        q = Q(assign__status=self.assign_status) & Q(status=PUSH)
+        if self.rsv_item_status == PULL:
+            q = Q(status=self.rsv_item_status)
+        return q
 
-            if self.rsv_item_status == PULL:
-                q = Q(status=self.rsv_item_status)
+    @property
+    def queryset(self):
+        q = self.reservation_item_filter
 
-            rsv_item_prefetch = ReservationItem.objects \
-                .prefetch_related(Prefetch('assign'), Prefetch('schedule'),
-                                  Prefetch('segment'), Prefetch('sla'), 
-                                  Prefetch('priority'), Prefetch('issue')) \
-                .select_related('assign', 'schedule', 'segment', 'sla', 'priority',
-                                'issue') \
-                .filter(q)
+        # retrieve show all items, each with its relations, one query
+        rsv_item_prefetch = ReservationItem.objects \
+            .select_related('assign', 'schedule', 'segment', 'sla', 'priority', 'priority__sla',
+                            'issue')
+        if q is not None:
+            rsv_item_prefetch = rsv_item_prefetch.filter(q)
 
         q = Reservation.objects \
             .prefetch_related(Prefetch('client'), Prefetch('consultant'),
                               Prefetch('reservation_item', queryset=rsv_item_prefetch),
-                              Prefetch('reservation_item__assign')) \
+                              Prefetch('reservation_item__assign'),
+                              Prefetch('reservation_item__issue__topic')) \
             .select_related('client', 'consultant')
 
         return q
 
+    def get_conditional_queryset(self):
+        if self.action == 'list':
+            # any assign status, list filter it from the query params
+            return self.owned(Reservation.objects.all())
+        return super().get_conditional_queryset()
+
     def get_objects(self):
         try:
-            queryset = self.queryset.filter(client__uuid=self.user.uuid)
+            queryset = self.owned(self.queryset)
         except (ValidationError, ObjectDoesNotExist, Exception) as e:
             raise NotAcceptable(detail=str(e))
         
@@ -112,14 +130,25 @@ class ReservationApiView(viewsets.ViewSet):
         return queryset
 
     def list(self, request, format=None):
-        context = {'request': request}
         self.assign_status = request.query_params.get('assign_status', WAITING)
         self.rsv_item_status = request.query_params.get('rsv_item_status', PUSH)
+        context = {'request': request, 'reservation_item_filter': self.reservation_item_filter}
 
-        queryset = self.get_objects()
-        queryset_paginator = _PAGINATOR.paginate_queryset(queryset, request)
-        serializer = ReservationListSerializer(queryset_paginator, many=True, context=context)
-        pagination_result = build_result_pagination(self, _PAGINATOR, serializer)
+        queryset = ReservationListProjection.project(self.get_objects())
+        queryset_paginator = self.paginate_queryset(queryset)
+        serializer = ReservationListProjection(queryset_paginator, context=context)
+        pagination_result = self.get_pagination_result(serializer)
+        return Response(pagination_result, status=response_status.HTTP_200_OK)
+
+    async def alist(self, request, format=None):
+        self.assign_status = request.query_params.get('assign_status', WAITING)
+        self.rsv_item_status = request.query_params.get('rsv_item_status', PUSH)
+        context = {'request': request, 'reservation_item_filter': self.reservation_item_filter}
+
+        queryset = ReservationListProjection.project(self.get_objects())
+        queryset_paginator = await self.apaginate_queryset(queryset)
+        serializer = ReservationListProjection(queryset_paginator, context=context)
+        pagination_result = await self.aget_pagination_result(serializer)
         return Response(pagination_result, status=response_status.HTTP_200_OK)
 
     def retrieve(self, request, uuid=None):
@@ -171,7 +200,7 @@ class ReservationApiView(viewsets.ViewSet):
                         status=response_status.HTTP_204_NO_CONTENT)
 
 
-class ReservationItemAPIView(viewsets.ViewSet):
+class ReservationItemAPIView(PaginationMixin, viewsets.ViewSet):
     """
     POST
     ------------------
@@ -183,6 +212,7 @@ class ReservationItemAPIView(viewsets.ViewSet):
             "datetime": "UTC datetime"
         }
     """
+    pagination_class = KeysetPagination
     lookup_field = 'uuid'
     permission_classes = (IsAuthenticated, IsClientOnly,)
     permission_action = {
@@ -210,8 +240,8 @@ class ReservationItemAPIView(viewsets.ViewSet):
     @property
     def queryset(self):
         q = ReservationItem.objects \
-            .prefetch_related(Prefetch('reservation'), Prefetch('reservation__issue'),
-                              Prefetch('reservation__sla'), Prefetch('reservation__priority'),
+            .prefetch_related(Prefetch('reservation'), Prefetch('issue'), Prefetch('schedule'),
+                              Prefetch('segment'), Prefetch('sla'), Prefetch('priority'),
                               Prefetch('assign')) \
             .select_related('reservation')
 
@@ -241,10 +271,10 @@ class ReservationItemAPIView(viewsets.ViewSet):
         else:
             queryset = self.queryset
     
-        queryset_paginator = _PAGINATOR.paginate_queryset(queryset, request)
+        queryset_paginator = self.paginate_queryset(queryset)
         serializer = ReservationItemListSerializer(queryset_paginator, many=True,
                                                    context=context)
-        pagination_result = build_result_pagination(self, _PAGINATOR, serializer)
+        pagination_result = self.get_pagination_result(serializer)
         return Response(pagination_result, status=response_status.HTTP_200_OK)
 
     @method_decorator(never_cache)
@@ -254,7 +284,9 @@ class ReservationItemAPIView(viewsets.ViewSet):
         serializer = ReservationItemCreateSerializer(data=request.data, context=context)
         if serializer.is_valid(raise_exception=True):
             try:
-                serializer.save()
+                with booking.defer_signals():
+                    instance = serializer.save()
+                booking.book_reservation_items([instance])
             except (ValidationError, IntegrityError) as e:
                 raise NotAcceptable(detail=str(e))
             return Response(serializer.data, status=response_status.HTTP_201_CREATED)
@@ -313,7 +345,10 @@ class ReservationItemAPIView(viewsets.ViewSet):
                                                      context=context, fields_used=update_fields)
         if serializer.is_valid(raise_exception=True):
             try:
-                serializer.save()
+                # assign all items at once, not each item save
+                with booking.defer_signals():
+                    instances = serializer.save()
+                booking.book_reservation_items(instances)
             except (ValidationError, Exception) as e:
                 raise NotAcceptable(detail=str(e))
             return Response(serializer.data, status=response_status.HTTP_200_OK)
@@ -1,27 +1,66 @@
 from rest_framework import serializers
 
 from utils.generals import get_model
-from utils.mixin.api import DynamicFieldsModelSerializer
+from utils.mixin.api import DynamicFieldsModelSerializer, TemplateHyperlinkedIdentityField, AbsoluteURLField
+from utils.projection import Projection, group_rows, uuid_value
+from utils.urls import url_template
+from apps.master.utils.fields import TopicSlugRelatedField
+from apps.helpdesk.utils.search import issue_search
 
 Issue = get_model('helpdesk', 'Issue')
 Topic = get_model('master', 'Topic')
 
 
 class IssueSerializer(DynamicFieldsModelSerializer, serializers.ModelSerializer):
-    url = serializers.HyperlinkedIdentityField(view_name='helpdesk_api:client:issue-detail',
-                                               lookup_field='uuid', read_only=True)
+    url = TemplateHyperlinkedIdentityField(view_name='helpdesk_api:client:issue-detail',
+                                           lookup_field='uuid', read_only=True)
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
-    topic = serializers.SlugRelatedField(many=True, slug_field='uuid', queryset=Topic.objects.all())
+    topic = TopicSlugRelatedField(many=True, queryset=Topic.objects.all())
 
     # display purpose only
     topic_label = serializers.SlugRelatedField(many=True, read_only=True, slug_field='label',
                                                source='topic')
-    permalink = serializers.SerializerMethodField(read_only=True)
+    permalink = AbsoluteURLField()
+
+    # search result only, ?keyword=
+    highlight = serializers.SerializerMethodField(read_only=True)
 
     class Meta:
         model = Issue
         fields = '__all__'
 
-    def get_permalink(self, obj):
-        request = self.context.get('request')
-        return request.build_absolute_uri(obj.permalink)
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if not self.context.get('keyword'):
+            self.fields.pop('highlight', None)
+
+    def get_highlight(self, obj):
+        return issue_search.highlight(obj, self.context.get('keyword'))
+
+
+""" LIST: ISSUE, read only projection """
+class IssueProjection(Projection):
+    # as IssueSerializer fields_used ('uuid', 'label', 'url', 'topic', 'topic_label', 'permalink')
+    serializer_class = IssueSerializer
+    values = ('id', 'uuid', 'label', 'create_date')
+
+    url = url_template('helpdesk_api:client:issue-detail')
+    permalink = url_template('helpdesk_view:client:issue_detail')
+
+    def prepare(self, rows):
+        # topic ordering as prefetch_related('topic')
+        topics = Topic.objects.filter(issue__in=[row['id'] for row in rows]) \
+            .values('issue', 'uuid', 'label')
+        self.topics = group_rows(topics, 'issue')
+
+    def represent(self, row):
+        uuid = uuid_value(row['uuid'])
+        topics = self.topics.get(row['id'], ())
+        return {
+            'url': self.hyperlink(self.url.path(uuid)),
+            'topic': [topic['uuid'] for topic in topics],
+            'topic_label': [topic['label'] for topic in topics],
+            'permalink': self.absolute_url(self.permalink.path(uuid)),
+            'uuid': uuid,
+            'label': row['label'],
+        }
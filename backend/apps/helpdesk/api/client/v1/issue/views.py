@@ -8,22 +8,30 @@ from django.views.decorators.cache import never_cache
 from rest_framework import viewsets, status as response_status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import NotAcceptable
-from rest_framework.response import Response
 from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
 
+from utils.conditional import ConditionalGetMixin
 from utils.generals import get_model
-from utils.pagination import build_result_pagination
+from utils.ownership import OwnerScopeMixin
+from utils.pagination import KeysetPagination, PaginationMixin
 from apps.helpdesk.utils.permissions import IsClientOnly, IsObjectOwnerOrReject
-from .serializers import IssueSerializer
+from apps.helpdesk.utils.search import issue_search
+from .serializers import IssueSerializer, IssueProjection
 
 Issue = get_model('helpdesk', 'Issue')
 
-# Define to avoid used ...().paginate__
-_PAGINATOR = LimitOffsetPagination()
+LIST_FIELDS = ('uuid', 'label', 'url', 'topic', 'topic_label', 'permalink', 'highlight',)
 
 
-class IssueAPIView(viewsets.ViewSet):
+class IssueAPIView(ConditionalGetMixin, PaginationMixin, OwnerScopeMixin, viewsets.ViewSet):
+    pagination_class = KeysetPagination
     lookup_field = 'uuid'
+    conditional_relations = ('topic',)
+    conditional_fields = {
+        'list': LIST_FIELDS,
+        'retrieve': ('__all__',),
+    }
     permission_classes = (IsAuthenticated, IsClientOnly,)
     permission_action = {
         'destroy': [IsObjectOwnerOrReject,],
@@ -45,8 +53,15 @@ class IssueAPIView(viewsets.ViewSet):
 
     def initialize_request(self, request, *args, **kwargs):
         self.user = request.user
+        self.keyword = None
         return super().initialize_request(request, *args, **kwargs)
 
+    def get_pagination_class(self):
+        # search result ordered by relevance, not keyset ordering
+        if self.keyword is not None:
+            return LimitOffsetPagination
+        return super().get_pagination_class()
+
     @property
     def queryset(self):
         q = Issue.objects.prefetch_related(Prefetch('topic'), Prefetch('user')) \
@@ -55,13 +70,13 @@ class IssueAPIView(viewsets.ViewSet):
 
     def get_objects(self, keyword=None):
         try:
-            queryset = self.queryset.filter(user__uuid=self.user.uuid)
+            queryset = self.owned(self.queryset)
         except (ValidationError, ObjectDoesNotExist, Exception) as e:
             raise NotAcceptable(detail=str(e))
         
         if keyword is not None:
             if keyword:
-                queryset = queryset.filter(label__icontains=keyword)
+                queryset = issue_search.rank(queryset, keyword)
             else:
                 return []
         return queryset
@@ -77,14 +92,19 @@ class IssueAPIView(viewsets.ViewSet):
         return queryset
 
     def list(self, request, format=None):
-        context = {'request': request}
-        keyword = request.query_params.get('keyword')
-        queryset = self.get_objects(keyword=keyword)
-        queryset_paginator = _PAGINATOR.paginate_queryset(queryset, request)
-        serializer = IssueSerializer(queryset_paginator, many=True, context=context,
-                                     fields_used=('uuid', 'label', 'url', 'topic',
-                                                  'topic_label', 'permalink',))
-        pagination_result = build_result_pagination(self, _PAGINATOR, serializer)
+        self.keyword = request.query_params.get('keyword')
+        context = {'request': request, 'keyword': self.keyword}
+        queryset = self.get_objects(keyword=self.keyword)
+
+        # search result need highlight from the instance
+        if self.keyword is None:
+            queryset_paginator = self.paginate_queryset(IssueProjection.project(queryset))
+            serializer = IssueProjection(queryset_paginator, context=context)
+        else:
+            queryset_paginator = self.paginate_queryset(queryset)
+            serializer = IssueSerializer(queryset_paginator, many=True, context=context,
+                                         fields_used=LIST_FIELDS)
+        pagination_result = self.get_pagination_result(serializer)
         return Response(pagination_result, status=response_status.HTTP_200_OK)
 
     def retrieve(self, request, uuid=None):
@@ -1,13 +1,14 @@
 from rest_framework import serializers
 
 from utils.generals import get_model
+from utils.mixin.api import TemplateHyperlinkedIdentityField
 
 Assign = get_model('helpdesk', 'Assign')
 
 
 class AssignSerializer(serializers.ModelSerializer):
-    url = serializers.HyperlinkedIdentityField(view_name='helpdesk_api:consultant:assign-detail',
-                                               lookup_field='uuid', read_only=True)
+    url = TemplateHyperlinkedIdentityField(view_name='helpdesk_api:consultant:assign-detail',
+                                           lookup_field='uuid', read_only=True)
 
     class Meta:
         model = Assign
@@ -8,23 +8,22 @@ from django.views.decorators.cache import never_cache
 
 from rest_framework import viewsets, status as response_status
 from rest_framework.exceptions import NotAcceptable, ValidationError
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from utils.asynchronous import AsyncReadMixin
 from utils.generals import get_model
-from utils.pagination import build_result_pagination
+from utils.ownership import OwnerScopeMixin
+from utils.pagination import PaginationMixin
 from apps.helpdesk.utils.permissions import IsAssignOwnerOrReject, IsConsultantOnly
 from .serializers import AssignSerializer
 
 Assign = get_model('helpdesk', 'Assign')
 
-# Define to avoid used ...().paginate__
-_PAGINATOR = LimitOffsetPagination()
 
-
-class AssignApiView(viewsets.ViewSet):
+class AssignApiView(AsyncReadMixin, PaginationMixin, OwnerScopeMixin, viewsets.ViewSet):
     lookup_field = 'uuid'
+    owner_field = 'consultant'
     permission_classes = (IsAuthenticated, IsConsultantOnly,)
     permission_action = {
         'partial_update': [IsAssignOwnerOrReject],
@@ -70,7 +69,7 @@ class AssignApiView(viewsets.ViewSet):
     # multiple objects
     def get_objects(self):
         try:
-            queryset = self.queryset.filter(consultant__uuid=self.user.uuid)
+            queryset = self.owned(self.queryset)
         except (ValidationError, Exception) as e:
             raise NotAcceptable(detail=str(e))
         return queryset
@@ -79,9 +78,18 @@ class AssignApiView(viewsets.ViewSet):
         context = {'request': request}
         queryset = self.get_objects()
 
-        queryset_paginator = _PAGINATOR.paginate_queryset(queryset, request)
+        queryset_paginator = self.paginate_queryset(queryset)
+        serializer = AssignSerializer(queryset_paginator, many=True, context=context)
+        pagination_result = self.get_pagination_result(serializer)
+        return Response(pagination_result, status=response_status.HTTP_200_OK)
+
+    async def alist(self, request, format=None):
+        context = {'request': request}
+        queryset = self.get_objects()
+
+        queryset_paginator = await self.apaginate_queryset(queryset)
         serializer = AssignSerializer(queryset_paginator, many=True, context=context)
-        pagination_result = build_result_pagination(self, _PAGINATOR, serializer)
+        pagination_result = await self.aget_pagination_result(serializer)
         return Response(pagination_result, status=response_status.HTTP_200_OK)
 
     def retrieve(self, request, uuid=None, format=None):
@@ -2,7 +2,7 @@ from django.db import models
 from rest_framework import serializers
 
 from utils.generals import get_model
-from utils.mixin.api import DynamicFieldsModelSerializer
+from utils.mixin.api import DynamicFieldsModelSerializer, TemplateHyperlinkedIdentityField, AbsoluteURLField
 from apps.person.api.profile.v1.serializers import ProfileSerializer
 from ....consultant.v1.priority.serializers import PrioritySerializer
 from ....consultant.v1.sla.serializers import SLASerializer
@@ -30,8 +30,8 @@ class ReservationItemSerializer(DynamicFieldsModelSerializer, serializers.ModelS
 
 """ RETRIEVE: RESERVATION """
 class ReservationRetrieveSerializer(DynamicFieldsModelSerializer, serializers.ModelSerializer):
-    url = serializers.HyperlinkedIdentityField(view_name='helpdesk_api:consultant:reservation-detail',
-                                               lookup_field='uuid', read_only=True)
+    url = TemplateHyperlinkedIdentityField(view_name='helpdesk_api:consultant:reservation-detail',
+                                           lookup_field='uuid', read_only=True)
     issue = IssueSerializer(read_only=True, fields_used=('uuid', 'label', 'topic_label', 'description',))
     client = ProfileSerializer(read_only=True, source='client.profile')
     segment = SegmentSerializer(read_only=True, fields_used=('uuid', 'canal', 'canal_label', 'quota',
@@ -42,24 +42,20 @@ class ReservationRetrieveSerializer(DynamicFieldsModelSerializer, serializers.Mo
     priority = PrioritySerializer(read_only=True)
     reservation_item = ReservationItemSerializer(many=True, read_only=True)
     total_cost = serializers.IntegerField(read_only=True)
-    permalink = serializers.SerializerMethodField(read_only=True)
+    permalink = AbsoluteURLField(source='permalink_for_consultant')
 
     class Meta:
         model = Reservation
         fields = '__all__'
 
-    def get_permalink(self, obj):
-        request = self.context.get('request')
-        return request.build_absolute_uri(obj.permalink_for_consultant)
-
 
 """ LIST: RESERVATION """
 class ReservationListSerializer(DynamicFieldsModelSerializer, serializers.ModelSerializer):
-    url = serializers.HyperlinkedIdentityField(view_name='helpdesk_api:consultant:reservation-detail',
-                                               lookup_field='uuid', read_only=True)
+    url = TemplateHyperlinkedIdentityField(view_name='helpdesk_api:consultant:reservation-detail',
+                                           lookup_field='uuid', read_only=True)
     issue_label = serializers.CharField(read_only=True, source='issue.label')
     total_cost = serializers.IntegerField(read_only=True)
-    permalink = serializers.SerializerMethodField(read_only=True)
+    permalink = AbsoluteURLField(source='permalink_for_consultant')
     reservation_item = ReservationItemSerializer(many=True, read_only=True,
                                                  fields_used=('uuid', 'datetime', 'status',
                                                               'assign_status', 'assign_uuid', 
@@ -68,7 +64,3 @@ class ReservationListSerializer(DynamicFieldsModelSerializer, serializers.ModelS
     class Meta:
         model = Reservation
         fields = ('uuid', 'url', 'issue_label', 'total_cost', 'permalink', 'reservation_item',)
-
-    def get_permalink(self, obj):
-        request = self.context.get('request')
-        return request.build_absolute_uri(obj.permalink_for_consultant)
@@ -6,13 +6,15 @@ from rest_framework import viewsets, status as response_status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import NotAcceptable
 from rest_framework.response import Response
-from rest_framework.pagination import LimitOffsetPagination
 
+from utils.asynchronous import AsyncReadMixin, database_sync_to_async
 from utils.generals import get_model
-from utils.pagination import build_result_pagination
+from utils.ownership import OwnerScopeMixin
+from utils.pagination import KeysetPagination, PaginationMixin
 
 from apps.helpdesk.utils.constants import PUSH, PULL, WAITING
 from apps.helpdesk.utils.permissions import IsConsultantOnly
+from apps.helpdesk.utils.search import issue_search
 
 from .serializers import (
     ReservationListSerializer, 
@@ -23,18 +25,18 @@ from .serializers import (
 Reservation = get_model('helpdesk', 'Reservation')
 ReservationItem = get_model('helpdesk', 'ReservationItem')
 
-# Define to avoid used ...().paginate__
-_PAGINATOR = LimitOffsetPagination()
 
-
-class ReservationApiView(viewsets.ViewSet):
+class ReservationApiView(AsyncReadMixin, PaginationMixin, OwnerScopeMixin, viewsets.ViewSet):
+    pagination_class = KeysetPagination
     lookup_field = 'uuid'
+    owner_field = 'consultant'
     permission_classes = (IsAuthenticated, IsConsultantOnly,)
 
     def initialize_request(self, request, *args, **kwargs):
         self.user = request.user
         self.assign_status = None
         self.rsv_item_status = PUSH
+        self.keyword = None
 
         return super().initialize_request(request, *args, **kwargs)
 
@@ -48,25 +50,33 @@ class ReservationApiView(viewsets.ViewSet):
             if self.rsv_item_status == PULL:
                 q = Q(status=self.rsv_item_status)
 
-            rsv_item_prefetch = ReservationItem.objects.prefetch_related(Prefetch('assign')) \
-                .select_related('assign') \
+            rsv_item_prefetch = ReservationItem.objects \
+                .prefetch_related(Prefetch('assign'), Prefetch('schedule'),
+                                  Prefetch('segment'), Prefetch('sla'),
+                                  Prefetch('priority'), Prefetch('issue')) \
+                .select_related('assign', 'schedule', 'segment', 'sla', 'priority', 'issue') \
                 .filter(q)
 
+        # schedule, segment, sla, priority and issue are of the item
         query = Reservation.objects \
-            .prefetch_related(Prefetch('client'), Prefetch('consultant'), Prefetch('schedule'),
-                              Prefetch('segment'), Prefetch('sla'), Prefetch('priority'),
-                              Prefetch('issue'), Prefetch('reservation_item', queryset=rsv_item_prefetch),
+            .prefetch_related(Prefetch('client'), Prefetch('consultant'),
+                              Prefetch('reservation_item', queryset=rsv_item_prefetch),
                               Prefetch('reservation_item__assign'), Prefetch('reservation_item__assign__assigned')) \
-            .select_related('client', 'consultant', 'schedule', 'segment', 'sla', 'priority', 'issue')
+            .select_related('client', 'consultant')
 
         return query
 
     def get_objects(self):
         try:
-            queryset = self.queryset.filter(consultant__uuid=self.user.uuid)
+            queryset = self.owned(self.queryset)
         except (ValidationError, ObjectDoesNotExist, Exception) as e:
             raise NotAcceptable(detail=str(e))
-        
+
+        # full text of the issue
+        if self.keyword:
+            queryset = queryset.filter(reservation_item__issue_id__in=issue_search.matching(self.keyword)) \
+                .distinct()
+
         return queryset.filter_assign(assign_status=self.assign_status,
                                       rsv_item_status=self.rsv_item_status)
 
@@ -85,11 +95,25 @@ class ReservationApiView(viewsets.ViewSet):
         context = {'request': request}
         self.assign_status = request.query_params.get('assign_status', WAITING)
         self.rsv_item_status = request.query_params.get('rsv_item_status', PUSH)
+        self.keyword = request.query_params.get('keyword')
 
         queryset = self.get_objects()
-        queryset_paginator = _PAGINATOR.paginate_queryset(queryset, request)
+        queryset_paginator = self.paginate_queryset(queryset)
+        serializer = ReservationListSerializer(queryset_paginator, many=True, context=context)
+        pagination_result = self.get_pagination_result(serializer)
+        return Response(pagination_result, status=response_status.HTTP_200_OK)
+
+    async def alist(self, request, format=None):
+        context = {'request': request}
+        self.assign_status = request.query_params.get('assign_status', WAITING)
+        self.rsv_item_status = request.query_params.get('rsv_item_status', PUSH)
+        self.keyword = request.query_params.get('keyword')
+
+        # local search index may read the database
+        queryset = await database_sync_to_async(self.get_objects)()
+        queryset_paginator = await self.apaginate_queryset(queryset)
         serializer = ReservationListSerializer(queryset_paginator, many=True, context=context)
-        pagination_result = build_result_pagination(self, _PAGINATOR, serializer)
+        pagination_result = await self.aget_pagination_result(serializer)
         return Response(pagination_result, status=response_status.HTTP_200_OK)
 
     def retrieve(self, request, uuid=None):
@@ -99,7 +123,8 @@ class ReservationApiView(viewsets.ViewSet):
         return Response(serializer.data, status=response_status.HTTP_200_OK)
 
 
-class ReservationItemApiView(viewsets.ViewSet):
+class ReservationItemApiView(PaginationMixin, viewsets.ViewSet):
+    pagination_class = KeysetPagination
     lookup_field = 'uuid'
     permission_classes = (IsAuthenticated, IsConsultantOnly,)
 
@@ -154,10 +179,10 @@ class ReservationItemApiView(viewsets.ViewSet):
         else:
             queryset = self.queryset
     
-        queryset_paginator = _PAGINATOR.paginate_queryset(queryset, request)
+        queryset_paginator = self.paginate_queryset(queryset)
         serializer = ReservationItemSerializer(queryset_paginator, many=True,
                                                context=context)
-        pagination_result = build_result_pagination(self, _PAGINATOR, serializer)
+        pagination_result = self.get_pagination_result(serializer)
         return Response(pagination_result, status=response_status.HTTP_200_OK)
 
     def retrieve(self, request, uuid=None):
@@ -5,7 +5,8 @@ from utils.generals import get_model
 from utils.mixin.api import (
     DynamicFieldsModelSerializer, 
     ListSerializerUpdateMappingField,
-    WritetableFieldPutMethod
+    WritetableFieldPutMethod,
+    TemplateHyperlinkedIdentityField
 )
 
 Priority = get_model('helpdesk', 'Priority')
@@ -17,8 +18,8 @@ class PriorityListSerializer(ListSerializerUpdateMappingField, serializers.ListS
 
 class PrioritySerializer(DynamicFieldsModelSerializer, WritetableFieldPutMethod,
                          serializers.ModelSerializer):
-    url = serializers.HyperlinkedIdentityField(view_name='helpdesk_api:consultant:priority-detail',
-                                               lookup_field='uuid', read_only=True)
+    url = TemplateHyperlinkedIdentityField(view_name='helpdesk_api:consultant:priority-detail',
+                                           lookup_field='uuid', read_only=True)
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
     sla = serializers.SlugRelatedField(slug_field='uuid', queryset=SLA.objects.all())
 
@@ -13,6 +13,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from utils.generals import get_model
+from utils.ownership import OwnerScopeMixin
 from apps.helpdesk.utils.permissions import (
     IsConsultantOnly, 
     IsObjectOwnerOrReject, 
@@ -23,7 +24,7 @@ from .serializers import PrioritySerializer
 Priority = get_model('helpdesk', 'Priority')
 
 
-class PriorityApiView(viewsets.ViewSet):
+class PriorityApiView(OwnerScopeMixin, viewsets.ViewSet):
     """
     GET
     ---------------
@@ -88,7 +89,7 @@ class PriorityApiView(viewsets.ViewSet):
         queryset = Priority.objects \
             .prefetch_related(Prefetch('user'), Prefetch('sla')) \
             .select_related('sla', 'user') \
-            .filter(user__uuid=self.user.uuid)
+            .filter(self.owner_q())
         return queryset
 
     # single object
@@ -198,7 +199,7 @@ class PriorityApiView(viewsets.ViewSet):
         uuids = [item.get('uuid', None) for item in request.data]
 
         try:
-            queryset = self.queryset.filter(uuid__in=uuids, rule__user__uuid=request.user.uuid)
+            queryset = self.queryset.filter(uuid__in=uuids)
         except (ValidationError, Exception) as e:
             raise NotAcceptable(detail=str(e))
 
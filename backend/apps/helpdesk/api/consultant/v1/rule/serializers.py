@@ -7,7 +7,8 @@ from utils.mixin.validators import CleanValidateMixin
 from utils.mixin.api import (
     DynamicFieldsModelSerializer, 
     ListSerializerUpdateMappingField, 
-    WritetableFieldPutMethod
+    WritetableFieldPutMethod,
+    TemplateHyperlinkedIdentityField
 )
 
 Rule = get_model('helpdesk', 'Rule')
@@ -35,8 +36,8 @@ class RuleValueSerializer(DynamicFieldsModelSerializer, WritetableFieldPutMethod
 
 
 class RuleSerializer(DynamicFieldsModelSerializer, serializers.ModelSerializer):
-    url = serializers.HyperlinkedIdentityField(view_name='helpdesk_api:consultant:rule-detail',
-                                               lookup_field='uuid', read_only=True)
+    url = TemplateHyperlinkedIdentityField(view_name='helpdesk_api:consultant:rule-detail',
+                                           lookup_field='uuid', read_only=True)
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
     schedule_term = serializers.SlugRelatedField(slug_field='uuid', queryset=ScheduleTerm.objects.all())
     rule_value = RuleValueSerializer(many=True, read_only=True,
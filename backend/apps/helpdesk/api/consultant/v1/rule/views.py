@@ -14,6 +14,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
 
 from utils.generals import get_model
+from utils.ownership import OwnerScopeMixin
 from apps.helpdesk.utils.permissions import (
     IsConsultantOnly, IsObjectOwnerOrReject, IsResumeCompleteOrReject, 
     IsRuleValueOwnerOrReject
@@ -24,7 +25,7 @@ from .serializers import RuleSerializer, RuleValueSerializer
 Rule = get_model('helpdesk', 'Rule')
 
 
-class RuleApiView(viewsets.ViewSet):
+class RuleApiView(OwnerScopeMixin, viewsets.ViewSet):
     """
     GET
     -----------------
@@ -166,7 +167,7 @@ class RuleApiView(viewsets.ViewSet):
         queryset = RuleValue.objects \
             .prefetch_related(Prefetch('rule'), Prefetch('rule__user'), Prefetch('schedule_term')) \
             .select_related('rule', 'schedule_term') \
-            .filter(rule__user__uuid=request.user.uuid)
+            .filter(self.owner_q('rule__user'))
 
         queryset_delete = queryset.filter(uuid__in=rule_value_uuids)
         if queryset_delete.exists():
@@ -177,7 +178,7 @@ class RuleApiView(viewsets.ViewSet):
             if not queryset_check.exists() and rule_value_uuids:
                 # if all RuleValue gone, delete the Rule to
                 try:
-                    rule = Rule.objects.get(uuid=uuid, identifier=identifier, user__uuid=request.user.uuid)
+                    rule = Rule.objects.get(self.owner_q(), uuid=uuid, identifier=identifier)
                     rule.delete()
                 except ObjectDoesNotExist:
                     pass
@@ -187,7 +188,7 @@ class RuleApiView(viewsets.ViewSet):
         raise NotFound()
 
 
-class RuleValueApiView(viewsets.ViewSet):
+class RuleValueApiView(OwnerScopeMixin, viewsets.ViewSet):
     """
     GET
     --------------
@@ -338,7 +339,7 @@ class RuleValueApiView(viewsets.ViewSet):
         uuids = [item.get('uuid', None) for item in request.data]
 
         try:
-            queryset = self.queryset.filter(uuid__in=uuids, rule__user__uuid=request.user.uuid)
+            queryset = self.owned(self.queryset).filter(uuid__in=uuids)
         except (ValidationError, Exception) as e:
             raise NotAcceptable(detail=str(e))
 
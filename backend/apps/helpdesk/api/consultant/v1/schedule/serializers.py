@@ -10,7 +10,9 @@ from utils.generals import get_model
 from utils.mixin.api import (
     DynamicFieldsModelSerializer, 
     ListSerializerUpdateMappingField, 
-    WritetableFieldPutMethod
+    WritetableFieldPutMethod,
+    TemplateHyperlinkedIdentityField,
+    AbsoluteURLField
 )
 from ..segment.serializers import SegmentSerializer
 from ..rule.serializers import RuleSerializer
@@ -19,6 +21,7 @@ Expertise = get_model('resume', 'Expertise')
 Schedule = get_model('helpdesk', 'Schedule')
 ScheduleExpertise = get_model('helpdesk', 'ScheduleExpertise')
 ScheduleTerm = get_model('helpdesk', 'ScheduleTerm')
+ScheduleOccurrence = get_model('helpdesk', 'ScheduleOccurrence')
 User = get_model('person', 'User')
 
 
@@ -29,8 +32,8 @@ class ScheduleExpertiseListSerializer(ListSerializerUpdateMappingField, serializ
 
 class ScheduleExpertiseSerializer(DynamicFieldsModelSerializer, WritetableFieldPutMethod,
                                   serializers.ModelSerializer):
-    url = serializers.HyperlinkedIdentityField(view_name='helpdesk_api:consultant:expertise-detail',
-                                               lookup_field='uuid', read_only=True)
+    url = TemplateHyperlinkedIdentityField(view_name='helpdesk_api:consultant:expertise-detail',
+                                           lookup_field='uuid', read_only=True)
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
     schedule = serializers.SlugRelatedField(slug_field='uuid', queryset=Schedule.objects.all())
     expertise = serializers.SlugRelatedField(slug_field='uuid', queryset=Expertise.objects.all())
@@ -48,8 +51,8 @@ class ScheduleExpertiseSerializer(DynamicFieldsModelSerializer, WritetableFieldP
 
 """ TERMS """
 class ScheduleTermSerializer(DynamicFieldsModelSerializer, serializers.ModelSerializer):
-    url = serializers.HyperlinkedIdentityField(view_name='helpdesk_api:consultant:scheduleterm-detail',
-                                               lookup_field='uuid', read_only=True)
+    url = TemplateHyperlinkedIdentityField(view_name='helpdesk_api:consultant:scheduleterm-detail',
+                                           lookup_field='uuid', read_only=True)
     schedule = serializers.SlugRelatedField(slug_field='uuid', write_only=True, queryset=Schedule.objects.all())
     rule = RuleSerializer(many=True, read_only=True, fields_used=('uuid', 'identifier', 'mode', 'type',
                                                                   'url', 'rule_value', 'direction',))
@@ -85,8 +88,19 @@ class ScheduleTermSerializer(DynamicFieldsModelSerializer, serializers.ModelSeri
         return instance
 
 
+""" OCCURRENCES """
+class ScheduleOccurrenceSerializer(DynamicFieldsModelSerializer, serializers.ModelSerializer):
+    segment = serializers.SlugRelatedField(slug_field='uuid', read_only=True)
+    canal = serializers.CharField(source='segment.canal', read_only=True)
+    remaining = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = ScheduleOccurrence
+        exclude = ('id', 'user', 'schedule',)
+
+
 """ SCHEDULE """
-class ScheduleListSerializer(serializers.ListSerializer):
+class ScheduleListSerializer(ListSerializerUpdateMappingField, serializers.ListSerializer):
     def to_representation(self, value):
         if isinstance(value, QuerySet):
             value = value.prefetch_related(Prefetch('segment'))
@@ -95,8 +109,8 @@ class ScheduleListSerializer(serializers.ListSerializer):
 
 
 class ScheduleSerializer(DynamicFieldsModelSerializer, serializers.ModelSerializer):
-    url = serializers.HyperlinkedIdentityField(view_name='helpdesk_api:consultant:schedule-detail',
-                                               lookup_field='uuid', read_only=True)
+    url = TemplateHyperlinkedIdentityField(view_name='helpdesk_api:consultant:schedule-detail',
+                                           lookup_field='uuid', read_only=True)
     user = serializers.SlugRelatedField(slug_field='uuid', queryset=User.objects.all(),
                                         default=serializers.CurrentUserDefault())
     schedule_expertise = ScheduleExpertiseSerializer(many=True, read_only=True,
@@ -112,8 +126,8 @@ class ScheduleSerializer(DynamicFieldsModelSerializer, serializers.ModelSerializ
                                              'open_hour_formated', 'close_hour_formated',))
     segment_label = serializers.SlugRelatedField(slug_field='canal_label', read_only=True, many=True,
                                                  source='segment')
-    permalink = serializers.SerializerMethodField(read_only=True)
-    permalink_schedule_reservation = serializers.SerializerMethodField(read_only=True)
+    permalink = AbsoluteURLField()
+    permalink_schedule_reservation = AbsoluteURLField()
     consultant = ProfileSerializer(read_only=True, source='user.profile')
 
     class Meta:
@@ -121,14 +135,6 @@ class ScheduleSerializer(DynamicFieldsModelSerializer, serializers.ModelSerializ
         list_serializer_class = ScheduleListSerializer
         fields = '__all__'
         
-    def get_permalink(self, obj):
-        request = self.context.get('request')
-        return request.build_absolute_uri(obj.permalink)
-
-    def get_permalink_schedule_reservation(self, obj):
-        request = self.context.get('request')
-        return request.build_absolute_uri(obj.permalink_schedule_reservation)
-
     @transaction.atomic
     def create(self, validated_data):
         instance, _created = Schedule.objects.get_or_create(**validated_data)
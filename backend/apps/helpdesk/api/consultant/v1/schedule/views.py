@@ -5,38 +5,43 @@ from django.views.decorators.cache import never_cache
 from django.utils.decorators import method_decorator
 from django.utils.translation import ugettext_lazy as _
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 
 from rest_framework import status as response_status, viewsets
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.exceptions import NotAcceptable, NotFound
 from rest_framework.decorators import action
-from rest_framework.pagination import LimitOffsetPagination
 
 from apps.helpdesk.utils.permissions import (
     IsConsultantOnly, 
     IsObjectOwnerOrReject, IsResumeCompleteOrReject, 
     IsScheduleTermOwnerOrReject
 )
+from utils.asynchronous import (
+    AsyncReadMixin, aprefetch_related_objects, aserializer_data,
+    database_sync_to_async, split_prefetch
+)
 from utils.generals import get_model
-from utils.pagination import build_result_pagination
+from utils.pagination import PaginationMixin
+from utils.ordering import ReorderMixin
+from utils.ownership import OwnerScopeMixin
 from apps.helpdesk.utils.constants import ONCE
 from .serializers import (
     ScheduleExpertiseSerializer, 
     ScheduleSerializer, 
-    ScheduleTermSerializer
+    ScheduleTermSerializer,
+    ScheduleOccurrenceSerializer
 )
 
 Schedule = get_model('helpdesk', 'Schedule')
 ScheduleTerm = get_model('helpdesk', 'ScheduleTerm')
 Rule = get_model('helpdesk', 'Rule')
 ScheduleExpertise = get_model('helpdesk', 'ScheduleExpertise')
-
-# Define to avoid used ...().paginate__
-_PAGINATOR = LimitOffsetPagination()
+ScheduleOccurrence = get_model('helpdesk', 'ScheduleOccurrence')
 
 
-class ScheduleApiView(viewsets.ViewSet):
+class ScheduleApiView(AsyncReadMixin, PaginationMixin, ReorderMixin, OwnerScopeMixin, viewsets.ViewSet):
     """
     POST
     ------------------
@@ -85,10 +90,10 @@ class ScheduleApiView(viewsets.ViewSet):
             Prefetch('segment__sla'),
             Prefetch('segment__sla__priority')) \
         .select_related('schedule_term', 'user') \
-        .exclude(~Q(user__uuid=self.user.uuid) & Q(is_active=False) |
-                 ~Q(user__uuid=self.user.uuid) & Q(schedule_term__dtstart__lte=timezone.now())
+        .exclude(~self.owner_q() & Q(is_active=False) |
+                 ~self.owner_q() & Q(schedule_term__dtstart__lte=timezone.now())
                  & Q(schedule_term__direction=ONCE) |
-                 ~Q(user__uuid=self.user.uuid) & ~Q(segment__isnull=False))
+                 ~self.owner_q() & ~Q(segment__isnull=False))
 
         return q
 
@@ -103,10 +108,10 @@ class ScheduleApiView(viewsets.ViewSet):
             Prefetch('schedule_term__rule'),
             Prefetch('schedule_term__rule__rule_value')) \
         .select_related('schedule_term') \
-        .exclude(~Q(user__uuid=self.user.uuid) & Q(is_active=False) |
-                 ~Q(user__uuid=self.user.uuid) & Q(schedule_term__dtstart__lte=timezone.now())
+        .exclude(~self.owner_q() & Q(is_active=False) |
+                 ~self.owner_q() & Q(schedule_term__dtstart__lte=timezone.now())
                  & Q(schedule_term__direction=ONCE) |
-                 ~Q(user__uuid=self.user.uuid) & ~Q(segment__isnull=False))
+                 ~self.owner_q() & ~Q(segment__isnull=False))
 
         return q
 
@@ -123,21 +128,34 @@ class ScheduleApiView(viewsets.ViewSet):
         return queryset
 
     """ SCHEDULE: LIST """
+    def get_objects(self, request):
+        # if user_uuid not set, current user by id
+        user_uuid = request.query_params.get('user_uuid', None)
+        if user_uuid is None:
+            queryset = self.owned(self.queryset_list)
+        else:
+            queryset = self.queryset_list.filter(user__uuid=user_uuid)
+
+        return queryset.order_by('sort_order')
+
+    def get_list_serializer(self, queryset, context):
+        return ScheduleSerializer(queryset, many=True, context=context,
+                                  fields_used=('url', 'uuid', 'label', 'expertise',
+                                               'is_active', 'permalink', 'permalink_schedule_reservation', 
+                                               'segment_label', 'schedule_term',))
+
     def list(self, request, format=None):
         context = {'request': request}
+        queryset_paginator = self.paginate_queryset(self.get_objects(request))
+        serializer = self.get_list_serializer(queryset_paginator, context)
+        pagination_result = self.get_pagination_result(serializer)
+        return Response(pagination_result, status=response_status.HTTP_200_OK)
 
-        # if user_uuid not set, user current user.uuid
-        user_uuid = request.query_params.get('user_uuid', None)
-        if user_uuid is None:
-            user_uuid = self.user.uuid
-
-        queryset = self.queryset_list.filter(user__uuid=user_uuid).order_by('sort_order')
-        queryset_paginator = _PAGINATOR.paginate_queryset(queryset, request)
-        serializer = ScheduleSerializer(queryset_paginator, many=True, context=context,
-                                        fields_used=('url', 'uuid', 'label', 'expertise',
-                                                     'is_active', 'permalink', 'permalink_schedule_reservation', 
-                                                     'segment_label', 'schedule_term',))
-        pagination_result = build_result_pagination(self, _PAGINATOR, serializer)
+    async def alist(self, request, format=None):
+        context = {'request': request}
+        queryset_paginator = await self.apaginate_queryset(self.get_objects(request))
+        serializer = self.get_list_serializer(queryset_paginator, context)
+        pagination_result = await self.aget_pagination_result(serializer)
         return Response(pagination_result, status=response_status.HTTP_200_OK)
 
     """ SCHEDULE: CREATE """
@@ -157,15 +175,31 @@ class ScheduleApiView(viewsets.ViewSet):
         return Response(serializer.errors, status=response_status.HTTP_400_BAD_REQUEST)
 
     """ SCHEDULE: GET """
+    def get_retrieve_serializer(self, instance, context):
+        return ScheduleSerializer(instance, many=False, context=context,
+                                  fields_used=('schedule_expertise', 'uuid', 'label', 'is_active',
+                                               'create_date', 'schedule_term', 'segment', 
+                                               'description', 'user', 'consultant',))
+
     def retrieve(self, request, uuid=None):
         context = {'request': request, 'uuid': uuid}
         queryset = self.get_object(uuid=uuid)
-        serializer = ScheduleSerializer(queryset, many=False, context=context,
-                                        fields_used=('schedule_expertise', 'uuid', 'label', 'is_active',
-                                                     'create_date', 'schedule_term', 'segment', 
-                                                     'description', 'user', 'consultant',))
+        serializer = self.get_retrieve_serializer(queryset, context)
         return Response(serializer.data, status=response_status.HTTP_200_OK)
 
+    async def aretrieve(self, request, uuid=None):
+        context = {'request': request, 'uuid': uuid}
+        queryset, lookups = split_prefetch(self.queryset)
+
+        try:
+            instance = await database_sync_to_async(queryset.get)(uuid=uuid)
+        except (ValidationError, ObjectDoesNotExist) as e:
+            raise NotAcceptable(detail=str(e))
+
+        await aprefetch_related_objects([instance], *lookups)
+        serializer = self.get_retrieve_serializer(instance, context)
+        return Response(await aserializer_data(serializer), status=response_status.HTTP_200_OK)
+
     """ SCHEDULE: UPDATE """
     @method_decorator(never_cache)
     @transaction.atomic
@@ -221,6 +255,46 @@ class ScheduleApiView(viewsets.ViewSet):
             return Response(serializer.data, status=response_status.HTTP_200_OK)
         return Response(serializer.errors, status=response_status.HTTP_400_BAD_REQUEST)
 
+    """ SCHEDULE: OCCURRENCES """
+    @action(methods=['get'], detail=True, permission_classes=[IsAuthenticated],
+            url_path='occurrences', url_name='occurrences')
+    def occurrences(self, request, uuid=None, format=None):
+        """
+        Pre-expanded available date, read from ScheduleOccurrence
+
+        Params;
+
+            {
+                "date_start": "2021-01-01",
+                "date_end": "2021-01-31"
+            }
+        """
+        context = {'request': request}
+        schedule = self.get_object(uuid=uuid)
+        date_start = request.query_params.get('date_start', None)
+        date_end = request.query_params.get('date_end', None)
+
+        try:
+            date_start = parse_date(date_start) if date_start else timezone.localdate()
+            date_end = parse_date(date_end) if date_end else None
+        except ValueError as e:
+            raise NotAcceptable(detail=str(e))
+
+        if date_start is None:
+            raise NotAcceptable(detail=_("Param date_start invalid"))
+
+        queryset = ScheduleOccurrence.objects \
+            .select_related('segment') \
+            .filter(schedule_id=schedule.id, is_active=True, date__gte=date_start)
+
+        if date_end:
+            queryset = queryset.filter(date__lte=date_end)
+
+        queryset_paginator = self.paginate_queryset(queryset)
+        serializer = ScheduleOccurrenceSerializer(queryset_paginator, many=True, context=context)
+        pagination_result = self.get_pagination_result(serializer)
+        return Response(pagination_result, status=response_status.HTTP_200_OK)
+
 
 """ TERMS """
 class ScheduleTermApiView(viewsets.ViewSet):
@@ -324,7 +398,7 @@ class ScheduleTermApiView(viewsets.ViewSet):
 
 
 """ EXPERTISES """
-class ScheduleExpertiseApiView(viewsets.ViewSet):
+class ScheduleExpertiseApiView(OwnerScopeMixin, viewsets.ViewSet):
     """
     GET
     ------------
@@ -382,9 +456,9 @@ class ScheduleExpertiseApiView(viewsets.ViewSet):
         try:
             if is_update:
                 queryset = self.queryset.select_for_update() \
-                    .get(uuid=uuid, user__uuid=self.user.uuid)
+                    .get(self.owner_q(), uuid=uuid)
             else:
-                queryset = self.queryset.get(uuid=uuid, user__uuid=self.user.uuid)
+                queryset = self.queryset.get(self.owner_q(), uuid=uuid)
         except (ValidationError, ObjectDoesNotExist, Exception) as e:
             raise NotAcceptable(detail=str(e))
         return queryset
@@ -486,7 +560,7 @@ class ScheduleExpertiseApiView(viewsets.ViewSet):
         uuids = [item.get('uuid', None) for item in request.data]
 
         try:
-            queryset = self.queryset.filter(uuid__in=uuids, user__uuid=request.user.uuid)
+            queryset = self.owned(self.queryset).filter(uuid__in=uuids)
         except (ValidationError, Exception) as e:
             raise NotAcceptable(detail=str(e))
 
@@ -3,7 +3,7 @@ from django.db.models import Prefetch
 from rest_framework import serializers
 
 from utils.generals import get_model
-from utils.mixin.api import DynamicFieldsModelSerializer
+from utils.mixin.api import DynamicFieldsModelSerializer, TemplateHyperlinkedIdentityField
 from ..sla.serializers import SLASerializer
 
 Segment = get_model('helpdesk', 'Segment')
@@ -17,8 +17,8 @@ class SegmentListSerializer(serializers.ListSerializer):
 
 
 class SegmentSerializer(DynamicFieldsModelSerializer, serializers.ModelSerializer):
-    url = serializers.HyperlinkedIdentityField(view_name='helpdesk_api:consultant:segment-detail',
-                                               lookup_field='uuid', read_only=True)
+    url = TemplateHyperlinkedIdentityField(view_name='helpdesk_api:consultant:segment-detail',
+                                           lookup_field='uuid', read_only=True)
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
     schedule = serializers.SlugRelatedField(slug_field='uuid', queryset=Schedule.objects.all())
     sla = SLASerializer(many=True, read_only=True)
@@ -12,6 +12,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from utils.generals import get_model
+from utils.ownership import OwnerScopeMixin
 from apps.helpdesk.utils.permissions import (
     IsConsultantOnly, 
     IsObjectOwnerOrReject, 
@@ -23,7 +24,7 @@ Segment = get_model('helpdesk', 'Segment')
 Priority = get_model('helpdesk', 'Priority')
 
 
-class SegmentApiView(viewsets.ViewSet):
+class SegmentApiView(OwnerScopeMixin, viewsets.ViewSet):
     """
     GET
     ---------------
@@ -105,7 +106,7 @@ class SegmentApiView(viewsets.ViewSet):
     def get_objects(self, schedule_uuid=None):
         try:
             queryset = self.queryset \
-                .filter(user__uuid=self.user.uuid, schedule__uuid=schedule_uuid)
+                .filter(self.owner_q(), schedule__uuid=schedule_uuid)
         except (ValidationError, Exception) as e:
             raise NotAcceptable(detail=str(e))
         return queryset
@@ -4,7 +4,7 @@ from django.db.models import Prefetch
 from rest_framework import serializers
 
 from utils.generals import get_model
-from utils.mixin.api import DynamicFieldsModelSerializer
+from utils.mixin.api import DynamicFieldsModelSerializer, TemplateHyperlinkedIdentityField
 from ..priority.serializers import PrioritySerializer
 
 SLA = get_model('helpdesk', 'SLA')
@@ -20,8 +20,8 @@ class SLAListSerializer(serializers.ListSerializer):
 
 
 class SLASerializer(DynamicFieldsModelSerializer, serializers.ModelSerializer):
-    url = serializers.HyperlinkedIdentityField(view_name='helpdesk_api:consultant:sla-detail',
-                                               lookup_field='uuid', read_only=True)
+    url = TemplateHyperlinkedIdentityField(view_name='helpdesk_api:consultant:sla-detail',
+                                           lookup_field='uuid', read_only=True)
     segment = serializers.SlugRelatedField(slug_field='uuid', queryset=Segment.objects.all(),
                                            write_only=True)
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
@@ -11,6 +11,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from utils.generals import get_model
+from utils.ownership import OwnerScopeMixin
 from apps.helpdesk.utils.permissions import (
     IsConsultantOnly, 
     IsObjectOwnerOrReject, 
@@ -21,7 +22,7 @@ from .serializers import SLASerializer
 SLA = get_model('helpdesk', 'SLA')
 
 
-class SLAApiView(viewsets.ViewSet):
+class SLAApiView(OwnerScopeMixin, viewsets.ViewSet):
     """
     GET
     ---------------
@@ -113,7 +114,7 @@ class SLAApiView(viewsets.ViewSet):
             queryset = self.queryset.prefetch_related(Prefetch('schedule'), Prefetch('priority'),
                                                  Prefetch('user'), Prefetch('segment')) \
                 .select_related('schedule', 'segment', 'user') \
-                .filter(user__uuid=self.user.uuid, segment__uuid=segment_uuid)
+                .filter(self.owner_q(), segment__uuid=segment_uuid)
         except (ValidationError, Exception) as e:
             raise NotAcceptable(detail=str(e))
         return queryset
@@ -1,5 +1,7 @@
 from django.apps import AppConfig
-from django.db.models.signals import post_save
+from django.db.models.signals import post_migrate, post_save, post_delete, pre_save
+
+from utils.signals import bulk_saved
 
 
 class HelpdeskConfig(AppConfig):
@@ -7,17 +9,33 @@ class HelpdeskConfig(AppConfig):
 
     def ready(self):
         from utils.generals import get_model
+        from utils.ordering import sequence_delete_handler
+        from utils.search import search_index_migrate_handler
         from apps.helpdesk.signals import (
             schedule_save_handler, 
+            schedule_bulk_save_handler,
             reservation_save_handler,
             reservationitem_save_handler,
-            assign_save_handler
+            reservationitem_bulk_save_handler,
+            assign_save_handler,
+            schedule_occurrence_handler,
+            schedule_occurrence_bulk_handler,
+            reservationitem_occurrence_pre_save_handler,
+            reservationitem_occurrence_handler,
+            reservationitem_occurrence_delete_handler,
+            issue_search_save_handler,
+            issue_search_delete_handler
         )
 
         Reservation = get_model('helpdesk', 'Reservation')
         ReservationItem = get_model('helpdesk', 'ReservationItem')
         Schedule = get_model('helpdesk', 'Schedule')
         Assign = get_model('helpdesk', 'Assign')
+        ScheduleTerm = get_model('helpdesk', 'ScheduleTerm')
+        Rule = get_model('helpdesk', 'Rule')
+        RuleValue = get_model('helpdesk', 'RuleValue')
+        Segment = get_model('helpdesk', 'Segment')
+        Issue = get_model('helpdesk', 'Issue')
 
         post_save.connect(reservation_save_handler, sender=Reservation,
                           dispatch_uid='reservation_save_signal')
@@ -25,8 +43,47 @@ class HelpdeskConfig(AppConfig):
         post_save.connect(reservationitem_save_handler, sender=ReservationItem,
                           dispatch_uid='reservationitem_save_signal')
 
+        # PUT many (utils/mixin/api.py)
+        bulk_saved.connect(reservationitem_bulk_save_handler, sender=ReservationItem,
+                           dispatch_uid='reservationitem_bulk_save_signal')
+
         post_save.connect(schedule_save_handler, sender=Schedule,
                           dispatch_uid='schedule_save_signal')
 
+        bulk_saved.connect(schedule_bulk_save_handler, sender=Schedule,
+                           dispatch_uid='schedule_bulk_save_signal')
+
+        # Rows counted for sort_order and max allowed (utils/ordering.py)
+        post_delete.connect(sequence_delete_handler, sender=Schedule,
+                            dispatch_uid='schedule_sequence_delete_signal')
+
         post_save.connect(assign_save_handler, sender=Assign,
                           dispatch_uid='assign_save_signal')
+
+        # Keep ScheduleOccurrence same as the rules
+        for model in [Schedule, ScheduleTerm, Rule, RuleValue, Segment]:
+            post_save.connect(schedule_occurrence_handler, sender=model,
+                              dispatch_uid='%s_occurrence_save_signal' % model._meta.model_name)
+            post_delete.connect(schedule_occurrence_handler, sender=model,
+                                dispatch_uid='%s_occurrence_delete_signal' % model._meta.model_name)
+            bulk_saved.connect(schedule_occurrence_bulk_handler, sender=model,
+                               dispatch_uid='%s_occurrence_bulk_save_signal' % model._meta.model_name)
+
+        pre_save.connect(reservationitem_occurrence_pre_save_handler, sender=ReservationItem,
+                         dispatch_uid='reservationitem_occurrence_pre_save_signal')
+
+        post_save.connect(reservationitem_occurrence_handler, sender=ReservationItem,
+                          dispatch_uid='reservationitem_occurrence_save_signal')
+
+        post_delete.connect(reservationitem_occurrence_delete_handler, sender=ReservationItem,
+                            dispatch_uid='reservationitem_occurrence_delete_signal')
+
+        post_save.connect(issue_search_save_handler, sender=Issue,
+                          dispatch_uid='issue_search_save_signal')
+
+        post_delete.connect(issue_search_delete_handler, sender=Issue,
+                            dispatch_uid='issue_search_delete_signal')
+
+        # MySQL FULLTEXT index of issue_search, MATCH fail without it
+        post_migrate.connect(search_index_migrate_handler, sender=self,
+                             dispatch_uid='helpdesk_search_index_migrate_signal')
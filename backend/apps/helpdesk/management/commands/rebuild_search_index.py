@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.search import registry
+
+# register the helpdesk index
+from apps.helpdesk.utils import search  # noqa
+
+
+class Command(BaseCommand):
+    help = "Rebuild full text search index, MySQL FULLTEXT index created when missing"
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', help="Index name, ex: helpdesk_issue (default all)")
+
+    def handle(self, *args, **options):
+        names = options['names'] or sorted(registry)
+        unknown = set(names) - set(registry)
+        if unknown:
+            raise CommandError("Unknown index %s, one of %s" % (', '.join(sorted(unknown)),
+                                                               ', '.join(sorted(registry))))
+
+        for name in names:
+            registry[name].rebuild()
+            self.stdout.write(self.style.SUCCESS("%s rebuilt" % name))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.helpdesk.utils.booking import repair_reservation_item_cost
+
+
+class Command(BaseCommand):
+    help = "Backfill ReservationItem.cost from the SLA and priority cost"
+
+    def handle(self, *args, **options):
+        changed = repair_reservation_item_cost()
+        self.stdout.write(self.style.SUCCESS("%s reservation item repaired" % changed))
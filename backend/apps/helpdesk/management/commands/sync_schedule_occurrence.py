@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.utils.dateparse import parse_date
+
+from apps.helpdesk.utils.occurrence import sync_all_schedule_occurrence
+
+
+class Command(BaseCommand):
+    help = "Roll ScheduleOccurrence horizon forward, run it daily from cron"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', type=parse_date, default=None,
+                            help="First date, default today (YYYY-MM-DD)")
+        parser.add_argument('--end', type=parse_date, default=None,
+                            help="Last date, default start + SCHEDULE_OCCURRENCE_HORIZON")
+
+    def handle(self, *args, **options):
+        sync_all_schedule_occurrence(start=options['start'], end=options['end'])
+        self.stdout.write(self.style.SUCCESS("Schedule occurrence synced"))
@@ -1,15 +1,16 @@
 import uuid
 
-from django.urls import reverse
 from django.conf import settings
 from django.db import models
-from django.db.models import Q, F, Count, Exists, OuterRef, IntegerField, ExpressionWrapper
+from django.db.models import Count, Exists, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
 
+from utils.urls import url_template
 from utils.validators import non_python_keyword, identifier_validator
 from utils.generals import random_string, get_model
 from apps.helpdesk.utils.constants import (
@@ -17,31 +18,40 @@ from apps.helpdesk.utils.constants import (
     WAITING, EVENT_CHOICES
 )
 
+# permalink, resolved at startup (utils/urls.py)
+issue_permalink = url_template('helpdesk_view:client:issue_detail')
+client_reservation_permalink = url_template('helpdesk_view:client:reservation_detail')
+consultant_reservation_permalink = url_template('helpdesk_view:consultant:reservation_detail')
 
-class ReservationQuerySet(models.query.QuerySet):
-    @property
-    def assign_query(self):
-        Assign = get_model('helpdesk', 'Assign')
-
-        qs = Assign.objects.filter(reservation_item__uuid=OuterRef('reservation_item__uuid'))
-        return qs
 
+class ReservationQuerySet(models.query.QuerySet):
     def filter_assign(self, assign_status=None, rsv_item_status=None):
         # rsv_item_status: pull, push
         # assign_status: accept, reject, waiting
         # rsv = reservation
-
-        q = Q(status=assign_status) & Q(reservation_item__status=PUSH)
+        #
+        # Two phase, no GROUP BY over the joined items;
+        # 1. reservation filtered by semi join on index assign (reservation, status, reservation_item),
+        #    reservation_item (reservation, status) for pull
+        # 2. assigned count and cost summed from ReservationItem.cost, with index
+        #    reservation (client|consultant, create_date) only evaluated for rows in the page
+        Assign = get_model('helpdesk', 'Assign')
+        ReservationItem = get_model('helpdesk', 'ReservationItem')
 
         if rsv_item_status == PULL:
-            q = Q(reservation_item__status=rsv_item_status)
+            matched = ReservationItem.objects \
+                .filter(reservation_id=OuterRef('pk'), status=PULL, assign__isnull=False)
+        else:
+            matched = Assign.objects \
+                .filter(reservation_id=OuterRef('pk'), status=assign_status, reservation_item__status=PUSH)
 
-        qs_assign = self.assign_query.filter(q)
-        qs = self.annotate(assign_exist=Exists(qs_assign),
-                           assigned_count=Count('reservation_item__assign__assigned', distinct=True),
-                           rsv_item_cost=F('reservation_item__sla__cost') + F('reservation_item__priority__cost'),
-                           total_cost=ExpressionWrapper(F('assigned_count') * F('rsv_item_cost'), output_field=IntegerField())) \
-            .filter(assign_exist=True)
+        assigned = ReservationItem.objects \
+            .filter(reservation_id=OuterRef('pk'), assign__assigned__isnull=False) \
+            .order_by().values('reservation_id')
+
+        qs = self.filter(Exists(matched)) \
+            .annotate(assigned_count=Coalesce(Subquery(assigned.annotate(total=Count('id')).values('total')), 0),
+                      total_cost=Coalesce(Subquery(assigned.annotate(total=Sum('cost')).values('total')), 0))
 
         return qs
 
@@ -72,14 +82,17 @@ class AbstractIssue(models.Model):
         ordering = ['-create_date']
         verbose_name = _("Issue")
         verbose_name_plural = _("Issues")
+        indexes = [
+            # keyset pagination seek on (create_date, id) each user
+            models.Index(fields=['user', 'create_date', 'id'], name='issue_user_date_idx'),
+        ]
 
     def __str__(self):
         return self.label
 
     @property
     def permalink(self):
-        from django.urls import reverse
-        return reverse('helpdesk_view:client:issue_detail', kwargs={'uuid': self.uuid})
+        return issue_permalink.path(self.uuid)
 
 
 class AbstractReservation(models.Model):
@@ -111,17 +124,22 @@ class AbstractReservation(models.Model):
         ordering = ['-create_date']
         verbose_name = _("Reservation")
         verbose_name_plural = _("Reservations")
+        indexes = [
+            # list each user in default ordering, stop at the page limit
+            models.Index(fields=['client', 'create_date', 'id'], name='rsv_client_date_idx'),
+            models.Index(fields=['consultant', 'create_date', 'id'], name='rsv_consultant_date_idx'),
+        ]
 
     def __str__(self):
         return self.client.username
 
     @property
     def permalink_for_client(self):
-        return reverse('helpdesk_view:client:reservation_detail', kwargs={'uuid': self.uuid})
+        return client_reservation_permalink.path(self.uuid)
 
     @property
     def permalink_for_consultant(self):
-        return reverse('helpdesk_view:consultant:reservation_detail', kwargs={'uuid': self.uuid})
+        return consultant_reservation_permalink.path(self.uuid)
 
 
 class AbstractReservationItem(models.Model):
@@ -152,12 +170,20 @@ class AbstractReservationItem(models.Model):
     number = models.CharField(max_length=255, editable=False, unique=True, null=True)
     status = models.CharField(choices=RSV_DATE_STATUS, default=PUSH, max_length=15)
 
+    # sla + priority cost when reserved, summed by ReservationQuerySet.filter_assign
+    cost = models.BigIntegerField(default=0, editable=False)
+
     class Meta:
         abstract = True
         app_label = 'helpdesk'
         ordering = ['-create_date']
         verbose_name = _("Reservation Item")
         verbose_name_plural = _("Reservation Items")
+        indexes = [
+            models.Index(fields=['reservation', 'status'], name='rsv_item_rsv_status_idx'),
+            # prefetch of the items each reservation, default ordering
+            models.Index(fields=['reservation', 'create_date'], name='rsv_item_rsv_date_idx'),
+        ]
 
     def __str__(self):
         return str(self.datetime)
@@ -175,16 +201,51 @@ class AbstractReservationItem(models.Model):
         issue = self.reservation.issue
         return issue.label
 
+    @staticmethod
+    def create_number():
+        rand = random_string(8)
+        now = timezone.datetime.now()
+        timestamp = timezone.datetime.timestamp(now)
+        return '{}{}'.format(rand, int(timestamp))
+
     def save(self, *args, **kwargs):
         if not self.pk:
-            rand = random_string(8)
-            now = timezone.datetime.now()
-            timestamp = timezone.datetime.timestamp(now)
-            number = '{}{}'.format(rand, int(timestamp))
+            self.number = self.create_number()
 
-            self.number = number
+        if self.sla_id and self.priority_id:
+            self.cost = self.sla.cost + self.priority.cost
         super().save(*args, **kwargs)
 
+    @classmethod
+    def bulk_prepare(cls, objs, fields=None):
+        """save() of many rows, costs read in one query each"""
+        if fields is None:
+            for obj in objs:
+                obj.number = cls.create_number()
+        elif not {'sla', 'priority'} & set(fields):
+            return ()
+
+        # deferred of changed rows (PUT only() the sent fields) read at once
+        current = dict()
+        if fields is not None:
+            current = {item[0]: item[1:] for item in cls.objects.filter(pk__in=[obj.pk for obj in objs])
+                       .values_list('id', 'sla_id', 'priority_id')}
+
+        def value(obj, index, attname):
+            return obj.__dict__[attname] if attname in obj.__dict__ else current[obj.pk][index]
+
+        pairs = [(obj, value(obj, 0, 'sla_id'), value(obj, 1, 'priority_id')) for obj in objs]
+        SLA = get_model('helpdesk', 'SLA')
+        Priority = get_model('helpdesk', 'Priority')
+        sla_costs = dict(SLA.objects.filter(id__in={pair[1] for pair in pairs}).values_list('id', 'cost'))
+        priority_costs = dict(Priority.objects.filter(id__in={pair[2] for pair in pairs})
+                              .values_list('id', 'cost'))
+
+        for obj, sla_id, priority_id in pairs:
+            if sla_id and priority_id:
+                obj.cost = sla_costs[sla_id] + priority_costs[priority_id]
+        return ('cost',)
+
     def clean(self):
         for field in self.__dict__:
             value = getattr(self, field)
@@ -244,6 +305,9 @@ class AbstractAssign(models.Model):
                                    related_name='consultant_assign')
     reservation = models.ForeignKey('helpdesk.Reservation', on_delete=models.CASCADE,
                                     related_name='assign')
+    reservation_item = models.OneToOneField('helpdesk.ReservationItem', on_delete=models.CASCADE,
+                                            related_name='assign')
+    status = models.CharField(choices=ASSIGN_STATUS, default=WAITING, max_length=15)
 
     class Meta:
         abstract = True
@@ -253,10 +317,18 @@ class AbstractAssign(models.Model):
         verbose_name_plural = _("Assigns")
         constraints = [
             models.UniqueConstraint(
-                fields=['client', 'consultant', 'reservation'], 
+                fields=['client', 'consultant', 'reservation_item'], 
                 name='unique_assign'
             )
         ]
+        indexes = [
+            # cover ReservationQuerySet.filter_assign first phase
+            models.Index(fields=['reservation', 'status', 'reservation_item'],
+                         name='assign_rsv_status_item_idx'),
+            # consultant's assign list, all or by status
+            models.Index(fields=['consultant', 'create_date'], name='assign_consultant_date_idx'),
+            models.Index(fields=['consultant', 'status', 'create_date'], name='assign_cons_status_date_idx'),
+        ]
 
     def __str__(self):
         return self.reservation.number
@@ -390,6 +462,11 @@ class AbstractConsultation(models.Model):
         ordering = ['-create_date']
         verbose_name = _("Consultation")
         verbose_name_plural = _("Consultations")
+        indexes = [
+            # consultation list each user by status
+            models.Index(fields=['client', 'status', 'create_date'], name='cst_client_status_date_idx'),
+            models.Index(fields=['consultant', 'status', 'create_date'], name='cst_cons_status_date_idx'),
+        ]
 
     @property
     def issue_label(self):
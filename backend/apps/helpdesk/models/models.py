@@ -222,3 +222,11 @@ if not is_model_registered('helpdesk', 'InvoiceItem'):
             db_table = 'helpdesk_invoice_item'
 
     __all__.append('InvoiceItem')
+
+# 26
+if not is_model_registered('helpdesk', 'ScheduleOccurrence'):
+    class ScheduleOccurrence(AbstractScheduleOccurrence):
+        class Meta(AbstractScheduleOccurrence.Meta):
+            db_table = 'helpdesk_schedule_occurrence'
+
+    __all__.append('ScheduleOccurrence')
@@ -38,14 +38,16 @@ class AbstractInvoice(models.Model):
     def __str__(self):
         return self.consultant.username
 
+    @staticmethod
+    def generate_number():
+        rand = random_string(8)
+        now = timezone.datetime.now()
+        timestamp = timezone.datetime.timestamp(now)
+        return 'INV{}{}'.format(rand, int(timestamp))
+
     def save(self, *args, **kwargs):
         if not self.pk:
-            rand = random_string(8)
-            now = timezone.datetime.now()
-            timestamp = timezone.datetime.timestamp(now)
-            number = 'INV{}{}'.format(rand, int(timestamp))
-
-            self.number = number
+            self.number = self.generate_number()
         super().save(*args, **kwargs)
 
 
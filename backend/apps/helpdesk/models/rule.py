@@ -57,6 +57,9 @@ class AbstractRule(models.Model):
                 name='unique_schedule_term_rule'
             )
         ]
+        indexes = [
+            models.Index(fields=['schedule_term', 'create_date'], name='rule_term_date_idx'),
+        ]
 
     def __str__(self):
         return '{0}'.format(self.get_identifier_display())
@@ -108,6 +111,17 @@ class AbstractRuleValue(models.Model):
         self.schedule = self.schedule_term.schedule
         super().save(*args, **kwargs)
 
+    @classmethod
+    def bulk_prepare(cls, objs, fields=None):
+        # save() of many rows, Rule already has the schedule_term and schedule
+        if fields is not None and 'rule' not in fields:
+            return ()
+
+        for obj in objs:
+            obj.schedule_term_id = obj.rule.schedule_term_id
+            obj.schedule_id = obj.rule.schedule_id
+        return ('schedule_term', 'schedule',)
+
     def __str__(self):
         return self.summary()
 
@@ -10,12 +10,18 @@ from django.core.exceptions import ValidationError
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 
+from utils import ordering
+from utils.urls import url_template
 from utils.validators import non_python_keyword, identifier_validator
 from apps.helpdesk.utils.constants import (
-    CANAL_CHOICES, RECUR, RRULE_RECURRENCE_CHOICES, TEXT, OPEN, PRIORITY_CHOICES, MEDIUM, RRULE_WKST_CHOICES,
+    CANAL_CHOICES, RECUR, RRULE_RECURRENCE_CHOICES, TEXT, PRIORITY_CHOICES, MEDIUM, RRULE_WKST_CHOICES,
     RRULE_FREQ_CHOICES
 )
 
+# permalink, resolved at startup (utils/urls.py)
+schedule_permalink = url_template('helpdesk_view:consultant:schedule_detail')
+schedule_reservation_permalink = url_template('helpdesk_view:client:schedule_reservation')
+
 MAX_ALLOWED_SCHEDULE = 6
 
 
@@ -41,32 +47,39 @@ class AbstractSchedule(models.Model):
         constraints = [
             models.UniqueConstraint(fields=['user', 'label'], name='unique_user_label')
         ]
+        indexes = [
+            models.Index(fields=['user', 'sort_order'], name='schedule_user_sort_idx'),
+        ]
 
     def __str__(self):
         return '{0}'.format(self.label)
 
     def clean(self):
         # limited schedule each user
-        if not self.pk and self.user:
-            c = self.__class__.objects.filter(user_id=self.user.id).count()
+        if not self.pk and self.user_id:
+            c = ordering.count(self.__class__, self.user_id)
             if c > MAX_ALLOWED_SCHEDULE:
                 raise ValidationError({'user': _(u"Max %s schedule" % MAX_ALLOWED_SCHEDULE)})
 
     def save(self, *args, **kwargs):
-        if self.user and not self.pk:
-            c = self.__class__.objects.filter(user_id=self.user.id).count()
-            self.sort_order = c + 1
+        if self.user_id and not self.pk:
+            self.sort_order = ordering.allocate(self.__class__, self.user_id)
         super().save(*args, **kwargs)
 
+    @classmethod
+    def bulk_prepare(cls, objs, fields=None):
+        # save() of many rows, PUT many (utils/mixin/api.py)
+        if fields is None:
+            ordering.assign(cls, objs)
+        return ()
+
     @property
     def permalink(self):
-        from django.urls import reverse
-        return reverse('helpdesk_view:consultant:schedule_detail', kwargs={'uuid': self.uuid})
+        return schedule_permalink.path(self.uuid)
 
     @property
     def permalink_schedule_reservation(self):
-        from django.urls import reverse
-        return reverse('helpdesk_view:client:schedule_reservation', kwargs={'uuid': self.uuid})
+        return schedule_reservation_permalink.path(self.uuid)
 
     @property
     def expertise(self):
@@ -163,14 +176,13 @@ class AbstractSegment(models.Model):
         ordering = ['-create_date']
         verbose_name = _("Segment")
         verbose_name_plural = _("Segments")
+        indexes = [
+            models.Index(fields=['schedule', 'create_date'], name='segment_schedule_date_idx'),
+        ]
 
-    @property
-    def is_open(self):
-        # check segment allow new consultation or not by compare ':max_openend'
-        # with consultations has opened status
-        consultation_count = self.schedule.reservation.issue.consultation \
-            .filter(status=OPEN).count()
-        return self.max_opened > consultation_count
+    def is_open(self, date):
+        # any seat left on :date, counted by ScheduleOccurrence (apps.helpdesk.utils.admission)
+        return self.schedule_occurrence.filter(date=date, is_active=True, used__lt=models.F('quota')).exists()
 
     @property
     def canal_label(self):
@@ -188,6 +200,53 @@ class AbstractSegment(models.Model):
         return '{0} from {1} to {2}'.format(self.schedule, self.open_hour, self.close_hour)
 
 
+class AbstractScheduleOccurrence(models.Model):
+    """
+    Pre-expanded schedule_term, one row each segment each date
+    Only cover from today until SCHEDULE_OCCURRENCE_HORIZON days ahead
+    Rebuild when ScheduleTerm, Rule, RuleValue or Segment changed
+    So availability read just filter by date, without expand rrule again
+    """
+    uuid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
+    create_date = models.DateTimeField(auto_now_add=True, null=True)
+    update_date = models.DateTimeField(auto_now=True, null=True)
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE,
+                             related_name='schedule_occurrence')
+    schedule = models.ForeignKey('helpdesk.Schedule', on_delete=models.CASCADE,
+                                 related_name='schedule_occurrence')
+    segment = models.ForeignKey('helpdesk.Segment', on_delete=models.CASCADE,
+                                related_name='schedule_occurrence')
+
+    date = models.DateField()
+    open_hour = models.TimeField()
+    close_hour = models.TimeField()
+    quota = models.IntegerField()
+    used = models.IntegerField(default=0, help_text=_("Reservation item pushed to this date"))
+    is_active = models.BooleanField(default=True)
+
+    class Meta:
+        abstract = True
+        app_label = 'helpdesk'
+        ordering = ['date', 'open_hour']
+        verbose_name = _("Schedule Occurrence")
+        verbose_name_plural = _("Schedule Occurrences")
+        constraints = [
+            models.UniqueConstraint(fields=['segment', 'date'], name='unique_segment_date')
+        ]
+        indexes = [
+            models.Index(fields=['date', 'is_active'], name='occurrence_date_idx'),
+            models.Index(fields=['schedule', 'date'], name='occurrence_schedule_date_idx'),
+        ]
+
+    def __str__(self):
+        return '{0} {1} from {2} to {3}'.format(self.schedule, self.date, self.open_hour, self.close_hour)
+
+    @property
+    def remaining(self):
+        return max(self.quota - self.used, 0)
+
+
 class AbstractSLA(models.Model):
     _ALLOC_TEXT = 10 # in replied
     _ALLOC_VOICE = 60 # in minutes
@@ -1,14 +1,13 @@
 from django.db import transaction
 
 from utils.generals import get_model
-from apps.helpdesk.utils.constants import ACCEPT
+from apps.helpdesk.utils import admission, booking
+from apps.helpdesk.utils.constants import PUSH
+from apps.helpdesk.utils.occurrence import occurrence_key, schedule_occurrence_sync
+from apps.helpdesk.utils.search import issue_search
 
 ScheduleTerm = get_model('helpdesk', 'ScheduleTerm')
 Respond = get_model('helpdesk', 'Respond')
-Assign = get_model('helpdesk', 'Assign')
-Assigned = get_model('helpdesk', 'Assigned')
-Invoice = get_model('helpdesk', 'Invoice')
-InvoiceItem = get_model('helpdesk', 'InvoiceItem')
 
 
 @transaction.atomic
@@ -17,6 +16,12 @@ def schedule_save_handler(sender, instance, created, **kwargs):
         ScheduleTerm.objects.create(schedule=instance)
 
 
+def schedule_bulk_save_handler(sender, created, **kwargs):
+    # as schedule_save_handler, new schedules of a PUT many
+    if created:
+        ScheduleTerm.objects.bulk_create([ScheduleTerm(schedule_id=obj.id) for obj in created])
+
+
 @transaction.atomic
 def reservation_save_handler(sender, instance, created, **kwargs):
     """
@@ -42,34 +47,82 @@ def reservation_save_handler(sender, instance, created, **kwargs):
     pass
 
 
-@transaction.atomic
 def reservationitem_save_handler(sender, instance, created, **kwargs):
-    if created:
-        reservation = instance.reservation
-        client = reservation.client
-        consultant = reservation.consultant
+    # fallback, batch booked by apps.helpdesk.utils.booking
+    if created and not booking.is_deferred():
+        booking.create_assigns([instance])
 
-        Assign.objects.create(client=client, consultant=consultant,
-                              reservation=reservation, reservation_item=instance)
+
+def reservationitem_bulk_save_handler(sender, created, **kwargs):
+    # seats taken by the list serializer, only the assigns here
+    if created and not booking.is_deferred():
+        booking.create_assigns(created)
 
 
-@transaction.atomic
 def assign_save_handler(sender, instance, created, **kwargs):
-    if not created:
-        if instance.status == ACCEPT:
-            consultant = instance.consultant
-            client = instance.client
-            reservation = instance.reservation
-            reservation_item = instance.reservation_item
-
-            # Create invoice.
-            assigned = Assigned.objects.create(client=client, consultant=consultant, assign=instance)
-            invoice, _created = Invoice.objects.get_or_create(client=client, consultant=consultant,
-                                                              reservation=reservation)
-            InvoiceItem.objects.create(invoice=invoice, reservation_item=reservation_item,
-                                       assign=instance, assigned=assigned)
-        else:
-            assigneds = Assigned.objects.filter(assign__uuid=instance.uuid)
-            if assigneds.exists():
-                assigneds.delete()
-    
+    if not created and not booking.is_deferred():
+        booking.sync_assigned([instance])
+
+
+def schedule_occurrence_handler(sender, instance, **kwargs):
+    """
+    Schedule, ScheduleTerm, Rule, RuleValue and Segment
+    changed rebuild the schedule occurrences
+    """
+    schedule_id = getattr(instance, 'schedule_id', None)
+    if schedule_id is None and sender._meta.model_name == 'schedule':
+        schedule_id = instance.id
+    schedule_occurrence_sync(schedule_id)
+
+
+def schedule_occurrence_bulk_handler(sender, created, updated, **kwargs):
+    """Rows of a PUT many, each schedule synced once"""
+    objs = list(created) + list(updated)
+    if sender._meta.model_name == 'schedule':
+        schedule_ids = {obj.id for obj in objs}
+    else:
+        # schedule_id maybe deferred (only() of the PUT)
+        schedule_ids = {obj.__dict__['schedule_id'] for obj in objs if 'schedule_id' in obj.__dict__}
+        deferred = [obj.pk for obj in objs if 'schedule_id' not in obj.__dict__]
+        if deferred:
+            schedule_ids.update(sender.objects.filter(pk__in=deferred).values_list('schedule_id', flat=True))
+
+    for schedule_id in schedule_ids:
+        schedule_occurrence_sync(schedule_id)
+
+
+def reservationitem_occurrence_pre_save_handler(sender, instance, **kwargs):
+    # remember old slot, maybe moved to other date or not pushed anymore
+    instance._occurrence_old_key = None
+    if instance.pk:
+        old = sender.objects.filter(pk=instance.pk).values_list('segment_id', 'datetime', 'status').first()
+        if old and old[2] == PUSH:
+            instance._occurrence_old_key = occurrence_key(old[0], old[1])
+
+
+def reservationitem_occurrence_handler(sender, instance, **kwargs):
+    """Pushed item hold a seat of it's slot, counter changed by delta (utils/admission.py)"""
+    old_key = getattr(instance, '_occurrence_old_key', None)
+    new_key = occurrence_key(instance.segment_id, instance.datetime) if instance.status == PUSH else None
+    if old_key == new_key:
+        return
+
+    if old_key is not None:
+        admission.release(*old_key)
+    if new_key is not None and not admission.is_admitted(new_key):
+        admission.occupy(*new_key)
+
+
+def reservationitem_occurrence_delete_handler(sender, instance, **kwargs):
+    if instance.status == PUSH:
+        key = occurrence_key(instance.segment_id, instance.datetime)
+        if key is not None:
+            admission.release(*key)
+
+
+def issue_search_save_handler(sender, instance, **kwargs):
+    issue_search.update(instance)
+
+
+def issue_search_delete_handler(sender, instance, **kwargs):
+    issue_search.discard(instance)
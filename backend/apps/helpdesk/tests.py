@@ -1,3 +1,1178 @@
-from django.test import TestCase
+import io
+import json
+import time
+import uuid
+import decimal
+import asyncio
+import datetime
+import threading
+import collections
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from asgiref.sync import async_to_sync
+from dateutil import rrule
+
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connection, connections, transaction
+from django.db.models import Prefetch, Q
+from django.test import AsyncRequestFactory, SimpleTestCase, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+
+from rest_framework import serializers, viewsets
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+
+from utils import parsers, renderers, search
+from utils.generals import get_model
+from utils.mixin.instrumentation import QueryBudgetMixin
+from utils.pagination import KeysetPagination, PaginationMixin
+from utils.signals import bulk_saved
+from utils.urls import url_templates
+from apps.helpdesk.api.client.v1.consultation.serializers import (
+    ReservationItemCreateSerializer, ReservationListSerializer
+)
+from apps.helpdesk.api.client.v1.issue.serializers import IssueSerializer
+from apps.helpdesk.api.consultant.v1.assign.views import AssignApiView
+from apps.helpdesk.api.consultant.v1.schedule.serializers import ScheduleSerializer
+from apps.helpdesk.api.consultant.v1.schedule.views import ScheduleApiView
+from apps.helpdesk.utils import admission, booking
+from apps.helpdesk.utils.constants import (
+    ACCEPT, BYDATE, BYWEEKDAY, DATETIME, EXCLUSION, ONCE, PULL, PUSH, REJECT,
+    WAITING
+)
+from apps.helpdesk.utils.expansion import expand_bulk
+from apps.helpdesk.utils.occurrence import expand_schedule_term, occurrence_key, sync_schedule_occurrence
+from apps.helpdesk.utils.search import issue_search
+from apps.person.utils.auth import set_role
+from apps.person.utils.constants import CLIENT, CONSULTANT
+
+User = get_model('person', 'User')
+Topic = get_model('master', 'Topic')
+Expertise = get_model('resume', 'Expertise')
+ScheduleExpertise = get_model('helpdesk', 'ScheduleExpertise')
+Schedule = get_model('helpdesk', 'Schedule')
+Segment = get_model('helpdesk', 'Segment')
+Rule = get_model('helpdesk', 'Rule')
+RuleValue = get_model('helpdesk', 'RuleValue')
+ScheduleOccurrence = get_model('helpdesk', 'ScheduleOccurrence')
+SLA = get_model('helpdesk', 'SLA')
+Priority = get_model('helpdesk', 'Priority')
+Issue = get_model('helpdesk', 'Issue')
+Reservation = get_model('helpdesk', 'Reservation')
+ReservationItem = get_model('helpdesk', 'ReservationItem')
+Assign = get_model('helpdesk', 'Assign')
+Assigned = get_model('helpdesk', 'Assigned')
+Invoice = get_model('helpdesk', 'Invoice')
+InvoiceItem = get_model('helpdesk', 'InvoiceItem')
+
 
 # Create your tests here.
+class ScheduleOccurrenceTestCase(TestCase):
+    def setUp(self):
+        self.start = datetime.date(2021, 1, 4)  # monday
+        self.end = self.start + datetime.timedelta(days=13)
+
+        self.user = User.objects.create_user('consultant', 'consultant@email.com', '123456')
+        self.schedule = Schedule.objects.create(user=self.user, label='Monday Clinic')
+        self.segment = Segment.objects.create(user=self.user, schedule=self.schedule, quota=5,
+                                              open_hour=datetime.time(8), close_hour=datetime.time(12))
+
+        self.schedule_term = self.schedule.schedule_term
+        self.schedule_term.dtstart = timezone.make_aware(datetime.datetime.combine(self.start, datetime.time(8)))
+        self.schedule_term.freq = rrule.WEEKLY
+        self.schedule_term.save()
+
+    def test_expand_weekly(self):
+        dates = expand_schedule_term(self.schedule_term, self.start, self.end)
+        self.assertEqual(dates, [self.start, self.start + datetime.timedelta(days=7)])
+
+    def test_expand_once(self):
+        self.schedule_term.direction = ONCE
+        dates = expand_schedule_term(self.schedule_term, self.start, self.end)
+        self.assertEqual(dates, [self.start])
+
+    def test_expand_bulk_same_as_rrule(self):
+        self.schedule_term.freq = rrule.MONTHLY
+        self.schedule_term.count = 5
+        self.schedule_term.save()
+
+        end = self.start + datetime.timedelta(days=365)
+        expected = [item.date() for item in rrule.rrule(rrule.MONTHLY, count=5,
+                                                        dtstart=datetime.datetime(2021, 1, 4, 8))]
+        dates = expand_bulk([self.schedule_term], self.start, end)
+
+        self.assertEqual(dates[self.schedule_term.id].tolist(), expected)
+
+    def test_sync_exclusion_bydate(self):
+        sync_schedule_occurrence(self.schedule.id, start=self.start, end=self.end)
+        self.assertEqual(ScheduleOccurrence.objects.filter(schedule=self.schedule).count(), 2)
+
+        holiday = self.start + datetime.timedelta(days=7)
+        rule = Rule.objects.create(user=self.user, schedule_term=self.schedule_term, identifier=BYDATE,
+                                   mode=EXCLUSION, type=DATETIME, direction=ONCE)
+        RuleValue.objects.create(rule=rule, value_datetime=timezone.make_aware(
+            datetime.datetime.combine(holiday, datetime.time(0))))
+
+        created, updated, deleted = sync_schedule_occurrence(self.schedule.id, start=self.start, end=self.end)
+        self.assertEqual((created, updated, deleted), (0, 0, 1))
+
+        occurrence = ScheduleOccurrence.objects.get(schedule=self.schedule)
+        self.assertEqual(occurrence.date, self.start)
+        self.assertEqual(occurrence.remaining, self.segment.quota)
+
+    def test_sync_segment_changed(self):
+        sync_schedule_occurrence(self.schedule.id, start=self.start, end=self.end)
+
+        self.segment.quota = 2
+        self.segment.save()
+
+        created, updated, deleted = sync_schedule_occurrence(self.schedule.id, start=self.start, end=self.end)
+        self.assertEqual((created, updated, deleted), (0, 2, 0))
+        self.assertFalse(ScheduleOccurrence.objects.exclude(quota=2).exists())
+
+    def test_weekday_exclusion(self):
+        rule = Rule.objects.create(user=self.user, schedule_term=self.schedule_term, identifier=BYWEEKDAY,
+                                   mode=EXCLUSION)
+        RuleValue.objects.create(rule=rule, value_varchar='MO')
+
+        dates = expand_schedule_term(self.schedule_term, self.start, self.end)
+        self.assertEqual(dates, [])
+
+
+class AvailabilitySearchTestCase(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.date = datetime.date(2021, 1, 4)
+        self.topic = Topic.objects.create(label='Django')
+        other_topic = Topic.objects.create(label='Laravel')
+
+        self.client_user = User.objects.create_user('client', 'client@email.com', '123456')
+        set_role(user=self.client_user, role=[CLIENT])
+
+        for index, (topic, used) in enumerate([(self.topic, 0), (self.topic, 4), (self.topic, 5),
+                                               (other_topic, 0)]):
+            user = User.objects.create_user('consultant%d' % index, 'c%d@email.com' % index, '123456')
+            schedule = Schedule.objects.create(user=user, label='Schedule')
+            segment = Segment.objects.create(user=user, schedule=schedule, quota=5,
+                                             open_hour=datetime.time(8), close_hour=datetime.time(12))
+            expertise = Expertise.objects.create(user=user, topic=topic)
+            ScheduleExpertise.objects.create(user=user, schedule=schedule, expertise=expertise)
+            ScheduleOccurrence.objects.create(user=user, schedule=schedule, segment=segment, date=self.date,
+                                              open_hour=segment.open_hour, close_hour=segment.close_hour,
+                                              quota=segment.quota, used=used)
+
+    def test_search_ranked_by_remaining(self):
+        client = APIClient()
+        client.force_authenticate(user=self.client_user)
+
+        response = client.get(reverse('helpdesk_api:client:availability-list'), {
+            'topic_uuid': str(self.topic.uuid),
+            'date_start': self.date.isoformat(),
+            'date_end': self.date.isoformat(),
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertQueryBudget(response)
+        self.assertEqual(response.data['total'], 2)
+        self.assertEqual([item['remaining'] for item in response.data['results']], [5, 1])
+
+
+class QueryBudgetTestCase(QueryBudgetMixin, TestCase):
+    """Same budget for 2 rows as for 1, no query each row"""
+
+    def setUp(self):
+        self.client_user = User.objects.create_user('client', 'client@email.com', '123456')
+        self.consultant = User.objects.create_user('consultant', 'consultant@email.com', '123456')
+        set_role(user=self.client_user, role=[CLIENT])
+        set_role(user=self.consultant, role=[CONSULTANT])
+
+        self.issues = list()
+        for index in range(2):
+            issue = Issue.objects.create(user=self.client_user, label='Issue %d' % index, description='Issue')
+            issue.topic.set([Topic.objects.create(label='Topic %d' % index)])
+            self.issues.append(issue)
+
+        self.schedules = list()
+        for index in range(2):
+            schedule = Schedule.objects.create(user=self.consultant, label='Schedule %d' % index)
+            segment = Segment.objects.create(user=self.consultant, schedule=schedule, quota=5,
+                                             open_hour=datetime.time(8), close_hour=datetime.time(12))
+            sla = SLA.objects.create(user=self.consultant, segment=segment, promise='Answered',
+                                     grace_periode=24, cost=50000)
+            priority = Priority.objects.create(user=self.consultant, sla=sla, label='Medium', cost=1000)
+
+            expertise = Expertise.objects.create(user=self.consultant, topic=self.issues[index].topic.get())
+            ScheduleExpertise.objects.create(user=self.consultant, schedule=schedule, expertise=expertise)
+            rule = Rule.objects.create(user=self.consultant, schedule_term=schedule.schedule_term,
+                                       identifier=BYWEEKDAY, mode=EXCLUSION)
+            RuleValue.objects.create(rule=rule, value_varchar='SU')
+            self.schedules.append((schedule, segment, sla, priority))
+
+        self.reservations = list()
+        for index in range(2):
+            reservation = Reservation.objects.create(client=self.client_user, consultant=self.consultant)
+            for issue, (schedule, segment, sla, priority) in zip(self.issues, self.schedules):
+                ReservationItem.objects.create(reservation=reservation, issue=issue, schedule=schedule,
+                                               segment=segment, sla=sla, priority=priority,
+                                               datetime=timezone.now() + datetime.timedelta(days=1))
+            self.reservations.append(reservation)
+
+    def get(self, user, name, **kwargs):
+        api = APIClient()
+        api.force_authenticate(user)
+        response = api.get(reverse(name, kwargs=kwargs or None))
+        self.assertEqual(response.status_code, 200)
+        self.assertQueryBudget(response)
+        return response
+
+    def test_client(self):
+        self.assertEqual(len(self.get(self.client_user, 'helpdesk_api:client:issue-list').data['results']), 2)
+        self.get(self.client_user, 'helpdesk_api:client:issue-detail', uuid=self.issues[0].uuid)
+
+        response = self.get(self.client_user, 'helpdesk_api:client:reservation-list')
+        self.assertEqual(len(response.data['results']), 2)
+        response = self.get(self.client_user, 'helpdesk_api:client:reservation-detail',
+                            uuid=self.reservations[0].uuid)
+        self.assertEqual(len(response.data['reservation_item']), 2)
+
+    def test_consultant(self):
+        response = self.get(self.consultant, 'helpdesk_api:consultant:assign-list')
+        self.assertEqual(len(response.data['results']), 4)
+        self.get(self.consultant, 'helpdesk_api:consultant:assign-detail',
+                 uuid=Assign.objects.filter(consultant=self.consultant).first().uuid)
+
+        response = self.get(self.consultant, 'helpdesk_api:consultant:schedule-list')
+        self.assertEqual(len(response.data['results']), 2)
+        self.get(self.consultant, 'helpdesk_api:consultant:schedule-detail', uuid=self.schedules[0][0].uuid)
+
+
+class BookingTestCase(TestCase):
+    def setUp(self):
+        self.client_user = User.objects.create_user('client', 'client@email.com', '123456')
+        self.consultant = User.objects.create_user('consultant', 'consultant@email.com', '123456')
+
+        self.schedule = Schedule.objects.create(user=self.consultant, label='Schedule')
+        self.segment = Segment.objects.create(user=self.consultant, schedule=self.schedule, quota=5,
+                                              open_hour=datetime.time(8), close_hour=datetime.time(12))
+        self.sla = SLA.objects.create(user=self.consultant, segment=self.segment, promise='Answered',
+                                      grace_periode=24, cost=50000)
+        self.priority = Priority.objects.create(user=self.consultant, sla=self.sla, label='Medium', cost=1000)
+        self.issue = Issue.objects.create(user=self.client_user, label='Issue', description='Issue')
+        self.reservation = Reservation.objects.create(client=self.client_user, consultant=self.consultant)
+
+    def create_items(self, total):
+        now = timezone.now()
+        return [ReservationItem.objects.create(reservation=self.reservation, issue=self.issue,
+                                               schedule=self.schedule, segment=self.segment, sla=self.sla,
+                                               priority=self.priority,
+                                               datetime=now + datetime.timedelta(days=index + 1))
+                for index in range(total)]
+
+    def test_signal_fallback(self):
+        item = self.create_items(1)[0]
+        self.assertEqual(item.assign.status, WAITING)
+
+        item.assign.status = ACCEPT
+        item.assign.save()
+        self.assertTrue(Assigned.objects.filter(assign=item.assign).exists())
+        self.assertEqual(InvoiceItem.objects.get().invoice.reservation, self.reservation)
+
+        item.assign.status = REJECT
+        item.assign.save()
+        self.assertFalse(Assigned.objects.exists())
+        self.assertFalse(InvoiceItem.objects.exists())
+
+    def test_book_reservation_batch(self):
+        with booking.defer_signals():
+            items = self.create_items(4)
+        self.assertFalse(Assign.objects.exists())
+
+        assigns, assigneds = booking.book_reservation(self.reservation)
+        self.assertEqual((len(assigns), len(assigneds)), (4, 0))
+
+        Assign.objects.filter(reservation_item__in=items[:3]).update(status=ACCEPT)
+        with booking.defer_signals():
+            items += self.create_items(2)
+
+        # same round trips whatever the items count
+        with self.assertNumQueries(15):
+            assigns, assigneds = booking.book_reservation(self.reservation)
+
+        self.assertEqual((len(assigns), len(assigneds)), (2, 3))
+        self.assertEqual(Invoice.objects.count(), 1)
+        self.assertEqual(InvoiceItem.objects.filter(invoice__reservation=self.reservation).count(), 3)
+
+        # booked again nothing changed
+        self.assertEqual(booking.book_reservation(self.reservation), ([], []))
+
+    def test_filter_assign(self):
+        items = self.create_items(3)
+        Assign.objects.filter(reservation_item=items[0]).update(status=ACCEPT)
+        booking.book_reservation(self.reservation)
+
+        queryset = Reservation.objects.filter(consultant=self.consultant)
+        reservation = queryset.filter_assign(assign_status=WAITING, rsv_item_status=PUSH).get()
+
+        self.assertEqual(reservation.assigned_count, 1)
+        self.assertEqual(reservation.total_cost, self.sla.cost + self.priority.cost)
+        self.assertFalse(queryset.filter_assign(assign_status=REJECT, rsv_item_status=PUSH).exists())
+
+
+class KeysetPaginationTestCase(TestCase):
+    def setUp(self):
+        self.client_user = User.objects.create_user('client', 'client@email.com', '123456')
+        set_role(user=self.client_user, role=[CLIENT])
+
+        # same create_date for some, the id must break the tie
+        now = timezone.now()
+        issues = [Issue(user=self.client_user, label='Issue %d' % index, description='Issue')
+                  for index in range(25)]
+        Issue.objects.bulk_create(issues)
+        Issue.objects.filter(label__in=['Issue 3', 'Issue 4', 'Issue 5']).update(create_date=now)
+
+        self.api = APIClient()
+        self.api.force_login(self.client_user)
+        self.url = reverse('helpdesk_api:client:issue-list')
+
+    def test_walk_next_and_previous(self):
+        response = self.api.get(self.url, {'limit': 10})
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.data['total'])
+        self.assertIsNone(response.data['previous'])
+
+        pages = [[item['uuid'] for item in response.data['results']]]
+        while response.data['next']:
+            response = self.api.get(response.data['next'])
+            pages.append([item['uuid'] for item in response.data['results']])
+
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        expected = [str(item) for item in Issue.objects.order_by('-create_date', '-id')
+                    .values_list('uuid', flat=True)]
+        self.assertEqual(sum(pages, []), expected)
+
+        # back from last page
+        response = self.api.get(response.data['previous'])
+        self.assertEqual([item['uuid'] for item in response.data['results']], pages[1])
+
+    def test_total_and_offset(self):
+        response = self.api.get(self.url, {'limit': 10, 'total': 1})
+        self.assertEqual(response.data['total'], 25)
+
+        # old client still paginate by offset
+        response = self.api.get(self.url, {'limit': 10, 'offset': 20})
+        self.assertEqual(response.data['offset'], 20)
+        self.assertEqual(response.data['total'], 25)
+        self.assertEqual(len(response.data['results']), 5)
+
+    def test_invalid_cursor(self):
+        response = self.api.get(self.url, {'cursor': 'invalid'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_total_of_empty_filter(self):
+        request = APIRequestFactory().get('/', {'total': 1})
+        paginator = KeysetPagination()
+        results = paginator.paginate_queryset(Issue.objects.filter(id__in=[]), Request(request))
+        self.assertEqual((results, paginator.count), ([], 0))
+
+
+class IssueSearchTestCase(TestCase):
+    def setUp(self):
+        issue_search.backend.clear()
+
+        self.client_user = User.objects.create_user('client', 'client@email.com', '123456')
+        other = User.objects.create_user('other', 'other@email.com', '123456')
+        set_role(user=self.client_user, role=[CLIENT])
+
+        Issue.objects.create(user=self.client_user, label='Deploy Django to production',
+                             description='Gunicorn behind nginx keep timeout')
+        Issue.objects.create(user=self.client_user, label='Slow page',
+                             description='The django admin list take 10 seconds <b>always</b>')
+        Issue.objects.create(user=self.client_user, label='Logo design', description='Need a new logo')
+        Issue.objects.create(user=other, label='Django upgrade', description='From 2.2 to 3.2')
+
+        self.api = APIClient()
+        self.api.force_login(self.client_user)
+        self.url = reverse('helpdesk_api:client:issue-list')
+
+    def tearDown(self):
+        issue_search.backend.clear()
+
+    def search(self, keyword):
+        response = self.api.get(self.url, {'keyword': keyword})
+        self.assertEqual(response.status_code, 200)
+        return response.data['results']
+
+    def test_ranked_and_scoped(self):
+        results = self.search('django')
+
+        # label weighted over description, other user never shown
+        self.assertEqual([item['label'] for item in results], ['Deploy Django to production', 'Slow page'])
+        self.assertEqual(results[0]['highlight']['label'], 'Deploy <mark>Django</mark> to production')
+        self.assertEqual(results[1]['highlight']['description'],
+                         'The <mark>django</mark> admin list take 10 seconds &lt;b&gt;always&lt;/b&gt;')
+
+        # description searched too
+        self.assertEqual([item['label'] for item in self.search('nginx timeout')],
+                         ['Deploy Django to production'])
+        self.assertEqual(self.search('kubernetes'), [])
+
+    def test_incremental(self):
+        self.search('logo')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            issue = Issue.objects.create(user=self.client_user, label='Logo animation', description='Motion')
+        self.assertEqual(len(self.search('logo')), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            issue.label = 'Intro video'
+            issue.save()
+        self.assertEqual(len(self.search('logo')), 1)
+        self.assertEqual(len(self.search('intro')), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            issue.delete()
+        self.assertEqual(self.search('intro'), [])
+        self.assertEqual(len(issue_search.backend), 4)
+
+    def test_rebuild_command(self):
+        call_command('rebuild_search_index', stdout=io.StringIO())
+        self.assertEqual(len(issue_search.backend), 4)
+        self.assertEqual(len(self.search('design')), 1)
+
+    def test_mysql_index_created_after_migrate(self):
+        app_config = issue_search.model._meta.app_config
+        mysql = mock.Mock(vendor='mysql')
+
+        with mock.patch.object(search, 'connections', {DEFAULT_DB_ALIAS: mysql}), \
+                mock.patch.object(search.MySQLBackend, 'index_exists', side_effect=[False, True]), \
+                mock.patch.object(search.MySQLBackend, 'rebuild') as rebuild:
+            search.search_index_migrate_handler(app_config, using=DEFAULT_DB_ALIAS)
+            self.assertEqual(rebuild.call_count, 1)
+
+            # already there, not rebuilt each migrate
+            search.search_index_migrate_handler(app_config, using=DEFAULT_DB_ALIAS)
+            self.assertEqual(rebuild.call_count, 1)
+
+        # local index, nothing to create
+        with mock.patch.object(search.MySQLBackend, 'rebuild') as rebuild:
+            search.search_index_migrate_handler(app_config, using=DEFAULT_DB_ALIAS)
+        rebuild.assert_not_called()
+
+
+class ConsultantReservationSearchTestCase(TestCase):
+    def setUp(self):
+        issue_search.backend.clear()
+
+        client_user = User.objects.create_user('client', 'client@email.com', '123456')
+        self.consultant = User.objects.create_user('consultant', 'consultant@email.com', '123456')
+        set_role(user=self.consultant, role=[CONSULTANT])
+
+        schedule = Schedule.objects.create(user=self.consultant, label='Schedule')
+        segment = Segment.objects.create(user=self.consultant, schedule=schedule, quota=5,
+                                         open_hour=datetime.time(8), close_hour=datetime.time(12))
+        sla = SLA.objects.create(user=self.consultant, segment=segment, promise='Answered',
+                                 grace_periode=24, cost=50000)
+        priority = Priority.objects.create(user=self.consultant, sla=sla, label='Medium', cost=1000)
+
+        self.reservations = dict()
+        for label in ('Deploy Django', 'Logo design'):
+            issue = Issue.objects.create(user=client_user, label=label, description=label)
+            reservation = Reservation.objects.create(client=client_user, consultant=self.consultant)
+            # two items of the same issue, reservation listed once
+            for days in (1, 2):
+                ReservationItem.objects.create(reservation=reservation, issue=issue, schedule=schedule,
+                                               segment=segment, sla=sla, priority=priority,
+                                               datetime=timezone.now() + datetime.timedelta(days=days))
+            self.reservations[label] = str(reservation.uuid)
+
+        self.api = APIClient()
+        self.api.force_login(self.consultant)
+        self.url = reverse('helpdesk_api:consultant:reservation-list')
+
+    def tearDown(self):
+        issue_search.backend.clear()
+
+    def search(self, **params):
+        response = self.api.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return [item['uuid'] for item in response.data['results']]
+
+    def test_keyword(self):
+        self.assertEqual(len(self.search()), 2)
+        self.assertEqual(self.search(keyword='django'), [self.reservations['Deploy Django']])
+        self.assertEqual(self.search(keyword='kubernetes'), [])
+
+
+class SerializerFieldPlanTestCase(TestCase):
+    def setUp(self):
+        user = User.objects.create_user('client', 'client@email.com', '123456')
+        self.issue = Issue.objects.create(user=user, label='Deploy Django', description='Gunicorn')
+        self.context = {'request': APIRequestFactory().get('/')}
+
+    def test_plan_reused_not_shared(self):
+        fields_used = ('uuid', 'label', 'highlight')
+        first = IssueSerializer(self.issue, context=self.context, fields_used=fields_used)
+        second = IssueSerializer(self.issue, context=dict(self.context, keyword='django'),
+                                 fields_used=fields_used)
+
+        # same plan, each instance own copy, popped on one kept on the other
+        self.assertEqual(list(first.data), ['uuid', 'label'])
+        self.assertEqual(list(second.data), ['highlight', 'uuid', 'label'])
+        self.assertIsNot(first.fields['label'], second.fields['label'])
+        self.assertEqual(second.data['highlight']['label'], 'Deploy <mark>Django</mark>')
+
+    def test_same_as_all_fields(self):
+        data = IssueSerializer(self.issue, context=self.context).data
+        pruned = IssueSerializer(self.issue, context=self.context, fields_used=('label', 'uuid')).data
+        self.assertEqual(dict(pruned), {'uuid': data['uuid'], 'label': data['label']})
+
+    def test_unknown_names_not_cached(self):
+        IssueSerializer(self.issue, context=self.context, fields_used=('uuid', 'label')).data
+        size = len(IssueSerializer._fields_plan)
+        for index in range(10):
+            serializer = IssueSerializer(self.issue, context=self.context,
+                                         fields_used=('uuid', 'label', 'junk%d' % index))
+            self.assertEqual(list(serializer.data), ['uuid', 'label'])
+        self.assertEqual(len(IssueSerializer._fields_plan), size)
+
+
+class ProjectionTestCase(TestCase):
+    """Golden output, list projection render the same JSON as the serializer"""
+
+    def setUp(self):
+        self.client_user = User.objects.create_user('client', 'client@email.com', '123456')
+        self.consultant = User.objects.create_user('consultant', 'consultant@email.com', '123456')
+        set_role(user=self.client_user, role=[CLIENT])
+
+        topics = [Topic.objects.create(label=label) for label in ('Django', 'Python', 'Deploy')]
+        for index in range(4):
+            issue = Issue.objects.create(user=self.client_user, label='Issue %d' % index,
+                                         description='Issue')
+            issue.topic.set(topics[:index])
+
+        schedule = Schedule.objects.create(user=self.consultant, label='Schedule')
+        segment = Segment.objects.create(user=self.consultant, schedule=schedule, quota=5,
+                                         open_hour=datetime.time(8), close_hour=datetime.time(12))
+        sla = SLA.objects.create(user=self.consultant, segment=segment, promise='Answered',
+                                 grace_periode=24, cost=50000)
+        priority = Priority.objects.create(user=self.consultant, sla=sla, label='Medium', cost=1000)
+
+        now = timezone.now()
+        for index in range(3):
+            reservation = Reservation.objects.create(client=self.client_user, consultant=self.consultant)
+            for day in range(index + 1):
+                ReservationItem.objects.create(reservation=reservation, issue=issue, schedule=schedule,
+                                               segment=segment, sla=sla, priority=priority,
+                                               datetime=now + datetime.timedelta(days=day + 1))
+
+        # pulled, one without assign
+        ReservationItem.objects.filter(reservation=reservation).update(status=PULL)
+        with booking.defer_signals():
+            ReservationItem.objects.create(reservation=reservation, issue=issue, schedule=schedule,
+                                           segment=segment, sla=sla, priority=priority, status=PULL,
+                                           datetime=now + datetime.timedelta(days=9))
+
+        self.api = APIClient()
+        self.api.force_login(self.client_user)
+
+    def render(self, data):
+        return JSONRenderer().render(data)
+
+    def assertGolden(self, response, serializer):
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['results'])
+        self.assertEqual(self.render(response.data['results']), self.render(serializer.data))
+
+    def test_issue(self):
+        for params in ({}, {'format': 'json'}):
+            response = self.api.get(reverse('helpdesk_api:client:issue-list'), params)
+            issues = Issue.objects.filter(user=self.client_user).order_by('-create_date', '-id')
+            serializer = IssueSerializer(issues, many=True,
+                                         context={'request': response.renderer_context['request']},
+                                         fields_used=('uuid', 'label', 'url', 'topic',
+                                                      'topic_label', 'permalink', 'highlight',))
+            self.assertGolden(response, serializer)
+
+        self.assertIn('?format=json', response.data['results'][0]['url'])
+        self.assertEqual(len(response.data['results'][0]['topic']), 3)
+
+    def test_reservation(self):
+        url = reverse('helpdesk_api:client:reservation-list')
+
+        for item_filter, params in ((Q(assign__status=WAITING, status=PUSH), {}),
+                                    (Q(status=PULL), {'rsv_item_status': PULL})):
+            response = self.api.get(url, params)
+            items = ReservationItem.objects.select_related('assign', 'issue').filter(item_filter)
+            reservations = Reservation.objects.filter(client=self.client_user) \
+                .filter_assign(assign_status=WAITING, rsv_item_status=params.get('rsv_item_status', PUSH)) \
+                .prefetch_related(Prefetch('reservation_item', queryset=items)) \
+                .select_related('consultant').order_by('-create_date', '-id')
+            serializer = ReservationListSerializer(reservations, many=True,
+                                                   context={'request': response.renderer_context['request']})
+            self.assertGolden(response, serializer)
+
+        # item without assign
+        items = response.data['results'][0]['reservation_item']
+        self.assertEqual([item['assign_status'] for item in items], [None, WAITING, WAITING, WAITING])
+
+    def test_pagination(self):
+        url = reverse('helpdesk_api:client:issue-list')
+        response = self.api.get(url, {'limit': 3})
+        labels = [item['label'] for item in response.data['results']]
+
+        response = self.api.get(response.data['next'])
+        labels += [item['label'] for item in response.data['results']]
+        self.assertEqual(labels, ['Issue 3', 'Issue 2', 'Issue 1', 'Issue 0'])
+
+        # page and topic of the page, whatever the rows count (and the ETag aggregate)
+        with self.assertNumQueries(5):
+            self.api.get(url, {'limit': 3})
+
+
+class URLTemplateTestCase(TestCase):
+    def setUp(self):
+        self.consultant = User.objects.create_user('consultant', 'consultant@email.com', '123456')
+        self.schedules = [Schedule.objects.create(user=self.consultant, label='Schedule %d' % index)
+                          for index in range(3)]
+        self.request = APIRequestFactory().get('/', {'format': 'json'})
+
+    def test_same_as_reverse(self):
+        data = ScheduleSerializer(self.schedules, many=True, context={'request': self.request},
+                                  fields_used=('url', 'permalink', 'permalink_schedule_reservation',)).data
+
+        for schedule, item in zip(self.schedules, data):
+            kwargs = {'uuid': schedule.uuid}
+            self.assertEqual(item['url'], self.request.build_absolute_uri(
+                reverse('helpdesk_api:consultant:schedule-detail', kwargs=kwargs)) + '?format=json')
+            self.assertEqual(item['permalink'], self.request.build_absolute_uri(
+                reverse('helpdesk_view:consultant:schedule_detail', kwargs=kwargs)))
+            self.assertEqual(item['permalink_schedule_reservation'], self.request.build_absolute_uri(
+                reverse('helpdesk_view:client:schedule_reservation', kwargs=kwargs)))
+
+    def test_resolved_once(self):
+        self.assertGreater(url_templates.resolve(), 0)
+
+        # no resolver walk each object
+        with mock.patch('utils.urls.reverse', side_effect=AssertionError):
+            data = ScheduleSerializer(self.schedules, many=True, context={'request': self.request},
+                                      fields_used=('url', 'permalink',)).data
+        self.assertEqual(len({item['url'] for item in data}), 3)
+
+
+class JSONRendererTestCase(SimpleTestCase):
+    """orjson renderer and parser, byte for byte the DRF one"""
+
+    def get_data(self):
+        return collections.OrderedDict([
+            ('uuid', uuid.UUID(int=7)),
+            ('aware', timezone.make_aware(datetime.datetime(2021, 3, 4, 5, 6, 7, 890), datetime.timezone.utc)),
+            ('naive', datetime.datetime(2021, 3, 4, 5, 6, 7)),
+            ('date', datetime.date(2021, 3, 4)),
+            ('time', datetime.time(5, 6, 7, 890)),
+            ('cost', decimal.Decimal('12.50')),
+            ('label', gettext_lazy('Label')),
+            ('text', 'Ngopi \u2028 di \u2029 Jakarta, caf\u00e9'),
+            ('items', [{1: None, 'nested': (1, 2.5, True)}]),
+        ])
+
+    def test_same_as_drf(self):
+        data = self.get_data()
+        self.assertEqual(renderers.JSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(renderers.JSONRenderer().render(None), b'')
+
+        # pretty print by DRF
+        self.assertEqual(renderers.JSONRenderer().render(data, 'application/json; indent=4'),
+                         JSONRenderer().render(data, 'application/json; indent=4'))
+
+    def test_parse(self):
+        body = JSONRenderer().render(self.get_data())
+        self.assertEqual(parsers.JSONParser().parse(io.BytesIO(body)),
+                         json.loads(body.decode()))
+        self.assertEqual(parsers.JSONParser().parse(io.BytesIO('{"label": "caf\u00e9"}'.encode('latin-1')),
+                                                    parser_context={'encoding': 'latin-1'}),
+                         {'label': 'caf\u00e9'})
+
+        for body in (b'{"cost": NaN}', b'{"label": ', b''):
+            with self.assertRaises(ParseError):
+                parsers.JSONParser().parse(io.BytesIO(body))
+
+
+class ConditionalGetTestCase(TestCase):
+    def setUp(self):
+        self.client_user = User.objects.create_user('client', 'client@email.com', '123456')
+        self.consultant = User.objects.create_user('consultant', 'consultant@email.com', '123456')
+        set_role(user=self.client_user, role=[CLIENT])
+
+        self.topic = Topic.objects.create(label='Django')
+        self.issue = Issue.objects.create(user=self.client_user, label='Issue', description='Issue')
+        self.issue.topic.set([self.topic])
+
+        schedule = Schedule.objects.create(user=self.consultant, label='Schedule')
+        segment = Segment.objects.create(user=self.consultant, schedule=schedule, quota=5,
+                                         open_hour=datetime.time(8), close_hour=datetime.time(12))
+        sla = SLA.objects.create(user=self.consultant, segment=segment, promise='Answered',
+                                 grace_periode=24, cost=50000)
+        priority = Priority.objects.create(user=self.consultant, sla=sla, label='Medium', cost=1000)
+
+        self.reservation = Reservation.objects.create(client=self.client_user, consultant=self.consultant)
+        self.item = ReservationItem.objects.create(reservation=self.reservation, issue=self.issue,
+                                                   schedule=schedule, segment=segment, sla=sla,
+                                                   priority=priority,
+                                                   datetime=timezone.now() + datetime.timedelta(days=1))
+
+        self.api = APIClient()
+        self.api.force_login(self.client_user)
+
+    def assertModified(self, url, etag):
+        response = self.api.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        return response['ETag']
+
+    def test_not_modified(self):
+        url = reverse('helpdesk_api:client:issue-list')
+        response = self.api.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Last-Modified', response)
+        self.assertIn('no-cache', response['Cache-Control'])
+
+        # one aggregate, no page, no serializer
+        with CaptureQueriesContext(connection) as queries:
+            not_modified = self.api.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b'')
+        self.assertEqual(not_modified['ETag'], response['ETag'])
+        self.assertEqual(len([query for query in queries if 'helpdesk_issue' in query['sql']]), 1)
+
+        not_modified = self.api.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(not_modified.status_code, 304)
+
+        # other page, other format
+        self.assertEqual(self.api.get(url, {'limit': 1}, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+        self.assertEqual(self.api.get(url, {'format': 'json'}, HTTP_IF_NONE_MATCH=response['ETag']).status_code,
+                         200)
+
+    def test_modified(self):
+        url = reverse('helpdesk_api:client:issue-list')
+        etag = self.api.get(url)['ETag']
+
+        self.issue.label = 'Changed'
+        self.issue.save()
+        etag = self.assertModified(url, etag)
+
+        self.topic.label = 'Python'
+        self.topic.save()
+        etag = self.assertModified(url, etag)
+
+        self.issue.topic.clear()
+        etag = self.assertModified(url, etag)
+
+        Issue.objects.create(user=self.client_user, label='Other', description='Other')
+        self.assertModified(url, etag)
+
+    def test_reservation_polling(self):
+        url = reverse('helpdesk_api:client:reservation-detail', kwargs={'uuid': self.reservation.uuid})
+        etag = self.api.get(url)['ETag']
+        self.assertEqual(self.api.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # consultant answer the assign
+        assign = Assign.objects.get(reservation_item=self.item)
+        assign.status = ACCEPT
+        assign.save()
+        etag = self.assertModified(url, etag)
+        self.assertEqual(self.api.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        list_url = reverse('helpdesk_api:client:reservation-list')
+        etag = self.api.get(list_url)['ETag']
+        self.item.delete()
+        self.assertModified(list_url, etag)
+
+        # other user never has the same
+        other = User.objects.create_user('other', 'other@email.com', '123456')
+        set_role(user=other, role=[CLIENT])
+        self.api.force_login(other)
+        self.assertEqual(self.api.get(list_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_malformed_uuid(self):
+        for name in ('helpdesk_api:client:issue-detail', 'helpdesk_api:client:reservation-detail'):
+            response = self.api.get(reverse(name, kwargs={'uuid': 'not-a-uuid'}))
+            self.assertEqual(response.status_code, 406)
+            self.assertNotIn('ETag', response)
+
+
+class AdmissionTestCase(TestCase):
+    def setUp(self):
+        self.client_user = User.objects.create_user('client', 'client@email.com', '123456')
+        self.consultant = User.objects.create_user('consultant', 'consultant@email.com', '123456')
+
+        self.schedule = Schedule.objects.create(user=self.consultant, label='Schedule')
+        self.segment = Segment.objects.create(user=self.consultant, schedule=self.schedule, quota=2,
+                                              open_hour=datetime.time(8), close_hour=datetime.time(12))
+        self.sla = SLA.objects.create(user=self.consultant, segment=self.segment, promise='Answered',
+                                      grace_periode=24, cost=50000)
+        self.priority = Priority.objects.create(user=self.consultant, sla=self.sla, label='Medium', cost=1000)
+        self.issue = Issue.objects.create(user=self.client_user, label='Issue', description='Issue')
+        self.reservation = Reservation.objects.create(client=self.client_user, consultant=self.consultant)
+
+        self.datetime = timezone.now() + datetime.timedelta(days=1)
+        self.occurrences = [
+            ScheduleOccurrence.objects.create(user=self.consultant, schedule=self.schedule, segment=self.segment,
+                                              date=occurrence_key(self.segment.id, value)[1],
+                                              open_hour=self.segment.open_hour,
+                                              close_hour=self.segment.close_hour, quota=self.segment.quota)
+            for value in (self.datetime, self.datetime + datetime.timedelta(days=1))
+        ]
+
+    def used(self):
+        return [occurrence.used for occurrence in ScheduleOccurrence.objects.order_by('date')]
+
+    def get_serializer(self, instance=None, **data):
+        values = {'reservation': self.reservation.uuid, 'issue': self.issue.uuid, 'schedule': self.schedule.uuid,
+                  'segment': self.segment.uuid, 'sla': self.sla.uuid, 'priority': self.priority.uuid,
+                  'datetime': self.datetime}
+        values.update(data)
+        return ReservationItemCreateSerializer(instance, data=values, partial=instance is not None,
+                                               context={'request': None})
+
+    def test_admit_until_full(self):
+        items = list()
+        for _ in range(2):
+            serializer = self.get_serializer()
+            self.assertTrue(serializer.is_valid())
+            items.append(serializer.save())
+        self.assertEqual(self.used(), [2, 0])
+
+        serializer = self.get_serializer()
+        self.assertTrue(serializer.is_valid())
+        with self.assertRaises(serializers.ValidationError):
+            serializer.save()
+        self.assertEqual(self.used(), [2, 0])
+        self.assertEqual(ReservationItem.objects.count(), 2)
+
+        # moved to the next date, seat given back
+        serializer = self.get_serializer(items[0], datetime=self.datetime + datetime.timedelta(days=1))
+        self.assertTrue(serializer.is_valid())
+        serializer.save()
+        self.assertEqual(self.used(), [1, 1])
+
+        items[1].status = PULL
+        items[1].save()
+        self.assertEqual(self.used(), [0, 1])
+
+        items[0].delete()
+        self.assertEqual(self.used(), [0, 0])
+
+    def test_closed(self):
+        ScheduleOccurrence.objects.update(is_active=False)
+        self.assertFalse(self.segment.is_open(self.occurrences[0].date))
+
+        serializer = self.get_serializer()
+        self.assertTrue(serializer.is_valid())
+        with self.assertRaises(serializers.ValidationError):
+            serializer.save()
+
+
+class AdmissionConcurrencyTestCase(TransactionTestCase):
+    """Many client book the last seats of one slot at once, never overbooked"""
+    threads = 16
+    quota = 5
+
+    def setUp(self):
+        consultant = User.objects.create_user('consultant', 'consultant@email.com', '123456')
+        schedule = Schedule.objects.create(user=consultant, label='Schedule')
+        self.segment = Segment.objects.create(user=consultant, schedule=schedule, quota=self.quota,
+                                              open_hour=datetime.time(8), close_hour=datetime.time(12))
+        self.date = timezone.localdate() + datetime.timedelta(days=1)
+        ScheduleOccurrence.objects.update_or_create(
+            segment=self.segment, date=self.date,
+            defaults={'user': consultant, 'schedule': schedule, 'quota': self.quota, 'used': 0,
+                      'open_hour': self.segment.open_hour, 'close_hour': self.segment.close_hour})
+
+    def test_never_overbooked(self):
+        barrier = threading.Barrier(self.threads)
+
+        def book(index):
+            try:
+                barrier.wait(timeout=10)
+                for _ in range(50):
+                    try:
+                        with transaction.atomic():
+                            return admission.admit(self.segment.id, self.date)
+                    except OperationalError:
+                        # SQLite lock the whole database, retry as client would
+                        time.sleep(0.001)
+                raise AssertionError('never got the database')
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+            admitted = list(executor.map(book, range(self.threads)))
+
+        self.assertEqual(admitted.count(True), self.quota)
+        self.assertEqual(ScheduleOccurrence.objects.get(segment=self.segment, date=self.date).used, self.quota)
+
+
+class BulkPutTestCase(TestCase):
+    """PUT many saved in constant statements, counters and assigns same as each row"""
+    def setUp(self):
+        self.client_user = User.objects.create_user('client', 'client@email.com', '123456')
+        self.consultant = User.objects.create_user('consultant', 'consultant@email.com', '123456')
+        set_role(user=self.client_user, role=[CLIENT])
+
+        self.schedule = Schedule.objects.create(user=self.consultant, label='Schedule')
+        self.segment = Segment.objects.create(user=self.consultant, schedule=self.schedule, quota=2,
+                                              open_hour=datetime.time(8), close_hour=datetime.time(12))
+        self.sla = SLA.objects.create(user=self.consultant, segment=self.segment, promise='Answered',
+                                      grace_periode=24, cost=50000)
+        self.priority = Priority.objects.create(user=self.consultant, sla=self.sla, label='Medium', cost=1000)
+        self.issue = Issue.objects.create(user=self.client_user, label='Issue', description='Issue')
+        self.reservation = Reservation.objects.create(client=self.client_user, consultant=self.consultant)
+
+        self.datetime = timezone.now() + datetime.timedelta(days=1)
+        self.next_datetime = self.datetime + datetime.timedelta(days=1)
+        for value in (self.datetime, self.next_datetime):
+            ScheduleOccurrence.objects.create(user=self.consultant, schedule=self.schedule, segment=self.segment,
+                                              date=occurrence_key(self.segment.id, value)[1],
+                                              open_hour=self.segment.open_hour,
+                                              close_hour=self.segment.close_hour, quota=100)
+
+        self.api = APIClient()
+        self.api.force_login(self.client_user)
+        self.url = reverse('helpdesk_api:client:reservation_item-list')
+
+    def used(self):
+        return [occurrence.used for occurrence in ScheduleOccurrence.objects.order_by('date')]
+
+    def create_items(self, count):
+        return [ReservationItem.objects.create(reservation=self.reservation, issue=self.issue,
+                                               schedule=self.schedule, segment=self.segment, sla=self.sla,
+                                               priority=self.priority, datetime=self.datetime)
+                for _ in range(count)]
+
+    def get_item(self, item=None, **data):
+        values = {'reservation': str(self.reservation.uuid), 'issue': str(self.issue.uuid),
+                  'schedule': str(self.schedule.uuid), 'segment': str(self.segment.uuid),
+                  'sla': str(self.sla.uuid), 'priority': str(self.priority.uuid),
+                  'datetime': self.datetime.isoformat()}
+        if item is not None:
+            values['uuid'] = str(item.uuid)
+        values.update(data)
+        return values
+
+    def test_bulk_saved(self):
+        items = self.create_items(2)
+        self.assertEqual(self.used(), [2, 0])
+
+        calls = list()
+        def receiver(sender, created, updated, fields, **kwargs):
+            calls.append((len(created), len(updated), fields))
+        bulk_saved.connect(receiver, sender=ReservationItem)
+        self.addCleanup(bulk_saved.disconnect, receiver, sender=ReservationItem)
+
+        # both moved to the next date, one new
+        data = [self.get_item(item, datetime=self.next_datetime.isoformat()) for item in items]
+        data.append(self.get_item())
+        response = self.api.put(self.url, data, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+
+        self.assertEqual(calls, [(1, 2, {'datetime', 'update_date'})])
+        self.assertEqual(self.used(), [1, 2])
+        self.assertEqual(ReservationItem.objects.filter(datetime=self.next_datetime).count(), 2)
+
+        created = ReservationItem.objects.exclude(id__in=[item.id for item in items]).get()
+        self.assertTrue(created.number)
+        self.assertEqual(created.cost, 51000)
+        self.assertTrue(Assign.objects.filter(reservation_item=created).exists())
+
+    def test_rejected_when_full(self):
+        ScheduleOccurrence.objects.update(quota=2)
+        items = self.create_items(1)
+
+        data = [self.get_item(items[0]), self.get_item(), self.get_item()]
+        response = self.api.put(self.url, data, format='json')
+        self.assertEqual(response.status_code, 406)
+        self.assertEqual(self.used(), [1, 0])
+        self.assertEqual(ReservationItem.objects.count(), 1)
+
+    def test_constant_queries(self):
+        request = APIRequestFactory().put(self.url)
+
+        def save(count):
+            items = self.create_items(count)
+            issue = Issue.objects.create(user=self.client_user, label='Other', description='Other')
+            data = [self.get_item(item, issue=str(issue.uuid)) for item in items] + [self.get_item()]
+
+            queryset = ReservationItem.objects.filter(uuid__in=[item.uuid for item in items])
+            serializer = ReservationItemCreateSerializer(queryset, data=data, many=True,
+                                                         context={'request': request})
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+            with CaptureQueriesContext(connection) as queries:
+                serializer.save()
+            self.assertEqual(ReservationItem.objects.filter(issue=issue).count(), count)
+            return len(queries)
+
+        self.assertEqual(save(2), save(8))
+
+
+class PaginationConcurrencyTestCase(SimpleTestCase):
+    """Many thread paginate at once, each must get back its own page"""
+    threads = 16
+    rounds = 20
+
+    def test_no_cross_talk(self):
+        barrier = threading.Barrier(self.threads)
+        numbers = list(range(1000))
+
+        class NumberView(PaginationMixin, viewsets.ViewSet):
+            authentication_classes = ()
+            permission_classes = ()
+
+            def list(self, request):
+                page = self.paginate_queryset(numbers)
+                # every thread paginated before any build the result
+                barrier.wait(timeout=10)
+                serializer = serializers.ListSerializer(page, child=serializers.IntegerField())
+                return Response(self.get_pagination_result(serializer))
+
+        view = NumberView.as_view({'get': 'list'})
+        factory = APIRequestFactory()
+
+        def call(index):
+            offset, limit = index * 7, index % 5 + 1
+            response = view(factory.get('/numbers/', {'offset': offset, 'limit': limit}))
+            return index, offset, limit, response.data
+
+        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+            for _ in range(self.rounds):
+                for index, offset, limit, data in executor.map(call, range(self.threads)):
+                    self.assertEqual(data['offset'], offset)
+                    self.assertEqual(data['limit'], limit)
+                    self.assertEqual(data['results'], numbers[offset:offset + limit])
+                    self.assertIn('offset=%d' % (offset + limit), data['next'])
+
+
+class AsyncReadPathTestCase(TransactionTestCase):
+    """ORM run in worker thread, need committed data"""
+
+    def setUp(self):
+        self.consultant = User.objects.create_user('consultant', 'consultant@email.com', '123456')
+        self.client_user = User.objects.create_user('client', 'client@email.com', '123456')
+        set_role(user=self.consultant, role=[CONSULTANT])
+
+        topic = Topic.objects.create(label='Django')
+        expertise = Expertise.objects.create(user=self.consultant, topic=topic)
+        for index in range(3):
+            schedule = Schedule.objects.create(user=self.consultant, label='Schedule %d' % index)
+            ScheduleExpertise.objects.create(user=self.consultant, schedule=schedule, expertise=expertise)
+            segment = Segment.objects.create(user=self.consultant, schedule=schedule, quota=5,
+                                             open_hour=datetime.time(8), close_hour=datetime.time(12))
+            sla = SLA.objects.create(user=self.consultant, segment=segment, promise='Answered',
+                                     grace_periode=24, cost=50000)
+            Priority.objects.create(user=self.consultant, sla=sla, label='Medium', cost=1000)
+
+        issue = Issue.objects.create(user=self.client_user, label='Issue', description='Issue')
+        reservation = Reservation.objects.create(client=self.client_user, consultant=self.consultant)
+        ReservationItem.objects.create(reservation=reservation, issue=issue, schedule=schedule,
+                                       segment=segment, sla=sla, priority=sla.priority.first(),
+                                       datetime=timezone.now() + datetime.timedelta(days=1))
+
+        self.api = APIClient()
+        self.api.force_login(self.consultant)
+
+    def call_async(self, viewset, actions, url, **kwargs):
+        with override_settings(ASYNC_READ_PATH=True):
+            view = viewset.as_view(actions)
+        self.assertTrue(asyncio.iscoroutinefunction(view))
+
+        request = AsyncRequestFactory().get(url)
+        request.user = self.consultant
+        force_authenticate(request, user=self.consultant)
+        response = async_to_sync(view)(request, **kwargs)
+        response.render()
+        return response
+
+    def test_schedule_same_as_sync(self):
+        url = reverse('helpdesk_api:consultant:schedule-list')
+        response = self.call_async(ScheduleApiView, {'get': 'list', 'post': 'create'}, url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, self.api.get(url).data)
+        self.assertEqual(len(response.data['results']), 3)
+
+        uuid = str(Schedule.objects.first().uuid)
+        url = reverse('helpdesk_api:consultant:schedule-detail', kwargs={'uuid': uuid})
+        response = self.call_async(ScheduleApiView, {'get': 'retrieve'}, url, uuid=uuid)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, self.api.get(url).data)
+
+    def test_assign_same_as_sync(self):
+        url = reverse('helpdesk_api:consultant:assign-list')
+        response = self.call_async(AssignApiView, {'get': 'list'}, url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, self.api.get(url).data)
+        self.assertEqual(response.data['results'][0]['uuid'], str(Assign.objects.get().uuid))
+
+    def test_error_handled(self):
+        url = reverse('helpdesk_api:consultant:schedule-detail', kwargs={'uuid': 'invalid'})
+        response = self.call_async(ScheduleApiView, {'get': 'retrieve'}, url, uuid='invalid')
+        self.assertEqual(response.status_code, 406)
+
+
+class OwnerScopeTestCase(TestCase):
+    """Owner scoped by FK id, no JOIN to person_user for it nor user loaded to compare"""
+
+    def setUp(self):
+        self.client_user = User.objects.create_user('client', 'client@email.com', '123456')
+        self.consultant = User.objects.create_user('consultant', 'consultant@email.com', '123456')
+        set_role(user=self.client_user, role=[CLIENT])
+        set_role(user=self.consultant, role=[CONSULTANT])
+
+        self.issue = Issue.objects.create(user=self.client_user, label='Issue', description='Issue')
+        schedule = Schedule.objects.create(user=self.consultant, label='Schedule')
+        segment = Segment.objects.create(user=self.consultant, schedule=schedule, quota=5,
+                                         open_hour=datetime.time(8), close_hour=datetime.time(12))
+        sla = SLA.objects.create(user=self.consultant, segment=segment, promise='Answered',
+                                 grace_periode=24, cost=50000)
+        priority = Priority.objects.create(user=self.consultant, sla=sla, label='Medium', cost=1000)
+        reservation = Reservation.objects.create(client=self.client_user, consultant=self.consultant)
+        ReservationItem.objects.create(reservation=reservation, issue=self.issue, schedule=schedule,
+                                       segment=segment, sla=sla, priority=priority,
+                                       datetime=timezone.now() + datetime.timedelta(days=1))
+
+    def get(self, user, name):
+        api = APIClient()
+        api.force_authenticate(user)
+        with CaptureQueriesContext(connection) as context:
+            response = api.get(reverse(name))
+        self.assertEqual(response.status_code, 200)
+        return [query['sql'] for query in context.captured_queries]
+
+    def test_scoped_by_id(self):
+        queries = self.get(self.client_user, 'helpdesk_api:client:issue-list') \
+            + self.get(self.client_user, 'helpdesk_api:client:reservation-list') \
+            + self.get(self.consultant, 'helpdesk_api:consultant:schedule-list') \
+            + self.get(self.consultant, 'helpdesk_api:consultant:assign-list')
+
+        self.assertEqual([sql for sql in queries if '"person_user"."uuid" =' in sql], [])
+
+    def test_permission_not_load_user(self):
+        from apps.helpdesk.utils.permissions import (
+            IsObjectOwnerOrReject, IsReservationItemOwnerOrReject
+        )
+
+        request = APIRequestFactory().get('/')
+        request.user = self.client_user
+        issue = Issue.objects.get(pk=self.issue.pk)
+        item = ReservationItem.objects.select_related('reservation').get()
+
+        with self.assertNumQueries(0):
+            self.assertTrue(IsObjectOwnerOrReject().has_object_permission(request, None, issue))
+            self.assertTrue(IsReservationItemOwnerOrReject().has_object_permission(request, None, item))
+
+            request.user = self.consultant
+            self.assertFalse(IsObjectOwnerOrReject().has_object_permission(request, None, issue))
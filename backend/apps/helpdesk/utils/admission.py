@@ -0,0 +1,64 @@
+"""
+Admission of reservation item to a slot, one (segment, date)
+
+ScheduleOccurrence.used is the counter of the slot, changed only by a
+single conditional UPDATE, no SELECT before and no select_for_update on
+Schedule, Segment or Reservation;
+
+    UPDATE ... SET used = used + 1
+    WHERE segment_id = %s AND date = %s AND is_active AND used + 1 <= quota
+
+Row lock of that UPDATE held until commit, so concurrent admission of
+the same slot queue on that row and see the committed used, never pass
+the quota. Other slot never blocked. Transaction rolled back give the
+seat back with it.
+
+Item saved outside the serializer (admin, shell, booking service) still
+counted by the signal, without quota check (occupy).
+"""
+
+import contextlib
+import contextvars
+
+from django.db.models import F
+from django.utils import timezone
+
+from utils.generals import get_model
+
+_admitted = contextvars.ContextVar('admission_admitted', default=None)
+
+
+def _slot(segment_id, date):
+    ScheduleOccurrence = get_model('helpdesk', 'ScheduleOccurrence')
+    return ScheduleOccurrence.objects.filter(segment_id=segment_id, date=date)
+
+
+def admit(segment_id, date, count=1):
+    """Take :count seat of the slot if left, return admitted or not"""
+    return bool(_slot(segment_id, date)
+                .filter(is_active=True, used__lte=F('quota') - count)
+                .update(used=F('used') + count, update_date=timezone.now()))
+
+
+def occupy(segment_id, date, count=1):
+    """Take :count seat whatever left, slot not expanded yet counted by it's sync"""
+    _slot(segment_id, date).update(used=F('used') + count, update_date=timezone.now())
+
+
+def release(segment_id, date, count=1):
+    _slot(segment_id, date).filter(used__gte=count) \
+        .update(used=F('used') - count, update_date=timezone.now())
+
+
+@contextlib.contextmanager
+def admitted(key):
+    """Item saved inside already admitted to :key slot, the signal not take it again"""
+    token = _admitted.set(key)
+    try:
+        yield
+    finally:
+        _admitted.reset(token)
+
+
+def is_admitted(key):
+    return key is not None and _admitted.get() == key
@@ -0,0 +1,168 @@
+"""
+Book a whole reservation in constant round trips
+
+ReservationItem -> Assign (waiting)
+Assign accepted -> Assigned, Invoice (one each reservation) and InvoiceItem
+Assign not accepted -> Assigned removed, the InvoiceItem cascaded
+
+Every step take many rows and create them with bulk_create in one transaction.
+The post_save handlers run the same step for one row, only as fallback
+for save outside this service, ex: admin or shell.
+"""
+
+import contextlib
+import contextvars
+
+from django.db import transaction
+from django.db.models import BigIntegerField, ExpressionWrapper, F, OuterRef, Subquery
+from django.utils import timezone
+
+from utils.generals import get_model
+from apps.helpdesk.utils.constants import ACCEPT
+
+_deferred = contextvars.ContextVar('booking_deferred', default=False)
+
+
+def is_deferred():
+    return _deferred.get()
+
+
+@contextlib.contextmanager
+def defer_signals():
+    """
+    Signal handlers skip the booking inside this block,
+    the caller must run book_reservation_items after
+    """
+    token = _deferred.set(True)
+    try:
+        yield
+    finally:
+        _deferred.reset(token)
+
+
+def _bulk_create(model, objs):
+    """bulk_create not set pk on MySQL, read back by uuid"""
+    if not objs:
+        return list()
+
+    model.objects.bulk_create(objs)
+    if all(obj.pk for obj in objs):
+        return objs
+    return list(model.objects.filter(uuid__in=[obj.uuid for obj in objs]))
+
+
+def create_assigns(reservation_items):
+    """Waiting Assign each item not assigned yet, return the new Assign"""
+    Assign = get_model('helpdesk', 'Assign')
+    Reservation = get_model('helpdesk', 'Reservation')
+
+    reservation_items = [item for item in reservation_items if item.pk]
+    if not reservation_items:
+        return list()
+
+    assigned_ids = set(Assign.objects.filter(reservation_item_id__in=[item.id for item in reservation_items])
+                       .values_list('reservation_item_id', flat=True))
+    reservations = Reservation.objects \
+        .filter(id__in={item.reservation_id for item in reservation_items}) \
+        .values_list('id', 'client_id', 'consultant_id')
+    reservations = {item[0]: item for item in reservations}
+
+    assigns = list()
+    for item in reservation_items:
+        if item.id in assigned_ids:
+            continue
+
+        _, client_id, consultant_id = reservations[item.reservation_id]
+        assigns.append(Assign(client_id=client_id, consultant_id=consultant_id,
+                              reservation_id=item.reservation_id, reservation_item_id=item.id))
+    return _bulk_create(Assign, assigns)
+
+
+def _get_invoices(assigns):
+    """Invoice each (client, consultant, reservation) of :assigns, created if not exist"""
+    Invoice = get_model('helpdesk', 'Invoice')
+
+    keys = {(item.client_id, item.consultant_id, item.reservation_id) for item in assigns}
+    invoices = Invoice.objects.filter(reservation_id__in={key[2] for key in keys})
+    invoices = {(item.client_id, item.consultant_id, item.reservation_id): item for item in invoices}
+
+    missing = [Invoice(client_id=key[0], consultant_id=key[1], reservation_id=key[2],
+                       number=Invoice.generate_number())
+               for key in keys if key not in invoices]
+
+    for item in _bulk_create(Invoice, missing):
+        invoices[(item.client_id, item.consultant_id, item.reservation_id)] = item
+    return invoices
+
+
+@transaction.atomic(savepoint=False)
+def sync_assigned(assigns):
+    """Assigned and InvoiceItem follow the :assigns status, return the new Assigned"""
+    Assigned = get_model('helpdesk', 'Assigned')
+    InvoiceItem = get_model('helpdesk', 'InvoiceItem')
+
+    assigns = list(assigns)
+    rejected = [item.id for item in assigns if item.status != ACCEPT]
+    accepted = [item for item in assigns if item.status == ACCEPT]
+
+    if rejected:
+        Assigned.objects.filter(assign_id__in=rejected).delete()
+
+    if accepted:
+        exists = set(Assigned.objects.filter(assign_id__in=[item.id for item in accepted])
+                     .values_list('assign_id', flat=True))
+        accepted = [item for item in accepted if item.id not in exists]
+
+    if not accepted:
+        return list()
+
+    assigneds = _bulk_create(Assigned, [Assigned(client_id=item.client_id, consultant_id=item.consultant_id,
+                                                 assign_id=item.id) for item in accepted])
+    assigneds = {item.assign_id: item for item in assigneds}
+    invoices = _get_invoices(accepted)
+
+    InvoiceItem.objects.bulk_create([
+        InvoiceItem(invoice_id=invoices[(item.client_id, item.consultant_id, item.reservation_id)].id,
+                    reservation_item_id=item.reservation_item_id, assign_id=item.id,
+                    assigned_id=assigneds[item.id].id)
+        for item in accepted
+    ])
+    return list(assigneds.values())
+
+
+@transaction.atomic
+def book_reservation_items(reservation_items):
+    """
+    Assign every item not assigned yet, then create Assigned and Invoice
+    for the one already accepted. Return (assigns created, assigneds created)
+    """
+    Assign = get_model('helpdesk', 'Assign')
+
+    reservation_items = list(reservation_items)
+    assigns = create_assigns(reservation_items)
+
+    # new assign always waiting, only old one can be accepted
+    accepted = Assign.objects \
+        .filter(reservation_item_id__in=[item.id for item in reservation_items if item.pk], status=ACCEPT) \
+        .exclude(id__in=[item.id for item in assigns])
+    return assigns, sync_assigned(accepted)
+
+
+def book_reservation(reservation):
+    ReservationItem = get_model('helpdesk', 'ReservationItem')
+    return book_reservation_items(ReservationItem.objects.filter(reservation_id=reservation.id))
+
+
+def repair_reservation_item_cost():
+    """Backfill ReservationItem.cost from current sla and priority cost, return how many changed"""
+    SLA = get_model('helpdesk', 'SLA')
+    Priority = get_model('helpdesk', 'Priority')
+    ReservationItem = get_model('helpdesk', 'ReservationItem')
+
+    sla_cost = SLA.objects.filter(id=OuterRef('sla_id')).values('cost')[:1]
+    priority_cost = Priority.objects.filter(id=OuterRef('priority_id')).values('cost')[:1]
+    cost = ExpressionWrapper(Subquery(sla_cost) + Subquery(priority_cost), output_field=BigIntegerField())
+
+    return ReservationItem.objects.annotate(expected_cost=cost) \
+        .exclude(cost=F('expected_cost')) \
+        .update(cost=cost, update_date=timezone.now())
@@ -0,0 +1,293 @@
+"""
+Vectorized ScheduleTerm expansion with NumPy
+
+Dates is datetime64[D] array, every Rule evaluated as set operation
+over a Calendar (continuous days with their year, month, weekday, ...)
+- inclusion recur: limit the period days like rrule, ex: byweekday ['MO', 'TU']
+- inclusion once bydate: union of dates
+- exclusion recur: np.isin against calendar field, ex: byweekday ['SU']
+- exclusion once bydate: np.setdiff1d of dates
+
+Sub-daily freq (hourly, minutely, secondly) and inclusion byweekno
+not mapped to calendar, for that the base dates still from dateutil.rrule
+"""
+
+import datetime
+import numpy as np
+
+from dateutil import rrule
+
+from django.utils import timezone
+
+from apps.helpdesk.utils.constants import (
+    BYDATE, BYMONTH, BYMONTHDAY, BYWEEKDAY, BYWEEKNO, BYYEARDAY,
+    INCLUSION, ONCE
+)
+
+WEEKDAYS = {str(weekday): weekday for weekday in rrule.weekdays}
+
+# rrule param each identifier, other identifier ignored
+RRULE_PARAMS = (BYWEEKDAY, BYMONTH, BYMONTHDAY, BYYEARDAY, BYWEEKNO,)
+
+# 1970-01-01 (datetime64 epoch) is thursday
+EPOCH_WEEKDAY = 3
+EMPTY = np.array([], dtype='datetime64[D]')
+
+
+def as_local(value, tz=None):
+    if value is not None and timezone.is_aware(value):
+        value = value.astimezone(tz or timezone.get_current_timezone()).replace(tzinfo=None)
+    return value
+
+
+def _as_array(dates):
+    return np.array(sorted(dates), dtype='datetime64[D]') if dates else EMPTY
+
+
+def _rule_value(rule, rule_value, tz=None):
+    value = getattr(rule_value, 'value_%s' % rule.type, None)
+
+    if rule.identifier == BYDATE:
+        value = as_local(value, tz)
+        return value.date() if value else None
+
+    if rule.identifier == BYWEEKDAY and isinstance(value, str):
+        weekday = WEEKDAYS.get(value.upper()[0:2])
+        return weekday.weekday if weekday else None
+
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def collect_rules(schedule_term, tz=None):
+    """
+    Group schedule_term rules to;
+    :inclusion rrule params, :exclusion params, :rdates and :exdates
+    Use prefetched `rule__rule_value` if available
+    """
+    inclusion, exclusion = dict(), dict()
+    rdates, exdates = set(), set()
+
+    for rule in schedule_term.rule.all():
+        values = [_rule_value(rule, item, tz) for item in rule.rule_value.all()]
+        values = [value for value in values if value is not None]
+        if not values:
+            continue
+
+        if rule.identifier == BYDATE:
+            (rdates if rule.mode == INCLUSION else exdates).update(values)
+        elif rule.identifier in RRULE_PARAMS:
+            target = inclusion if rule.mode == INCLUSION else exclusion
+            target.setdefault(rule.identifier, list()).extend(values)
+
+    return inclusion, exclusion, rdates, exdates
+
+
+def _wkst(schedule_term):
+    weekday = WEEKDAYS.get(schedule_term.wkst)
+    return weekday.weekday if weekday else rrule.MO.weekday
+
+
+def rrule_params(schedule_term, tz=None):
+    params = {
+        'freq': schedule_term.freq,
+        'interval': schedule_term.interval or 1,
+        'dtstart': as_local(schedule_term.dtstart, tz),
+        'wkst': _wkst(schedule_term),
+    }
+
+    # count and until can't used together
+    if schedule_term.dtuntil:
+        params['until'] = as_local(schedule_term.dtuntil, tz)
+    else:
+        params['count'] = schedule_term.count
+    return params
+
+
+class Calendar:
+    """
+    Calendar fields of continuous days from :start to :end,
+    computed once then each schedule_term only slice it
+    """
+
+    def __init__(self, start, end):
+        self.start = np.datetime64(start, 'D')
+        self.end = np.datetime64(end, 'D')
+        self.days = np.arange(self.start, self.end + 1, dtype='datetime64[D]')
+
+        months = self.days.astype('datetime64[M]')
+        years = self.days.astype('datetime64[Y]')
+        month_start = months.astype('datetime64[D]')
+        year_start = years.astype('datetime64[D]')
+
+        self.ordinal = self.days.astype(np.int64)
+        self.weekday = (self.ordinal + EPOCH_WEEKDAY) % 7
+        self.month_index = months.astype(np.int64)
+        self.month = self.month_index % 12 + 1
+        self.year = years.astype(np.int64) + 1970
+        self.monthday = (self.days - month_start).astype(np.int64) + 1
+        self.month_length = ((months + 1).astype('datetime64[D]') - month_start).astype(np.int64)
+        self.yearday = (self.days - year_start).astype(np.int64) + 1
+        self.year_length = ((years + 1).astype('datetime64[D]') - year_start).astype(np.int64)
+
+        # iso week, the week belong to year of it's thursday
+        thursday = self.days + (3 - self.weekday)
+        thursday_year = thursday.astype('datetime64[Y]').astype('datetime64[D]')
+        self.weekno = (thursday - thursday_year).astype(np.int64) // 7 + 1
+
+    def covers(self, start, end):
+        return self.start <= np.datetime64(start, 'D') and np.datetime64(end, 'D') <= self.end
+
+    def index(self, date):
+        return int((np.datetime64(date, 'D') - self.start).astype(np.int64))
+
+    def slice(self, start, end):
+        return slice(self.index(start), self.index(end) + 1)
+
+    def mask(self, identifier, values, index):
+        """Days at :index match :values of :identifier, negative value count from end"""
+        values = np.asarray(values)
+
+        if identifier == BYWEEKDAY:
+            return np.isin(self.weekday[index], values)
+
+        if identifier == BYMONTH:
+            return np.isin(self.month[index], values)
+
+        if identifier == BYMONTHDAY:
+            monthday = self.monthday[index]
+            return np.isin(monthday, values) \
+                | np.isin(monthday - self.month_length[index] - 1, values)
+
+        if identifier == BYYEARDAY:
+            yearday = self.yearday[index]
+            return np.isin(yearday, values) \
+                | np.isin(yearday - self.year_length[index] - 1, values)
+
+        if identifier == BYWEEKNO:
+            return np.isin(self.weekno[index], values)
+
+        raise ValueError("Identifier %s not supported" % identifier)
+
+    def period(self, freq, index, first, wkst):
+        """Period number each day counted from :first, same as rrule interval"""
+        ordinal = self.ordinal[index]
+        first = self.index(first)
+
+        if freq == rrule.DAILY:
+            return ordinal - self.ordinal[first]
+
+        if freq == rrule.WEEKLY:
+            shift = EPOCH_WEEKDAY - wkst
+            return (ordinal + shift) // 7 - (self.ordinal[first] + shift) // 7
+
+        if freq == rrule.MONTHLY:
+            return self.month_index[index] - self.month_index[first]
+
+        return self.year[index] - self.year[first]
+
+
+def _rrule_defaults(freq, dtstart, inclusion):
+    """Same as dateutil.rrule, day from dtstart used if no by* param"""
+    params = dict(inclusion)
+
+    if not any(key in params for key in (BYWEEKNO, BYYEARDAY, BYMONTHDAY, BYWEEKDAY)):
+        if freq == rrule.YEARLY:
+            params.setdefault(BYMONTH, [dtstart.month])
+            params[BYMONTHDAY] = [dtstart.day]
+        elif freq == rrule.MONTHLY:
+            params[BYMONTHDAY] = [dtstart.day]
+        elif freq == rrule.WEEKLY:
+            params[BYWEEKDAY] = [dtstart.weekday()]
+    return params
+
+
+def _is_vectorizable(schedule_term, inclusion):
+    return schedule_term.freq in (rrule.YEARLY, rrule.MONTHLY, rrule.WEEKLY, rrule.DAILY) \
+        and BYWEEKNO not in inclusion
+
+
+def _expand_rrule(schedule_term, inclusion, start, end, tz):
+    window_start = datetime.datetime.combine(start, datetime.time.min)
+    window_end = datetime.datetime.combine(end, datetime.time.max)
+    recurrence = rrule.rrule(**rrule_params(schedule_term, tz), **inclusion)
+    return _as_array({item.date() for item in recurrence.between(window_start, window_end, inc=True)})
+
+
+def _expand_calendar(schedule_term, inclusion, end, calendar, tz):
+    dtstart = as_local(schedule_term.dtstart, tz)
+    dtuntil = as_local(schedule_term.dtuntil, tz)
+    first, last = dtstart.date(), end
+
+    # occurrence time always dtstart time, so until day skipped if until earlier
+    if dtuntil:
+        until = dtuntil.date()
+        if dtuntil.time() < dtstart.time():
+            until -= datetime.timedelta(days=1)
+        last = min(last, until)
+
+    if last < first:
+        return EMPTY
+
+    index = calendar.slice(first, last)
+    interval = schedule_term.interval or 1
+    mask = calendar.period(schedule_term.freq, index, first, _wkst(schedule_term)) % interval == 0
+
+    for identifier, values in _rrule_defaults(schedule_term.freq, dtstart, inclusion).items():
+        mask &= calendar.mask(identifier, values, index)
+
+    dates = calendar.days[index][mask]
+    if not dtuntil and schedule_term.count:
+        dates = dates[:schedule_term.count]
+    return dates
+
+
+def _calendar_start(schedule_term, start, tz=None):
+    dtstart = as_local(schedule_term.dtstart, tz)
+    return min(dtstart.date(), start) if dtstart else start
+
+
+def expand(schedule_term, start, end, calendar=None, tz=None):
+    """Return sorted datetime64[D] array of :schedule_term between :start and :end (inclusive)"""
+    tz = tz or timezone.get_current_timezone()
+    calendar_start = _calendar_start(schedule_term, start, tz)
+    if calendar is None or not calendar.covers(calendar_start, end):
+        calendar = Calendar(calendar_start, end)
+
+    inclusion, exclusion, rdates, exdates = collect_rules(schedule_term, tz)
+
+    if schedule_term.direction == ONCE:
+        dates = _as_array({as_local(schedule_term.dtstart, tz).date()})
+    elif _is_vectorizable(schedule_term, inclusion):
+        dates = _expand_calendar(schedule_term, inclusion, end, calendar, tz)
+    else:
+        dates = _expand_rrule(schedule_term, inclusion, start, end, tz)
+
+    dates = np.union1d(dates, _as_array(rdates))
+    dates = dates[(dates >= np.datetime64(start, 'D')) & (dates <= np.datetime64(end, 'D'))]
+    dates = np.setdiff1d(dates, _as_array(exdates), assume_unique=True)
+
+    if exclusion and dates.size:
+        index = (dates - calendar.start).astype(np.int64)
+        excluded = np.zeros(dates.size, dtype=bool)
+        for identifier, values in exclusion.items():
+            excluded |= calendar.mask(identifier, values, index)
+        dates = dates[~excluded]
+
+    return dates
+
+
+def expand_bulk(schedule_terms, start, end):
+    """
+    Expand many schedule_term in one call, calendar built once
+    Return {schedule_term.id: datetime64[D] array}
+    """
+    schedule_terms = list(schedule_terms)
+    if not schedule_terms:
+        return dict()
+
+    tz = timezone.get_current_timezone()
+    calendar = Calendar(min(_calendar_start(item, start, tz) for item in schedule_terms), end)
+    return {item.id: expand(item, start, end, calendar=calendar, tz=tz) for item in schedule_terms}
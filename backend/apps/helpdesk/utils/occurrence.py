@@ -0,0 +1,185 @@
+"""
+Keep ScheduleOccurrence rows same as expanded ScheduleTerm and it's Rule,
+the expansion itself in apps.helpdesk.utils.expansion
+"""
+
+import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Prefetch
+from django.utils import timezone
+
+from utils.generals import get_model
+from apps.helpdesk.utils.constants import PUSH
+from apps.helpdesk.utils.expansion import as_local, expand, expand_bulk
+
+# schedules expanded together in sync_all_schedule_occurrence
+SYNC_CHUNK_SIZE = 500
+
+
+def expand_schedule_term(schedule_term, start, end):
+    """Return sorted dates of :schedule_term between :start and :end (inclusive)"""
+    return expand(schedule_term, start, end).tolist()
+
+
+def get_horizon(start=None, end=None):
+    start = start or timezone.localdate()
+    end = end or start + datetime.timedelta(days=settings.SCHEDULE_OCCURRENCE_HORIZON)
+    return start, end
+
+
+def datetime_range(start, end):
+    """Aware [start, end + 1 day) of local dates, index usable unlike `datetime__date`"""
+    tz = timezone.get_current_timezone()
+    return (timezone.make_aware(datetime.datetime.combine(start, datetime.time.min), tz),
+            timezone.make_aware(datetime.datetime.combine(end + datetime.timedelta(days=1),
+                                                          datetime.time.min), tz))
+
+
+def count_used(segment_ids, start, end):
+    """Count pushed reservation item each (segment, date)"""
+    ReservationItem = get_model('helpdesk', 'ReservationItem')
+
+    if not segment_ids:
+        return dict()
+
+    lower, upper = datetime_range(start, end)
+    used = ReservationItem.objects \
+        .filter(segment_id__in=segment_ids, status=PUSH, datetime__gte=lower, datetime__lt=upper) \
+        .values('segment_id', 'datetime__date') \
+        .annotate(total=Count('id'))
+    return {(item['segment_id'], item['datetime__date']): item['total'] for item in used}
+
+
+def _schedule_queryset():
+    Schedule = get_model('helpdesk', 'Schedule')
+
+    return Schedule.objects \
+        .prefetch_related(Prefetch('segment'), Prefetch('schedule_term__rule__rule_value')) \
+        .select_related('schedule_term')
+
+
+@transaction.atomic
+def _sync_schedule(schedule_id, schedule, dates, start, end):
+    """
+    Compare :dates of :schedule with stored ScheduleOccurrence,
+    then only create, update and delete the difference.
+    Occurrence already used by reservation not deleted, only inactivated.
+    """
+    ScheduleOccurrence = get_model('helpdesk', 'ScheduleOccurrence')
+
+    wanted = dict()
+    if schedule is not None and schedule.is_active:
+        segments = [segment for segment in schedule.segment.all() if segment.is_active]
+
+        for segment in segments:
+            for date in dates:
+                wanted[(segment.id, date)] = segment
+
+    existing = ScheduleOccurrence.objects \
+        .filter(schedule_id=schedule_id, date__gte=start, date__lte=end)
+    existing = {(obj.segment_id, obj.date): obj for obj in existing}
+
+    news = [key for key in wanted if key not in existing]
+    used = count_used(list(dict.fromkeys(key[0] for key in news)), start, end)
+    now = timezone.now()
+    creates, updates, deletes = list(), list(), list()
+
+    for key, segment in wanted.items():
+        obj = existing.pop(key, None)
+        values = {
+            'open_hour': segment.open_hour,
+            'close_hour': segment.close_hour,
+            'quota': segment.quota,
+            'is_active': True,
+        }
+
+        if obj is None:
+            creates.append(ScheduleOccurrence(user_id=schedule.user_id, schedule_id=schedule_id,
+                                              segment_id=segment.id, date=key[1],
+                                              used=used.get(key, 0), **values))
+        elif any(getattr(obj, field) != value for field, value in values.items()):
+            for field, value in values.items():
+                setattr(obj, field, value)
+
+            obj.update_date = now
+            updates.append(obj)
+
+    # not wanted anymore
+    for obj in existing.values():
+        if obj.used > 0:
+            if obj.is_active:
+                obj.is_active = False
+                obj.update_date = now
+                updates.append(obj)
+        else:
+            deletes.append(obj.id)
+
+    if creates:
+        ScheduleOccurrence.objects.bulk_create(creates)
+
+    if updates:
+        ScheduleOccurrence.objects.bulk_update(updates, ['open_hour', 'close_hour', 'quota',
+                                                         'is_active', 'update_date'])
+
+    if deletes:
+        ScheduleOccurrence.objects.filter(id__in=deletes).delete()
+
+    return len(creates), len(updates), len(deletes)
+
+
+def sync_schedule_occurrence(schedule_id, start=None, end=None):
+    start, end = get_horizon(start, end)
+    schedule = _schedule_queryset().filter(id=schedule_id).first()
+    schedule_term = getattr(schedule, 'schedule_term', None)
+
+    dates = expand_schedule_term(schedule_term, start, end) if schedule_term else list()
+    return _sync_schedule(schedule_id, schedule, dates, start, end)
+
+
+def sync_all_schedule_occurrence(start=None, end=None):
+    """Roll the horizon forward, run it daily"""
+    ScheduleOccurrence = get_model('helpdesk', 'ScheduleOccurrence')
+
+    start, end = get_horizon(start, end)
+
+    # past occurrence without reservation useless
+    ScheduleOccurrence.objects.filter(date__lt=start, used=0).delete()
+
+    schedule_ids = list(_schedule_queryset().filter(schedule_term__isnull=False)
+                        .values_list('id', flat=True))
+
+    # expand each chunk in one call, calendar computed once per chunk
+    for index in range(0, len(schedule_ids), SYNC_CHUNK_SIZE):
+        schedules = _schedule_queryset().filter(id__in=schedule_ids[index:index + SYNC_CHUNK_SIZE])
+        schedules = list(schedules)
+        dates = expand_bulk([schedule.schedule_term for schedule in schedules], start, end)
+
+        for schedule in schedules:
+            _sync_schedule(schedule.id, schedule, dates[schedule.schedule_term.id].tolist(), start, end)
+
+
+def schedule_occurrence_sync(schedule_id):
+    """Sync after transaction committed, so see the final rules"""
+    if schedule_id:
+        transaction.on_commit(lambda: sync_schedule_occurrence(schedule_id))
+
+
+def refresh_occurrence_used(segment_id, date):
+    """Recount the slot, repair only, counter kept by apps.helpdesk.utils.admission"""
+    ReservationItem = get_model('helpdesk', 'ReservationItem')
+    ScheduleOccurrence = get_model('helpdesk', 'ScheduleOccurrence')
+
+    lower, upper = datetime_range(date, date)
+    used = ReservationItem.objects \
+        .filter(segment_id=segment_id, status=PUSH, datetime__gte=lower, datetime__lt=upper) \
+        .count()
+    ScheduleOccurrence.objects.filter(segment_id=segment_id, date=date).update(used=used)
+
+
+def occurrence_key(segment_id, value):
+    value = as_local(value)
+    if segment_id and value:
+        return segment_id, value.date()
+    return None
@@ -1,6 +1,8 @@
 from django.utils.translation import gettext_lazy as _
 from rest_framework import permissions
 
+from utils.ownership import IsOwnerOrReject
+
 
 class IsConsultantOnly(permissions.BasePermission):
     def has_permission(self, request, view):
@@ -19,31 +21,25 @@ class IsResumeCompleteOrReject(permissions.BasePermission):
         return request.user.is_resume_complete
 
 
-class IsObjectOwnerOrReject(permissions.BasePermission):
-    def has_object_permission(self, request, view, obj):
-        return request.user.uuid == obj.user.uuid
+class IsObjectOwnerOrReject(IsOwnerOrReject):
+    owner_field = 'user'
 
 
-class IsRuleValueOwnerOrReject(permissions.BasePermission):
-    def has_object_permission(self, request, view, obj):
-        return request.user.uuid == obj.rule.user.uuid
+class IsRuleValueOwnerOrReject(IsOwnerOrReject):
+    owner_field = 'rule__user'
 
 
-class IsScheduleTermOwnerOrReject(permissions.BasePermission):
-    def has_object_permission(self, request, view, obj):
-        return request.user.uuid == obj.schedule.user.uuid
+class IsScheduleTermOwnerOrReject(IsOwnerOrReject):
+    owner_field = 'schedule__user'
 
 
-class IsReservationOwnerOrReject(permissions.BasePermission):
-    def has_object_permission(self, request, view, obj):
-        return request.user.uuid == obj.client.uuid
+class IsReservationOwnerOrReject(IsOwnerOrReject):
+    owner_field = 'client'
 
 
-class IsReservationItemOwnerOrReject(permissions.BasePermission):
-    def has_object_permission(self, request, view, obj):
-        return request.user.uuid == obj.reservation.client.uuid
+class IsReservationItemOwnerOrReject(IsOwnerOrReject):
+    owner_field = 'reservation__client'
 
 
-class IsAssignOwnerOrReject(permissions.BasePermission):
-    def has_object_permission(self, request, view, obj):
-        return request.user.uuid == obj.consultant.uuid
+class IsAssignOwnerOrReject(IsOwnerOrReject):
+    owner_field = 'consultant'
@@ -0,0 +1,9 @@
+"""
+Full text search of helpdesk text, see utils.search
+Respond / Reply registered the same way when their list searched
+"""
+
+from utils.search import SearchIndex
+
+issue_search = SearchIndex('helpdesk', 'Issue', fields=('label', 'description'),
+                           weights={'label': 2})
@@ -1,5 +1,5 @@
 from django.db import transaction
-from django.db.models import Q, Prefetch
+from django.db.models import Prefetch
 from django.db.utils import IntegrityError
 from django.utils.decorators import method_decorator
 from django.utils.translation import ugettext_lazy as _
@@ -11,6 +11,8 @@ from rest_framework.response import Response
 from rest_framework.exceptions import NotAcceptable, ValidationError
 
 from utils.generals import get_model
+from apps.master.utils.cache import get_scope_topics, search_topics
+from apps.master.utils.search import search_topic_ids
 from .serializers import TopicSerializer
 
 Topic = get_model('master', 'Topic')
@@ -24,11 +26,13 @@ class TopicApiView(viewsets.ViewSet):
     Params:
 
         {
-            "s": "string"
+            "s": "string",
+            "scope": "uuid"
         }
 
     Example:
         api/master/topics/?s=PHP
+        api/master/topics/?scope=<uuid>
     
     POST
     --------------------
@@ -53,17 +57,27 @@ class TopicApiView(viewsets.ViewSet):
         param_missed = dict()
         context = {'request': request}
         s = request.query_params.get('s')
+        scope = request.query_params.get('scope')
 
-        if not s:
+        if not s and not scope:
             param_missed.update({'s': _("Required")})
 
         # print error if params not provided
         if param_missed:
             raise NotAcceptable(detail=param_missed)
-    
-        queryset = self.queryset \
-            .filter(Q(is_active=True), Q(label__icontains=s))
-        serializer = TopicSerializer(queryset, many=True, context=context)
+
+        if scope:
+            # active topic of the scope from master cache
+            topics = get_scope_topics(scope)
+            if s:
+                topics = search_topics(s, topics=topics)
+        else:
+            # ranked by topic index, only the matched row read
+            ids = search_topic_ids(s)
+            topics = self.queryset.in_bulk(ids)
+            topics = [topics[i] for i in ids if i in topics]
+
+        serializer = TopicSerializer(topics, many=True, context=context)
         return Response(serializer.data, status=response_status.HTTP_200_OK)
 
     @method_decorator(never_cache)
@@ -1,5 +1,39 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_save, post_delete, m2m_changed
 
 
 class MasterConfig(AppConfig):
     name = 'apps.master'
+
+    def ready(self):
+        from utils.generals import get_model
+        from apps.master.signals import (
+            master_change_handler,
+            scope_topics_change_handler,
+            topic_index_save_handler,
+            topic_index_delete_handler
+        )
+
+        Topic = get_model('master', 'Topic')
+        Scope = get_model('master', 'Scope')
+
+        post_save.connect(master_change_handler, sender=Topic,
+                          dispatch_uid='topic_save_signal')
+
+        post_delete.connect(master_change_handler, sender=Topic,
+                            dispatch_uid='topic_delete_signal')
+
+        post_save.connect(topic_index_save_handler, sender=Topic,
+                          dispatch_uid='topic_index_save_signal')
+
+        post_delete.connect(topic_index_delete_handler, sender=Topic,
+                            dispatch_uid='topic_index_delete_signal')
+
+        post_save.connect(master_change_handler, sender=Scope,
+                          dispatch_uid='scope_save_signal')
+
+        post_delete.connect(master_change_handler, sender=Scope,
+                            dispatch_uid='scope_delete_signal')
+
+        m2m_changed.connect(scope_topics_change_handler, sender=Scope.topics.through,
+                            dispatch_uid='scope_topics_change_signal')
@@ -0,0 +1,128 @@
+import sys
+import json
+import shlex
+import importlib
+import contextlib
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test.utils import get_runner, setup_test_environment, teardown_test_environment
+
+from utils.explain import Audit, Recorder
+
+
+class Command(BaseCommand):
+    help = "EXPLAIN the queries of the tests / benchmarks, flag full scan and filesort, propose composite index"
+
+    def add_arguments(self, parser):
+        parser.add_argument('test_labels', nargs='*',
+                            help="Tests run to capture queries, default all (none with --benchmark or --load)")
+        parser.add_argument('--benchmark', action='append', default=[],
+                            help="Benchmark run to capture queries, with it's args, "
+                                 "ex: --benchmark 'filter_assign --repeat 1'")
+        parser.add_argument('--load', default=None, help="Queries captured before (JSON lines)")
+        parser.add_argument('--save', default=None, help="Write captured queries (JSON lines)")
+        parser.add_argument('--live', action='store_true',
+                            help="EXPLAIN on the database as is (data and statistics), not a new test database")
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--format', choices=['table', 'json'], default='table')
+
+    @contextlib.contextmanager
+    def capture(self, recorder):
+        wrapped = list()
+        for connection in connections.all():
+            connection.execute_wrappers.append(recorder)
+            wrapped.append(connection)
+        try:
+            yield
+        finally:
+            for connection in wrapped:
+                connection.execute_wrappers.remove(recorder)
+
+    def run_tests(self, recorder, labels):
+        runner = get_runner(settings)(verbosity=0, interactive=False)
+        with self.capture(recorder):
+            runner.run_tests(labels)
+
+    def run_benchmark(self, recorder, value):
+        args = shlex.split(value)
+        module = importlib.import_module('benchmarks.%s' % args[0])
+
+        # benchmark create (and destroy) it's test database
+        stdout = sys.stdout
+        sys.stdout = self.stderr
+        try:
+            with self.capture(recorder):
+                module.main(args[1:])
+        finally:
+            sys.stdout = stdout
+
+    @contextlib.contextmanager
+    def explain_database(self, live):
+        if live:
+            yield
+            return
+
+        connection = connections[self.database]
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            yield
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+    def handle(self, *args, **options):
+        self.database = options['database']
+        self.verbosity = options['verbosity']
+        vendor = connections[self.database].vendor
+        if vendor not in ('sqlite', 'mysql'):
+            raise CommandError("EXPLAIN read for SQLite and MySQL only, not %s" % vendor)
+
+        recorder = Recorder()
+        if options['load']:
+            with open(options['load']) as stream:
+                try:
+                    recorder.load(stream, vendor)
+                except ValueError as e:
+                    raise CommandError(str(e))
+
+        for value in options['benchmark']:
+            self.run_benchmark(recorder, value)
+
+        if options['test_labels'] or not (options['load'] or options['benchmark']):
+            self.run_tests(recorder, options['test_labels'])
+
+        if options['save']:
+            with open(options['save'], 'w') as stream:
+                recorder.dump(stream, vendor)
+
+        with self.explain_database(options['live']):
+            audit = Audit(recorder, using=self.database).run()
+
+        if options['format'] == 'json':
+            self.stdout.write(json.dumps(audit.as_dict(), indent=2, default=str))
+            return
+        self.write_table(audit)
+
+    def write_table(self, audit):
+        result = audit.as_dict()
+        self.stdout.write('%s: %d queries captured, %d explained, %d failed'
+                          % (result['vendor'], result['captured'], result['explained'], len(result['failed'])))
+
+        self.stdout.write(self.style.MIGRATE_HEADING("Proposed index"))
+        for proposal in sorted(result['proposals'], key=lambda item: -item['queries']):
+            self.stdout.write('  {model}: models.Index(fields={fields!r}, name={name!r})'.format(**proposal))
+            self.stdout.write('    {queries} queries, {problems}\n    {sql}'.format(
+                queries=proposal['queries'], problems=', '.join(proposal['problems']), sql=proposal['sql'][:200]))
+
+        if self.verbosity > 1:
+            self.stdout.write(self.style.MIGRATE_HEADING("Flagged, no index proposed"))
+            for item in result['uncovered']:
+                self.stdout.write('  {table}: {problems}\n    {sql}'.format(
+                    table=item['table'], problems=', '.join(item['problems']), sql=item['sql'][:200]))
+
+            for item in result['failed']:
+                self.stdout.write('  failed: {error}\n    {sql}'.format(error=item['error'], sql=item['sql'][:200]))
@@ -0,0 +1,37 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from utils.middleware.instrumentation import HISTOGRAM_BUCKETS, collect_snapshots
+
+
+class Command(BaseCommand):
+    help = "Query count and latency each endpoint, from all processes running InstrumentationMiddleware"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=['table', 'json'], default='table')
+
+    def handle(self, *args, **options):
+        snapshots = collect_snapshots()
+
+        if options['format'] == 'json':
+            self.stdout.write(json.dumps(snapshots, indent=2, sort_keys=True))
+            return
+
+        if not snapshots:
+            self.stdout.write("No instrumentation data yet")
+            return
+
+        buckets = ' '.join('<=%s' % bound for bound in HISTOGRAM_BUCKETS[:-1]) + ' >'
+        for pid, snapshot in sorted(snapshots.items()):
+            self.stdout.write(self.style.MIGRATE_HEADING("Process %s" % pid))
+
+            for key, item in sorted(snapshot.items()):
+                self.stdout.write(
+                    '  {key}\n'
+                    '    n={count} p50={p50:.1f}ms p95={p95:.1f}ms max={max:.1f}ms '
+                    'queries p50={queries_p50} max={queries_max} '
+                    'db={db_mean:.1f}ms serializer={serializer_mean:.1f}ms render={render_mean:.1f}ms'
+                    .format(key=key, **item)
+                )
+                self.stdout.write('    ms   %s\n    hits %s' % (buckets, ' '.join(str(x) for x in item['histogram'])))
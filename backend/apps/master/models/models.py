@@ -1,5 +1,6 @@
 from .scope import *
 from .topic import *
+from .sequence import *
 
 # PROJECT UTILS
 from utils.generals import is_model_registered
@@ -23,3 +24,12 @@ if not is_model_registered('resume', 'Topic'):
             db_table = 'master_topic'
 
     __all__.append('Topic')
+
+
+# 3
+if not is_model_registered('master', 'Sequence'):
+    class Sequence(AbstractSequence):
+        class Meta(AbstractSequence.Meta):
+            db_table = 'master_sequence'
+
+    __all__.append('Sequence')
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.db import models
+from django.utils.translation import ugettext_lazy as _
+
+
+class AbstractSequence(models.Model):
+    """ie: Expertise sort_order of a user, kept by utils/ordering.py"""
+    create_date = models.DateTimeField(auto_now_add=True, null=True)
+    update_date = models.DateTimeField(auto_now=True, null=True)
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE,
+                             related_name='sequence')
+    # model label, ie: resume.expertise
+    label = models.CharField(max_length=255)
+    # last sort_order given
+    value = models.BigIntegerField(default=0)
+    # rows of the user now, for the max allowed
+    count = models.BigIntegerField(default=0)
+
+    class Meta:
+        abstract = True
+        app_label = 'master'
+        verbose_name = _("Sequence")
+        verbose_name_plural = _("Sequences")
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'label'], name='unique_sequence_user_label')
+        ]
+
+    def __str__(self):
+        return '{0} {1}'.format(self.label, self.value)
@@ -26,6 +26,10 @@ class AbstractTopic(models.Model):
         constraints = [
             models.UniqueConstraint(fields=['label'], name='unique_topic_label')
         ]
+        indexes = [
+            # topic search index sync
+            models.Index(fields=['update_date'], name='topic_update_date_idx'),
+        ]
 
     def __str__(self):
         return self.label
@@ -0,0 +1,28 @@
+from django.db import transaction
+
+from apps.master.utils.cache import invalidate_master_cache
+from apps.master.utils.search import topic_index
+
+
+def master_change_handler(sender, instance, **kwargs):
+    # Topic / Scope saved or deleted, ex: from admin
+    invalidate_master_cache()
+
+
+def scope_topics_change_handler(sender, instance, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_master_cache()
+
+
+def topic_index_save_handler(sender, instance, **kwargs):
+    # not built yet, built from database on first search
+    if topic_index.built_at is not None:
+        # values as saved, the index kept if rolled back
+        values = (instance.id, instance.label, instance.is_active, instance.is_approved)
+        transaction.on_commit(lambda: topic_index.update(*values))
+
+
+def topic_index_delete_handler(sender, instance, **kwargs):
+    if topic_index.built_at is not None:
+        pk = instance.id
+        transaction.on_commit(lambda: topic_index.discard(pk))
@@ -1,3 +1,218 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import IntegrityError, connection, transaction
 from django.test import TestCase
+from django.utils import timezone
+
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from utils.generals import get_model
+from apps.master.api.topic.v1.views import TopicApiView
+from apps.master.utils.cache import master_cache, get_topic, get_active_topics
+from apps.master.utils.search import topic_index, search_topic_ids
+from utils.explain import Audit, Recorder
+from utils.middleware.instrumentation import INSTRUMENTATION_CACHE_KEY, Metrics, Registry, collect_snapshots
+
+User = get_model('person', 'User')
+VerifyCode = get_model('person', 'VerifyCode')
+Topic = get_model('master', 'Topic')
+Scope = get_model('master', 'Scope')
+
 
 # Create your tests here.
+class MasterCacheTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('topicuser', 'topic@email.com', '123456')
+        self.python = Topic.objects.create(label='Python', is_approved=True)
+        self.django = Topic.objects.create(label='Django', is_approved=True)
+        Topic.objects.create(label='Pyramid', is_active=False, is_approved=True)
+
+        self.scope = Scope.objects.create(label='Backend')
+        self.scope.topics.add(self.django)
+
+        cache.clear()
+        master_cache.local.clear()
+        master_cache.reset_stats()
+
+    def search(self, **params):
+        request = APIRequestFactory().get('/', params)
+        force_authenticate(request, user=self.user)
+        return TopicApiView.as_view({'get': 'list'})(request)
+
+    def test_hit_and_miss(self):
+        get_topic(self.python.uuid)
+        get_topic(self.python.uuid)
+
+        with self.assertNumQueries(0):
+            topic = get_topic(self.python.uuid)
+
+        stats = master_cache.stats()
+        self.assertEqual(topic, self.python)
+        self.assertEqual((stats['misses'], stats['local_hits']), (1, 2))
+
+        # local tier gone (other process), served by shared tier
+        master_cache.local.clear()
+        with self.assertNumQueries(0):
+            get_topic(self.python.uuid)
+        self.assertEqual(master_cache.stats()['shared_hits'], 1)
+
+        self.assertIsNone(get_topic('not-uuid'))
+
+    def test_search_served_from_cache(self):
+        response = self.search(scope=str(self.scope.uuid), s='go')
+        self.assertEqual([item['label'] for item in response.data], ['Django'])
+
+        with self.assertNumQueries(0):
+            response = self.search(scope=str(self.scope.uuid))
+        self.assertEqual([item['label'] for item in response.data], ['Django'])
+        self.assertEqual(response.data[0]['scope'], ['Backend'])
+
+    def test_invalidate(self):
+        self.assertEqual(len(get_active_topics()), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.python.label = 'Python 3'
+            self.python.save()
+            # not committed, still the old one
+            self.assertIn('Python', [topic.label for topic in get_active_topics()])
+        self.assertEqual(get_topic(self.python.uuid).label, 'Python 3')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Topic.objects.create(label='Flask')
+        self.assertEqual(len(get_active_topics()), 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.scope.topics.add(self.python)
+        response = self.search(scope=str(self.scope.uuid))
+        self.assertEqual([item['label'] for item in response.data], ['Python 3', 'Django'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.django.delete()
+        self.assertIsNone(get_topic(self.django.uuid))
+        self.assertEqual(master_cache.stats()['invalidations'], 4)
+
+
+class TopicSearchTestCase(TestCase):
+    def setUp(self):
+        topic_index.clear()
+        self.user = User.objects.create_user('searchuser', 'search@email.com', '123456')
+
+        labels = ['Python', 'Python Django', 'Django REST Framework', 'Pyramid', 'CPython', 'Rust']
+        self.topics = {label: Topic.objects.create(label=label, is_approved=True) for label in labels}
+        Topic.objects.create(label='Python 2', is_approved=False)
+        Topic.objects.create(label='Pytest', is_approved=True, is_active=False)
+
+    def tearDown(self):
+        topic_index.clear()
+
+    def labels(self, s, limit=None):
+        ids = search_topic_ids(s, limit=limit)
+        return [Topic.objects.get(id=i).label for i in ids]
+
+    def test_ranked(self):
+        # prefix, word prefix, substring
+        self.assertEqual(self.labels('py'), ['Pyramid', 'Python', 'Python Django'])
+        self.assertEqual(self.labels('python'), ['Python', 'Python Django', 'CPython'])
+        self.assertEqual(self.labels('dja'), ['Django REST Framework', 'Python Django'])
+        self.assertEqual(self.labels('python', limit=1), ['Python'])
+
+        # fuzzy, typo
+        self.assertEqual(self.labels('pythn')[:1], ['Python'])
+        self.assertEqual(self.labels('golang'), [])
+
+    def test_incremental(self):
+        self.assertEqual(self.labels('rust'), ['Rust'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            topic = Topic.objects.create(label='Rustacean', is_approved=True)
+        self.assertEqual(self.labels('rust'), ['Rust', 'Rustacean'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            topic.is_active = False
+            topic.save()
+        self.assertEqual(self.labels('rust'), ['Rust'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.topics['Rust'].delete()
+        self.assertEqual(self.labels('rust'), [])
+
+    def test_rollback_not_indexed(self):
+        self.assertEqual(self.labels('rust'), ['Rust'])
+
+        try:
+            with transaction.atomic():
+                Topic.objects.get(pk=self.topics['Rust'].pk).delete()
+                raise IntegrityError
+        except IntegrityError:
+            pass
+        self.assertEqual(self.labels('rust'), ['Rust'])
+
+    def test_sync_other_process(self):
+        self.labels('rust')
+
+        # changed in other process, only master cache version seen here
+        Topic.objects.filter(label='Rust').update(label='Rust Lang', update_date=timezone.now())
+        master_cache.invalidate()
+        self.assertEqual(self.labels('lang'), ['Rust Lang'])
+
+    def test_endpoint(self):
+        request = APIRequestFactory().get('/', {'s': 'python'})
+        force_authenticate(request, user=self.user)
+        response = TopicApiView.as_view({'get': 'list'})(request)
+
+        self.assertEqual([item['label'] for item in response.data], ['Python', 'Python Django', 'CPython'])
+        self.assertEqual(set(response.data[0]), {'id', 'uuid', 'create_date', 'update_date', 'label', 'description',
+                                                 'is_active', 'is_approved', 'scope'})
+
+
+class IndexAuditTestCase(TestCase):
+    def capture(self):
+        recorder = Recorder()
+        with connection.execute_wrapper(recorder):
+            list(Topic.objects.filter(uuid__in=[Topic().uuid]))
+            list(Topic.objects.filter(uuid__in=[Topic().uuid, Topic().uuid]))
+            list(Topic.objects.filter(description='python').order_by('label'))
+            list(VerifyCode.objects.filter(email='audit@email.com', is_used=False, is_expired=False))
+        return recorder
+
+    def test_shape(self):
+        recorder = self.capture()
+        self.assertEqual(len(recorder), 3)
+        self.assertEqual(list(recorder.queries.values())[0]['count'], 2)
+
+    def test_proposed(self):
+        result = Audit(self.capture()).run().as_dict()
+        self.assertEqual(result['explained'], 3)
+
+        # uuid unique, verifycode_email_idx used
+        proposals = [(item['model'], item['fields'], item['problems']) for item in result['proposals']]
+        self.assertEqual(proposals, [('master.Topic', ['description', 'label'], ['full scan'])])
+
+
+class InstrumentationFlushTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def flush(self, pid, key):
+        registry = Registry(10)
+        metrics = Metrics()
+        metrics.key = key
+        registry.add(metrics)
+        with mock.patch('os.getpid', return_value=pid):
+            registry.flush(force=True)
+        return registry
+
+    def test_each_process_own_slot(self):
+        first = self.flush(100, 'first list')
+        second = self.flush(200, 'second list')
+        self.assertNotEqual(first.slot, second.slot)
+
+        snapshots = collect_snapshots()
+        self.assertEqual(sorted(snapshots), [100, 200])
+        self.assertEqual(list(snapshots[200]), ['second list'])
+
+        # expired, worker gone
+        cache.delete(INSTRUMENTATION_CACHE_KEY.format(first.slot))
+        self.assertEqual(list(collect_snapshots()), [200])
+
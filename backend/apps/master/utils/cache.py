@@ -0,0 +1,66 @@
+"""
+Master data (Topic, Scope) cache, read by every autocomplete and
+Issue / Expertise write, changed rarely.
+Served by utils.cache.TieredCache, whole namespace invalidated
+on Topic / Scope save, delete and Scope.topics change (see signals),
+after commit, else other process fill the new version from old rows.
+"""
+
+import uuid
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Prefetch
+
+from utils.cache import TieredCache
+from utils.generals import get_model
+
+master_cache = TieredCache('master', maxsize=settings.MASTER_CACHE_LOCAL_SIZE,
+                           local_timeout=settings.MASTER_CACHE_LOCAL_TIMEOUT,
+                           timeout=settings.MASTER_CACHE_TIMEOUT,
+                           version_timeout=settings.MASTER_CACHE_VERSION_TIMEOUT)
+
+
+def _topic_queryset():
+    Topic = get_model('master', 'Topic')
+    return Topic.objects.prefetch_related(Prefetch('scope'))
+
+
+def get_topic(value):
+    """Topic by uuid (active or not), None when not found or not an uuid"""
+    try:
+        value = uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+    Topic = get_model('master', 'Topic')
+    return master_cache.get_or_set('topic_%s' % value.hex,
+                                   lambda: Topic.objects.filter(uuid=value).first())
+
+
+def get_active_topics():
+    """Active topic ordered as Topic.Meta, scope prefetched"""
+    return master_cache.get_or_set('topic_active',
+                                   lambda: list(_topic_queryset().filter(is_active=True)))
+
+
+def get_scope_topics(value):
+    """Active topic of the scope by uuid, scope prefetched"""
+    try:
+        value = uuid.UUID(str(value))
+    except ValueError:
+        return list()
+
+    return master_cache.get_or_set('scope_topics_%s' % value.hex,
+                                   lambda: list(_topic_queryset().filter(is_active=True, scope__uuid=value)))
+
+
+def search_topics(s, topics=None):
+    """Same as label__icontains, in memory"""
+    s = s.casefold()
+    topics = get_active_topics() if topics is None else topics
+    return [topic for topic in topics if s in topic.label.casefold()]
+
+
+def invalidate_master_cache():
+    transaction.on_commit(master_cache.invalidate)
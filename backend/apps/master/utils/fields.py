@@ -0,0 +1,18 @@
+from rest_framework import serializers
+
+from apps.master.utils.cache import get_topic
+
+
+class TopicSlugRelatedField(serializers.SlugRelatedField):
+    """Topic by uuid from master cache, queryset only when not cached"""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('slug_field', 'uuid')
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        topic = get_topic(data)
+        if topic is None:
+            # raise does_not_exist / invalid
+            return super().to_internal_value(data)
+        return topic
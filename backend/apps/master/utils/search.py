@@ -0,0 +1,249 @@
+"""
+Topic autocomplete index, in process, over active and approved topic label
+- prefix: label and each word of it kept sorted, prefix range by bisect
+  (a trie flattened to arrays, far smaller than node dicts in python)
+- trigram: trigram -> sorted topic ids, for substring and fuzzy match
+
+Ranked prefix > substring > fuzzy (trigram similarity), query under
+3 characters served by prefix only.
+
+Built on first search. This process kept by Topic signals, other process
+follow master cache version and re-read the changed topic by update_date,
+rebuilt fully each TOPIC_INDEX_REBUILD_INTERVAL (delete from other process).
+"""
+
+import time
+import heapq
+import bisect
+import datetime
+import threading
+import collections
+
+from array import array
+
+from django.conf import settings
+from django.utils import timezone
+
+from utils.generals import get_model
+from apps.master.utils.cache import master_cache
+
+
+def normalize(value):
+    return ' '.join((value or '').casefold().split())
+
+
+def trigrams(value, pad=True):
+    """pad as pg_trgm, so word start weight more on fuzzy match"""
+    if pad:
+        value = '  %s ' % value
+    return {value[i:i + 3] for i in range(len(value) - 2)}
+
+
+class SortedKeys:
+    """Parallel keys and ids sorted by (key, id), many id may share a key"""
+
+    def __init__(self, pairs=()):
+        pairs = sorted(pairs)
+        self.keys = [key for key, _ in pairs]
+        self.ids = array('l', [topic_id for _, topic_id in pairs])
+
+    def _position(self, key, topic_id):
+        lo = bisect.bisect_left(self.keys, key)
+        hi = bisect.bisect_right(self.keys, key, lo)
+        return bisect.bisect_left(self.ids, topic_id, lo, hi), hi
+
+    def add(self, key, topic_id):
+        index, _ = self._position(key, topic_id)
+        self.keys.insert(index, key)
+        self.ids.insert(index, topic_id)
+
+    def discard(self, key, topic_id):
+        index, hi = self._position(key, topic_id)
+        if index < hi and self.ids[index] == topic_id:
+            del self.keys[index]
+            del self.ids[index]
+
+    def prefix(self, query):
+        index = bisect.bisect_left(self.keys, query)
+        while index < len(self.keys) and self.keys[index].startswith(query):
+            yield self.ids[index]
+            index += 1
+
+
+class TopicIndex:
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.clear()
+
+    def clear(self):
+        self.load(())
+
+    def load(self, rows):
+        """Build from (id, label) at once, far faster than add each"""
+        labels = ((topic_id, normalize(label)) for topic_id, label in rows)
+        self.labels = {topic_id: label for topic_id, label in labels if label}
+
+        postings = collections.defaultdict(list)
+        for topic_id in sorted(self.labels):
+            for trigram in trigrams(self.labels[topic_id]):
+                postings[trigram].append(topic_id)
+
+        self.postings = collections.defaultdict(lambda: array('l'))
+        self.postings.update((trigram, array('l', ids)) for trigram, ids in postings.items())
+        self.label_keys = SortedKeys((label, topic_id) for topic_id, label in self.labels.items())
+        self.word_keys = SortedKeys((word, topic_id) for topic_id, label in self.labels.items()
+                                    for word in set(label.split()[1:]))
+
+        self.version = None
+        self.built_at = None
+        self.synced_at = None
+
+    def __len__(self):
+        return len(self.labels)
+
+    def add(self, topic_id, label):
+        with self.lock:
+            self.discard(topic_id)
+
+            label = normalize(label)
+            if not label:
+                return
+
+            self.labels[topic_id] = label
+            self.label_keys.add(label, topic_id)
+            for word in set(label.split()[1:]):
+                self.word_keys.add(word, topic_id)
+            for trigram in trigrams(label):
+                posting = self.postings[trigram]
+                posting.insert(bisect.bisect_left(posting, topic_id), topic_id)
+
+    def discard(self, topic_id):
+        with self.lock:
+            label = self.labels.pop(topic_id, None)
+            if label is None:
+                return
+
+            self.label_keys.discard(label, topic_id)
+            for word in set(label.split()[1:]):
+                self.word_keys.discard(word, topic_id)
+            for trigram in trigrams(label):
+                posting = self.postings[trigram]
+                index = bisect.bisect_left(posting, topic_id)
+                if index < len(posting) and posting[index] == topic_id:
+                    del posting[index]
+                if not posting:
+                    del self.postings[trigram]
+
+    def update(self, topic_id, label, is_active, is_approved):
+        if is_active and is_approved:
+            self.add(topic_id, label)
+        else:
+            self.discard(topic_id)
+
+    # database
+    def rebuild(self):
+        Topic = get_model('master', 'Topic')
+
+        with self.lock:
+            version, now = master_cache.get_version(), timezone.now()
+            self.load(Topic.objects.filter(is_active=True, is_approved=True)
+                      .values_list('id', 'label').iterator())
+            self.version, self.built_at, self.synced_at = version, time.monotonic(), now
+
+    def sync(self):
+        """Apply topic changed (by update_date) since last sync"""
+        Topic = get_model('master', 'Topic')
+
+        with self.lock:
+            version, now = master_cache.get_version(), timezone.now()
+
+            # a save committed a bit after it's update_date not missed
+            since = self.synced_at - datetime.timedelta(seconds=settings.MASTER_CACHE_VERSION_TIMEOUT)
+            rows = Topic.objects.filter(update_date__gte=since) \
+                .values_list('id', 'label', 'is_active', 'is_approved')
+            for row in rows:
+                self.update(*row)
+
+            self.version, self.synced_at = version, now
+
+    def ensure(self):
+        with self.lock:
+            if self.built_at is None \
+                    or time.monotonic() - self.built_at > settings.TOPIC_INDEX_REBUILD_INTERVAL:
+                self.rebuild()
+            elif self.version != master_cache.get_version():
+                self.sync()
+
+    # query
+    def search(self, s, limit=None):
+        """Topic id ranked, prefix > substring > fuzzy"""
+        query = normalize(s)
+        limit = limit or settings.TOPIC_SEARCH_LIMIT
+        if not query:
+            return list()
+
+        with self.lock:
+            result = list()
+            seen = set()
+
+            def collect(ids):
+                for topic_id in ids:
+                    if len(result) >= limit:
+                        return
+                    if topic_id not in seen:
+                        seen.add(topic_id)
+                        result.append(topic_id)
+
+            # prefix, label then it's other word, in label order
+            collect(self.label_keys.prefix(query))
+            collect(self.word_keys.prefix(query))
+            if len(result) >= limit or len(query) < 3:
+                return result
+
+            collect(self.substring(query, seen, limit - len(result)))
+            if len(result) >= limit:
+                return result
+
+            collect(self.fuzzy(query, seen, limit - len(result)))
+            return result
+
+    def substring(self, query, exclude, limit):
+        """Label contain :query, by position then length"""
+        postings = sorted((self.postings.get(trigram, ()) for trigram in trigrams(query, pad=False)), key=len)
+        if not postings or not postings[0]:
+            return list()
+
+        candidates = set(postings[0]).difference(exclude)
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                return list()
+
+        matched = ((self.labels[topic_id].find(query), len(self.labels[topic_id]), self.labels[topic_id], topic_id)
+                   for topic_id in candidates)
+        return [item[-1] for item in heapq.nsmallest(limit, (item for item in matched if item[0] >= 0))]
+
+    def fuzzy(self, query, exclude, limit):
+        """Label trigram similarity (jaccard) at least TOPIC_SEARCH_SIMILARITY"""
+        grams = trigrams(query)
+        shared = collections.Counter()
+        for trigram in grams:
+            shared.update(self.postings.get(trigram, ()))
+
+        threshold = settings.TOPIC_SEARCH_SIMILARITY
+        matched = list()
+        for topic_id, count in shared.items():
+            # label trigram counted as it's padded length, at most that many
+            label = self.labels[topic_id]
+            similarity = count / (len(grams) + len(label) + 1 - count)
+            if similarity >= threshold and topic_id not in exclude:
+                matched.append((-similarity, label, topic_id))
+        return [item[-1] for item in heapq.nsmallest(limit, matched)]
+
+
+topic_index = TopicIndex()
+
+
+def search_topic_ids(s, limit=None):
+    topic_index.ensure()
+    return topic_index.search(s, limit=limit)
@@ -1,7 +1,6 @@
 from django.conf import settings
 from django.db import transaction
 from django.db.models import Prefetch
-from django.urls import reverse
 from django.utils.translation import ugettext_lazy as _
 from django.core.exceptions import ObjectDoesNotExist
 
@@ -9,6 +8,7 @@ from rest_framework import serializers
 # from firebase_admin.auth import get_user_by_phone_number
 
 from utils.generals import get_model
+from utils.urls import absolute_url, url_template
 from apps.person.utils.constants import CHANGE_MSISDN
 from apps.person.api.validator import (
     MSISDNDuplicateValidator,
@@ -104,9 +104,9 @@ class AccountSerializer(serializers.ModelSerializer):
 
     def get_url(self, obj):
         request = self.context.get('request')
-        url = reverse('person_api:user-detail', kwargs={'uuid': obj.user.uuid})
+        url = url_template('person_api:user-detail').path(obj.user.uuid)
 
-        return request.build_absolute_uri(url + 'account/')
+        return absolute_url(request, url + 'account/')
 
     def to_internal_value(self, data):
         data = super().to_internal_value(data)
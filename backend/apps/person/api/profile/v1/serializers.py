@@ -3,13 +3,13 @@ import base64
 
 from django.db import transaction
 from django.http import request
-from django.urls.base import reverse
 from django.utils.translation import ugettext_lazy as _
 from django.core.files.base import ContentFile
 
 from rest_framework import serializers
 
 from utils.generals import get_model
+from utils.urls import absolute_url, url_template
 
 Profile = get_model('person', 'Profile')
 
@@ -53,9 +53,9 @@ class ProfileSerializer(serializers.ModelSerializer):
 
     def get_url(self, obj):
         request = self.context.get('request')
-        url = reverse('person_api:user-detail', kwargs={'uuid': obj.user.uuid})
+        url = url_template('person_api:user-detail').path(obj.user.uuid)
 
-        return request.build_absolute_uri(url + 'profile/')
+        return absolute_url(request, url + 'profile/')
 
     def to_representation(self, value):
         ret = super().to_representation(value)
@@ -14,6 +14,9 @@ from rest_framework import serializers
 
 # PROJECT UTILS
 from utils.generals import get_model
+from utils.mixin.api import TemplateHyperlinkedIdentityField, AbsoluteURLField
+from utils.projection import Projection, date_value, uuid_value
+from utils.urls import url_template
 from utils.validators import non_python_keyword, identifier_validator
 
 from apps.person.api.validator import (
@@ -78,8 +81,8 @@ class UserListSerializer(serializers.ListSerializer):
 
 
 class UserSerializer(DynamicFieldsModelSerializer, serializers.ModelSerializer):
-    url = serializers.HyperlinkedIdentityField(view_name='person_api:user-detail',
-                                               lookup_field='uuid', read_only=True)
+    url = TemplateHyperlinkedIdentityField(view_name='person_api:user-detail',
+                                           lookup_field='uuid', read_only=True)
 
     profile = ProfileSerializer(many=False, read_only=True)
     account = AccountSerializer(many=False, read_only=True)
@@ -109,7 +112,7 @@ class UserSerializer(DynamicFieldsModelSerializer, serializers.ModelSerializer):
     # for display purpose only
     role_identifier = serializers.SlugRelatedField(slug_field='identifier', many=True,
                                                    read_only=True, source='role')
-    permalink = serializers.SerializerMethodField(read_only=True)
+    permalink = AbsoluteURLField()
 
     class Meta:
         model = User
@@ -176,10 +179,6 @@ class UserSerializer(DynamicFieldsModelSerializer, serializers.ModelSerializer):
             if settings.STRICT_EMAIL_DUPLICATE:
                 self.fields['email'].validators.extend([EmailDuplicateValidator()])
 
-    def get_permalink(self, obj):
-        request = self.context.get('request')
-        return request.build_absolute_uri(obj.permalink)
-
     def to_internal_value(self, data):
         data = super().to_internal_value(data)
 
@@ -341,3 +340,54 @@ class UserSerializer(DynamicFieldsModelSerializer, serializers.ModelSerializer):
         if self.verifycode_obj:
             self.verifycode_obj.mark_used()
         return instance
+
+
+""" LIST: USER, read only projection """
+class UserProjection(Projection):
+    # as UserSerializer fields_used ('uuid', 'username', 'url', 'profile', 'permalink')
+    serializer_class = UserSerializer
+    values = ('id', 'uuid', 'username', 'first_name', 'date_joined',
+              'profile__id', 'profile__uuid', 'profile__headline', 'profile__gender',
+              'profile__birthdate', 'profile__about', 'profile__picture', 'profile__picture_original')
+
+    url = url_template('person_api:user-detail')
+    permalink = url_template('person_view:user_detail')
+
+    def __init__(self, instance, context=None):
+        super().__init__(instance, context=context)
+
+        Profile = get_model('person', 'Profile')
+        self.gender_choices = dict(Profile._meta.get_field('gender').flatchoices)
+        self.picture_storage = Profile._meta.get_field('picture').storage
+
+    def picture_url(self, name):
+        # as ImageField, MEDIA_URL may be absolute
+        if not name:
+            return None
+        return self.request.build_absolute_uri(self.picture_storage.url(name))
+
+    def represent_profile(self, row, uuid):
+        gender = row['profile__gender']
+        return {
+            'first_name': row['first_name'],
+            'url': self.absolute_url(self.url.path(uuid) + 'profile/'),
+            'uuid': uuid_value(row['profile__uuid']),
+            'headline': row['profile__headline'],
+            'gender': gender,
+            'birthdate': date_value(row['profile__birthdate']),
+            'about': row['profile__about'],
+            'picture': self.picture_url(row['profile__picture']),
+            'picture_original': self.picture_url(row['profile__picture_original']),
+            'gender_display': str(self.gender_choices.get(gender, gender)) if gender is not None else None,
+        }
+
+    def represent(self, row):
+        uuid = uuid_value(row['uuid'])
+        return {
+            'url': self.hyperlink(self.url.path(uuid)),
+            # null without profile (left join)
+            'profile': self.represent_profile(row, uuid) if row['profile__id'] is not None else None,
+            'permalink': self.absolute_url(self.permalink.path(uuid)),
+            'username': row['username'],
+            'uuid': uuid,
+        }
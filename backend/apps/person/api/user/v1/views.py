@@ -24,8 +24,7 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from rest_framework.exceptions import NotFound, NotAcceptable
-from rest_framework.pagination import LimitOffsetPagination
-from rest_framework.parsers import JSONParser, MultiPartParser
+from rest_framework.parsers import MultiPartParser
 
 # JWT
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
@@ -33,12 +32,13 @@ from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from rest_framework_simplejwt.views import TokenObtainPairView
 
 # SERIALIZERS 
-from .serializers import UserSerializer, AccountSerializer
+from .serializers import UserSerializer, UserProjection, AccountSerializer
 from ...profile.v1.serializers import ProfileSerializer
 
 # GET MODELS FROM GLOBAL UTILS
 from utils.generals import get_model
-from utils.pagination import build_result_pagination
+from utils.pagination import KeysetPagination, PaginationMixin
+from utils.parsers import JSONParser
 from apps.person.utils.permissions import IsCurrentUserOrReject
 from apps.person.utils.auth import validate_username
 from apps.person.utils.constants import PASSWORD_RECOVERY
@@ -48,11 +48,8 @@ Account = get_model('person', 'Account')
 Profile = get_model('person', 'Profile')
 VerifyCode = get_model('person', 'VerifyCode')
 
-# Define to avoid used ...().paginate__
-_PAGINATOR = LimitOffsetPagination()
 
-
-class UserApiView(viewsets.ViewSet):
+class UserApiView(PaginationMixin, viewsets.ViewSet):
     """
     POST
     ------------
@@ -71,6 +68,8 @@ class UserApiView(viewsets.ViewSet):
             "challenge": "string token caused by, eg: register_validation"
         }
     """
+    pagination_class = KeysetPagination
+    pagination_kwargs = {'ordering': ('-date_joined', '-id')}
     verifycode_email = None
     verifycode_msisdn = None
     verifycode_token = None
@@ -135,11 +134,9 @@ class UserApiView(viewsets.ViewSet):
             queryset = queryset.filter(Q(username__icontains=keyword)
                                        | Q(first_name__icontains=keyword))
 
-        queryset_paginator = _PAGINATOR.paginate_queryset(queryset, request)
-        serializer = UserSerializer(queryset_paginator, many=True, context=context,
-                                    fields_used=('uuid', 'username', 'url', 'profile',
-                                                 'permalink',))
-        pagination_result = build_result_pagination(self, _PAGINATOR, serializer)
+        queryset_paginator = self.paginate_queryset(UserProjection.project(queryset))
+        serializer = UserProjection(queryset_paginator, context=context)
+        pagination_result = self.get_pagination_result(serializer)
         return Response(pagination_result, status=response_status.HTTP_200_OK)
 
     # Single User
@@ -375,7 +372,9 @@ class UserApiView(viewsets.ViewSet):
     def profile(self, request, uuid=None):
         context = {'request': self.request}
         try:
-            queryset = Profile.objects.get(user__uuid=uuid)
+            # uuid is request.user (IsCurrentUserOrReject), by id no join
+            queryset = Profile.objects.get(user_id=request.user.id)
+            queryset.user = request.user
         except ObjectDoesNotExist:
             raise NotFound()
 
@@ -411,7 +410,9 @@ class UserApiView(viewsets.ViewSet):
         """
         context = {'request': self.request}
         try:
-            queryset = Account.objects.get(user__uuid=uuid)
+            # uuid is request.user (IsCurrentUserOrReject), by id no join
+            queryset = Account.objects.get(user_id=request.user.id)
+            queryset.user = request.user
         except ObjectDoesNotExist:
             raise NotFound()
 
@@ -1,5 +1,5 @@
 from django.apps import AppConfig
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 
 
 class PersonConfig(AppConfig):
@@ -8,12 +8,23 @@ class PersonConfig(AppConfig):
     def ready(self):
         from django.conf import settings
         from utils.generals import get_model
-        from apps.person.signals import user_save_handler, verifycodecode_save_handler
+        from apps.person.signals import (
+            user_save_handler,
+            verifycodecode_save_handler,
+            role_change_handler
+        )
 
         VerifyCode = get_model('person', 'VerifyCode')
+        Role = get_model('person', 'Role')
 
         post_save.connect(user_save_handler, sender=settings.AUTH_USER_MODEL,
                           dispatch_uid='user_save_signal')
 
         post_save.connect(verifycodecode_save_handler, sender=VerifyCode,
                           dispatch_uid='verifycodecode_save_signal')
+
+        post_save.connect(role_change_handler, sender=Role,
+                          dispatch_uid='role_save_signal')
+
+        post_delete.connect(role_change_handler, sender=Role,
+                            dispatch_uid='role_delete_signal')
@@ -23,6 +23,9 @@ class AbstractAccount(models.Model):
     email_verified = models.BooleanField(default=False, null=True)
     msisdn_verified = models.BooleanField(default=False, null=True)
 
+    # maintained by resume signals, see apps.resume.utils.completeness
+    resume_complete = models.BooleanField(default=False, editable=False)
+
     class Meta:
         abstract = True
         app_label = 'person'
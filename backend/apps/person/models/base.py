@@ -1,11 +1,15 @@
 import uuid
 
 from django.db import models
-from django.db.models import Count
 from django.contrib.auth.models import AbstractUser
 from django.utils.translation import ugettext_lazy as _
 
+from utils.urls import url_template
 from apps.person.utils.constants import CLIENT, CONSULTANT, REGISTERED
+from apps.person.utils.role import get_role_identifier
+
+# permalink, resolved at startup (utils/urls.py)
+user_permalink = url_template('person_view:user_detail')
 
 
 # Extend User
@@ -17,8 +21,8 @@ class User(AbstractUser):
         app_label = 'person'
 
     def role_identifier(self):
-        role = self.role.all().values_list('identifier', flat=True)
-        return role
+        # cached, see apps.person.utils.role
+        return get_role_identifier(self)
 
     @property
     def is_registered(self):
@@ -37,20 +41,10 @@ class User(AbstractUser):
 
     @property
     def is_resume_complete(self):
-        resume_count = self.__class__.objects.filter(id=self.id) \
-            .aggregate(education=Count('education', distinct=True),
-                       experience=Count('experience', distinct=True),
-                       expertise=Count('expertise', distinct=True))
-
-        education_count = resume_count.get('education', 0)
-        experience_count = resume_count.get('experience', 0)
-        expertise_count = resume_count.get('expertise', 0)
-
-        if education_count > 0 and experience_count > 0 and expertise_count > 0:
-            return True
-        return False
+        # denormalized on Account, see apps.resume.utils.completeness
+        account = getattr(self, 'account', None)
+        return bool(account and account.resume_complete)
 
     @property
     def permalink(self):
-        from django.urls import reverse
-        return reverse('person_view:user_detail', kwargs={'uuid': self.uuid})
+        return user_permalink.path(self.uuid)
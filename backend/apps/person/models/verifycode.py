@@ -21,6 +21,15 @@ User = get_model('person', 'User')
 
 
 class VerifyCodeQuerySet(models.query.QuerySet):
+    def receiver_q(self, email=None, msisdn=None):
+        # plain equal, not CASE over the column, so index (email|msisdn, ...) used
+        q = Q(pk__in=[])
+        if email is not None:
+            q |= Q(email=email)
+        if msisdn is not None:
+            q |= Q(msisdn=msisdn)
+        return q
+
     def get_verified_unused(self, email=None, msisdn=None, token=None,
                             challenge=None, uuid=None, passcode=None):
         q_uuid = Q()
@@ -36,8 +45,7 @@ class VerifyCodeQuerySet(models.query.QuerySet):
             q_challenge = Q(challenge=challenge)
 
         return self.get(
-            Q(email=Case(When(email__isnull=False, then=Value(email))))
-            | Q(msisdn=Case(When(msisdn__isnull=False, then=Value(msisdn)))),
+            self.receiver_q(email=email, msisdn=msisdn),
             Q(token=token), Q(is_verified=True), Q(is_used=False), Q(is_expired=False),
             q_uuid, q_passcode, q_challenge
         )
@@ -57,8 +65,7 @@ class VerifyCodeQuerySet(models.query.QuerySet):
             q_challenge = Q(challenge=challenge)
 
         return self.get(
-            Q(email=Case(When(email__isnull=False, then=Value(email))))
-            | Q(msisdn=Case(When(msisdn__isnull=False, then=Value(msisdn)))),
+            self.receiver_q(email=email, msisdn=msisdn),
             Q(token=token), Q(is_verified=False), Q(is_used=False), Q(is_expired=False),
             q_uuid, q_passcode, q_challenge
         )
@@ -113,6 +120,12 @@ class AbstractVerifyCode(models.Model):
         app_label = 'person'
         verbose_name = _(u"Verify Code")
         verbose_name_plural = _(u"Verify Codes")
+        indexes = [
+            # get_verified_unused / get_unverified_unused and the resend check,
+            # flags filtered as NOT is_used not seek the index, token selective enough
+            models.Index(fields=['email', 'token'], name='verifycode_email_idx'),
+            models.Index(fields=['msisdn', 'token'], name='verifycode_msisdn_idx'),
+        ]
 
     def __str__(self):
         return self.passcode
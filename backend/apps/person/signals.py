@@ -6,6 +6,7 @@ from django.db.models import Q, Case, When, Value
 from utils.generals import get_model
 from apps.person.utils.constants import ROLE_DEFAULTS
 from apps.person.utils.auth import set_role
+from apps.person.utils.role import invalidate_role_cache
 
 # Celery task
 from apps.person.tasks import send_verifycode_email
@@ -83,3 +84,8 @@ def verifycodecode_save_handler(sender, instance, created, **kwargs):
 
         if oldest.exists():
             oldest.update(is_expired=True)
+
+
+def role_change_handler(sender, instance, **kwargs):
+    # role edited outside set_role / update_role, ex: from admin
+    invalidate_role_cache(user_id=instance.user_id)
@@ -1,6 +1,18 @@
+import datetime
+
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
 
 from utils.generals import get_model
+from utils.mixin.instrumentation import QueryBudgetMixin
+from apps.person.api.user.v1.serializers import UserSerializer
+from apps.person.utils.auth import set_role, update_role
+from apps.person.utils.constants import CLIENT, CONSULTANT
+from apps.person.utils.role import ROLE_CACHE_ATTR
 
 User = get_model('person', 'User')
 Account = get_model('person', 'Account')
@@ -36,3 +48,93 @@ class AccountTestCase(TestCase):
 
         self.assertEqual(passcode_valid_email, True)
         self.assertEqual(passcode_valid_msisdn, True)
+
+
+class RoleCacheTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('roleuser', 'role@email.com', '123456')
+
+    def test_role_cached(self):
+        set_role(user=self.user, role=[CLIENT])
+        self.assertTrue(self.user.is_client)
+
+        with self.assertNumQueries(0):
+            self.assertTrue(self.user.is_client)
+            self.assertFalse(self.user.is_consultant)
+
+        # other request, new user object, first one fill the cache
+        self.assertTrue(User.objects.get(id=self.user.id).is_client)
+        user = User.objects.get(id=self.user.id)
+        with self.assertNumQueries(0):
+            self.assertTrue(user.is_client)
+
+    def test_role_invalidated(self):
+        self.assertFalse(self.user.is_consultant)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            update_role(user=self.user, role=[CONSULTANT])
+            self.assertTrue(self.user.is_consultant)
+            # not committed, other request still read the cache
+            self.assertFalse(User.objects.get(id=self.user.id).is_consultant)
+        self.assertTrue(User.objects.get(id=self.user.id).is_consultant)
+
+        # committed, this user object read the cache again
+        delattr(self.user, ROLE_CACHE_ATTR)
+        with self.assertNumQueries(0):
+            self.assertTrue(self.user.is_consultant)
+
+
+class UserProjectionTestCase(TestCase):
+    """Golden output, user list projection render the same JSON as UserSerializer"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('listuser', 'list@email.com', '123456')
+        for index in range(3):
+            User.objects.create_user('other%d' % index, 'other%d@email.com' % index, '123456')
+
+        Profile.objects.filter(user__username='other0').update(
+            headline='Headline', gender='male', birthdate=datetime.date(1990, 1, 31),
+            picture='images/user/other0.jpg')
+        Profile.objects.filter(user__username='other1').delete()
+
+        self.api = APIClient()
+        self.api.force_login(self.user)
+
+    def test_same_as_serializer(self):
+        response = self.api.get(reverse('person_api:user-list'))
+        self.assertEqual(response.status_code, 200)
+
+        users = list(User.objects.select_related('profile').order_by('-date_joined', '-id'))
+        serializer = UserSerializer(users, many=True, context={'request': response.renderer_context['request']},
+                                    fields_used=('uuid', 'username', 'url', 'profile', 'permalink',))
+
+        renderer = JSONRenderer()
+        self.assertEqual(renderer.render(response.data['results']), renderer.render(serializer.data))
+
+        results = {item['username']: item for item in response.data['results']}
+        self.assertIsNone(results['other1']['profile'])
+        self.assertEqual(results['other0']['profile']['gender_display'], 'Male')
+        self.assertTrue(results['other0']['profile']['picture'].startswith('http://testserver/'))
+
+
+class QueryBudgetTestCase(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('budgetuser', 'budget@email.com', '123456')
+        for index in range(3):
+            User.objects.create_user('other%d' % index, 'other%d@email.com' % index, '123456')
+
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+
+    def test_list_and_retrieve(self):
+        response = self.api.get(reverse('person_api:user-list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 4)
+        self.assertQueryBudget(response)
+
+        # own user, all fields
+        response = self.api.get(reverse('person_api:user-detail', kwargs={'uuid': self.user.uuid}))
+        self.assertEqual(response.status_code, 200)
+        self.assertQueryBudget(response)
+
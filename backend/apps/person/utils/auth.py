@@ -11,6 +11,7 @@ from django.contrib.auth.validators import UnicodeUsernameValidator
 
 from utils.generals import get_model
 from apps.person.utils.constants import VerifyCode_SESSION_FIELDS
+from apps.person.utils.role import invalidate_role_cache
 
 validate_username = UnicodeUsernameValidator()
 
@@ -114,6 +115,7 @@ def set_role(user=None, role=list()):
 
     if role_created:
         user.role.model.objects.bulk_create(role_created)
+        invalidate_role_cache(user)
 
     capability_objs = RoleCapability.objects \
         .prefetch_related(Prefetch('permission')) \
@@ -143,6 +145,7 @@ def update_role(user=None, role=list()):
         permission = [list(item.permission.all()) for item in capability]
         permission_removed = list(set(itertools.chain.from_iterable(permission)))
         role_removed.delete()
+        invalidate_role_cache(user)
 
     # ADD ROLE
     if role:
@@ -156,6 +159,7 @@ def update_role(user=None, role=list()):
 
         if role_created:
             user.role.model.objects.bulk_create(role_created)
+            invalidate_role_cache(user)
 
         capability = capability.filter(identifier__in=user.role.all().values('identifier'))
         permission = [list(item.permission.all()) for item in capability]
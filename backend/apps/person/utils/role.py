@@ -0,0 +1,58 @@
+"""
+Role identifier cache, so permission check not query the role each time
+- per request: kept on the user object, request.user is new each request
+- cross request: django cache keyed by user id,
+  invalidated by set_role / update_role and Role save / delete, after
+  commit, else other request re-cache the roles not committed yet
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+ROLE_CACHE_KEY = 'person_user_role_{0}'
+ROLE_CACHE_ATTR = '_role_identifier_cache'
+# roles changed by this user object, cache stale until commit
+ROLE_CACHE_STALE_ATTR = '_role_identifier_stale'
+
+
+def role_cache_key(user_id):
+    return ROLE_CACHE_KEY.format(user_id)
+
+
+def get_role_identifier(user):
+    identifier = getattr(user, ROLE_CACHE_ATTR, None)
+    if identifier is not None:
+        return identifier
+
+    cached = user.id and not getattr(user, ROLE_CACHE_STALE_ATTR, False)
+    key = role_cache_key(user.id)
+    identifier = cache.get(key) if cached else None
+    if identifier is None:
+        identifier = tuple(user.role.values_list('identifier', flat=True))
+        if cached:
+            cache.set(key, identifier, settings.ROLE_CACHE_TIMEOUT)
+
+    setattr(user, ROLE_CACHE_ATTR, identifier)
+    return identifier
+
+
+def invalidate_role_cache(user=None, user_id=None):
+    if user is not None:
+        user_id = user.id
+        if hasattr(user, ROLE_CACHE_ATTR):
+            delattr(user, ROLE_CACHE_ATTR)
+        setattr(user, ROLE_CACHE_STALE_ATTR, True)
+
+    if not user_id:
+        return
+
+    key = role_cache_key(user_id)
+
+    def committed():
+        cache.delete(key)
+        # cache right again, this user object use it too
+        if user is not None and hasattr(user, ROLE_CACHE_STALE_ATTR):
+            delattr(user, ROLE_CACHE_STALE_ATTR)
+
+    transaction.on_commit(committed)
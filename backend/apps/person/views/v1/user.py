@@ -18,7 +18,7 @@ class ProfileView(View):
 
     def get(self, request):
         user = request.user
-        profile = Profile.objects.get(user__uuid=user.uuid)
+        profile = Profile.objects.get(user_id=user.id)
 
         self.context['profile'] = profile
         self.context['gender_choices'] = choices_to_json(GENDER_CHOICES)
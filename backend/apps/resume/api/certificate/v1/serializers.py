@@ -7,10 +7,12 @@ from django.utils.translation import ugettext_lazy as _
 from rest_framework import serializers
 
 from utils.generals import get_model
+from utils.ownership import is_owner
 from utils.mixin.api import (
     DynamicFieldsModelSerializer, 
     ListSerializerUpdateMappingField, 
-    WritetableFieldPutMethod
+    WritetableFieldPutMethod,
+    TemplateHyperlinkedIdentityField
 )
 from apps.resume.utils.constants import DRAFT
 
@@ -24,15 +26,15 @@ class CertificateListSerializer(ListSerializerUpdateMappingField, serializers.Li
         if isinstance(value, QuerySet):
             value = value.prefetch_related(Prefetch('user')) \
                 .select_related('user') \
-                .exclude(~Q(user__uuid=request.user.uuid) & Q(status=DRAFT))
+                .exclude(~Q(user_id=request.user.id) & Q(status=DRAFT))
     
         return super().to_representation(value)
 
 
 class CertificateSerializer(DynamicFieldsModelSerializer, WritetableFieldPutMethod,
                             serializers.ModelSerializer):
-    url = serializers.HyperlinkedIdentityField(view_name='resume:certificate-detail',
-                                               lookup_field='uuid', read_only=True)
+    url = TemplateHyperlinkedIdentityField(view_name='resume:certificate-detail',
+                                           lookup_field='uuid', read_only=True)
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
 
     class Meta:
@@ -44,7 +46,7 @@ class CertificateSerializer(DynamicFieldsModelSerializer, WritetableFieldPutMeth
         request = self.context.get('request')
         ret = super().to_representation(value)
 
-        ret['is_creator'] = request.user.uuid == value.user.uuid
+        ret['is_creator'] = is_owner(request.user, value)
         ret['issued_formated'] = formats.date_format(value.issued, 'DATE_FORMAT')
         if value.expired:
             ret['expired_formated'] = formats.date_format(value.expired, 'DATE_FORMAT')
@@ -12,6 +12,8 @@ from rest_framework.response import Response
 from rest_framework.exceptions import NotAcceptable
 
 from utils.generals import get_model
+from utils.ordering import ReorderMixin
+from utils.ownership import OwnerScopeMixin
 from .serializers import CertificateSerializer
 from apps.resume.utils.permissions import IsObjectOwnerOrReject
 from apps.resume.utils.constants import PUBLISH
@@ -19,7 +21,7 @@ from apps.resume.utils.constants import PUBLISH
 Certificate = get_model('resume', 'Certificate')
 
 
-class CertificateApiView(viewsets.ViewSet):
+class CertificateApiView(ReorderMixin, OwnerScopeMixin, viewsets.ViewSet):
     """
     GET
     ---------------------
@@ -91,9 +93,14 @@ class CertificateApiView(viewsets.ViewSet):
     # multiple objects
     def get_objects(self, user_uuid=None):
         try:
-            queryset = self.queryset \
-                .filter(user__uuid=user_uuid) \
-                .exclude(~Q(user__uuid=self.user.uuid) & ~Q(status=PUBLISH)) \
+            # current user by id, other user by the uuid param
+            if user_uuid is None:
+                queryset = self.owned(self.queryset)
+            else:
+                queryset = self.queryset.filter(user__uuid=user_uuid)
+
+            queryset = queryset \
+                .exclude(~self.owner_q() & ~Q(status=PUBLISH)) \
                 .order_by('sort_order')
         except (ValidationError, Exception) as e:
             raise NotAcceptable(detail=str(e))
@@ -102,9 +109,6 @@ class CertificateApiView(viewsets.ViewSet):
     def list(self, request, format=None):
         context = {'request': request}
         user_uuid = request.query_params.get('user_uuid', None)
-        if user_uuid is None:
-            user_uuid = self.user.uuid
-
         queryset = self.get_objects(user_uuid=user_uuid)
         serializer = CertificateSerializer(queryset, many=True, context=context)
         return Response(serializer.data, status=response_status.HTTP_200_OK)
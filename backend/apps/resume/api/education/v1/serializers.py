@@ -5,11 +5,13 @@ from django.utils.translation import ugettext_lazy as _
 from rest_framework import serializers
 
 from utils.generals import get_model
+from utils.ownership import is_owner
 from utils.mixin.validators import CleanValidateMixin
 from utils.mixin.api import (
     DynamicFieldsModelSerializer, 
     ListSerializerUpdateMappingField, 
-    WritetableFieldPutMethod
+    WritetableFieldPutMethod,
+    TemplateHyperlinkedIdentityField
 )
 from apps.resume.utils.constants import DRAFT
 
@@ -23,15 +25,15 @@ class EducationListSerializer(ListSerializerUpdateMappingField, serializers.List
         if isinstance(value, QuerySet):
             value = value.prefetch_related(Prefetch('user')) \
                 .select_related('user') \
-                .exclude(~Q(user__uuid=request.user.uuid) & Q(status=DRAFT))
+                .exclude(~Q(user_id=request.user.id) & Q(status=DRAFT))
 
         return super().to_representation(value)
 
 
 class EducationSerializer(DynamicFieldsModelSerializer, CleanValidateMixin, WritetableFieldPutMethod,
                           serializers.ModelSerializer):
-    url = serializers.HyperlinkedIdentityField(view_name='resume:education-detail',
-                                               lookup_field='uuid', read_only=True)
+    url = TemplateHyperlinkedIdentityField(view_name='resume:education-detail',
+                                           lookup_field='uuid', read_only=True)
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
 
     class Meta:
@@ -42,6 +44,6 @@ class EducationSerializer(DynamicFieldsModelSerializer, CleanValidateMixin, Writ
     def to_representation(self, value):
         request = self.context.get('request')
         ret = super().to_representation(value)
-        ret['is_creator'] = request.user.uuid == value.user.uuid
+        ret['is_creator'] = is_owner(request.user, value)
 
         return ret
@@ -6,11 +6,13 @@ from django.utils.translation import ugettext_lazy as _
 from rest_framework import serializers
 
 from utils.generals import get_model
+from utils.ownership import is_owner
 from utils.mixin.validators import CleanValidateMixin
 from utils.mixin.api import (
     DynamicFieldsModelSerializer, 
     ListSerializerUpdateMappingField, 
-    WritetableFieldPutMethod
+    WritetableFieldPutMethod,
+    TemplateHyperlinkedIdentityField
 )
 from apps.resume.utils.constants import DRAFT
 
@@ -24,15 +26,15 @@ class ExperienceListSerializer(ListSerializerUpdateMappingField, serializers.Lis
         if isinstance(value, QuerySet):
             value = value.prefetch_related(Prefetch('user')) \
                 .select_related('user') \
-                .exclude(~Q(user__uuid=request.user.uuid) & Q(status=DRAFT))
+                .exclude(~Q(user_id=request.user.id) & Q(status=DRAFT))
 
         return super().to_representation(value)
 
 
 class ExperienceSerializer(DynamicFieldsModelSerializer, WritetableFieldPutMethod,
                            CleanValidateMixin, serializers.ModelSerializer):
-    url = serializers.HyperlinkedIdentityField(view_name='resume:experience-detail',
-                                               lookup_field='uuid', read_only=True)
+    url = TemplateHyperlinkedIdentityField(view_name='resume:experience-detail',
+                                           lookup_field='uuid', read_only=True)
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
 
     class Meta:
@@ -43,7 +45,7 @@ class ExperienceSerializer(DynamicFieldsModelSerializer, WritetableFieldPutMetho
     def to_representation(self, value):
         request = self.context.get('request')
         ret = super().to_representation(value)
-        ret['is_creator'] = request.user.uuid == value.user.uuid
+        ret['is_creator'] = is_owner(request.user, value)
         ret['start_month_display'] = value.get_start_month_display()
         ret['employment_display'] = value.get_employment_display()
 
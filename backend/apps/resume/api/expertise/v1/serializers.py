@@ -5,12 +5,14 @@ from django.db.models import Prefetch
 from rest_framework import serializers
 
 from utils.generals import get_model
+from utils.ownership import is_owner
 from utils.mixin.validators import CleanValidateMixin
 from utils.mixin.api import (
     DynamicFieldsModelSerializer, 
     ListSerializerUpdateMappingField, 
     WritetableFieldPutMethod
 )
+from apps.master.utils.fields import TopicSlugRelatedField
 
 Expertise = get_model('resume', 'Expertise')
 Topic = get_model('master', 'Topic')
@@ -26,7 +28,7 @@ class ExpertiseListSerializer(ListSerializerUpdateMappingField, serializers.List
 class ExpertiseSerializer(DynamicFieldsModelSerializer, WritetableFieldPutMethod,
                           CleanValidateMixin, serializers.ModelSerializer):
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
-    topic = serializers.SlugRelatedField(slug_field='uuid', queryset=Topic.objects.all())
+    topic = TopicSlugRelatedField(queryset=Topic.objects.all())
 
     class Meta:
         list_serializer_class = ExpertiseListSerializer
@@ -39,6 +41,6 @@ class ExpertiseSerializer(DynamicFieldsModelSerializer, WritetableFieldPutMethod
 
         ret['topic_label'] = value.topic.label
         ret['level_display'] = value.get_level_display()
-        ret['is_creator'] = request.user.uuid == value.user.uuid
+        ret['is_creator'] = is_owner(request.user, value)
 
         return ret
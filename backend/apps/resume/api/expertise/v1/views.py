@@ -12,13 +12,15 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import NotAcceptable, ValidationError
 
 from utils.generals import get_model
+from utils.ordering import ReorderMixin
+from utils.ownership import OwnerScopeMixin
 from .serializers import ExpertiseSerializer
 from apps.resume.utils.permissions import IsObjectOwnerOrReject
 
 Expertise = get_model('resume', 'Expertise')
 
 
-class ExpertiseApiView(viewsets.ViewSet):
+class ExpertiseApiView(ReorderMixin, OwnerScopeMixin, viewsets.ViewSet):
     """
     GET
     ---------------------
@@ -82,9 +84,13 @@ class ExpertiseApiView(viewsets.ViewSet):
     # multiple objects
     def get_objects(self, user_uuid=None):
         try:
-            queryset = self.queryset \
-                .filter(user__uuid=user_uuid) \
-                .order_by('sort_order')
+            # current user by id, other user by the uuid param
+            if user_uuid is None:
+                queryset = self.owned(self.queryset)
+            else:
+                queryset = self.queryset.filter(user__uuid=user_uuid)
+
+            queryset = queryset.order_by('sort_order')
         except (ValidationError, Exception) as e:
             raise NotAcceptable(detail=str(e))
         return queryset
@@ -92,9 +98,6 @@ class ExpertiseApiView(viewsets.ViewSet):
     def list(self, request, format=None):
         context = {'request': request}
         user_uuid = request.query_params.get('user_uuid', None)
-        if user_uuid is None:
-            user_uuid = self.user.uuid
-
         queryset = self.get_objects(user_uuid=user_uuid)
         serializer = ExpertiseSerializer(queryset, many=True, context=context)
         return Response(serializer.data, status=response_status.HTTP_200_OK)
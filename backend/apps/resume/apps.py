@@ -1,5 +1,7 @@
 from django.apps import AppConfig
-from django.db.models.signals import post_delete
+from django.db.models.signals import post_delete, post_save
+
+from utils.signals import bulk_saved
 
 
 class ResumeConfig(AppConfig):
@@ -7,9 +9,30 @@ class ResumeConfig(AppConfig):
 
     def ready(self):
         from utils.generals import get_model
-        from apps.resume.signals import attachment_delete_handler
+        from utils.ordering import sequence_delete_handler
+        from apps.resume.signals import (
+            attachment_delete_handler,
+            resume_change_handler,
+            resume_bulk_change_handler
+        )
 
         Attachment = get_model('resume', 'Attachment')
 
         post_delete.connect(attachment_delete_handler, sender=Attachment,
                             dispatch_uid='attachment_delete_signal')
+
+        # Rows counted for sort_order and max allowed (utils/ordering.py)
+        for name in ('Certificate', 'Education', 'Experience', 'Expertise'):
+            post_delete.connect(sequence_delete_handler, sender=get_model('resume', name),
+                                dispatch_uid='%s_sequence_delete_signal' % name.lower())
+
+        # Keep Account.resume_complete updated
+        for name in ('Education', 'Experience', 'Expertise'):
+            model = get_model('resume', name)
+
+            post_save.connect(resume_change_handler, sender=model,
+                              dispatch_uid='%s_resume_complete_save_signal' % name.lower())
+            post_delete.connect(resume_change_handler, sender=model,
+                                dispatch_uid='%s_resume_complete_delete_signal' % name.lower())
+            bulk_saved.connect(resume_bulk_change_handler, sender=model,
+                               dispatch_uid='%s_resume_complete_bulk_save_signal' % name.lower())
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.resume.utils.completeness import repair_resume_complete
+
+
+class Command(BaseCommand):
+    help = "Recompute Account.resume_complete from education, experience and expertise"
+
+    def handle(self, *args, **options):
+        changed = repair_resume_complete()
+        self.stdout.write(self.style.SUCCESS("%s account repaired" % changed))
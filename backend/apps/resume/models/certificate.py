@@ -6,6 +6,7 @@ from django.db import models
 from django.utils.translation import ugettext_lazy as _
 from django.contrib.contenttypes.fields import GenericRelation
 
+from utils import ordering
 from apps.resume.utils.constants import CERTIFICATE_STATUS, DRAFT
 
 
@@ -37,6 +38,9 @@ class AbstractCertificate(models.Model):
         ordering = ['-create_date']
         verbose_name = _(u"Certificate")
         verbose_name_plural = _(u"Certificates")
+        indexes = [
+            models.Index(fields=['user', 'sort_order'], name='certificate_user_sort_idx'),
+        ]
 
     def __str__(self):
         return self.user.username
@@ -47,7 +51,13 @@ class AbstractCertificate(models.Model):
                 raise ValidationError({'expired': _("Expired required")})
 
     def save(self, *args, **kwargs):
-        if self.user and not self.pk:
-            c = self.__class__.objects.filter(user_id=self.user.id).count()
-            self.sort_order = c + 1
+        if self.user_id and not self.pk:
+            self.sort_order = ordering.allocate(self.__class__, self.user_id)
         super().save(*args, **kwargs)
+
+    @classmethod
+    def bulk_prepare(cls, objs, fields=None):
+        # save() of many rows, PUT many (utils/mixin/api.py)
+        if fields is None:
+            ordering.assign(cls, objs)
+        return ()
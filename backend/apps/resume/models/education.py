@@ -5,6 +5,7 @@ from django.db import models
 from django.utils.translation import ugettext_lazy as _
 from django.contrib.contenttypes.fields import GenericRelation
 
+from utils import ordering
 from apps.resume.utils.validators import year_validator
 from apps.resume.utils.constants import EDUCATION_STATUS, DRAFT
 
@@ -38,13 +39,22 @@ class AbstractEducation(models.Model):
         ordering = ['-create_date']
         verbose_name = _(u"Education")
         verbose_name_plural = _(u"Educations")
+        indexes = [
+            models.Index(fields=['user', 'sort_order'], name='education_user_sort_idx'),
+        ]
 
     def __str__(self):
         return self.user.username
 
 
     def save(self, *args, **kwargs):
-        if self.user and not self.pk:
-            c = self.__class__.objects.filter(user_id=self.user.id).count()
-            self.sort_order = c + 1
+        if self.user_id and not self.pk:
+            self.sort_order = ordering.allocate(self.__class__, self.user_id)
         super().save(*args, **kwargs)
+
+    @classmethod
+    def bulk_prepare(cls, objs, fields=None):
+        # save() of many rows, PUT many (utils/mixin/api.py)
+        if fields is None:
+            ordering.assign(cls, objs)
+        return ()
@@ -6,6 +6,7 @@ from django.db import models
 from django.utils.translation import ugettext_lazy as _
 from django.contrib.contenttypes.fields import GenericRelation
 
+from utils import ordering
 from utils.constants import MONTH_CHOICES
 from utils.validators import non_python_keyword, identifier_validator
 from apps.resume.utils.validators import year_validator, month_validator
@@ -51,6 +52,9 @@ class AbstractExperience(models.Model):
         ordering = ['-create_date']
         verbose_name = _(u"Experience")
         verbose_name_plural = _(u"Experiences")
+        indexes = [
+            models.Index(fields=['user', 'sort_order'], name='experience_user_sort_idx'),
+        ]
 
     def __str__(self):
         return self.user.username
@@ -64,7 +68,13 @@ class AbstractExperience(models.Model):
                 raise ValidationError({'end_year': _(u"End year required")})
 
     def save(self, *args, **kwargs):
-        if self.user and not self.pk:
-            c = self.__class__.objects.filter(user_id=self.user.id).count()
-            self.sort_order = c + 1
+        if self.user_id and not self.pk:
+            self.sort_order = ordering.allocate(self.__class__, self.user_id)
         super().save(*args, **kwargs)
+
+    @classmethod
+    def bulk_prepare(cls, objs, fields=None):
+        # save() of many rows, PUT many (utils/mixin/api.py)
+        if fields is None:
+            ordering.assign(cls, objs)
+        return ()
@@ -5,6 +5,7 @@ from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils.translation import ugettext_lazy as _
 
+from utils import ordering
 from utils.validators import identifier_validator, non_python_keyword
 from apps.resume.utils.constants import EXPERTISE_LEVELS, SKILLED
 
@@ -37,22 +38,31 @@ class AbstractExpertise(models.Model):
         constraints = [
             models.UniqueConstraint(fields=['user', 'topic'], name='unique_user_topic')
         ]
+        indexes = [
+            models.Index(fields=['user', 'sort_order'], name='expertise_user_sort_idx'),
+        ]
 
     def __str__(self):
         return '{0}'.format(self.topic.label)
 
     def clean(self):
         if not self.uuid and self.topic:
-            c = self.__class__.objects.filter(user_id=self.user.id).count()
+            c = ordering.count(self.__class__, self.user_id)
             if c > MAX_ALLOWED_EXPERTISE:
                 raise ValidationError({'topic': _(u"Max %s topics" % MAX_ALLOWED_EXPERTISE)})
 
     def save(self, *args, **kwargs):
-        if self.user and not self.pk:
-            c = self.__class__.objects.filter(user_id=self.user.id).count()
-            self.sort_order = c + 1
+        if self.user_id and not self.pk:
+            self.sort_order = ordering.allocate(self.__class__, self.user_id)
         super().save(*args, **kwargs)
 
+    @classmethod
+    def bulk_prepare(cls, objs, fields=None):
+        # save() of many rows, PUT many (utils/mixin/api.py)
+        if fields is None:
+            ordering.assign(cls, objs)
+        return ()
+
     @property
     def topic_label(self):
         return self.topic.label
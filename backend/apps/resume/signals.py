@@ -2,6 +2,8 @@ import os
 
 from django.db import transaction
 
+from apps.resume.utils.completeness import refresh_resume_complete
+
 
 @transaction.atomic
 def attachment_delete_handler(sender, instance, using, **kwargs):
@@ -9,3 +11,15 @@ def attachment_delete_handler(sender, instance, using, **kwargs):
     if file:
         if os.path.isfile(file.path):
             os.remove(file.path)
+
+
+def resume_change_handler(sender, instance, **kwargs):
+    # only new or deleted section can change the completeness
+    if kwargs.get('created', True):
+        refresh_resume_complete(instance.user_id)
+
+
+def resume_bulk_change_handler(sender, created, **kwargs):
+    # PUT many, once each user
+    for user_id in {obj.user_id for obj in created}:
+        refresh_resume_complete(user_id)
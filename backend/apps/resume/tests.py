@@ -1,3 +1,169 @@
+import datetime
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework.test import APIClient, APIRequestFactory
+
+from utils import ordering
+from utils.generals import get_model
+from utils.mixin.instrumentation import QueryBudgetMixin
+from apps.resume.api.expertise.v1.serializers import ExpertiseSerializer
+from apps.resume.utils.completeness import repair_resume_complete
+
+User = get_model('person', 'User')
+Account = get_model('person', 'Account')
+Topic = get_model('master', 'Topic')
+Education = get_model('resume', 'Education')
+Experience = get_model('resume', 'Experience')
+Expertise = get_model('resume', 'Expertise')
+Certificate = get_model('resume', 'Certificate')
+Sequence = get_model('master', 'Sequence')
+
 
 # Create your tests here.
+class ResumeCompleteTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('consultant', 'consultant@email.com', '123456')
+        self.topic = Topic.objects.create(label='Python')
+
+    def is_resume_complete(self):
+        return User.objects.get(id=self.user.id).is_resume_complete
+
+    def test_resume_complete_maintained(self):
+        Education.objects.create(user=self.user, school='ITB')
+        Experience.objects.create(user=self.user, title='Engineer', employment='fulltime',
+                                  start_month=1, start_year=2015)
+        self.assertFalse(self.is_resume_complete())
+
+        expertise = Expertise.objects.create(user=self.user, topic=self.topic)
+        self.assertTrue(self.is_resume_complete())
+
+        expertise.delete()
+        self.assertFalse(self.is_resume_complete())
+
+    def test_bulk_put_maintained(self):
+        Education.objects.create(user=self.user, school='ITB')
+        Experience.objects.create(user=self.user, title='Engineer', employment='fulltime',
+                                  start_month=1, start_year=2015)
+        expertise = Expertise.objects.create(user=self.user, topic=self.topic)
+        expertise.delete()
+
+        # PUT keep only the sent fields, hidden user sent by POST
+        request = APIRequestFactory().post('/')
+        request.user = self.user
+        topics = [Topic.objects.create(label=label) for label in ('Django', 'Flask')]
+        serializer = ExpertiseSerializer(Expertise.objects.none(), many=True, context={'request': request},
+                                         data=[{'topic': str(topic.uuid)} for topic in topics])
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+
+        # sort_order as each save() (after the deleted one), completeness once
+        self.assertEqual(list(Expertise.objects.order_by('sort_order').values_list('topic__label', 'sort_order')),
+                         [('Django', 2), ('Flask', 3)])
+        self.assertTrue(self.is_resume_complete())
+
+    def test_repair(self):
+        Education.objects.create(user=self.user, school='ITB')
+        Account.objects.filter(user=self.user).update(resume_complete=True)
+
+        self.assertEqual(repair_resume_complete(), 1)
+        self.assertFalse(self.is_resume_complete())
+
+
+class OrderingTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('consultant', 'consultant@email.com', '123456')
+        self.other = User.objects.create_user('other', 'other@email.com', '123456')
+        self.topics = [Topic.objects.create(label='Topic %d' % index) for index in range(5)]
+
+    def sort_orders(self, user):
+        return list(Expertise.objects.filter(user=user).order_by('sort_order')
+                    .values_list('topic__label', 'sort_order'))
+
+    def test_counter(self):
+        first = Expertise.objects.create(user=self.user, topic=self.topics[0])
+        Expertise.objects.create(user=self.user, topic=self.topics[1])
+        self.assertEqual(ordering.count(Expertise, self.user.id), 2)
+
+        # user's rows not counted again
+        with CaptureQueriesContext(connection) as queries:
+            Expertise.objects.create(user=self.user, topic=self.topics[2])
+        self.assertFalse([query for query in queries if 'COUNT(' in query['sql']])
+
+        first.delete()
+        self.assertEqual(ordering.count(Expertise, self.user.id), 2)
+        Expertise.objects.create(user=self.user, topic=self.topics[3])
+        self.assertEqual(self.sort_orders(self.user), [('Topic 1', 2), ('Topic 2', 3), ('Topic 3', 4)])
+
+    def test_seeded_from_rows(self):
+        Expertise.objects.bulk_create([Expertise(user=self.user, topic=self.topics[0], sort_order=5)])
+        self.assertEqual(ordering.count(Expertise, self.user.id), 1)
+
+        Expertise.objects.create(user=self.user, topic=self.topics[1])
+        self.assertEqual(Sequence.objects.get(user=self.user, label='resume.expertise').count, 2)
+        self.assertEqual(self.sort_orders(self.user), [('Topic 0', 5), ('Topic 1', 6)])
+
+        self.assertEqual(ordering.repair(Expertise), 1)
+        self.assertEqual(ordering.count(Expertise, self.user.id), 2)
+
+    def test_reorder(self):
+        expertises = [Expertise.objects.create(user=self.user, topic=topic) for topic in self.topics[:3]]
+        other = Expertise.objects.create(user=self.other, topic=self.topics[0])
+
+        api = APIClient()
+        api.force_login(self.user)
+        uuids = [str(expertises[index].uuid) for index in (2, 0, 1)] + [str(other.uuid)]
+        with CaptureQueriesContext(connection) as queries:
+            response = api.post(reverse('resume:expertise-reorder'), uuids, format='json')
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(len([query for query in queries if query['sql'].startswith('UPDATE')]), 1)
+
+        self.assertEqual(self.sort_orders(self.user), [('Topic 2', 1), ('Topic 0', 2), ('Topic 1', 3)])
+        self.assertEqual(self.sort_orders(self.other), [('Topic 0', 1)])
+
+
+class OwnerScopeTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('consultant', 'consultant@email.com', '123456')
+        self.other = User.objects.create_user('other', 'other@email.com', '123456')
+        for index, user in enumerate((self.user, self.user, self.other)):
+            Expertise.objects.create(user=user, topic=Topic.objects.create(label='Topic %d' % index))
+
+        self.api = APIClient()
+        self.api.force_login(self.user)
+
+    def test_list_scoped_by_id(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.api.get(reverse('resume:expertise-list'))
+        self.assertEqual([item['is_creator'] for item in response.data], [True, True])
+        self.assertFalse([query for query in queries if '"person_user"."uuid" =' in query['sql']])
+
+        response = self.api.get(reverse('resume:expertise-list'), {'user_uuid': str(self.other.uuid)})
+        self.assertEqual([item['is_creator'] for item in response.data], [False])
+
+
+class QueryBudgetTestCase(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('consultant', 'consultant@email.com', '123456')
+        for index in range(3):
+            Expertise.objects.create(user=self.user, topic=Topic.objects.create(label='Topic %d' % index))
+            Education.objects.create(user=self.user, school='School %d' % index)
+            Experience.objects.create(user=self.user, title='Engineer %d' % index, employment='fulltime',
+                                      start_month=1, start_year=2015)
+            Certificate.objects.create(user=self.user, name='Certificate %d' % index,
+                                       issued=datetime.date(2020, 1, 1))
+
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+
+    def test_lists(self):
+        for name in ('resume:expertise-list', 'resume:education-list', 'resume:experience-list',
+                     'resume:certificate-list'):
+            response = self.api.get(reverse(name))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data), 3)
+            self.assertQueryBudget(response)
+
@@ -0,0 +1,38 @@
+"""
+Keep Account.resume_complete same as the resume,
+complete mean user has education, experience and expertise
+"""
+
+from django.db.models import Exists, OuterRef
+
+from utils.generals import get_model
+
+RESUME_SECTIONS = ('Education', 'Experience', 'Expertise',)
+
+
+def _section_exists(name):
+    return Exists(get_model('resume', name).objects.filter(user_id=OuterRef('user_id')))
+
+
+def refresh_resume_complete(user_id):
+    Account = get_model('person', 'Account')
+
+    complete = all(
+        get_model('resume', name).objects.filter(user_id=user_id).exists()
+        for name in RESUME_SECTIONS
+    )
+    return Account.objects.filter(user_id=user_id).exclude(resume_complete=complete) \
+        .update(resume_complete=complete)
+
+
+def repair_resume_complete():
+    """Recompute all accounts, return how many changed"""
+    Account = get_model('person', 'Account')
+
+    complete = Account.objects.filter(*[_section_exists(name) for name in RESUME_SECTIONS])
+    changed = complete.filter(resume_complete=False).update(resume_complete=True)
+
+    for name in RESUME_SECTIONS:
+        changed += Account.objects.filter(~_section_exists(name), resume_complete=True) \
+            .update(resume_complete=False)
+    return changed
@@ -1,6 +1,5 @@
-from rest_framework import permissions
+from utils.ownership import IsOwnerOrReject
 
 
-class IsObjectOwnerOrReject(permissions.BasePermission):
-    def has_object_permission(self, request, view, obj):
-        return request.user.uuid == obj.user.uuid
+class IsObjectOwnerOrReject(IsOwnerOrReject):
+    owner_field = 'user'
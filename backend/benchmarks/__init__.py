@@ -0,0 +1,8 @@
+"""
+Performance benchmarks, run from backend directory;
+
+    python -m benchmarks.<name> --help
+
+Each benchmark create a throwaway test database from DJANGO_SETTINGS_MODULE,
+seed it and measure, so never touch real data.
+"""
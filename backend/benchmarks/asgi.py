@@ -0,0 +1,233 @@
+"""
+Concurrent throughput of the read endpoints, WSGI vs ASGI deployment
+
+    python -m benchmarks.asgi --concurrency 16 --requests 400 --query-latency 2
+
+Each mode run in own process, the URLconf decide async view once on import;
+- wsgi, gunicorn sync worker (current deployment), one request at a time
+- gthread, gunicorn --threads :concurrency
+- asgi, setup/asgi.py, :concurrency request in flight on one event loop
+
+Request go through the full handler and middleware, no network.
+--query-latency add sleep to each query, as round trip to MySQL server.
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import subprocess
+
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+from benchmarks.base import setup, test_database, summarize
+
+MODES = ('wsgi', 'gthread', 'asgi')
+
+
+def add_query_latency(seconds):
+    """Every query sleep :seconds before execute, release GIL as real network wait"""
+    from django.db.backends import utils
+
+    def slow(method):
+        def wrapper(self, *args, **kwargs):
+            time.sleep(seconds)
+            return method(self, *args, **kwargs)
+        return wrapper
+
+    utils.CursorWrapper._execute = slow(utils.CursorWrapper._execute)
+    utils.CursorWrapper._executemany = slow(utils.CursorWrapper._executemany)
+
+
+def get_targets(fixture):
+    from django.urls import reverse
+    from utils.generals import get_model
+
+    Schedule = get_model('helpdesk', 'Schedule')
+    schedule = Schedule.objects.filter(user=fixture.consultant).first()
+
+    return [
+        ('consultant.schedule.list', 'consultant', reverse('helpdesk_api:consultant:schedule-list'), None),
+        ('consultant.schedule.retrieve', 'consultant',
+         reverse('helpdesk_api:consultant:schedule-detail', kwargs={'uuid': schedule.uuid}), None),
+        ('client.reservation.list', 'client', reverse('helpdesk_api:client:reservation-list'), None),
+        ('consultant.reservation.list', 'consultant',
+         reverse('helpdesk_api:consultant:reservation-list'), None),
+        ('consultant.assign.list', 'consultant', reverse('helpdesk_api:consultant:assign-list'), None),
+    ]
+
+
+def get_cookies(fixture):
+    from django.conf import settings
+    from django.test import Client
+
+    cookies = dict()
+    for actor, user in (('client', fixture.client), ('consultant', fixture.consultant)):
+        client = Client()
+        client.force_login(user)
+        cookies[actor] = '%s=%s' % (settings.SESSION_COOKIE_NAME,
+                                    client.cookies[settings.SESSION_COOKIE_NAME].value)
+    return cookies
+
+
+def wsgi_runner(concurrency):
+    from django.core.wsgi import get_wsgi_application
+    from django.test.client import RequestFactory
+
+    handler = get_wsgi_application()
+    factory = RequestFactory()
+
+    def call(path, query, cookie):
+        environ = factory._base_environ(PATH_INFO=path, QUERY_STRING=query, REQUEST_METHOD='GET',
+                                        HTTP_COOKIE=cookie)
+        status = list()
+        start = time.perf_counter()
+        body = handler(environ, lambda value, headers, exc_info=None: status.append(value))
+        b''.join(body)
+        body.close()
+        return int(status[0].split()[0]), (time.perf_counter() - start) * 1000
+
+    def run(requests):
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            return list(executor.map(lambda item: call(*item), requests))
+    return run
+
+
+def asgi_runner(concurrency):
+    from django.core.asgi import get_asgi_application
+
+    application = get_asgi_application()
+
+    async def call(path, query, cookie):
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+            'method': 'GET', 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+            'query_string': query.encode(), 'root_path': '',
+            'headers': [(b'host', b'testserver'), (b'cookie', cookie.encode())],
+            'client': ('127.0.0.1', 0), 'server': ('testserver', 80),
+        }
+        status = list()
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                status.append(message['status'])
+
+        start = time.perf_counter()
+        await application(scope, receive, send)
+        return status[0], (time.perf_counter() - start) * 1000
+
+    async def gather(requests):
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def limited(item):
+            async with semaphore:
+                return await call(*item)
+        return await asyncio.gather(*[limited(item) for item in requests])
+
+    def run(requests):
+        return asyncio.run(gather(requests))
+    return run
+
+
+def run_mode(options):
+    """Seed, then serve every target in :options.mode, return result dict"""
+    from benchmarks.factories import build
+
+    if options.query_latency:
+        add_query_latency(options.query_latency / 1000)
+
+    with test_database():
+        fixture = build(options.scale)
+        cookies = get_cookies(fixture)
+
+        concurrency = 1 if options.mode == 'wsgi' else options.concurrency
+        runner = asgi_runner(concurrency) if options.mode == 'asgi' else wsgi_runner(concurrency)
+
+        # error counted in the result, traceback each request only noise,
+        # after the handler created, it configure logging again
+        logging.getLogger('django.request').setLevel(logging.CRITICAL)
+
+        results = list()
+        for name, actor, path, params in get_targets(fixture):
+            query = urlencode(params or dict())
+            runner([(path, query, cookies[actor])] * options.warmup)
+
+            start = time.perf_counter()
+            responses = runner([(path, query, cookies[actor])] * options.requests)
+            elapsed = time.perf_counter() - start
+
+            results.append({
+                'name': name,
+                'throughput': len(responses) / elapsed,
+                'errors': sum(1 for status, _ in responses if status >= 400),
+                'latency': summarize([latency for _, latency in responses]),
+            })
+        return {'mode': options.mode, 'concurrency': concurrency, 'scenarios': results}
+
+
+def write_table(results, stream=sys.stdout):
+    modes = [item['mode'] for item in results]
+    stream.write('{0:<30} {1}\n'.format('req/s (p95 ms)', ' '.join('{0:>20}'.format(
+        '%s c=%d' % (item['mode'], item['concurrency'])) for item in results)))
+
+    for index, scenario in enumerate(results[0]['scenarios']):
+        cells = list()
+        for item in results:
+            row = item['scenarios'][index]
+            cell = '%.1f (%.1f)' % (row['throughput'], row['latency']['p95'])
+            if row['errors']:
+                cell = '!%s' % cell
+            cells.append('{0:>20}'.format(cell))
+        stream.write('{0:<30} {1}\n'.format(scenario['name'], ' '.join(cells)))
+
+    if 'wsgi' in modes and 'asgi' in modes:
+        wsgi, asgi = results[modes.index('wsgi')], results[modes.index('asgi')]
+        stream.write('\nasgi / wsgi: %s\n' % ', '.join(
+            '%s x%.1f' % (a['name'], a['throughput'] / w['throughput'])
+            for w, a in zip(wsgi['scenarios'], asgi['scenarios'])))
+    if any(row['errors'] for item in results for row in item['scenarios']):
+        stream.write('! some request failed\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mode', choices=MODES, help="Run one mode in this process, print JSON")
+    parser.add_argument('--scale', default='small', choices=['small', 'medium', 'large'])
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=400, help="Requests each endpoint")
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--query-latency', type=float, default=2, help="Milliseconds added to each query")
+    parser.add_argument('--output', help="Save result as JSON to this path")
+    options = parser.parse_args(argv)
+
+    if options.mode:
+        # decided before django.setup, same as setup/asgi.py
+        os.environ['ASYNC_READ_PATH'] = '1' if options.mode == 'asgi' else '0'
+        setup()
+        json.dump(run_mode(options), sys.stdout)
+        return 0
+
+    results = list()
+    for mode in MODES:
+        args = [sys.executable, '-m', 'benchmarks.asgi', '--mode', mode]
+        for key in ('scale', 'concurrency', 'requests', 'warmup', 'query_latency'):
+            args += ['--%s' % key.replace('_', '-'), str(getattr(options, key))]
+        output = subprocess.check_output(args)
+        results.append(json.loads(output.decode().strip().splitlines()[-1]))
+
+    write_table(results)
+    if options.output:
+        with open(options.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
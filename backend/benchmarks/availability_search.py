@@ -0,0 +1,118 @@
+"""
+Availability search latency, ex; 10k consultants and 1M occurrence rows
+
+    python -m benchmarks.availability_search --consultants 10000 --occurrences 1000000
+"""
+
+import sys
+import argparse
+import datetime
+
+from benchmarks.base import setup, test_database, bulk_insert, measure, report
+
+# p95 of one search page must stay under this
+LATENCY_BUDGET_MS = 250
+
+
+def seed(consultants, occurrences, topics):
+    from django.utils import timezone
+    from utils.generals import get_model
+    from apps.person.utils.auth import set_role
+    from apps.person.utils.constants import CLIENT
+
+    User = get_model('person', 'User')
+    Topic = get_model('master', 'Topic')
+    Expertise = get_model('resume', 'Expertise')
+    Schedule = get_model('helpdesk', 'Schedule')
+    ScheduleExpertise = get_model('helpdesk', 'ScheduleExpertise')
+    Segment = get_model('helpdesk', 'Segment')
+    ScheduleOccurrence = get_model('helpdesk', 'ScheduleOccurrence')
+
+    # bulk_create skip signals, so no Account/Profile/ScheduleTerm created
+    bulk_insert(Topic, (Topic(label='topic-%d' % i, is_active=True) for i in range(topics)))
+    bulk_insert(User, (User(username='consultant-%d' % i, email='consultant-%d@bench.local' % i)
+                       for i in range(consultants)))
+
+    topic_ids = list(Topic.objects.order_by('id').values_list('id', flat=True))
+    user_ids = list(User.objects.filter(username__startswith='consultant-').order_by('id')
+                    .values_list('id', flat=True))
+
+    bulk_insert(Expertise, (Expertise(user_id=user_id, topic_id=topic_ids[i % topics])
+                            for i, user_id in enumerate(user_ids)))
+    bulk_insert(Schedule, (Schedule(user_id=user_id, label='schedule') for user_id in user_ids))
+
+    schedules = list(Schedule.objects.order_by('id').values_list('id', 'user_id'))
+    expertises = dict(Expertise.objects.values_list('user_id', 'id'))
+
+    bulk_insert(ScheduleExpertise, (ScheduleExpertise(user_id=user_id, schedule_id=schedule_id,
+                                                      expertise_id=expertises[user_id])
+                                    for schedule_id, user_id in schedules))
+    bulk_insert(Segment, (Segment(user_id=user_id, schedule_id=schedule_id, quota=5,
+                                  open_hour=datetime.time(8 + schedule_id % 8),
+                                  close_hour=datetime.time(17))
+                          for schedule_id, user_id in schedules))
+
+    segments = Segment.objects.order_by('id').values_list('id', 'schedule_id', 'user_id',
+                                                          'open_hour', 'close_hour', 'quota')
+    days = max(occurrences // max(consultants, 1), 1)
+    today = timezone.localdate()
+
+    def occurrence_rows():
+        for segment_id, schedule_id, user_id, open_hour, close_hour, quota in segments.iterator():
+            for day in range(days):
+                yield ScheduleOccurrence(user_id=user_id, schedule_id=schedule_id, segment_id=segment_id,
+                                         date=today + datetime.timedelta(days=day),
+                                         open_hour=open_hour, close_hour=close_hour, quota=quota,
+                                         used=(segment_id + day) % (quota + 1))
+
+    bulk_insert(ScheduleOccurrence, occurrence_rows())
+
+    client = User.objects.create_user('bench-client', 'bench-client@bench.local', 'bench')
+    set_role(user=client, role=[CLIENT])
+    return client, Topic.objects.order_by('id').first(), today
+
+
+def run(options):
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+    from utils.generals import get_model
+
+    ScheduleOccurrence = get_model('helpdesk', 'ScheduleOccurrence')
+
+    with test_database():
+        user, topic, today = seed(options.consultants, options.occurrences, options.topics)
+        sys.stdout.write('seeded {0} occurrences\n'.format(ScheduleOccurrence.objects.count()))
+
+        client = APIClient()
+        client.force_authenticate(user=user)
+        url = reverse('helpdesk_api:client:availability-list')
+        params = {
+            'topic_uuid': str(topic.uuid),
+            'date_start': today.isoformat(),
+            'date_end': (today + datetime.timedelta(days=options.window)).isoformat(),
+        }
+
+        def search():
+            response = client.get(url, params)
+            assert response.status_code == 200, response.content
+
+        samples = measure(search, repeat=options.repeat)
+        return report('availability_search', samples, budget_ms=options.budget)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--consultants', type=int, default=10000)
+    parser.add_argument('--occurrences', type=int, default=1000000)
+    parser.add_argument('--topics', type=int, default=50)
+    parser.add_argument('--window', type=int, default=14, help="Search window in days")
+    parser.add_argument('--repeat', type=int, default=30)
+    parser.add_argument('--budget', type=float, default=LATENCY_BUDGET_MS, help="p95 budget in ms")
+    options = parser.parse_args(argv)
+
+    setup()
+    return 0 if run(options) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
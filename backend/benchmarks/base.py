@@ -0,0 +1,96 @@
+import os
+import sys
+import time
+import statistics
+import contextlib
+
+import django
+
+
+# `--database sqlite` run on this instead of settings.DATABASES['default']
+SQLITE_DATABASE = {
+    'ENGINE': 'django.db.backends.sqlite3',
+    'NAME': ':memory:',
+}
+
+
+def setup(database=None):
+    """:database 'sqlite' replace default database, other value keep settings as is"""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'setup.settings')
+
+    if database == 'sqlite':
+        from django.conf import settings
+        settings.DATABASES['default'] = dict(SQLITE_DATABASE)
+
+    django.setup()
+
+
+@contextlib.contextmanager
+def test_database(verbosity=0):
+    """Create test database (same as manage.py test) and destroy after"""
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=verbosity, autoclobber=True, serialize=False)
+
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=verbosity)
+        teardown_test_environment()
+
+
+def bulk_insert(model, objs, batch_size=5000):
+    """Insert in batch, keep memory flat for million rows"""
+    batch = list()
+    for obj in objs:
+        batch.append(obj)
+        if len(batch) >= batch_size:
+            model.objects.bulk_create(batch, batch_size=batch_size)
+            batch = list()
+
+    if batch:
+        model.objects.bulk_create(batch, batch_size=batch_size)
+
+
+def measure(func, repeat=20, warmup=2):
+    """Run :func :repeat times, return each duration in milliseconds"""
+    for _ in range(warmup):
+        func()
+
+    samples = list()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(round(len(ordered) * 0.95)) - 1)]
+
+    return {
+        'count': len(ordered),
+        'min': ordered[0],
+        'p50': statistics.median(ordered),
+        'p95': p95,
+        'max': ordered[-1],
+        'mean': statistics.mean(ordered),
+    }
+
+
+def report(name, samples, budget_ms=None, stream=sys.stdout):
+    """Print summary, return False when p95 over :budget_ms"""
+    summary = summarize(samples)
+    line = '{name}: n={count} min={min:.2f}ms p50={p50:.2f}ms p95={p95:.2f}ms max={max:.2f}ms' \
+        .format(name=name, **summary)
+
+    passed = budget_ms is None or summary['p95'] <= budget_ms
+    if budget_ms is not None:
+        line += ' budget={0:.0f}ms [{1}]'.format(budget_ms, 'OK' if passed else 'FAIL')
+
+    stream.write(line + '\n')
+    return passed
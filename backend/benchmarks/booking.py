@@ -0,0 +1,112 @@
+"""
+Booking a multi-date reservation, per row (signal fallback) vs booking service
+
+    python -m benchmarks.booking --items 30 --accepted 20
+"""
+
+import sys
+import time
+import argparse
+import datetime
+
+from benchmarks.base import setup, test_database, report
+
+
+def seed():
+    from django.utils import timezone
+    from utils.generals import get_model
+
+    User = get_model('person', 'User')
+    Schedule = get_model('helpdesk', 'Schedule')
+    Segment = get_model('helpdesk', 'Segment')
+    SLA = get_model('helpdesk', 'SLA')
+    Priority = get_model('helpdesk', 'Priority')
+    Issue = get_model('helpdesk', 'Issue')
+
+    client = User.objects.create_user('bench-client', 'bench-client@bench.local', 'bench')
+    consultant = User.objects.create_user('bench-consultant', 'bench-consultant@bench.local', 'bench')
+    schedule = Schedule.objects.create(user=consultant, label='schedule')
+    segment = Segment.objects.create(user=consultant, schedule=schedule, quota=100,
+                                     open_hour=datetime.time(8), close_hour=datetime.time(12))
+    sla = SLA.objects.create(user=consultant, segment=segment, promise='answered', grace_periode=24, cost=50000)
+    priority = Priority.objects.create(user=consultant, sla=sla, label='priority', cost=10000)
+    issue = Issue.objects.create(user=client, label='issue', description='benchmark issue')
+
+    return {
+        'client': client, 'consultant': consultant, 'issue': issue, 'schedule': schedule,
+        'segment': segment, 'sla': sla, 'priority': priority, 'now': timezone.now(),
+    }
+
+
+def run(options):
+    from django.db import connection, transaction
+    from django.test.utils import CaptureQueriesContext
+    from utils.generals import get_model
+    from apps.helpdesk.utils import booking
+    from apps.helpdesk.utils.constants import ACCEPT
+
+    Reservation = get_model('helpdesk', 'Reservation')
+    ReservationItem = get_model('helpdesk', 'ReservationItem')
+    Assign = get_model('helpdesk', 'Assign')
+
+    with test_database():
+        data = seed()
+
+        def prepare():
+            reservation = Reservation.objects.create(client=data['client'], consultant=data['consultant'])
+            with booking.defer_signals():
+                for index in range(options.items):
+                    ReservationItem.objects.create(reservation=reservation, issue=data['issue'],
+                                                   schedule=data['schedule'], segment=data['segment'],
+                                                   sla=data['sla'], priority=data['priority'],
+                                                   datetime=data['now'] + datetime.timedelta(days=index + 1))
+            return reservation
+
+        @transaction.atomic
+        def per_row(reservation):
+            # same as post_save handlers, one item and one assign each time
+            for item in ReservationItem.objects.filter(reservation=reservation):
+                booking.create_assigns([item])
+
+            for assign in Assign.objects.filter(reservation=reservation)[:options.accepted]:
+                assign.status = ACCEPT
+                assign.save()
+
+        @transaction.atomic
+        def batch(reservation):
+            booking.book_reservation(reservation)
+
+            ids = Assign.objects.filter(reservation=reservation).values_list('id', flat=True)[:options.accepted]
+            Assign.objects.filter(id__in=list(ids)).update(status=ACCEPT)
+            booking.book_reservation(reservation)
+
+        passed = True
+        for name, func in (('booking_per_row', per_row), ('booking_batch', batch)):
+            reservation = prepare()
+            with CaptureQueriesContext(connection) as context:
+                func(reservation)
+            sys.stdout.write('{0}: {1} queries\n'.format(name, len(context.captured_queries)))
+
+            samples = list()
+            for _ in range(options.repeat):
+                reservation = prepare()
+                start = time.perf_counter()
+                func(reservation)
+                samples.append((time.perf_counter() - start) * 1000)
+            passed &= report(name, samples)
+        return passed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=30, help="Reservation items each reservation")
+    parser.add_argument('--accepted', type=int, default=20, help="Items accepted by consultant")
+    parser.add_argument('--repeat', type=int, default=20)
+    options = parser.parse_args(argv)
+
+    setup()
+    return 0 if run(options) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""
+PUT many (ListSerializerUpdateMappingField), each row saved vs bulk
+
+    python -m benchmarks.bulk_put --sizes 10 100 1000
+
+reservation_item: 90% rows moved to other date with other issue, 10% new
+expertise: every row other level
+baseline patch the list serializer to save each row (child create /
+update, signals each row). Items validated before, only save() measured,
+rolled back after each sample.
+"""
+
+import sys
+import time
+import argparse
+import datetime
+import contextlib
+
+from benchmarks.base import setup, test_database, summarize
+
+
+@contextlib.contextmanager
+def baseline():
+    from utils.mixin.api import ListSerializerUpdateMappingField
+
+    original = ListSerializerUpdateMappingField.__dict__['can_bulk']
+    ListSerializerUpdateMappingField.can_bulk = lambda self, validated_data: False
+    try:
+        yield
+    finally:
+        ListSerializerUpdateMappingField.can_bulk = original
+
+
+def seed(size):
+    from django.utils import timezone
+    from rest_framework.test import APIRequestFactory
+    from utils.generals import get_model
+    from apps.helpdesk.utils.occurrence import occurrence_key
+    from benchmarks.base import bulk_insert
+
+    User = get_model('person', 'User')
+    Topic = get_model('master', 'Topic')
+    Expertise = get_model('resume', 'Expertise')
+    Schedule = get_model('helpdesk', 'Schedule')
+    Segment = get_model('helpdesk', 'Segment')
+    ScheduleOccurrence = get_model('helpdesk', 'ScheduleOccurrence')
+    SLA = get_model('helpdesk', 'SLA')
+    Priority = get_model('helpdesk', 'Priority')
+    Issue = get_model('helpdesk', 'Issue')
+    Reservation = get_model('helpdesk', 'Reservation')
+    ReservationItem = get_model('helpdesk', 'ReservationItem')
+
+    client = User.objects.create_user('bench-client-%d' % size, 'bench-client-%d@bench.local' % size, 'bench')
+    consultant = User.objects.create_user('bench-consultant-%d' % size,
+                                          'bench-consultant-%d@bench.local' % size, 'bench')
+    schedule = Schedule.objects.create(user=consultant, label='schedule')
+    segment = Segment.objects.create(user=consultant, schedule=schedule, quota=size * 2,
+                                     open_hour=datetime.time(8), close_hour=datetime.time(12))
+    sla = SLA.objects.create(user=consultant, segment=segment, promise='answered', grace_periode=24, cost=50000)
+    priority = Priority.objects.create(user=consultant, sla=sla, label='priority', cost=10000)
+    issues = [Issue.objects.create(user=client, label='issue %d' % index, description='benchmark issue')
+              for index in range(2)]
+    reservation = Reservation.objects.create(client=client, consultant=consultant)
+
+    now = timezone.now()
+    dates = [now + datetime.timedelta(days=1), now + datetime.timedelta(days=2)]
+    for value in dates:
+        ScheduleOccurrence.objects.create(user=consultant, schedule=schedule, segment=segment,
+                                          date=occurrence_key(segment.id, value)[1], open_hour=segment.open_hour,
+                                          close_hour=segment.close_hour, quota=size * 2)
+
+    existing = size - size // 10
+    bulk_insert(ReservationItem, (ReservationItem(reservation=reservation, issue=issues[0], schedule=schedule,
+                                                  segment=segment, sla=sla, priority=priority, datetime=dates[0],
+                                                  number=ReservationItem.create_number() + str(index))
+                                  for index in range(existing)))
+
+    bulk_insert(Topic, (Topic(label='bench topic %d %d' % (size, index)) for index in range(size)))
+    topics = Topic.objects.filter(label__startswith='bench topic %d ' % size)
+    bulk_insert(Expertise, (Expertise(user=consultant, topic=topic, sort_order=index + 1)
+                            for index, topic in enumerate(topics)))
+
+    def request(user):
+        ret = APIRequestFactory().put('/')
+        ret.user = user
+        return ret
+
+    item = {'reservation': str(reservation.uuid), 'issue': str(issues[1].uuid), 'schedule': str(schedule.uuid),
+            'segment': str(segment.uuid), 'sla': str(sla.uuid), 'priority': str(priority.uuid),
+            'datetime': dates[1].isoformat()}
+    items = [dict(item, uuid=str(uuid)) for uuid in
+             ReservationItem.objects.filter(reservation=reservation).values_list('uuid', flat=True)]
+    items += [dict(item, datetime=dates[0].isoformat()) for _ in range(size - existing)]
+
+    expertises = [{'uuid': str(uuid), 'level': 'expert'} for uuid in
+                  Expertise.objects.filter(user=consultant).values_list('uuid', flat=True)]
+
+    return {
+        'reservation_item': (ReservationItem, items, request(client)),
+        'expertise': (Expertise, expertises, request(consultant)),
+    }
+
+
+def get_serializer(name, model, data, request):
+    from apps.helpdesk.api.client.v1.consultation.serializers import ReservationItemCreateSerializer
+    from apps.resume.api.expertise.v1.serializers import ExpertiseSerializer
+
+    serializer_class = {'reservation_item': ReservationItemCreateSerializer, 'expertise': ExpertiseSerializer}[name]
+    queryset = model.objects.filter(uuid__in=[item['uuid'] for item in data if 'uuid' in item])
+    serializer = serializer_class(queryset, data=data, many=True, context={'request': request})
+    serializer.is_valid(raise_exception=True)
+    return serializer
+
+
+def save(name, model, data, request):
+    """(ms, queries) of save(), rolled back"""
+    from django.db import connection, reset_queries, transaction
+    from django.test.utils import CaptureQueriesContext
+
+    with transaction.atomic():
+        serializer = get_serializer(name, model, data, request)
+        # query log is bounded, the capture of a big PUT need it empty
+        reset_queries()
+        with CaptureQueriesContext(connection) as context:
+            start = time.perf_counter()
+            serializer.save()
+            elapsed = (time.perf_counter() - start) * 1000
+        transaction.set_rollback(True)
+    return elapsed, len(context.captured_queries)
+
+
+def run(options):
+    sys.stdout.write('{0:<18} {1:>6} {2:>10} {3:>10} {4:>10} {5:>10} {6:>8}\n'.format(
+        'payload', 'items', 'row ms', 'bulk ms', 'row qs', 'bulk qs', 'speedup'))
+
+    for size in options.sizes:
+        for name, (model, data, request) in seed(size).items():
+            results = dict()
+            for mode in ('row', 'bulk'):
+                with (baseline() if mode == 'row' else contextlib.nullcontext()):
+                    samples = [save(name, model, data, request) for _ in range(options.repeat)]
+                results[mode] = (summarize([sample[0] for sample in samples])['p50'], samples[-1][1])
+
+            sys.stdout.write('{0:<18} {1:>6} {2:>10.2f} {3:>10.2f} {4:>10} {5:>10} {6:>7.2f}x\n'.format(
+                name, len(data), results['row'][0], results['bulk'][0], results['row'][1], results['bulk'][1],
+                results['row'][0] / results['bulk'][0]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000], help="Items each PUT")
+    parser.add_argument('--repeat', type=int, default=5)
+    options = parser.parse_args(argv)
+
+    setup()
+    with test_database():
+        run(options)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,265 @@
+"""
+Data factories for the booking funnel, all inserted with bulk_create
+
+Issue -> Reservation -> ReservationItem -> Assign -> Assigned -> Invoice
+Signals skipped by bulk_create, so every related row (Account, Role,
+ScheduleTerm, ScheduleOccurrence, ...) created here explicitly.
+Values derived from the row index, same scale always give same data.
+"""
+
+import datetime
+import itertools
+import collections
+
+from benchmarks.base import bulk_insert
+
+SCALES = {
+    'small': {
+        'topics': 10, 'consultants': 20, 'clients': 50, 'segments': 2,
+        'reservations': 1000, 'items': 3, 'assigned_ratio': 0.5,
+    },
+    'medium': {
+        'topics': 50, 'consultants': 500, 'clients': 2000, 'segments': 2,
+        'reservations': 20000, 'items': 3, 'assigned_ratio': 0.5,
+    },
+    'large': {
+        'topics': 200, 'consultants': 5000, 'clients': 20000, 'segments': 3,
+        'reservations': 200000, 'items': 5, 'assigned_ratio': 0.5,
+    },
+}
+
+# consultant work on this weekdays
+WORKDAYS = ('MO', 'TU', 'WE', 'TH', 'FR')
+
+# every reservation item not older than this
+DAYS_AHEAD = 60
+
+# items booked together, one transaction each
+BOOKING_BATCH = 2000
+
+SLA_COST = 50000
+PRIORITY_COST = 10000
+
+Fixture = collections.namedtuple('Fixture', ['client', 'consultant', 'topic', 'reservation',
+                                             'date', 'counts'])
+
+
+def _ids(queryset):
+    return list(queryset.order_by('id').values_list('id', flat=True))
+
+
+def create_users(prefix, total, role):
+    """User with Account, Profile and :role, return ids"""
+    from utils.generals import get_model
+    from apps.person.utils.constants import REGISTERED
+
+    User = get_model('person', 'User')
+    Account = get_model('person', 'Account')
+    Profile = get_model('person', 'Profile')
+    Role = get_model('person', 'Role')
+
+    bulk_insert(User, (User(username='%s-%d' % (prefix, i), email='%s-%d@bench.local' % (prefix, i),
+                            password='!') for i in range(total)))
+
+    user_ids = _ids(User.objects.filter(username__startswith='%s-' % prefix))
+    bulk_insert(Account, (Account(user_id=user_id, email_verified=True,
+                                  resume_complete=role != REGISTERED) for user_id in user_ids))
+    bulk_insert(Profile, (Profile(user_id=user_id) for user_id in user_ids))
+    bulk_insert(Role, (Role(user_id=user_id, identifier=identifier, is_active=True)
+                       for user_id in user_ids for identifier in (REGISTERED, role)))
+    return user_ids
+
+
+def create_schedules(consultant_ids, topic_ids, segments, today):
+    """Each consultant one Schedule repeated on workdays with :segments Segment, SLA and Priority"""
+    from dateutil import rrule
+    from django.utils import timezone
+    from utils.generals import get_model
+    from apps.helpdesk.utils.constants import BYWEEKDAY, INCLUSION
+
+    Expertise = get_model('resume', 'Expertise')
+    Schedule = get_model('helpdesk', 'Schedule')
+    ScheduleExpertise = get_model('helpdesk', 'ScheduleExpertise')
+    ScheduleTerm = get_model('helpdesk', 'ScheduleTerm')
+    Rule = get_model('helpdesk', 'Rule')
+    RuleValue = get_model('helpdesk', 'RuleValue')
+    Segment = get_model('helpdesk', 'Segment')
+    SLA = get_model('helpdesk', 'SLA')
+    Priority = get_model('helpdesk', 'Priority')
+
+    dtstart = timezone.make_aware(datetime.datetime.combine(today, datetime.time(8)))
+
+    bulk_insert(Expertise, (Expertise(user_id=user_id, topic_id=topic_ids[i % len(topic_ids)])
+                            for i, user_id in enumerate(consultant_ids)))
+    bulk_insert(Schedule, (Schedule(user_id=user_id, label='schedule') for user_id in consultant_ids))
+
+    schedules = list(Schedule.objects.filter(user_id__in=consultant_ids).order_by('id')
+                     .values_list('id', 'user_id'))
+    expertises = dict(Expertise.objects.filter(user_id__in=consultant_ids).values_list('user_id', 'id'))
+
+    bulk_insert(ScheduleExpertise, (ScheduleExpertise(user_id=user_id, schedule_id=schedule_id,
+                                                      expertise_id=expertises[user_id])
+                                    for schedule_id, user_id in schedules))
+    bulk_insert(ScheduleTerm, (ScheduleTerm(schedule_id=schedule_id, dtstart=dtstart, freq=rrule.DAILY,
+                                            count=DAYS_AHEAD * 2)
+                               for schedule_id, _ in schedules))
+
+    terms = ScheduleTerm.objects.filter(schedule_id__in=[item[0] for item in schedules]) \
+        .order_by('id').values_list('id', 'schedule_id', 'schedule__user_id')
+    bulk_insert(Rule, (Rule(user_id=user_id, schedule_id=schedule_id, schedule_term_id=term_id,
+                            identifier=BYWEEKDAY, mode=INCLUSION)
+                       for term_id, schedule_id, user_id in terms))
+
+    rules = Rule.objects.filter(schedule_term_id__in=[item[0] for item in terms]) \
+        .order_by('id').values_list('id', 'schedule_id', 'schedule_term_id')
+    bulk_insert(RuleValue, (RuleValue(rule_id=rule_id, schedule_id=schedule_id, schedule_term_id=term_id,
+                                      value_varchar=weekday)
+                            for rule_id, schedule_id, term_id in rules for weekday in WORKDAYS))
+
+    bulk_insert(Segment, (Segment(user_id=user_id, schedule_id=schedule_id, quota=10,
+                                  open_hour=datetime.time(8 + index * 3),
+                                  close_hour=datetime.time(10 + index * 3))
+                          for schedule_id, user_id in schedules for index in range(segments)))
+
+    segments = Segment.objects.filter(user_id__in=consultant_ids).order_by('id') \
+        .values_list('id', 'user_id')
+    bulk_insert(SLA, (SLA(user_id=user_id, segment_id=segment_id, label='sla', promise='answered',
+                          grace_periode=24, cost=SLA_COST, allocation=30)
+                      for segment_id, user_id in segments))
+
+    slas = SLA.objects.filter(user_id__in=consultant_ids).order_by('id').values_list('id', 'user_id')
+    bulk_insert(Priority, (Priority(user_id=user_id, sla_id=sla_id, label='priority', cost=PRIORITY_COST)
+                           for sla_id, user_id in slas))
+
+
+def _plans(consultant_ids):
+    """{consultant_id: [(schedule_id, segment_id, sla_id, priority_id), ...]}"""
+    from utils.generals import get_model
+
+    Priority = get_model('helpdesk', 'Priority')
+
+    plans = collections.defaultdict(list)
+    rows = Priority.objects.filter(user_id__in=consultant_ids).order_by('id') \
+        .values_list('user_id', 'sla__segment__schedule_id', 'sla__segment_id', 'sla_id', 'id')
+
+    for user_id, schedule_id, segment_id, sla_id, priority_id in rows:
+        plans[user_id].append((schedule_id, segment_id, sla_id, priority_id))
+    return plans
+
+
+def _workdays(today):
+    days = (today + datetime.timedelta(days=i) for i in range(1, DAYS_AHEAD + 1))
+    return [day for day in days if day.weekday() < 5]
+
+
+def create_bookings(client_ids, consultant_ids, topic_ids, options, today):
+    """Issue, Reservation and it's items, each item assigned and part of them accepted"""
+    from django.utils import timezone
+    from utils.generals import get_model
+    from apps.helpdesk.utils import booking
+    from apps.helpdesk.utils.constants import ACCEPT, PULL, PUSH, REJECT
+
+    Issue = get_model('helpdesk', 'Issue')
+    Reservation = get_model('helpdesk', 'Reservation')
+    ReservationItem = get_model('helpdesk', 'ReservationItem')
+    Assign = get_model('helpdesk', 'Assign')
+
+    total = options['reservations']
+    pairs = [(client_ids[i % len(client_ids)], consultant_ids[i % len(consultant_ids)])
+             for i in range(total)]
+
+    bulk_insert(Issue, (Issue(user_id=client_id, label='issue-%d' % i, description='benchmark issue')
+                        for i, (client_id, _) in enumerate(pairs)))
+    issue_ids = _ids(Issue.objects.filter(user_id__in=client_ids))
+
+    Through = Issue.topic.through
+    bulk_insert(Through, (Through(issue_id=issue_id, topic_id=topic_ids[i % len(topic_ids)])
+                          for i, issue_id in enumerate(issue_ids)))
+
+    bulk_insert(Reservation, (Reservation(client_id=client_id, consultant_id=consultant_id,
+                                          number='bench-rsv-%d' % i)
+                              for i, (client_id, consultant_id) in enumerate(pairs)))
+    reservations = list(Reservation.objects.filter(number__startswith='bench-rsv-').order_by('id')
+                        .values_list('id', 'client_id', 'consultant_id'))
+
+    plans = _plans(consultant_ids)
+    days = _workdays(today)
+    tz = timezone.get_current_timezone()
+
+    def item_rows():
+        counter = itertools.count()
+        for index, (reservation_id, _, consultant_id) in enumerate(reservations):
+            plan = plans[consultant_id]
+            for _ in range(options['items']):
+                number = next(counter)
+                schedule_id, segment_id, sla_id, priority_id = plan[number % len(plan)]
+                day = days[number % len(days)]
+                hour = 8 + (number % len(plan)) * 3
+
+                yield ReservationItem(reservation_id=reservation_id, issue_id=issue_ids[index],
+                                      schedule_id=schedule_id, segment_id=segment_id, sla_id=sla_id,
+                                      priority_id=priority_id, number='bench-item-%d' % number,
+                                      datetime=timezone.make_aware(
+                                          datetime.datetime.combine(day, datetime.time(hour)), tz),
+                                      status=PULL if number % 10 == 0 else PUSH,
+                                      cost=SLA_COST + PRIORITY_COST)
+
+    bulk_insert(ReservationItem, item_rows())
+
+    # same path as the API, booking service in batch
+    item_ids = _ids(ReservationItem.objects.filter(number__startswith='bench-item-'))
+    for index in range(0, len(item_ids), BOOKING_BATCH):
+        chunk = ReservationItem.objects.filter(id__in=item_ids[index:index + BOOKING_BATCH]) \
+            .only('id', 'reservation_id')
+        booking.create_assigns(chunk)
+
+    # consultant answer part of them
+    assign_ids = _ids(Assign.objects.filter(reservation_item__number__startswith='bench-item-'))
+    step = max(int(round(1 / options['assigned_ratio'])), 1) if options['assigned_ratio'] else 0
+    accepted = assign_ids[::step] if step else list()
+    rejected = sorted(set(assign_ids[1::7]) - set(accepted))
+
+    for status, ids in ((ACCEPT, accepted), (REJECT, rejected)):
+        for index in range(0, len(ids), BOOKING_BATCH):
+            Assign.objects.filter(id__in=ids[index:index + BOOKING_BATCH]).update(status=status)
+
+    for index in range(0, len(accepted), BOOKING_BATCH):
+        booking.sync_assigned(Assign.objects.filter(id__in=accepted[index:index + BOOKING_BATCH]))
+
+
+def build(scale='small', today=None, **overrides):
+    """Populate current database for :scale (:overrides any of it's option), return Fixture"""
+    from django.utils import timezone
+    from utils.generals import get_model
+    from apps.helpdesk.utils.occurrence import sync_all_schedule_occurrence
+    from apps.person.utils.constants import CLIENT, CONSULTANT
+
+    User = get_model('person', 'User')
+    Topic = get_model('master', 'Topic')
+    Reservation = get_model('helpdesk', 'Reservation')
+    ReservationItem = get_model('helpdesk', 'ReservationItem')
+
+    options = dict(SCALES[scale], **overrides)
+    today = today or timezone.localdate()
+
+    bulk_insert(Topic, (Topic(label='bench-topic-%d' % i, is_active=True) for i in range(options['topics'])))
+    topic_ids = _ids(Topic.objects.filter(label__startswith='bench-topic-'))
+
+    consultant_ids = create_users('bench-consultant', options['consultants'], CONSULTANT)
+    client_ids = create_users('bench-client', options['clients'], CLIENT)
+
+    create_schedules(consultant_ids, topic_ids, options['segments'], today)
+    create_bookings(client_ids, consultant_ids, topic_ids, options, today)
+
+    # occurrence count the reservation item already pushed
+    sync_all_schedule_occurrence(start=today, end=today + datetime.timedelta(days=DAYS_AHEAD))
+
+    counts = {model._meta.label: model.objects.count() for model in (
+        User, Reservation, ReservationItem, get_model('helpdesk', 'ScheduleOccurrence'),
+        get_model('helpdesk', 'Assign'), get_model('helpdesk', 'Assigned'),
+        get_model('helpdesk', 'Invoice'))}
+
+    reservation = Reservation.objects.order_by('id').first()
+    return Fixture(client=reservation.client, consultant=reservation.consultant,
+                   topic=Topic.objects.get(id=topic_ids[0]), reservation=reservation,
+                   date=today, counts=counts)
@@ -0,0 +1,89 @@
+"""
+ReservationQuerySet.filter_assign, previous annotation vs two phase query
+
+    python -m benchmarks.filter_assign --reservations 250000 --items 4
+
+Each run count and read the first page, same as the reservation list endpoint.
+"""
+
+import sys
+import argparse
+
+from benchmarks.base import setup, test_database, measure, report
+
+PAGE_SIZE = 20
+
+
+def legacy_filter_assign(queryset, assign_status=None, rsv_item_status=None):
+    """filter_assign before two phase query, kept as the baseline"""
+    from django.db.models import Q, F, Count, Exists, OuterRef, IntegerField, ExpressionWrapper
+    from utils.generals import get_model
+    from apps.helpdesk.utils.constants import PULL, PUSH
+
+    Assign = get_model('helpdesk', 'Assign')
+
+    q = Q(status=assign_status) & Q(reservation_item__status=PUSH)
+    if rsv_item_status == PULL:
+        q = Q(reservation_item__status=rsv_item_status)
+
+    qs_assign = Assign.objects.filter(reservation_item__uuid=OuterRef('reservation_item__uuid')).filter(q)
+    return queryset.annotate(assign_exist=Exists(qs_assign),
+                             assigned_count=Count('reservation_item__assign__assigned', distinct=True),
+                             rsv_item_cost=F('reservation_item__sla__cost') + F('reservation_item__priority__cost'),
+                             total_cost=ExpressionWrapper(F('assigned_count') * F('rsv_item_cost'),
+                                                          output_field=IntegerField())) \
+        .filter(assign_exist=True)
+
+
+def run(options):
+    from utils.generals import get_model
+    from apps.helpdesk.utils.constants import ACCEPT, PULL, PUSH, WAITING
+    from benchmarks.factories import build
+
+    Reservation = get_model('helpdesk', 'Reservation')
+
+    with test_database():
+        fixture = build(options.scale, reservations=options.reservations, items=options.items)
+        sys.stdout.write('seeded {0}\n'.format(fixture.counts))
+
+        cases = [
+            ('consultant_waiting', {'consultant_id': fixture.consultant.id}, WAITING, PUSH),
+            ('consultant_accept', {'consultant_id': fixture.consultant.id}, ACCEPT, PUSH),
+            ('client_pull', {'client_id': fixture.client.id}, WAITING, PULL),
+        ]
+
+        passed = True
+        for name, lookup, assign_status, rsv_item_status in cases:
+            for label, method in (('legacy', legacy_filter_assign), ('two_phase', None)):
+                queryset = Reservation.objects.filter(**lookup)
+                if method is None:
+                    queryset = queryset.filter_assign(assign_status=assign_status, rsv_item_status=rsv_item_status)
+                else:
+                    queryset = method(queryset, assign_status=assign_status, rsv_item_status=rsv_item_status)
+
+                def page(queryset=queryset):
+                    queryset.count()
+                    list(queryset[:PAGE_SIZE])
+
+                if options.explain:
+                    sys.stdout.write('{0} {1}\n{2}\n'.format(name, label, queryset.explain()))
+
+                passed &= report('%s.%s' % (name, label), measure(page, repeat=options.repeat))
+        return passed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', default='medium', help="Base scale from benchmarks.factories")
+    parser.add_argument('--reservations', type=int, default=250000)
+    parser.add_argument('--items', type=int, default=4, help="Items each reservation")
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--explain', action='store_true', help="Print query plan each case")
+    options = parser.parse_args(argv)
+
+    setup()
+    return 0 if run(options) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
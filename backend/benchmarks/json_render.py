@@ -0,0 +1,114 @@
+"""
+JSON render (and parse) of the largest list payloads, DRF vs orjson
+
+    python -m benchmarks.json_render --limit 200
+
+Payload built once (serializer / projection .data, as the view response
+data), only rendering measured. Allocation is tracemalloc peak of a
+render, the rendered body included.
+"""
+
+import io
+import sys
+import argparse
+import tracemalloc
+
+from benchmarks.base import setup, test_database, measure, summarize
+
+
+def allocated(func):
+    """Peak KiB allocated by :func"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def get_payloads(fixture, limit):
+    from django.db.models import Prefetch
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+    from utils.generals import get_model
+    from apps.helpdesk.api.client.v1.consultation.serializers import ReservationListProjection
+    from apps.helpdesk.api.client.v1.consultation.views import ReservationApiView
+    from apps.helpdesk.api.consultant.v1.schedule.serializers import ScheduleSerializer
+    from apps.helpdesk.utils.constants import PUSH, WAITING
+    from apps.person.api.user.v1.serializers import UserProjection
+    from apps.person.api.user.v1.views import UserApiView
+
+    Schedule = get_model('helpdesk', 'Schedule')
+    request = Request(APIRequestFactory().get('/'))
+
+    schedules = list(Schedule.objects.prefetch_related(
+        Prefetch('schedule_expertise__expertise__topic'),
+        Prefetch('schedule_term__rule__rule_value'),
+        Prefetch('segment__sla__priority')).select_related('schedule_term', 'user__profile')
+        .order_by('id')[:limit])
+
+    reservation_view = ReservationApiView()
+    reservation_view.user, reservation_view.assign_status, reservation_view.rsv_item_status = \
+        fixture.client, WAITING, PUSH
+    reservations = reservation_view.get_objects().order_by('-create_date', '-id')
+    reservation_context = {'request': request,
+                           'reservation_item_filter': reservation_view.reservation_item_filter}
+
+    users = UserApiView().get_objects().order_by('-date_joined', '-id')
+
+    # as paginated response
+    def page(results):
+        return {'count': len(results), 'next': None, 'previous': None, 'results': results}
+
+    return {
+        'schedule': page(ScheduleSerializer(schedules, many=True, context={'request': request}).data),
+        'reservation': page(ReservationListProjection(ReservationListProjection.project(reservations)[:limit],
+                                                      context=reservation_context).data),
+        'user': page(UserProjection(UserProjection.project(users)[:limit], context={'request': request}).data),
+    }
+
+
+def run(options):
+    from rest_framework.parsers import JSONParser as DRFJSONParser
+    from rest_framework.renderers import JSONRenderer as DRFJSONRenderer
+    from utils.parsers import JSONParser
+    from utils.renderers import JSONRenderer
+    from benchmarks.factories import build
+
+    fixture = build('small', clients=5, consultants=options.limit, reservations=options.limit * 5)
+    payloads = get_payloads(fixture, options.limit)
+
+    sys.stdout.write('{0:<12} {1:>8} {2:>10} {3:>10} {4:>8} {5:>10} {6:>10} {7:>10} {8:>10}\n'.format(
+        'payload', 'KiB', 'drf ms', 'orjson ms', 'speedup', 'drf KiB', 'orjson KiB', 'parse drf', 'parse orj'))
+
+    for name, data in payloads.items():
+        drf, fast = DRFJSONRenderer(), JSONRenderer()
+        body = drf.render(data)
+        assert fast.render(data) == body, name
+
+        before = summarize(measure(lambda: drf.render(data), repeat=options.repeat))
+        after = summarize(measure(lambda: fast.render(data), repeat=options.repeat))
+        parse_before = summarize(measure(lambda: DRFJSONParser().parse(io.BytesIO(body)), repeat=options.repeat))
+        parse_after = summarize(measure(lambda: JSONParser().parse(io.BytesIO(body)), repeat=options.repeat))
+
+        sys.stdout.write('{0:<12} {1:>8.1f} {2:>10.2f} {3:>10.2f} {4:>7.2f}x {5:>10.1f} {6:>10.1f} '
+                         '{7:>10.2f} {8:>10.2f}\n'.format(
+                             name, len(body) / 1024, before['p50'], after['p50'], before['p50'] / after['p50'],
+                             allocated(lambda: drf.render(data)), allocated(lambda: fast.render(data)),
+                             parse_before['p50'], parse_after['p50']))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--limit', type=int, default=200, help="Rows each payload")
+    parser.add_argument('--repeat', type=int, default=20)
+    options = parser.parse_args(argv)
+
+    setup()
+    with test_database():
+        run(options)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+List page throughput, serializer vs read only projection
+
+    python -m benchmarks.projection --limit 200
+
+Each endpoint page (queries included) built from the view queryset;
+- serializer, page of instance with prefetch, then serializer.data
+- projection, page of `.values()` row, then projection.data
+Client has :limit issue and reservation (3 items each), so a full page.
+"""
+
+import sys
+import argparse
+
+from benchmarks.base import setup, test_database, measure, summarize
+
+
+def get_scenarios(fixture, limit):
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+    from apps.helpdesk.api.client.v1.consultation.serializers import (
+        ReservationListSerializer, ReservationListProjection
+    )
+    from apps.helpdesk.api.client.v1.consultation.views import ReservationApiView
+    from apps.helpdesk.api.client.v1.issue.serializers import IssueSerializer, IssueProjection
+    from apps.helpdesk.api.client.v1.issue.views import IssueAPIView
+    from apps.helpdesk.utils.constants import PUSH, WAITING
+    from apps.person.api.user.v1.serializers import UserSerializer, UserProjection
+    from apps.person.api.user.v1.views import UserApiView
+
+    request = Request(APIRequestFactory().get('/'))
+
+    issue_view = IssueAPIView()
+    issue_view.user = fixture.client
+    issues = issue_view.get_objects().order_by('-create_date', '-id')
+
+    reservation_view = ReservationApiView()
+    reservation_view.user, reservation_view.assign_status, reservation_view.rsv_item_status = \
+        fixture.client, WAITING, PUSH
+    reservations = reservation_view.get_objects().order_by('-create_date', '-id')
+    reservation_context = {'request': request,
+                           'reservation_item_filter': reservation_view.reservation_item_filter}
+
+    users = UserApiView().get_objects().order_by('-date_joined', '-id')
+
+    return {
+        'issue': (
+            lambda: IssueSerializer(list(issues[:limit]), many=True, context={'request': request},
+                                    fields_used=('uuid', 'label', 'url', 'topic', 'topic_label',
+                                                 'permalink',)).data,
+            lambda: IssueProjection(IssueProjection.project(issues)[:limit], context={'request': request}).data,
+        ),
+        'reservation': (
+            lambda: ReservationListSerializer(list(reservations[:limit]), many=True,
+                                              context={'request': request}).data,
+            lambda: ReservationListProjection(ReservationListProjection.project(reservations)[:limit],
+                                              context=reservation_context).data,
+        ),
+        'user': (
+            lambda: UserSerializer(list(users[:limit]), many=True, context={'request': request},
+                                   fields_used=('uuid', 'username', 'url', 'profile', 'permalink',)).data,
+            lambda: UserProjection(UserProjection.project(users)[:limit], context={'request': request}).data,
+        ),
+    }
+
+
+def run(options):
+    from benchmarks.factories import build
+
+    # all reservation of few client, each has a full page
+    fixture = build('small', clients=5, consultants=options.limit, reservations=options.limit * 5)
+
+    sys.stdout.write('{0:<12} {1:>6} {2:>16} {3:>16} {4:>8}\n'.format(
+        'page', 'rows', 'serializer row/s', 'projection row/s', 'speedup'))
+
+    for name, (serializer, projection) in get_scenarios(fixture, options.limit).items():
+        rows = len(projection())
+        before = summarize(measure(serializer, repeat=options.repeat))
+        after = summarize(measure(projection, repeat=options.repeat))
+        sys.stdout.write('{0:<12} {1:>6} {2:>16.0f} {3:>16.0f} {4:>7.2f}x\n'.format(
+            name, rows, rows * 1000 / before['p50'], rows * 1000 / after['p50'], before['p50'] / after['p50']))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--limit', type=int, default=200, help="Rows each page")
+    parser.add_argument('--repeat', type=int, default=10)
+    options = parser.parse_args(argv)
+
+    setup()
+    with test_database():
+        run(options)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""
+ScheduleTerm expansion, plain dateutil.rrule walk versus NumPy (single and bulk)
+
+    python -m benchmarks.rrule_expansion --terms 2000 --days 90
+"""
+
+import sys
+import argparse
+import datetime
+
+from benchmarks.base import setup, test_database, bulk_insert, measure, report
+
+
+def seed(terms, holidays):
+    from dateutil import rrule
+    from django.utils import timezone
+    from utils.generals import get_model
+    from apps.helpdesk.utils.constants import (
+        BYDATE, BYMONTHDAY, BYWEEKDAY, DATETIME, EXCLUSION, INCLUSION, INTEGER, ONCE, VARCHAR
+    )
+
+    User = get_model('person', 'User')
+    Schedule = get_model('helpdesk', 'Schedule')
+    ScheduleTerm = get_model('helpdesk', 'ScheduleTerm')
+    Rule = get_model('helpdesk', 'Rule')
+    RuleValue = get_model('helpdesk', 'RuleValue')
+
+    user = User.objects.create_user('bench-consultant', 'bench-consultant@bench.local', 'bench')
+    today = timezone.now().replace(hour=9, minute=0, second=0, microsecond=0)
+
+    bulk_insert(Schedule, (Schedule(user=user, label='schedule-%d' % i) for i in range(terms)))
+    schedule_ids = list(Schedule.objects.order_by('id').values_list('id', flat=True))
+
+    # mix of freq, half with count and half with until
+    freqs = (rrule.WEEKLY, rrule.DAILY, rrule.MONTHLY)
+    bulk_insert(ScheduleTerm, (
+        ScheduleTerm(schedule_id=schedule_id, freq=freqs[i % len(freqs)], interval=1 + i % 2,
+                     dtstart=today - datetime.timedelta(days=i % 60), count=30,
+                     dtuntil=today + datetime.timedelta(days=365) if i % 2 else None)
+        for i, schedule_id in enumerate(schedule_ids)
+    ))
+
+    schedule_terms = list(ScheduleTerm.objects.values_list('id', 'schedule_id'))
+    rules = list()
+    for schedule_term_id, schedule_id in schedule_terms:
+        for identifier, mode, type, direction in ((BYWEEKDAY, INCLUSION, VARCHAR, 'recur'),
+                                                  (BYMONTHDAY, EXCLUSION, INTEGER, 'recur'),
+                                                  (BYDATE, EXCLUSION, DATETIME, ONCE)):
+            rules.append(Rule(user=user, schedule_id=schedule_id, schedule_term_id=schedule_term_id,
+                              identifier=identifier, mode=mode, type=type, direction=direction))
+    bulk_insert(Rule, rules)
+
+    def rule_values():
+        for rule in Rule.objects.values('id', 'identifier', 'schedule_id', 'schedule_term_id'):
+            kwargs = {'rule_id': rule['id'], 'schedule_id': rule['schedule_id'],
+                      'schedule_term_id': rule['schedule_term_id']}
+
+            if rule['identifier'] == BYWEEKDAY:
+                for value in ('MO', 'WE', 'FR'):
+                    yield RuleValue(value_varchar=value, **kwargs)
+            elif rule['identifier'] == BYMONTHDAY:
+                for value in (1, 15):
+                    yield RuleValue(value_integer=value, **kwargs)
+            else:
+                for day in range(holidays):
+                    yield RuleValue(value_datetime=today + datetime.timedelta(days=day * 7 + 2), **kwargs)
+
+    bulk_insert(RuleValue, rule_values())
+
+
+def naive_expand(schedule_term, start, end):
+    """Walk rrule and check each date against each exclusion RuleValue"""
+    from dateutil import rrule
+    from apps.helpdesk.utils.constants import BYDATE, BYMONTHDAY, BYWEEKDAY, INCLUSION
+    from apps.helpdesk.utils.expansion import WEEKDAYS, as_local, rrule_params
+
+    params = rrule_params(schedule_term)
+    rules = list(schedule_term.rule.all())
+
+    for rule in rules:
+        if rule.mode == INCLUSION and rule.identifier == BYWEEKDAY:
+            params['byweekday'] = [WEEKDAYS[item.value_varchar] for item in rule.rule_value.all()]
+
+    dates = list()
+    for occurrence in rrule.rrule(**params):
+        date = occurrence.date()
+        if date > end:
+            break
+
+        if date < start:
+            continue
+
+        excluded = False
+        for rule in rules:
+            if rule.mode == INCLUSION:
+                continue
+
+            for rule_value in rule.rule_value.all():
+                if rule.identifier == BYMONTHDAY and rule_value.value_integer == date.day:
+                    excluded = True
+                elif rule.identifier == BYDATE and as_local(rule_value.value_datetime).date() == date:
+                    excluded = True
+
+        if not excluded:
+            dates.append(date)
+    return dates
+
+
+def run(options):
+    from django.db.models import Prefetch
+    from django.utils import timezone
+    from utils.generals import get_model
+    from apps.helpdesk.utils.expansion import expand, expand_bulk
+
+    ScheduleTerm = get_model('helpdesk', 'ScheduleTerm')
+
+    with test_database():
+        seed(options.terms, options.holidays)
+
+        start = timezone.localdate()
+        end = start + datetime.timedelta(days=options.days)
+        schedule_terms = list(ScheduleTerm.objects.prefetch_related(Prefetch('rule__rule_value')))
+
+        # same result before compare the speed
+        bulk = expand_bulk(schedule_terms, start, end)
+        for schedule_term in schedule_terms:
+            expected = naive_expand(schedule_term, start, end)
+            assert bulk[schedule_term.id].tolist() == expected, schedule_term.id
+
+        passed = True
+        name = '{0} terms x {1} days'.format(len(schedule_terms), options.days)
+        for label, func in (
+            ('naive_rrule', lambda: [naive_expand(item, start, end) for item in schedule_terms]),
+            ('numpy_single', lambda: [expand(item, start, end) for item in schedule_terms]),
+            ('numpy_bulk', lambda: expand_bulk(schedule_terms, start, end)),
+        ):
+            samples = measure(func, repeat=options.repeat, warmup=1)
+            passed = report('rrule_expansion.%s (%s)' % (label, name), samples) and passed
+        return passed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--terms', type=int, default=2000)
+    parser.add_argument('--days', type=int, default=90)
+    parser.add_argument('--holidays', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=5)
+    options = parser.parse_args(argv)
+
+    setup()
+    return 0 if run(options) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
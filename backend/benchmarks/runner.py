@@ -0,0 +1,240 @@
+"""
+Booking funnel benchmark, every scenario in benchmarks.scenarios
+
+    python -m benchmarks.runner --database sqlite --scale small --output sqlite.json
+    python -m benchmarks.runner --database default --scale medium --output mysql.json --compare sqlite.json
+
+Each scenario report p50/p95 latency, queries per request and rows scanned.
+Rows scanned read from MySQL `Handler_read%` session status, null on other database.
+Scenario return error status still reported, with `ok` false and the error body.
+"""
+
+import sys
+import json
+import time
+import logging
+import argparse
+import datetime
+import platform
+import subprocess
+
+from benchmarks.base import setup, test_database, summarize
+
+ROWS_SCANNED_SQL = "SHOW SESSION STATUS LIKE 'Handler_read%%'"
+
+
+def _handler_reads(connection):
+    with connection.cursor() as cursor:
+        cursor.execute(ROWS_SCANNED_SQL)
+        return sum(int(value) for _, value in cursor.fetchall())
+
+
+class RowsScanned:
+    """Handler_read delta around a call, minus the cost of SHOW STATUS itself"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.enabled = connection.vendor == 'mysql'
+        self.overhead = 0
+
+        if self.enabled:
+            first = _handler_reads(connection)
+            self.overhead = _handler_reads(connection) - first
+
+    def __call__(self, func):
+        if not self.enabled:
+            return func(), None
+
+        before = _handler_reads(self.connection)
+        result = func()
+        return result, max(_handler_reads(self.connection) - before - self.overhead, 0)
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL) \
+            .decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _error_body(response):
+    exc_info = getattr(response, 'exc_info', None)
+    if exc_info:
+        return '%s: %s' % (exc_info[0].__name__, exc_info[1])
+    return response.content.decode('utf-8', 'replace')[:500]
+
+
+def run_scenario(scenario, client, rows_scanned, repeat, warmup):
+    from django.urls import reverse
+
+    url = reverse(scenario.view_name, kwargs=scenario.kwargs)
+    method = getattr(client, scenario.method)
+    params = scenario.params or dict()
+    kwargs = {'format': 'json'} if scenario.method != 'get' else dict()
+
+    def request():
+        start = time.perf_counter()
+        response = method(url, params, **kwargs)
+        return response, (time.perf_counter() - start) * 1000
+
+    for _ in range(warmup):
+        request()
+
+    latencies, queries, scanned = list(), list(), list()
+    status, error = None, None
+
+    for _ in range(repeat):
+        (response, elapsed), rows = rows_scanned(request)
+        metrics = getattr(response, 'instrumentation', None)
+        status = response.status_code
+
+        if status >= 400 and error is None:
+            error = _error_body(response)
+
+        # server side time if InstrumentationMiddleware enabled
+        if metrics is not None:
+            latencies.append(metrics.total_time * 1000)
+            queries.append(metrics.queries)
+        else:
+            latencies.append(elapsed)
+        if rows is not None:
+            scanned.append(rows)
+
+    return {
+        'name': scenario.name,
+        'actor': scenario.actor,
+        'method': scenario.method.upper(),
+        'url': url,
+        'status': status,
+        'ok': error is None,
+        'error': error,
+        'latency': summarize(latencies),
+        'queries': summarize(queries) if queries else None,
+        'rows_scanned': summarize(scanned) if scanned else None,
+    }
+
+
+def run(options):
+    import django
+    from django.db import connection
+    from rest_framework.test import APIClient
+
+    from benchmarks.factories import SCALES, build
+    from benchmarks.scenarios import CLIENT, CONSULTANT, get_scenarios
+
+    with test_database():
+        fixture = build(options.scale)
+
+        clients = dict()
+        for actor, user in ((CLIENT, fixture.client), (CONSULTANT, fixture.consultant)):
+            # broken endpoint reported as 500, not abort the run
+            clients[actor] = APIClient(raise_request_exception=False)
+            clients[actor].force_login(user)
+
+        rows_scanned = RowsScanned(connection)
+        scenarios = [item for item in get_scenarios(fixture)
+                     if not options.only or any(name in item.name for name in options.only)]
+
+        results = list()
+        for scenario in scenarios:
+            results.append(run_scenario(scenario, clients[scenario.actor], rows_scanned,
+                                        options.repeat, options.warmup))
+
+        return {
+            'meta': {
+                'timestamp': datetime.datetime.utcnow().isoformat() + 'Z',
+                'commit': _git_commit(),
+                'database': connection.vendor,
+                'scale': options.scale,
+                'options': SCALES[options.scale],
+                'rows': fixture.counts,
+                'repeat': options.repeat,
+                'python': platform.python_version(),
+                'django': django.get_version(),
+            },
+            'scenarios': results,
+        }
+
+
+def _value(summary, key='p95'):
+    return summary[key] if summary else None
+
+
+def _format(value, pattern='{0:.2f}'):
+    return '-' if value is None else pattern.format(value)
+
+
+def _change(new, old):
+    if new is None or old is None:
+        return '-'
+    if not old:
+        return '{0:+.2f}'.format(new - old)
+    return '{0:+.1f}%'.format((new - old) / old * 100)
+
+
+def write_table(result, baseline=None, stream=sys.stdout):
+    meta = result['meta']
+    stream.write('{database} scale={scale} commit={commit}\n'.format(**meta))
+    stream.write('rows: {0}\n\n'.format(', '.join('%s=%d' % item for item in meta['rows'].items())))
+
+    previous = {item['name']: item for item in (baseline or dict()).get('scenarios', list())}
+    header = '{0:<34} {1:>6} {2:>10} {3:>10} {4:>8} {5:>12}'.format(
+        'scenario', 'status', 'p50 ms', 'p95 ms', 'queries', 'rows scanned')
+    if baseline:
+        header += ' {0:>10} {1:>10}'.format('p95 diff', 'query diff')
+    stream.write(header + '\n')
+
+    for item in result['scenarios']:
+        line = '{0:<34} {1:>6} {2:>10} {3:>10} {4:>8} {5:>12}'.format(
+            item['name'], item['status'] if item['ok'] else '!%s' % item['status'],
+            _format(_value(item['latency'], 'p50')), _format(_value(item['latency'])),
+            _format(_value(item['queries'], 'max'), '{0:.0f}'),
+            _format(_value(item['rows_scanned'], 'p50'), '{0:.0f}'))
+
+        old = previous.get(item['name'])
+        if baseline:
+            line += ' {0:>10} {1:>10}'.format(
+                _change(_value(item['latency']), _value(old['latency']) if old else None),
+                _change(_value(item['queries'], 'max'), _value(old['queries'], 'max') if old else None))
+        stream.write(line + '\n')
+
+    for item in result['scenarios']:
+        if not item['ok']:
+            stream.write('\n{0}: {1}'.format(item['name'], item['error']))
+    stream.write('\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database', default='default',
+                        help="`sqlite` for in-memory sqlite, `default` for settings database (MySQL)")
+    parser.add_argument('--scale', default='small', choices=['small', 'medium', 'large'])
+    parser.add_argument('--repeat', type=int, default=30)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--only', nargs='*', help="Run scenario which name contains this")
+    parser.add_argument('--output', help="Save result as JSON to this path")
+    parser.add_argument('--compare', help="Previous JSON result, show the difference")
+    options = parser.parse_args(argv)
+
+    baseline = None
+    if options.compare:
+        with open(options.compare) as f:
+            baseline = json.load(f)
+
+    setup(options.database)
+
+    # error already in the result, traceback each request only noise
+    logging.getLogger('django.request').setLevel(logging.CRITICAL)
+    result = run(options)
+    write_table(result, baseline=baseline)
+
+    if options.output:
+        with open(options.output, 'w') as f:
+            json.dump(result, f, indent=2, default=str)
+
+    return 0 if all(item['ok'] for item in result['scenarios']) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""
+Hot endpoints of the booking funnel, client and consultant side
+
+Each Scenario resolved against Fixture from benchmarks.factories,
+so the url and params point to rows really exists.
+"""
+
+import datetime
+import collections
+
+CLIENT = 'client'
+CONSULTANT = 'consultant'
+
+Scenario = collections.namedtuple('Scenario', ['name', 'actor', 'method', 'view_name',
+                                               'kwargs', 'params'])
+
+
+def _date(fixture, days=0):
+    return (fixture.date + datetime.timedelta(days=days)).isoformat()
+
+
+def get_scenarios(fixture):
+    reservation_uuid = str(fixture.reservation.uuid)
+
+    return [
+        # client
+        Scenario('client.availability.list', CLIENT, 'get', 'helpdesk_api:client:availability-list', None, {
+            'topic_uuid': str(fixture.topic.uuid),
+            'date_start': _date(fixture, 1),
+            'date_end': _date(fixture, 14),
+        }),
+        Scenario('client.issue.list', CLIENT, 'get', 'helpdesk_api:client:issue-list', None, None),
+        Scenario('client.issue.create', CLIENT, 'post', 'helpdesk_api:client:issue-list', None, {
+            'label': 'benchmark issue',
+            'description': 'created by benchmark',
+            'topic': [str(fixture.topic.uuid)],
+        }),
+        Scenario('client.reservation.list', CLIENT, 'get', 'helpdesk_api:client:reservation-list',
+                 None, None),
+        Scenario('client.reservation.retrieve', CLIENT, 'get', 'helpdesk_api:client:reservation-detail',
+                 {'uuid': reservation_uuid}, None),
+        Scenario('client.reservation_item.list', CLIENT, 'get', 'helpdesk_api:client:reservation_item-list',
+                 None, {'reservation_uuid': reservation_uuid}),
+
+        # consultant
+        Scenario('consultant.schedule.list', CONSULTANT, 'get', 'helpdesk_api:consultant:schedule-list',
+                 None, None),
+        Scenario('consultant.segment.list', CONSULTANT, 'get', 'helpdesk_api:consultant:segment-list',
+                 None, None),
+        Scenario('consultant.reservation.list', CONSULTANT, 'get',
+                 'helpdesk_api:consultant:reservation-list', None, None),
+        Scenario('consultant.reservation.retrieve', CONSULTANT, 'get',
+                 'helpdesk_api:consultant:reservation-detail', {'uuid': reservation_uuid}, None),
+        Scenario('consultant.assign.list', CONSULTANT, 'get', 'helpdesk_api:consultant:assign-list',
+                 None, None),
+    ]
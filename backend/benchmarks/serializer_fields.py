@@ -0,0 +1,113 @@
+"""
+ScheduleSerializer cost each object, DRF field building vs cached field plan
+
+    python -m benchmarks.serializer_fields --schedules 200
+
+baseline patch DynamicFieldsModelSerializer back to build the fields
+each instance (then pop the unwanted) and DRF to_representation.
+Rows read and prefetched once before, only serialization measured.
+"""
+
+import sys
+import argparse
+import contextlib
+
+from benchmarks.base import setup, test_database, measure, summarize
+
+
+@contextlib.contextmanager
+def baseline():
+    from rest_framework import serializers
+    from utils.mixin.api import DynamicFieldsModelSerializer
+
+    def get_fields(self):
+        fields = serializers.ModelSerializer.get_fields(self)
+        if self._fields_used is not None:
+            for field_name in set(fields) - self._fields_used:
+                fields.pop(field_name)
+        return fields
+
+    patched = {
+        'get_fields': get_fields,
+        '_readable_fields': serializers.Serializer._readable_fields,
+        'to_representation': serializers.Serializer.to_representation,
+    }
+    original = {name: DynamicFieldsModelSerializer.__dict__[name] for name in patched}
+
+    for name, value in patched.items():
+        setattr(DynamicFieldsModelSerializer, name, value)
+    try:
+        yield
+    finally:
+        for name, value in original.items():
+            setattr(DynamicFieldsModelSerializer, name, value)
+
+
+def seed(count):
+    from django.utils import timezone
+    from utils.generals import get_model
+    from apps.person.utils.constants import CONSULTANT
+    from benchmarks.base import bulk_insert
+    from benchmarks.factories import create_users, create_schedules
+
+    Topic = get_model('master', 'Topic')
+    bulk_insert(Topic, [Topic(label='bench-topic', is_active=True)])
+
+    consultant_ids = create_users('bench-consultant', count, CONSULTANT)
+    create_schedules(consultant_ids, [Topic.objects.get().id], 2, timezone.localdate())
+
+
+def run(options):
+    from django.db.models import Prefetch
+    from rest_framework.test import APIRequestFactory
+    from utils.generals import get_model
+    from apps.helpdesk.api.consultant.v1.schedule.serializers import ScheduleSerializer
+    from apps.helpdesk.api.consultant.v1.schedule.views import ScheduleApiView
+
+    Schedule = get_model('helpdesk', 'Schedule')
+
+    seed(options.schedules)
+    schedules = list(Schedule.objects.prefetch_related(
+        Prefetch('schedule_expertise__expertise__topic'),
+        Prefetch('schedule_term__rule__rule_value'),
+        Prefetch('segment__sla__priority')).select_related('schedule_term', 'user__profile').order_by('id'))
+
+    context = {'request': APIRequestFactory().get('/')}
+    view = ScheduleApiView()
+
+    scenarios = {
+        # one serializer, the list endpoint fields
+        'list': lambda: view.get_list_serializer(schedules, context).data,
+        # serializer each object, all fields and nested
+        'retrieve': lambda: [ScheduleSerializer(item, context=context).data for item in schedules],
+    }
+
+    results = dict()
+    for name, func in scenarios.items():
+        with baseline():
+            before = measure(func, repeat=options.repeat)
+        after = measure(func, repeat=options.repeat)
+        results[name] = (summarize(before), summarize(after))
+
+    count = len(schedules)
+    sys.stdout.write('{0:<10} {1:>18} {2:>18} {3:>8}\n'.format('per object', 'baseline us', 'field plan us',
+                                                               'speedup'))
+    for name, (before, after) in results.items():
+        sys.stdout.write('{0:<10} {1:>18.1f} {2:>18.1f} {3:>7.2f}x\n'.format(
+            name, before['p50'] * 1000 / count, after['p50'] * 1000 / count, before['p50'] / after['p50']))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--schedules', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=10)
+    options = parser.parse_args(argv)
+
+    setup()
+    with test_database():
+        run(options)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""
+Topic autocomplete, label__icontains scan vs in process topic index
+
+    python -m benchmarks.topic_search --topics 100000
+"""
+
+import sys
+import time
+import random
+import argparse
+import itertools
+import tracemalloc
+
+from benchmarks.base import setup, test_database, bulk_insert, measure, report
+
+# p95 of one index search must stay under this, prefix is each keystroke
+PREFIX_BUDGET_MS = 1
+SEARCH_BUDGET_MS = 5
+
+WORDS = [
+    'python', 'django', 'flask', 'react', 'vue', 'angular', 'node', 'express', 'laravel', 'symfony',
+    'rails', 'ruby', 'golang', 'rust', 'java', 'spring', 'kotlin', 'swift', 'android', 'ios',
+    'mysql', 'postgres', 'redis', 'memcached', 'kafka', 'rabbitmq', 'docker', 'kubernetes', 'terraform',
+    'ansible', 'linux', 'nginx', 'apache', 'graphql', 'rest', 'grpc', 'websocket', 'celery', 'pandas',
+    'numpy', 'tensorflow', 'pytorch', 'scikit', 'spark', 'hadoop', 'elastic', 'mongodb', 'cassandra',
+    'typescript', 'javascript', 'html', 'css', 'sass', 'webpack', 'babel', 'jest', 'pytest', 'selenium',
+    'security', 'testing', 'design', 'marketing', 'accounting', 'finance', 'legal', 'tax', 'payroll',
+    'photography', 'writing', 'editing', 'translation', 'seo', 'analytics', 'excel', 'wordpress',
+    'shopify', 'magento', 'blockchain', 'solidity', 'unity', 'unreal', 'blender', 'figma', 'sketch',
+    'illustrator', 'photoshop', 'premiere', 'aftereffects', 'audio', 'mixing', 'mastering', 'guitar',
+    'piano', 'yoga', 'nutrition', 'fitness', 'coaching', 'career', 'interview', 'resume', 'startup',
+]
+QUALIFIERS = ['basic', 'advanced', 'for beginners', 'performance', 'architecture', 'migration',
+              'deployment', 'debugging', 'best practice', 'consulting', 'review', 'tuning']
+
+QUERIES = {
+    'prefix': ['py', 'dja', 'kube', 'photo', 'tensor'],
+    'substring': ['script', 'sql', 'ograph', 'netes', 'tuning'],
+    'fuzzy': ['pythn', 'kubernets', 'javscript', 'photoshp', 'tensrflow'],
+}
+
+
+def labels(count):
+    for index, (word, other, qualifier) in enumerate(itertools.cycle(
+            itertools.product(WORDS, WORDS, QUALIFIERS))):
+        if index >= count:
+            return
+        yield '%s %s %s %d' % (word, other, qualifier, index)
+
+
+def seed(count):
+    from utils.generals import get_model
+
+    Topic = get_model('master', 'Topic')
+    bulk_insert(Topic, (Topic(label=label, is_active=True, is_approved=True) for label in labels(count)))
+
+
+def run(options):
+    from django.db.models import Q
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+    from utils.generals import get_model
+    from apps.master.utils.search import topic_index
+
+    User = get_model('person', 'User')
+    Topic = get_model('master', 'Topic')
+    passed = True
+
+    start = time.perf_counter()
+    seed(options.topics)
+    sys.stdout.write('seeded %d topics in %.1fs\n' % (options.topics, time.perf_counter() - start))
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    topic_index.rebuild()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    sys.stdout.write('index built: %d topics in %.2fs, %.1f MB (peak %.1f MB)\n'
+                     % (len(topic_index), elapsed, current / 2 ** 20, peak / 2 ** 20))
+
+    random.seed(options.seed)
+    for kind, queries in QUERIES.items():
+        def icontains():
+            s = random.choice(queries)
+            list(Topic.objects.filter(Q(is_active=True), Q(label__icontains=s)).values_list('id', flat=True))
+
+        def search():
+            topic_index.search(random.choice(queries))
+
+        report('%s.icontains' % kind, measure(icontains, repeat=options.repeat))
+        budget = PREFIX_BUDGET_MS if kind == 'prefix' else SEARCH_BUDGET_MS
+        passed &= report('%s.index' % kind, measure(search, repeat=options.repeat * 20), budget)
+
+    # incremental update, one topic saved
+    topic = Topic.objects.order_by('id').first()
+
+    def update():
+        topic_index.update(topic.id, topic.label + ' edited', True, True)
+        topic_index.update(topic.id, topic.label, True, True)
+
+    report('index.update (x2)', measure(update, repeat=options.repeat))
+
+    user = User.objects.create_user('bench-topic', 'bench-topic@bench.local', 'bench')
+    client = APIClient()
+    client.force_authenticate(user=user)
+    url = reverse('master:topic-list')
+
+    def endpoint():
+        response = client.get(url, {'s': random.choice(QUERIES['prefix'])})
+        assert response.status_code == 200, response.content
+
+    report('endpoint', measure(endpoint, repeat=options.repeat))
+    return passed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database', default='default', help="'sqlite' replace settings database")
+    parser.add_argument('--topics', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=1)
+    options = parser.parse_args(argv)
+
+    setup(options.database)
+    with test_database():
+        passed = run(options)
+    return 0 if passed else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+Hyperlink cost each object, reverse() vs URL template
+
+    python -m benchmarks.url_templates --schedules 200
+
+baseline patch the url field back to DRF HyperlinkedIdentityField (reverse
+with the namespace versioning fallback), the permalink back to reverse()
+and build_absolute_uri() each object. Request is a v1 API request, as the
+view get it. Rows read and prefetched once before, only serialization measured.
+"""
+
+import sys
+import argparse
+import contextlib
+
+from benchmarks.base import setup, test_database, measure, summarize
+
+
+@contextlib.contextmanager
+def baseline():
+    from django.urls import reverse
+    from rest_framework import serializers
+    from utils.mixin.api import TemplateHyperlinkedIdentityField, AbsoluteURLField
+    from utils.urls import URLTemplate
+
+    def path(self, value):
+        return reverse(self.viewname, kwargs={self.kwarg: value})
+
+    def to_representation(self, value):
+        return self.context['request'].build_absolute_uri(value)
+
+    patched = (
+        (TemplateHyperlinkedIdentityField, 'get_url', serializers.HyperlinkedIdentityField.get_url),
+        (AbsoluteURLField, 'to_representation', to_representation),
+        (URLTemplate, 'path', path),
+    )
+    original = [(klass, name, klass.__dict__[name]) for klass, name, _ in patched]
+
+    for klass, name, value in patched:
+        setattr(klass, name, value)
+    try:
+        yield
+    finally:
+        for klass, name, value in original:
+            setattr(klass, name, value)
+
+
+def get_request():
+    from django.conf import settings
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+    from rest_framework.versioning import NamespaceVersioning
+
+    request = Request(APIRequestFactory().get('/api/%s/' % settings.API_VERSION_SLUG))
+    request.version, request.versioning_scheme = settings.API_VERSION_SLUG, NamespaceVersioning()
+    return request
+
+
+def run(options):
+    from django.db.models import Prefetch
+    from utils.generals import get_model
+    from utils.urls import url_templates
+    from apps.helpdesk.api.consultant.v1.schedule.serializers import ScheduleSerializer
+    from apps.helpdesk.api.client.v1.issue.serializers import IssueSerializer
+    from apps.helpdesk.api.client.v1.issue.views import IssueAPIView
+    from apps.person.api.user.v1.serializers import UserSerializer
+    from apps.person.api.user.v1.views import UserApiView
+    from benchmarks.factories import build
+
+    Schedule = get_model('helpdesk', 'Schedule')
+
+    # a client has :schedules issue, a consultant at least a schedule
+    fixture = build('small', clients=1, consultants=options.schedules, reservations=options.schedules)
+    url_templates.resolve()
+
+    schedules = list(Schedule.objects.prefetch_related(
+        Prefetch('schedule_expertise__expertise__topic'),
+        Prefetch('schedule_term__rule__rule_value'),
+        Prefetch('segment__sla__priority')).select_related('schedule_term', 'user__profile')
+        .order_by('id')[:options.schedules])
+
+    issue_view = IssueAPIView()
+    issue_view.user = fixture.client
+    issues = list(issue_view.get_objects().order_by('-create_date', '-id')[:options.schedules])
+    users = list(UserApiView().get_objects().order_by('-date_joined', '-id')[:options.schedules])
+
+    context = {'request': get_request()}
+    scenarios = {
+        'schedule': (len(schedules), lambda: ScheduleSerializer(schedules, many=True, context=context).data),
+        'issue': (len(issues), lambda: IssueSerializer(issues, many=True, context=context,
+                                                       fields_used=('uuid', 'label', 'url', 'topic',
+                                                                    'topic_label', 'permalink',)).data),
+        'user': (len(users), lambda: UserSerializer(users, many=True, context=context,
+                                                    fields_used=('uuid', 'username', 'url', 'profile',
+                                                                 'permalink',)).data),
+    }
+
+    sys.stdout.write('{0:<10} {1:>6} {2:>14} {3:>14} {4:>8}\n'.format('per object', 'rows', 'reverse us',
+                                                                       'template us', 'speedup'))
+    for name, (count, func) in scenarios.items():
+        with baseline():
+            before = summarize(measure(func, repeat=options.repeat))
+        after = summarize(measure(func, repeat=options.repeat))
+        sys.stdout.write('{0:<10} {1:>6} {2:>14.1f} {3:>14.1f} {4:>7.2f}x\n'.format(
+            name, count, before['p50'] * 1000 / count, after['p50'] * 1000 / count, before['p50'] / after['p50']))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--schedules', type=int, default=200, help="Rows each serializer")
+    parser.add_argument('--repeat', type=int, default=10)
+    options = parser.parse_args(argv)
+
+    setup()
+    with test_database():
+        run(options)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,6 +2,9 @@
 ASGI config for project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Read endpoints with AsyncReadMixin served as coroutine here, see utils/asynchronous.py
+
+    gunicorn setup.asgi:application -k uvicorn.workers.UvicornWorker
 
 For more information on this file, see
 https://docs.djangoproject.com/en/3.0/howto/deployment/asgi/
@@ -12,5 +15,10 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'setup.settings')
+os.environ.setdefault('ASYNC_READ_PATH', '1')
 
 application = get_asgi_application()
+
+# every url / permalink template resolved before the first request
+from utils.urls import url_templates  # noqa: E402
+url_templates.resolve()
@@ -3,6 +3,18 @@ from .project import *
 
 DEBUG = True
 
+# query count and latency of each endpoint, QUERY_BUDGETS asserted by tests
+INSTRUMENTATION_ENABLED = True
+
+# Django REST Framework
+# ------------------------------------------------------------------------------
+# browsable API, debug only
+if DEBUG:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] + [
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ]
+
+
 # Database
 # https://docs.djangoproject.com/en/2.2/ref/settings/#databases
 DATABASES = {
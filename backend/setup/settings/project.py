@@ -1,3 +1,5 @@
+import os
+
 from datetime import timedelta
 from django.contrib.messages import constants as messages
 
@@ -19,6 +21,79 @@ API_VERSION_SLUG = 'v%s' % (API_VERSION)
 APP_VERSION = 1
 APP_VERSION_SLUG = 'v%s' % (APP_VERSION)
 
+# PAGINATION
+# seconds total of KeysetPagination (?total=1) cached
+PAGINATION_TOTAL_CACHE_TIMEOUT = 60
+
+# ASYNC READ PATH
+# read action with AsyncReadMixin served as coroutine, set by setup/asgi.py
+ASYNC_READ_PATH = os.environ.get('ASYNC_READ_PATH') == '1'
+
+# worker threads run ORM of the async read path, each hold one connection
+ASYNC_DATABASE_THREADS = 16
+
+# ROLE CACHE
+# seconds user role identifier cached across request
+ROLE_CACHE_TIMEOUT = 60 * 60
+
+# MASTER CACHE
+# Topic / Scope, in process LRU in front of django cache
+MASTER_CACHE_TIMEOUT = 60 * 60 * 24
+MASTER_CACHE_LOCAL_SIZE = 512
+MASTER_CACHE_LOCAL_TIMEOUT = 60
+# seconds other process may serve it's local copy after invalidated
+MASTER_CACHE_VERSION_TIMEOUT = 5
+
+# TOPIC SEARCH
+# autocomplete over active and approved topic, in process index
+TOPIC_SEARCH_LIMIT = 20
+# minimum trigram similarity of fuzzy match
+TOPIC_SEARCH_SIMILARITY = 0.3
+# seconds before the index rebuilt from database
+TOPIC_INDEX_REBUILD_INTERVAL = 60 * 60
+
+# FULL TEXT SEARCH
+# MySQL use FULLTEXT index (created after migrate, manage.py rebuild_search_index rebuild it),
+# other database a local index in process, rebuilt after this seconds
+SEARCH_INDEX_REBUILD_INTERVAL = 60 * 60
+# seconds other process may miss a change of the local index
+SEARCH_INDEX_VERSION_TIMEOUT = 5
+# characters of highlight snippet
+SEARCH_SNIPPET_SIZE = 160
+
+# SCHEDULE OCCURRENCE
+# how many days ahead schedule_term expanded to ScheduleOccurrence
+SCHEDULE_OCCURRENCE_HORIZON = 90
+
+# INSTRUMENTATION
+# InstrumentationMiddleware and serializer timing, on in development
+INSTRUMENTATION_ENABLED = os.environ.get('INSTRUMENTATION') == '1'
+# samples kept each endpoint, and seconds between flush to cache
+INSTRUMENTATION_WINDOW = 1000
+INSTRUMENTATION_FLUSH_INTERVAL = 30
+# seconds a process snapshot kept after its last flush
+INSTRUMENTATION_SNAPSHOT_TIMEOUT = INSTRUMENTATION_FLUSH_INTERVAL * 4
+
+# max queries each endpoint as `<route> <action>`, asserted from tests,
+# same whatever the rows count (no query each row)
+QUERY_BUDGETS = {
+    'helpdesk_api:client:availability-list list': 3,
+    'helpdesk_api:client:issue-list list': 5,
+    'helpdesk_api:client:issue-detail retrieve': 5,
+    'helpdesk_api:client:reservation-list list': 5,
+    'helpdesk_api:client:reservation-detail retrieve': 7,
+    'helpdesk_api:consultant:assign-list list': 4,
+    'helpdesk_api:consultant:assign-detail retrieve': 3,
+    'helpdesk_api:consultant:schedule-list list': 9,
+    'helpdesk_api:consultant:schedule-detail retrieve': 11,
+    'person_api:user-list list': 2,
+    'person_api:user-detail retrieve': 6,
+    'resume:expertise-list list': 2,
+    'resume:education-list list': 2,
+    'resume:experience-list list': 2,
+    'resume:certificate-list list': 2,
+}
+
 # REGISTRATION REQUIREMENTS
 STRICT_EMAIL = True
 STRICT_EMAIL_VERIFIED = False
@@ -46,6 +121,7 @@ INSTALLED_APPS = INSTALLED_APPS + PROJECT_APPS
 
 # MIDDLEWARES
 PROJECT_MIDDLEWARE = [
+    'utils.middleware.instrumentation.InstrumentationMiddleware',
     'corsheaders.middleware.CorsMiddleware',
 ]
 MIDDLEWARE = PROJECT_MIDDLEWARE + MIDDLEWARE
@@ -112,13 +188,14 @@ SIMPLE_JWT = {
 # ------------------------------------------------------------------------------
 # https://www.django-rest-framework.org/
 REST_FRAMEWORK = {
+    # orjson, same JSON as DRF one (utils/renderers.py)
     'DEFAULT_PARSER_CLASSES': [
-        'rest_framework.parsers.JSONParser',
+        'utils.parsers.JSONParser',
         'rest_framework.parsers.FormParser',
     ],
+    # BrowsableAPIRenderer added by development settings only
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
-        'rest_framework.renderers.BrowsableAPIRenderer',
+        'utils.renderers.JSONRenderer',
     ],
     # Use Django's standard `django.contrib.auth` permissions,
     # or allow read-only access for unauthenticated users.
@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'setup.settings.production')
 
 application = get_wsgi_application()
+
+# every url / permalink template resolved before the first request
+from utils.urls import url_templates  # noqa: E402
+url_templates.resolve()
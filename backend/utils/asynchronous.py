@@ -0,0 +1,174 @@
+"""
+Async read path for DRF ViewSet, served by setup/asgi.py
+
+Django ORM here is sync only, so every query run through
+database_sync_to_async in ASYNC_DATABASE_THREADS worker threads,
+slow query only hold that thread, not the event loop.
+Each worker thread keep it's own connection between call (at most
+one connection each thread), closed only when become unusable.
+Independent prefetch branches fetched at the same time.
+"""
+
+import asyncio
+import functools
+import threading
+import contextvars
+
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Prefetch, prefetch_related_objects
+from django.db.models.constants import LOOKUP_SEP
+
+from utils.middleware.instrumentation import current_metrics, instrument_connections
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.ASYNC_DATABASE_THREADS,
+                                           thread_name_prefix='database')
+    return _executor
+
+
+def _discard_unusable_connections():
+    # not close_old_connections, CONN_MAX_AGE 0 would reconnect every call
+    for connection in connections.all():
+        if connection.connection is not None and connection.errors_occurred:
+            if connection.is_usable():
+                connection.errors_occurred = False
+            else:
+                connection.close()
+
+
+def _call(func, *args, **kwargs):
+    _discard_unusable_connections()
+    with instrument_connections(current_metrics()):
+        return func(*args, **kwargs)
+
+
+def database_sync_to_async(func):
+    """:func in database worker thread, context (ex: instrumentation metrics) copied"""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        call = functools.partial(contextvars.copy_context().run, _call, func, *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(_get_executor(), call)
+
+    return wrapper
+
+
+def split_prefetch(queryset):
+    """Return (:queryset without prefetch_related, the lookups)"""
+    return queryset.prefetch_related(None), queryset._prefetch_related_lookups
+
+
+async def aprefetch_related_objects(instances, *lookups):
+    """
+    Same as prefetch_related_objects, each top level branch in it's own thread
+    ex: ('user', 'segment__sla', 'segment__sla__priority') run
+    ['user'] and ['segment__sla', 'segment__sla__priority'] at once
+    """
+    instances = list(instances)
+    if not instances or not lookups:
+        return instances
+
+    branches = dict()
+    for lookup in lookups:
+        path = lookup.prefetch_through if isinstance(lookup, Prefetch) else lookup
+        branches.setdefault(path.split(LOOKUP_SEP)[0], list()).append(lookup)
+
+    # every branch write it's own key, the cache must exist before
+    for instance in instances:
+        if not hasattr(instance, '_prefetched_objects_cache'):
+            instance._prefetched_objects_cache = dict()
+
+    await asyncio.gather(*[database_sync_to_async(prefetch_related_objects)(instances, *items)
+                           for items in branches.values()])
+    return instances
+
+
+async def aserializer_data(serializer):
+    # nested field may query lazily
+    return await database_sync_to_async(lambda: serializer.data)()
+
+
+class AsyncReadMixin:
+    """
+    When ASYNC_READ_PATH (set by setup/asgi.py) the action in `async_actions`
+    which has `a<action>` coroutine, ex: `async def alist(...)`, served by
+    the coroutine. Other action and WSGI deployment keep the sync one.
+
+    Put before PaginationMixin, apaginate_queryset use it.
+    """
+    async_actions = ('list', 'retrieve')
+    async_dispatch = False
+
+    @classmethod
+    def has_async_action(cls, action):
+        return action in cls.async_actions \
+            and asyncio.iscoroutinefunction(getattr(cls, 'a%s' % action, None))
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        if not settings.ASYNC_READ_PATH \
+                or not any(cls.has_async_action(action) for action in (actions or dict()).values()):
+            return super().as_view(actions, **initkwargs)
+
+        view = super().as_view(actions, async_dispatch=True, **initkwargs)
+        sync_view = sync_to_async(view)
+
+        async def async_view(request, *args, **kwargs):
+            if cls.has_async_action(view.actions.get(request.method.lower())):
+                return await view(request, *args, **kwargs)
+            return await sync_view(request, *args, **kwargs)
+
+        # keep cls, actions, initkwargs and csrf_exempt for router and middleware
+        functools.update_wrapper(async_view, view)
+        return async_view
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.async_dispatch and self.has_async_action(self.action_map.get(request.method.lower())):
+            return self.adispatch(request, *args, **kwargs)
+        return super().dispatch(request, *args, **kwargs)
+
+    async def adispatch(self, request, *args, **kwargs):
+        """Same as APIView.dispatch, the handler awaited"""
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await database_sync_to_async(self.async_initial)(request, *args, **kwargs)
+            handler = getattr(self, 'a%s' % self.action)
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    def async_initial(self, request, *args, **kwargs):
+        self.initial(request, *args, **kwargs)
+
+        # lazy user from initialize_request evaluated here, not in the event loop
+        getattr(getattr(self, 'user', None), 'pk', None)
+
+    async def apaginate_queryset(self, queryset):
+        """Page in worker thread, then each prefetch branch at once"""
+        queryset, lookups = split_prefetch(queryset)
+        page = await database_sync_to_async(self.paginate_queryset)(queryset)
+        return await aprefetch_related_objects(page, *lookups)
+
+    async def aget_pagination_result(self, serializer):
+        return await database_sync_to_async(self.get_pagination_result)(serializer)
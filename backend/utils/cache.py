@@ -0,0 +1,162 @@
+"""
+Two tier cache for read mostly data
+- local: in process LRU with TTL, no network
+- shared: django cache (memcached)
+
+Every key carry the namespace version, invalidate() bump it so all
+keys of the namespace stale at once. Other process see the new version
+after it's known version expire (version_timeout), so local tier may
+late by that much, the invalidating process see it immediately.
+
+Value returned from local tier shared by threads, treat as read only.
+"""
+
+import time
+import threading
+import collections
+
+from django.core.cache import cache
+
+_MISSING = object()
+
+
+class LocalLRU:
+    """Thread safe LRU, each entry expire after :timeout seconds"""
+
+    def __init__(self, maxsize, timeout):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return default
+
+            expires, value = entry
+            if expires < time.monotonic():
+                del self.entries[key]
+                return default
+
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.timeout, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class TieredCache:
+    def __init__(self, namespace, maxsize=1024, local_timeout=30, timeout=None, version_timeout=5):
+        self.namespace = namespace
+        self.local = LocalLRU(maxsize, local_timeout)
+        self.timeout = timeout
+        self.version_timeout = version_timeout
+
+        self._version = None
+        self._version_expires = 0
+        self._lock = threading.Lock()
+        self._counters = collections.Counter()
+
+    @property
+    def version_key(self):
+        return '%s_version' % self.namespace
+
+    def get_version(self):
+        now = time.monotonic()
+        if self._version is not None and self._version_expires > now:
+            return self._version
+
+        version = cache.get(self.version_key)
+        if version is None:
+            cache.add(self.version_key, 1, None)
+            version = cache.get(self.version_key) or 1
+
+        with self._lock:
+            self._version, self._version_expires = version, now + self.version_timeout
+        return version
+
+    def make_key(self, key):
+        return '%s_%s_%s' % (self.namespace, self.get_version(), key)
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def get(self, key, default=None):
+        key = self.make_key(key)
+
+        value = self.local.get(key, _MISSING)
+        if value is not _MISSING:
+            self._count('local_hits')
+            return value
+
+        value = cache.get(key, _MISSING)
+        if value is not _MISSING:
+            self._count('shared_hits')
+            self.local.set(key, value)
+            return value
+
+        self._count('misses')
+        return default
+
+    def set(self, key, value):
+        key = self.make_key(key)
+        cache.set(key, value, self.timeout)
+        self.local.set(key, value)
+
+    def get_or_set(self, key, func):
+        """Value of :key, from :func() when missing, None never cached"""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = func()
+            if value is not None:
+                self.set(key, value)
+        return value
+
+    def invalidate(self):
+        """Stale every key of this namespace, in all process"""
+        try:
+            version = cache.incr(self.version_key)
+        except ValueError:
+            # version key evicted, start again above any version seen
+            version = (self._version or 0) + 1
+            cache.set(self.version_key, version, None)
+
+        with self._lock:
+            self._version, self._version_expires = version, time.monotonic() + self.version_timeout
+        self.local.clear()
+        self._count('invalidations')
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+
+        lookups = sum(counters.get(name, 0) for name in ('local_hits', 'shared_hits', 'misses'))
+        hits = counters.get('local_hits', 0) + counters.get('shared_hits', 0)
+        return {
+            'namespace': self.namespace,
+            'version': self._version,
+            'local_size': len(self.local),
+            'local_hits': counters.get('local_hits', 0),
+            'shared_hits': counters.get('shared_hits', 0),
+            'misses': counters.get('misses', 0),
+            'invalidations': counters.get('invalidations', 0),
+            'hit_ratio': hits / lookups if lookups else None,
+        }
+
+    def reset_stats(self):
+        with self._lock:
+            self._counters.clear()
@@ -0,0 +1,128 @@
+"""
+Conditional GET for DRF ViewSet (ETag / Last-Modified on update_date)
+
+Rows of the response (and the relations it show) read by one aggregate
+query, max update_date and count each. Strong ETag from that, the fields
+shown, the request path and who ask. Client sent the same ETag
+(If-None-Match) or not modified since (If-Modified-Since) get 304 before
+the action run, no serializer, no page query.
+
+Count catch row deleted or leave the filter, max update_date catch row
+saved or join the filter. QuerySet.update() not touch auto_now, set
+update_date there when the row is shown by a conditional view.
+"""
+
+import hashlib
+import calendar
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.db.models.constants import LOOKUP_SEP
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from rest_framework.exceptions import APIException
+
+
+class NotModified(APIException):
+    """Carry the 304 (or 412 of If-Match) response out of `initial()`, action not called"""
+    status_code = 304
+
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+class ConditionalGetMixin:
+    """
+    `conditional_actions` answered 304 when not modified, ex;
+
+        class ReservationApiView(ConditionalGetMixin, AsyncReadMixin, PaginationMixin, viewsets.ViewSet):
+            conditional_relations = ('reservation_item', 'reservation_item__assign',)
+            conditional_fields = {'list': ReservationListProjection.values}
+
+    conditional_relations: relation shown in the response, each has update_date
+    conditional_fields: action -> fields_used, response shape part of the ETag
+    get_conditional_queryset(): rows shown, default list `get_objects()`,
+    retrieve by `lookup_field`, may be more rows than shown (less 304 only)
+    """
+    conditional_actions = ('list', 'retrieve')
+    conditional_relations = ()
+    conditional_fields = None
+    conditional_field = 'update_date'
+
+    def get_conditional_queryset(self):
+        if self.action == 'retrieve':
+            return self.queryset.filter(**{self.lookup_field: self.kwargs[self.lookup_field]})
+        return self.get_objects()
+
+    def get_conditional_fields(self):
+        return (self.conditional_fields or dict()).get(self.action, ())
+
+    def get_conditional_state(self):
+        """(max update_date, count) of rows and each relation, one query, None when lookup invalid"""
+        # joined relation repeat the row
+        aggregates = {'count': Count('pk', distinct=bool(self.conditional_relations)),
+                      'last': Max(self.conditional_field)}
+        for index, relation in enumerate(self.conditional_relations):
+            aggregates['count_%d' % index] = Count(LOOKUP_SEP.join((relation, 'pk')), distinct=True)
+            aggregates['last_%d' % index] = Max(LOOKUP_SEP.join((relation, self.conditional_field)))
+
+        try:
+            queryset = self.get_conditional_queryset().prefetch_related(None).order_by()
+            return queryset.aggregate(**aggregates)
+        except ValidationError:
+            # malformed lookup (uuid), the action answer it
+            return None
+
+    def get_conditional_validators(self, state):
+        """Return (etag, last modified timestamp) of the :state"""
+        dates = [value for key, value in state.items() if key.startswith('last') and value is not None]
+        last_modified = calendar.timegm(max(dates).utctimetuple()) if dates else None
+
+        request = self.request
+        key = (
+            type(self).__qualname__, self.action, request.get_full_path(), request.get_host(),
+            getattr(request.user, 'pk', None), request.version, request.accepted_media_type,
+            tuple(self.get_conditional_fields()),
+            sorted((key, value.isoformat() if hasattr(value, 'isoformat') else value)
+                   for key, value in state.items()),
+        )
+        return quote_etag(hashlib.sha1(repr(key).encode()).hexdigest()), last_modified
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        self.conditional_validators = None
+        if request.method not in ('GET', 'HEAD') or self.action not in self.conditional_actions:
+            return
+
+        state = self.get_conditional_state()
+        if state is None or (self.action == 'retrieve' and not state['count']):
+            # not found, the action answer it
+            return
+
+        self.conditional_validators = self.get_conditional_validators(state)
+        etag, last_modified = self.conditional_validators
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is not None:
+            raise NotModified(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+
+        validators = getattr(self, 'conditional_validators', None)
+        if validators is not None and response.status_code in (200, 304):
+            etag, last_modified = validators
+            if not response.has_header('ETag'):
+                response['ETag'] = etag
+            if last_modified is not None and not response.has_header('Last-Modified'):
+                response['Last-Modified'] = http_date(last_modified)
+            # cached by the client only, always revalidated
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
@@ -0,0 +1,264 @@
+"""
+Index audit, EXPLAIN of the queries the ORM run (manage.py audit_indexes)
+
+1. capture: every SELECT / UPDATE / DELETE run while tests or a benchmark
+   run, one each SQL shape (IN list of any length same shape)
+2. explain: EXPLAIN QUERY PLAN (SQLite) or EXPLAIN (MySQL) of each
+3. flag table read in full (SCAN / type ALL) and sort not by index
+   (TEMP B-TREE FOR ORDER BY / Using filesort)
+4. propose composite index for the flagged table; equal columns
+   of the WHERE / JOIN from a filtered table first, then ORDER BY or
+   the range column. Not proposed when an index start with them or an
+   equal column is unique already.
+
+Plan of an empty table can be a scan whatever the index (MySQL), replay
+captured queries on a database with data (--load --live) there.
+"""
+
+import re
+import json
+import collections
+
+from django.apps import apps
+from django.db import DatabaseError, connections
+
+STATEMENTS = ('SELECT', 'UPDATE', 'DELETE')
+# placeholders of IN, any length the same shape
+IN_PARAMS = re.compile(r'IN \((?:%s, )*%s\)')
+QUOTE = '["`]'
+NAME = QUOTE + r'(\w+)' + QUOTE
+# "table" alias / "table" AS "alias"
+ALIAS = re.compile(NAME + r'\s+(?:AS\s+)?' + QUOTE + r'?([A-Z]\d+)' + QUOTE + r'?(?=[\s,)])')
+# ON ("a"."b" = T3."c")
+REFERENCE = r'(?:' + QUOTE + r'?\w+' + QUOTE + r'?\.' + QUOTE + r'\w+' + QUOTE + r')'
+JOIN_ON = re.compile(r'ON \((' + REFERENCE + r') = (' + REFERENCE + r')\)')
+SQLITE_SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)(.*)$')
+
+FULL_SCAN = 'full scan'
+FILESORT = 'filesort'
+
+INDEX_NAME_LENGTH = 30
+
+
+class Recorder:
+    """Execute wrapper keep one query each shape, connection.execute_wrapper(recorder)"""
+
+    def __init__(self):
+        self.queries = collections.OrderedDict()
+
+    def __call__(self, execute, sql, params, many, context):
+        if not many and sql.lstrip()[:6].upper() in STATEMENTS:
+            self.add(sql, params)
+        return execute(sql, params, many, context)
+
+    def add(self, sql, params, count=1):
+        key = IN_PARAMS.sub('IN (%s)', sql)
+        query = self.queries.get(key)
+        if query is None:
+            self.queries[key] = {'sql': sql, 'params': list(params or ()), 'count': count}
+        else:
+            query['count'] += count
+
+    def __len__(self):
+        return len(self.queries)
+
+    def dump(self, stream, vendor):
+        for query in self.queries.values():
+            stream.write(json.dumps(dict(query, vendor=vendor), default=str) + '\n')
+
+    def load(self, stream, vendor):
+        for line in stream:
+            if not line.strip():
+                continue
+
+            query = json.loads(line)
+            if query.get('vendor', vendor) != vendor:
+                raise ValueError("Captured on %s, can't explain on %s" % (query['vendor'], vendor))
+            self.add(query['sql'], query['params'], count=query['count'])
+
+
+def explain(connection, sql, params):
+    """Plan rows; SQLite detail string, MySQL dict each table"""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            return [row[-1] for row in cursor.fetchall()]
+
+        cursor.execute('EXPLAIN ' + sql, params)
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def get_aliases(sql):
+    """alias -> table, table itself included"""
+    ret = {table: table for table in re.findall(r'(?:FROM|JOIN|UPDATE)\s+' + NAME, sql)}
+    ret.update((alias, table) for table, alias in ALIAS.findall(sql))
+    return ret
+
+
+def get_order_by(sql):
+    """ORDER BY of the outer query"""
+    index = sql.rfind('ORDER BY')
+    if index < 0 or sql.count('(', index) != sql.count(')', index):
+        return ''
+    return sql[index:]
+
+
+def inspect(vendor, sql, plan):
+    """[(alias, problem)] of the :plan"""
+    ret = list()
+    if vendor == 'sqlite':
+        for detail in plan:
+            match = SQLITE_SCAN.match(detail)
+            # SCAN ... USING INDEX too, all rows read in index order
+            if match and match.group(1) not in ('CONSTANT', 'SUBQUERY'):
+                ret.append((match.group(1), FULL_SCAN))
+
+            elif detail.startswith('USE TEMP B-TREE FOR ORDER BY'):
+                aliases = re.findall(NAME + r'\.' + NAME, get_order_by(sql))
+                if aliases:
+                    ret.append((aliases[0][0], FILESORT))
+        return ret
+
+    for row in plan:
+        alias = row.get('table')
+        if not alias or alias.startswith('<'):
+            continue
+
+        if row.get('type') == 'ALL':
+            ret.append((alias, FULL_SCAN))
+        if 'Using filesort' in (row.get('Extra') or ''):
+            ret.append((alias, FILESORT))
+    return ret
+
+
+def get_where(sql):
+    """WHERE of the outer query, ORDER BY not included"""
+    index = sql.find(' WHERE ')
+    if index < 0:
+        return ''
+    where = sql[index:]
+    order_by = get_order_by(where)
+    return where[:len(where) - len(order_by)] if order_by else where
+
+
+def get_columns(sql, alias):
+    """(equal, sort or range) columns of the index for :alias"""
+    column = QUOTE + re.escape(alias) + QUOTE + r'\.' + NAME
+    where = get_where(sql)
+
+    equals = re.findall(column + r'\s*(?:=|IN\s*\(|IS NULL)', where)
+    equals += re.findall(r'=\s*' + column, where)
+    # join from a table the WHERE filter, ex: user__uuid
+    for left, right in JOIN_ON.findall(sql):
+        for this, other in ((left, right), (right, left)):
+            table, name = this.replace('`', '"').split('.')
+            other = other.split('.')[0].strip('"`')
+            if table.strip('"') == alias and re.search(r'["`]?%s["`]?\.' % re.escape(other), where):
+                equals.append(name.strip('"'))
+
+    ranges = re.findall(column + r'\s*(?:>=|<=|>|<|BETWEEN)', where)
+    # sort by the index after equal columns, else the new index bring a filesort
+    orders = re.findall(column, get_order_by(sql))
+
+    # equal columns any order in the index, one proposal each set
+    equals = sorted(set(equals))
+    tail = [name for name in dict.fromkeys(orders or ranges[:1]) if name not in equals]
+    return equals, tail
+
+
+def get_existing(connection, table):
+    """Column list of each index and unique column of :table"""
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, table)
+
+    indexes, unique = list(), set()
+    for constraint in constraints.values():
+        columns = constraint.get('columns') or []
+        if constraint.get('index') or constraint.get('unique') or constraint.get('primary_key'):
+            indexes.append(columns)
+        if (constraint.get('unique') or constraint.get('primary_key')) and len(columns) == 1:
+            unique.add(columns[0])
+    return indexes, unique
+
+
+def index_name(model, fields):
+    name = '%s_%s' % (model._meta.model_name[:10], '_'.join(field[:8] for field in fields))
+    return name[:INDEX_NAME_LENGTH - 4].rstrip('_') + '_idx'
+
+
+class Audit:
+    """Explain captured queries on :using, collect flagged and proposed"""
+
+    def __init__(self, recorder, using='default'):
+        self.recorder = recorder
+        self.connection = connections[using]
+        self.models = {model._meta.db_table: model for model in apps.get_models()}
+        self.existing = dict()
+
+        self.explained = 0
+        self.failed = list()
+        # (table, columns) -> proposal
+        self.proposals = collections.OrderedDict()
+        # flagged, index exist or no column to index
+        self.uncovered = list()
+
+    def get_existing(self, table):
+        if table not in self.existing:
+            self.existing[table] = get_existing(self.connection, table)
+        return self.existing[table]
+
+    def run(self):
+        vendor = self.connection.vendor
+        for query in self.recorder.queries.values():
+            try:
+                plan = explain(self.connection, query['sql'], query['params'])
+            except DatabaseError as e:
+                self.failed.append((query, str(e)))
+                continue
+
+            self.explained += 1
+            flagged = collections.OrderedDict()
+            for alias, problem in inspect(vendor, query['sql'], plan):
+                flagged.setdefault(alias, list()).append(problem)
+
+            aliases = get_aliases(query['sql'])
+            for alias, problems in flagged.items():
+                self.propose(query, aliases.get(alias, alias), alias, problems, plan)
+        return self
+
+    def propose(self, query, table, alias, problems, plan):
+        model = self.models.get(table)
+        equals, tail = get_columns(query['sql'], alias)
+        columns = equals + tail
+        if model is None or not columns:
+            self.uncovered.append((query, table, problems, plan))
+            return
+
+        indexes, unique = self.get_existing(table)
+        if set(equals) & unique or any(index[:len(columns)] == columns for index in indexes):
+            self.uncovered.append((query, table, problems, plan))
+            return
+
+        names = {field.column: field.name for field in model._meta.concrete_fields}
+        fields = [names.get(column, column) for column in columns]
+        proposal = self.proposals.get((table, tuple(columns)))
+        if proposal is None:
+            proposal = self.proposals[(table, tuple(columns))] = {
+                'model': model._meta.label, 'table': table, 'fields': fields,
+                'name': index_name(model, fields), 'problems': set(), 'queries': 0, 'sql': query['sql'],
+            }
+        proposal['problems'].update(problems)
+        proposal['queries'] += query['count']
+
+    def as_dict(self):
+        return {
+            'vendor': self.connection.vendor,
+            'captured': len(self.recorder),
+            'explained': self.explained,
+            'failed': [{'sql': query['sql'], 'error': error} for query, error in self.failed],
+            'proposals': [dict(proposal, problems=sorted(proposal['problems']))
+                          for proposal in self.proposals.values()],
+            'uncovered': [{'table': table, 'problems': problems, 'sql': query['sql'], 'plan': plan}
+                          for query, table, problems, plan in self.uncovered],
+        }
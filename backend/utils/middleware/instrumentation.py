@@ -0,0 +1,320 @@
+"""
+Query count and latency per route and action
+
+Each request record;
+- queries and db time (all database connections)
+- serializer time (Serializer.data, include lazy query inside it)
+- render time (after view return until response rendered)
+- total time
+
+In DEBUG the numbers sent back as `Server-Timing` and `X-Query-Count` headers.
+Work both under WSGI and ASGI, query run in worker thread counted
+through instrument_connections (see utils/asynchronous.py).
+Every process keep rolling window per endpoint, flushed to cache periodically
+so `manage.py instrumentation_report` can read all processes.
+
+Only when INSTRUMENTATION_ENABLED, else the middleware not used and
+Serializer.data not patched.
+"""
+
+import os
+import time
+import asyncio
+import threading
+import contextlib
+import contextvars
+import collections
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from rest_framework import serializers
+
+INSTRUMENTATION_CACHE_KEY = 'instrumentation_{0}'
+INSTRUMENTATION_SLOTS_KEY = 'instrumentation_slots'
+
+# upper bound of each histogram bucket, in milliseconds
+HISTOGRAM_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, float('inf'))
+
+_current = contextvars.ContextVar('instrumentation_metrics', default=None)
+
+
+class Metrics:
+    def __init__(self):
+        self.key = None
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.render_time = 0.0
+        self.total_time = 0.0
+        self._serializer_depth = 0
+        self._view_end = None
+        self._lock = threading.Lock()
+        self._instrumented = list()
+
+    def as_dict(self):
+        return {
+            'key': self.key,
+            'queries': self.queries,
+            'db': self.db_time * 1000,
+            'serializer': self.serializer_time * 1000,
+            'render': self.render_time * 1000,
+            'total': self.total_time * 1000,
+        }
+
+    def instrument(self):
+        """Count query of the current thread connections until release"""
+        for connection in connections.all():
+            wrapper = _query_wrapper(self)
+            connection.execute_wrappers.append(wrapper)
+            self._instrumented.append((connection, wrapper))
+
+    def release(self):
+        for connection, wrapper in self._instrumented:
+            connection.execute_wrappers.remove(wrapper)
+        self._instrumented = list()
+
+    def server_timing(self):
+        return ', '.join([
+            'db;dur=%.2f;desc="%d queries"' % (self.db_time * 1000, self.queries),
+            'serializer;dur=%.2f' % (self.serializer_time * 1000),
+            'render;dur=%.2f' % (self.render_time * 1000),
+            'total;dur=%.2f' % (self.total_time * 1000),
+        ])
+
+
+def current_metrics():
+    return _current.get()
+
+
+@contextlib.contextmanager
+def instrument_connections(metrics):
+    """Count query of the current thread connections to :metrics inside this block"""
+    with contextlib.ExitStack() as stack:
+        if metrics is not None:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(_query_wrapper(metrics)))
+        yield
+
+
+def _percentile(ordered, percent):
+    if not ordered:
+        return 0
+    return ordered[min(len(ordered) - 1, int(round(len(ordered) * percent)) - 1)]
+
+
+class Registry:
+    """
+    Rolling window of samples each endpoint, for this process only
+
+    Flushed to its own cache slot, slot number from one atomic incr so
+    processes never overwrite each other. Slot expire after
+    INSTRUMENTATION_SNAPSHOT_TIMEOUT, dead worker gone from the report.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.samples = collections.defaultdict(lambda: collections.deque(maxlen=self.window))
+        self.lock = threading.Lock()
+        self.last_flush = time.monotonic()
+        self.slot = None
+        self.pid = None
+
+    def add(self, metrics):
+        with self.lock:
+            self.samples[metrics.key].append(metrics.as_dict())
+
+    def reset(self):
+        with self.lock:
+            self.samples.clear()
+
+    def snapshot(self):
+        with self.lock:
+            samples = {key: list(value) for key, value in self.samples.items()}
+
+        result = dict()
+        for key, items in samples.items():
+            totals = sorted(item['total'] for item in items)
+            queries = sorted(item['queries'] for item in items)
+            histogram = [0] * len(HISTOGRAM_BUCKETS)
+
+            for total in totals:
+                for index, bound in enumerate(HISTOGRAM_BUCKETS):
+                    if total <= bound:
+                        histogram[index] += 1
+                        break
+
+            result[key] = {
+                'count': len(items),
+                'p50': _percentile(totals, 0.5),
+                'p95': _percentile(totals, 0.95),
+                'max': totals[-1],
+                'queries_p50': _percentile(queries, 0.5),
+                'queries_max': queries[-1],
+                'db_mean': sum(item['db'] for item in items) / len(items),
+                'serializer_mean': sum(item['serializer'] for item in items) / len(items),
+                'render_mean': sum(item['render'] for item in items) / len(items),
+                'histogram': histogram,
+            }
+        return result
+
+    def get_slot(self):
+        # forked worker get its own slot, not the parent's
+        pid = os.getpid()
+        if self.slot is None or self.pid != pid:
+            cache.add(INSTRUMENTATION_SLOTS_KEY, 0, None)
+            try:
+                self.slot = cache.incr(INSTRUMENTATION_SLOTS_KEY)
+            except ValueError:
+                # slots key evicted, start again
+                cache.set(INSTRUMENTATION_SLOTS_KEY, 1, None)
+                self.slot = 1
+            self.pid = pid
+        return self.slot
+
+    def flush(self, force=False):
+        """Share this process snapshot through cache"""
+        now = time.monotonic()
+        if not force and now - self.last_flush < settings.INSTRUMENTATION_FLUSH_INTERVAL:
+            return
+
+        self.last_flush = now
+        slot = self.get_slot()
+        cache.set(INSTRUMENTATION_CACHE_KEY.format(slot), {'pid': self.pid, 'snapshot': self.snapshot()},
+                  settings.INSTRUMENTATION_SNAPSHOT_TIMEOUT)
+
+
+registry = Registry(settings.INSTRUMENTATION_WINDOW)
+
+
+def collect_snapshots():
+    """Snapshot all processes flushed to cache and not expired, {pid: snapshot}"""
+    slots = cache.get(INSTRUMENTATION_SLOTS_KEY) or 0
+    keys = [INSTRUMENTATION_CACHE_KEY.format(slot) for slot in range(1, slots + 1)]
+    return {value['pid']: value['snapshot'] for value in cache.get_many(keys).values()}
+
+
+def _query_wrapper(metrics):
+    def wrapper(execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            # concurrent prefetch branch count from many thread
+            with metrics._lock:
+                metrics.db_time += time.perf_counter() - start
+                metrics.queries += 1
+    return wrapper
+
+
+def _timed_data(prop):
+    def data(self):
+        metrics = _current.get()
+        if metrics is None or metrics._serializer_depth:
+            return prop.fget(self)
+
+        metrics._serializer_depth += 1
+        start = time.perf_counter()
+        try:
+            return prop.fget(self)
+        finally:
+            metrics.serializer_time += time.perf_counter() - start
+            metrics._serializer_depth -= 1
+
+    data._instrumented = True
+    return property(data)
+
+
+def install_serializer_timing():
+    for klass in (serializers.Serializer, serializers.ListSerializer):
+        if not getattr(klass.data.fget, '_instrumented', False):
+            klass.data = _timed_data(klass.data)
+
+
+def endpoint_key(request, view_func):
+    """ex: `helpdesk_api:client:availability-list list`"""
+    match = request.resolver_match
+    route = ':'.join(match.app_names + [match.url_name or '']) if match else request.path
+    actions = getattr(view_func, 'actions', None) or dict()
+    return '%s %s' % (route, actions.get(request.method.lower(), request.method.lower()))
+
+
+class InstrumentationMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.INSTRUMENTATION_ENABLED:
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            # mark as coroutine, so the ASGI handler not adapt it to sync
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+        install_serializer_timing()
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        metrics = Metrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+
+        try:
+            with instrument_connections(metrics):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+
+        return self.finish(request, response, metrics, start)
+
+    async def __acall__(self, request):
+        metrics = Metrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+            metrics.release()
+
+        return self.finish(request, response, metrics, start)
+
+    def finish(self, request, response, metrics, start):
+        end = time.perf_counter()
+        metrics.total_time = end - start
+        if metrics._view_end is not None:
+            metrics.render_time = end - metrics._view_end
+
+        if metrics.key is None:
+            metrics.key = request.path
+
+        registry.add(metrics)
+        registry.flush()
+
+        response.instrumentation = metrics
+        if settings.DEBUG:
+            response['Server-Timing'] = metrics.server_timing()
+            response['X-Query-Count'] = str(metrics.queries)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.key = endpoint_key(request, view_func)
+
+            # under ASGI sync view run in other thread, same one as this hook
+            if self.is_async:
+                metrics.instrument()
+
+    def process_template_response(self, request, response):
+        # DRF Response rendered after this
+        metrics = _current.get()
+        if metrics is not None:
+            metrics._view_end = time.perf_counter()
+        return response
@@ -1,31 +1,82 @@
+import copy
 import itertools
 
-from django.db import transaction
+from collections import OrderedDict
+
+from django.db import models, transaction
+from django.utils import timezone
 from django.utils.decorators import method_decorator
+from django.utils.functional import cached_property
 from django.views.decorators.cache import never_cache
 
 from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+from rest_framework.reverse import preserve_builtin_query_params
+
+from utils.signals import bulk_saved
+from utils.urls import absolute_url, url_template
 
 
 class DynamicFieldsModelSerializer(serializers.ModelSerializer):
     """
     A ModelSerializer that takes an additional `fields` argument that
     controls which fields should be displayed.
+
+    Field plan (model introspection then pruned by `fields_used`) built once
+    each (class, fields_used of the fields), every instance get a deep copy of it, same as
+    DRF do for declared fields. Dropped field never built nor copied.
     """
+    _fields_plan = dict()
 
     def __init__(self, *args, **kwargs):
         # Don't pass the 'fields_used' arg up to the superclass
         fields_used = kwargs.pop('fields_used', None)
+        if fields_used == '__all__':
+            fields_used = None
+        self._fields_used = frozenset(fields_used) if fields_used is not None else None
 
         # Instantiate the superclass normally
         super(DynamicFieldsModelSerializer, self).__init__(*args, **kwargs)
 
-        if fields_used is not None and fields_used != '__all__':
+    def get_fields(self):
+        full = self._fields_plan.get((self.__class__, None))
+        if full is None:
+            full = super(DynamicFieldsModelSerializer, self).get_fields()
+            self._fields_plan[(self.__class__, None)] = full
+
+        if self._fields_used is None:
+            return copy.deepcopy(full)
+
+        # name not a field (ex: key of the request data) not part of the key,
+        # at most one plan each subset of the fields
+        used = self._fields_used & frozenset(full)
+        key = (self.__class__, used)
+        plan = self._fields_plan.get(key)
+
+        if plan is None:
             # Drop any fields that are not specified in the `fields_used` argument.
-            allowed = set(fields_used)
-            existing = set(self.fields)
-            for field_name in existing - allowed:
-                self.fields.pop(field_name)
+            plan = OrderedDict((name, field) for name, field in full.items() if name in used)
+            self._fields_plan[key] = plan
+        return copy.deepcopy(plan)
+
+    @cached_property
+    def _readable_fields(self):
+        # fields final after __init__, listed once not each object
+        return [field for field in self.fields.values() if not field.write_only]
+
+    def to_representation(self, instance):
+        ret = OrderedDict()
+
+        for field in self._readable_fields:
+            try:
+                attribute = field.get_attribute(instance)
+            except SkipField:
+                continue
+
+            check_for_none = attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+            ret[field.field_name] = None if check_for_none is None else field.to_representation(attribute)
+        return ret
 
 
 class WritetableFieldPutMethod(serializers.ModelSerializer):
@@ -62,13 +113,67 @@ class WritetableFieldPutMethod(serializers.ModelSerializer):
 
 
 class ListSerializerUpdateMappingField(serializers.ListSerializer):
-    @transaction.atomic
-    def update(self, instance, validated_data):
-        # Maps for uuid->instance and uuid->data item.
-        obj_mapping = {obj.uuid: obj for obj in instance}
-        data_mapping = {item.get('uuid', index): item for index, item in enumerate(validated_data)}
+    """
+    PUT many, item matched to the instance by uuid (new item has none),
+    then saved in constant statements whatever the items count;
+    - one bulk_update, only changed fields of the changed rows
+    - one bulk_create, item without instance
+    - one delete(), instance without item
+    and `utils.signals.bulk_saved` sent once. post_save of each row not sent,
+    post_delete still sent by the delete collector.
+
+    Model save() with logic must do the same for many rows in
+    `bulk_prepare(objs, fields=None)` (fields None is new rows, return
+    other fields it set), else each row saved by child create / update
+    as before. Item with many to many (or other not column) too.
+    """
 
-        # Perform creations and updates.
+    def can_bulk(self, validated_data):
+        model = self.child.Meta.model
+        if model.save is not models.Model.save and not hasattr(model, 'bulk_prepare'):
+            return False
+
+        # many to many or not a column, saved by the child
+        names = {field.name for field in model._meta.concrete_fields}
+        return all(name in names for data in validated_data for name in data)
+
+    def get_changed_fields(self, obj, data):
+        """Fields of :data changed on :obj, deferred field (not loaded) taken as changed"""
+        changed = list()
+        for name, value in data.items():
+            field = obj._meta.get_field(name)
+            if field.attname not in obj.__dict__:
+                changed.append(name)
+            elif field.is_relation:
+                if obj.__dict__[field.attname] != getattr(value, 'pk', value):
+                    changed.append(name)
+            elif obj.__dict__[field.attname] != value:
+                changed.append(name)
+        return changed
+
+    def perform_bulk(self, model, created, updated, fields, deleted):
+        if deleted:
+            model.objects.filter(pk__in=deleted).delete()
+
+        if updated:
+            now = timezone.now()
+            for field in model._meta.concrete_fields:
+                if getattr(field, 'auto_now', False):
+                    for obj in updated:
+                        setattr(obj, field.attname, now)
+                    fields.add(field.name)
+            model.objects.bulk_update(updated, fields)
+
+        if created:
+            model.objects.bulk_create(created)
+            # pk not set on MySQL, read back by uuid
+            if not all(obj.pk for obj in created):
+                pks = dict(model.objects.filter(uuid__in=[obj.uuid for obj in created])
+                           .values_list('uuid', 'pk'))
+                for obj in created:
+                    obj.pk = pks[obj.uuid]
+
+    def update_each(self, obj_mapping, data_mapping):
         ret = []
         for obj_uuid, data in data_mapping.items():
             obj = obj_mapping.get(obj_uuid, None)
@@ -78,9 +183,79 @@ class ListSerializerUpdateMappingField(serializers.ListSerializer):
             else:
                 ret.append(self.child.update(obj, data))
 
-        # Perform deletions.
         for obj_uuid, obj in obj_mapping.items():
             if obj_uuid not in data_mapping:
                 obj.delete()
 
         return ret
+
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        # Maps for uuid->instance and uuid->data item.
+        obj_mapping = {obj.uuid: obj for obj in instance}
+        data_mapping = {item.get('uuid', index): item for index, item in enumerate(validated_data)}
+
+        if not self.can_bulk(validated_data):
+            return self.update_each(obj_mapping, data_mapping)
+
+        model = self.child.Meta.model
+        ret, created, updated, fields = [], [], [], set()
+
+        for obj_uuid, data in data_mapping.items():
+            obj = obj_mapping.get(obj_uuid, None)
+
+            if obj is None:
+                obj = model(**data)
+                created.append(obj)
+            else:
+                changed = self.get_changed_fields(obj, data)
+                if changed:
+                    for name in changed:
+                        setattr(obj, name, data[name])
+                    fields.update(changed)
+                    updated.append(obj)
+            ret.append(obj)
+
+        deleted = [obj.pk for obj_uuid, obj in obj_mapping.items() if obj_uuid not in data_mapping]
+
+        prepare = getattr(model, 'bulk_prepare', None)
+        if prepare is not None:
+            if created:
+                prepare(created)
+            if updated:
+                fields.update(prepare(updated, fields=set(fields)) or ())
+
+        self.perform_bulk(model, created, updated, fields, deleted)
+        if created or updated:
+            bulk_saved.send(sender=model, created=created, updated=updated, fields=fields)
+        return ret
+
+
+class TemplateHyperlinkedIdentityField(serializers.HyperlinkedIdentityField):
+    """
+    HyperlinkedIdentityField, the url from URL template of :view_name,
+    not reverse() each object. Same url, ?format= of the request kept
+    """
+
+    def __init__(self, view_name=None, **kwargs):
+        super().__init__(view_name=view_name, **kwargs)
+        # registered at import, resolved at startup
+        self.template = url_template(self.view_name, kwarg=self.lookup_url_kwarg)
+
+    def get_url(self, obj, view_name, request, format):
+        if format or request is None or view_name != self.view_name:
+            return super().get_url(obj, view_name, request, format)
+
+        if hasattr(obj, 'pk') and obj.pk in (None, ''):
+            return None
+
+        path = self.template.path(getattr(obj, self.lookup_field))
+        return preserve_builtin_query_params(absolute_url(request, path), request)
+
+
+class AbsoluteURLField(serializers.ReadOnlyField):
+    """Path attribute (ex: model permalink) as absolute url of the request"""
+
+    def to_representation(self, value):
+        request = self.context.get('request')
+        return absolute_url(request, value)
@@ -0,0 +1,19 @@
+from django.conf import settings
+
+
+class QueryBudgetMixin:
+    """
+    Use in TestCase, fail when endpoint run more query than QUERY_BUDGETS
+    Need InstrumentationMiddleware enabled (INSTRUMENTATION_ENABLED)
+    """
+
+    def assertQueryBudget(self, response, budget=None):
+        metrics = getattr(response, 'instrumentation', None)
+        self.assertIsNotNone(metrics, "InstrumentationMiddleware not enabled, see INSTRUMENTATION_ENABLED")
+
+        if budget is None:
+            budget = settings.QUERY_BUDGETS.get(metrics.key)
+        self.assertIsNotNone(budget, "No query budget for %s" % metrics.key)
+
+        self.assertLessEqual(metrics.queries, budget, "%s run %d queries, budget %d"
+                             % (metrics.key, metrics.queries, budget))
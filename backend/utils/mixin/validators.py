@@ -1,10 +1,18 @@
+from django.db import models
+
 from rest_framework import serializers
 
 
 class CleanValidateMixin(serializers.ModelSerializer):
     def validate(self, attrs):
         instance = self.instance
-        if not self.instance:
+        if instance is not None and not isinstance(instance, models.Model):
+            # child of PUT many, instance is all the rows, matched by uuid
+            if not hasattr(self, '_instance_mapping'):
+                self._instance_mapping = {obj.uuid: obj for obj in instance}
+            instance = self._instance_mapping.get(attrs.get('uuid'))
+
+        if not instance:
             instance = self.Meta.model(**attrs)
 
         instance.clean()
@@ -0,0 +1,137 @@
+"""
+sort_order of user's rows (Schedule, Expertise, Education, Experience,
+Certificate) from a counter, master.Sequence one row each (user, model)
+
+- new row take value + 1 by one UPDATE of the counter, user's rows not
+  counted on every insert. Counter created at first use from the rows
+  already there (once).
+- count is the user's rows now, clean() check the max allowed on it.
+  Deleted row give it back (sequence_delete_handler), sort_order not.
+- reorder() sort many rows in one UPDATE ... CASE WHEN
+
+Rows created without save() / bulk_prepare (bulk_create in a script)
+not counted, repair() the model then.
+"""
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, F, IntegerField, Max, Value, When
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.utils.translation import gettext_lazy as _
+from django.views.decorators.cache import never_cache
+
+from rest_framework import status as response_status
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotAcceptable
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from utils.generals import get_model
+
+
+def _sequence(model, user_id):
+    Sequence = get_model('master', 'Sequence')
+    return Sequence.objects.filter(user_id=user_id, label=model._meta.label_lower)
+
+
+def _create(model, user_id):
+    Sequence = get_model('master', 'Sequence')
+    state = model.objects.filter(user_id=user_id).order_by() \
+        .aggregate(value=Max('sort_order'), count=Count('pk'))
+
+    try:
+        # other request may create it first
+        with transaction.atomic():
+            Sequence.objects.create(user_id=user_id, label=model._meta.label_lower,
+                                    value=state['value'] or 0, count=state['count'])
+    except IntegrityError:
+        pass
+
+
+def allocate(model, user_id, count=1):
+    """Take :count sort_order for new rows of the user, return the first"""
+    sequence = _sequence(model, user_id)
+    changes = {'value': F('value') + count, 'count': F('count') + count, 'update_date': timezone.now()}
+
+    with transaction.atomic():
+        if not sequence.update(**changes):
+            _create(model, user_id)
+            sequence.update(**changes)
+
+        # row locked by the update until commit
+        return sequence.values_list('value', flat=True).get() - count + 1
+
+
+def assign(model, objs):
+    """sort_order of new :objs, one allocate each user"""
+    users = dict()
+    for obj in objs:
+        if obj.user_id:
+            users.setdefault(obj.user_id, list()).append(obj)
+
+    for user_id, user_objs in users.items():
+        first = allocate(model, user_id, count=len(user_objs))
+        for index, obj in enumerate(user_objs):
+            obj.sort_order = first + index
+
+
+def count(model, user_id):
+    """User's rows of :model"""
+    ret = _sequence(model, user_id).values_list('count', flat=True).first()
+    if ret is None:
+        # not counted yet
+        ret = model.objects.filter(user_id=user_id).count()
+    return ret
+
+
+def release(model, user_id, count=1):
+    _sequence(model, user_id).filter(count__gte=count) \
+        .update(count=F('count') - count, update_date=timezone.now())
+
+
+def repair(model):
+    """Counters of :model created again from the rows at next use"""
+    Sequence = get_model('master', 'Sequence')
+    return Sequence.objects.filter(label=model._meta.label_lower).delete()[0]
+
+
+def reorder(queryset, uuids):
+    """sort_order 1, 2, ... as :uuids order, one UPDATE, return rows changed"""
+    uuids = list(dict.fromkeys(uuids))
+    if not uuids:
+        return 0
+
+    whens = [When(uuid=uuid, then=Value(index)) for index, uuid in enumerate(uuids, start=1)]
+    return queryset.filter(uuid__in=uuids) \
+        .update(sort_order=Case(*whens, output_field=IntegerField()), update_date=timezone.now())
+
+
+def sequence_delete_handler(sender, instance, **kwargs):
+    if instance.user_id:
+        release(sender, instance.user_id)
+
+
+class ReorderMixin:
+    """
+    POST
+    ---------------------
+    Sort the user's rows as given, ex: api/v1/resume/expertises/reorder/
+
+        ["uuid v4", "uuid v4", ...]
+    """
+
+    @method_decorator(never_cache)
+    @transaction.atomic
+    @action(methods=['post'], detail=False, permission_classes=[IsAuthenticated],
+            url_path='reorder', url_name='reorder')
+    def reorder(self, request, format=None):
+        uuids = request.data
+        if not isinstance(uuids, list):
+            raise NotAcceptable(detail=_("List of uuid required"))
+
+        queryset = self.queryset.model.objects.filter(user_id=request.user.id)
+        try:
+            reorder(queryset, uuids)
+        except Exception as e:
+            raise NotAcceptable(detail=str(e))
+        return Response(status=response_status.HTTP_204_NO_CONTENT)
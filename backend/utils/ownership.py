@@ -0,0 +1,56 @@
+"""
+Owner scope of the API by FK id
+
+request.user.id already in hand, so the rows of the user filtered by
+user_id (client_id, consultant_id), not user__uuid=request.user.uuid with
+a JOIN to person_user each query. Object permission compare obj.user_id,
+not obj.user.uuid which load the user of each object.
+
+    class IssueApiView(OwnerScopeMixin, viewsets.ViewSet):
+        owner_field = 'user'
+
+        def get_objects(self):
+            return self.owned(self.queryset)  # WHERE user_id = %s
+
+Path of the owner with '__', ex: 'rule__user' -> rule__user_id, the
+related rule still joined / loaded, only the user not.
+"""
+
+from django.db.models import Q
+
+from rest_framework import permissions
+
+
+def owner_lookup(owner_field):
+    return '%s_id' % owner_field
+
+
+def owner_id(obj, owner_field='user'):
+    """Owner id of :obj, ex: 'rule__user' -> obj.rule.user_id"""
+    *path, name = owner_field.split('__')
+    for attr in path:
+        obj = getattr(obj, attr)
+    return getattr(obj, owner_lookup(name))
+
+
+def is_owner(user, obj, owner_field='user'):
+    return user.is_authenticated and owner_id(obj, owner_field) == user.id
+
+
+class OwnerScopeMixin:
+    """Rows of request.user by :owner_field id, no JOIN to the user"""
+    owner_field = 'user'
+
+    def owner_q(self, owner_field=None):
+        return Q(**{owner_lookup(owner_field or self.owner_field): self.request.user.id})
+
+    def owned(self, queryset, owner_field=None):
+        return queryset.filter(self.owner_q(owner_field))
+
+
+class IsOwnerOrReject(permissions.BasePermission):
+    """Object of request.user, compared by :owner_field id"""
+    owner_field = 'user'
+
+    def has_object_permission(self, request, view, obj):
+        return is_owner(request.user, obj, self.owner_field)
@@ -1,4 +1,15 @@
+import json
+import base64
+import hashlib
+
 from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, ValidationError
+from django.db.models import Q
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class Pagination:
@@ -19,6 +30,183 @@ class Pagination:
         self.show_full_result_count = True
 
 
+class KeysetPagination(LimitOffsetPagination):
+    """
+    Cursor pagination ordered by (create_date, id), each page is
+    `WHERE (create_date, id) < cursor ORDER BY ... LIMIT n`
+    so deep page cost the same as first page
+
+    ?offset still served as LimitOffsetPagination for old client
+    ?total=1 add the total, counted once and cached for
+    PAGINATION_TOTAL_CACHE_TIMEOUT seconds, may late by that
+
+    Row with null ordering field never reached by the cursor
+    """
+    cursor_query_param = 'cursor'
+    total_query_param = 'total'
+    ordering = ('-create_date', '-id')
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self, ordering=None):
+        if ordering is not None:
+            self.ordering = ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.keyset = self.offset_query_param not in request.query_params \
+            or self.cursor_query_param in request.query_params
+
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view=view)
+
+        self.offset = None
+        self.limit = self.get_limit(request)
+        self.count = self.get_total(queryset, request)
+        position, reverse = self.decode_cursor(request, queryset.model)
+
+        ordering = self.ordering
+        if reverse:
+            ordering = [self._reverse(item) for item in ordering]
+
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.get_position_filter(ordering, position))
+
+        # one more row tell if the next page exist
+        results = list(queryset[:self.limit + 1])
+        has_more = len(results) > self.limit
+        results = results[:self.limit]
+
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        self.first = self.get_position(results[0]) if results else None
+        self.last = self.get_position(results[-1]) if results else None
+
+        # empty page from previous link, next must start again from the cursor
+        if not results and position is not None:
+            self.first = self.last = position
+        return results
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.last, reverse=False)
+
+    def get_previous_link(self):
+        if not self.keyset:
+            return super().get_previous_link()
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(self.first, reverse=True)
+
+    def get_total(self, queryset, request):
+        if request.query_params.get(self.total_query_param) not in ('1', 'true'):
+            return None
+
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            # filter never match, ex: empty __in of a search without result
+            return 0
+
+        key = 'pagination_total_%s' % hashlib.md5(
+            ('%s %s' % (sql, params)).encode('utf-8')).hexdigest()
+
+        total = cache.get(key)
+        if total is None:
+            total = queryset.count()
+            cache.set(key, total, settings.PAGINATION_TOTAL_CACHE_TIMEOUT)
+        return total
+
+    @staticmethod
+    def _reverse(field):
+        return field[1:] if field.startswith('-') else '-' + field
+
+    def get_position(self, instance):
+        # row dict from projection `.values()`
+        if isinstance(instance, dict):
+            return [instance[field.lstrip('-')] for field in self.ordering]
+        return [getattr(instance, field.lstrip('-')) for field in self.ordering]
+
+    def get_position_filter(self, ordering, position):
+        """
+        Row after :position in :ordering, for ('-create_date', '-id')
+        create_date < d OR (create_date = d AND id < i)
+        """
+        condition = Q()
+        equal = dict()
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            lookup = '%s__%s' % (name, 'lt' if field.startswith('-') else 'gt')
+            condition |= Q(**equal, **{lookup: value})
+            equal[name] = value
+        return condition
+
+    def encode_cursor(self, position, reverse):
+        values = [item.isoformat() if hasattr(item, 'isoformat') else item for item in position]
+        cursor = json.dumps({'p': values, 'r': int(reverse)}, separators=(',', ':'))
+        cursor = base64.urlsafe_b64encode(cursor.encode('utf-8')).decode('ascii')
+
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.offset_query_param)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request, model):
+        """Return (position, reverse), position None on first page"""
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None, False
+
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+            values, reverse = cursor['p'], bool(cursor['r'])
+            if len(values) != len(self.ordering):
+                raise ValueError
+
+            position = [model._meta.get_field(field.lstrip('-')).to_python(value)
+                        for field, value in zip(self.ordering, values)]
+        except (TypeError, ValueError, KeyError, UnicodeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if None in position:
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+
+class PaginationMixin:
+    """
+    ViewSet instance live one request, so paginator made here
+    keep the page state (offset, count, request) of that request only,
+    safe for threaded and ASGI worker
+
+    pagination_kwargs passed to pagination_class, ex: KeysetPagination ordering
+    get_pagination_class may pick other for the request, ex: ranked search
+    """
+    pagination_class = LimitOffsetPagination
+    pagination_kwargs = None
+
+    def get_pagination_class(self):
+        return self.pagination_class
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            self._paginator = self.get_pagination_class()(**(self.pagination_kwargs or dict()))
+        return self._paginator
+
+    def paginate_queryset(self, queryset):
+        return self.paginator.paginate_queryset(queryset, self.request, view=self)
+
+    def get_pagination_result(self, serializer):
+        return build_result_pagination(self, self.paginator, serializer)
+
+
 def build_result_pagination(self, _PAGINATOR, serializer):
     result = {
         'offset': _PAGINATOR.offset,
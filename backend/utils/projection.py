@@ -0,0 +1,84 @@
+"""
+Read only list representation from `.values()` rows, for list endpoint
+- no model instance, no serializer field, plain dict each row
+- relation read by join in the same query, many relation by one
+  more query for the whole page
+- url and permalink from URL template (utils.urls), not reverse() each row
+
+Output must be the same JSON as the serializer it stand for (field order
+included), each projection has golden test against that serializer.
+Write path and retrieve keep the serializer.
+"""
+
+import collections
+
+from rest_framework import serializers
+from rest_framework.reverse import preserve_builtin_query_params
+
+from utils.urls import absolute_url
+
+# DRF representation of the value, without a field each row
+_datetime = serializers.DateTimeField()
+_date = serializers.DateField()
+
+datetime_value = _datetime.to_representation
+date_value = _date.to_representation
+
+
+def uuid_value(value):
+    return str(value) if value is not None else None
+
+
+def group_rows(rows, key):
+    """:rows by row[:key], each keep the query order"""
+    groups = collections.defaultdict(list)
+    for row in rows:
+        groups[row[key]].append(row)
+    return groups
+
+
+class Projection:
+    """
+    Subclass set `values` (lookups read each row), `represent(row)`
+    build the item, `prepare(rows)` fetch many relation of the page, ex;
+
+        page = self.paginate_queryset(IssueProjection.project(queryset))
+        projection = IssueProjection(page, context=context)
+        projection.data
+
+    `values` must include the paginator ordering field (keyset cursor).
+    """
+    serializer_class = None
+    values = ()
+
+    def __init__(self, instance, context=None):
+        self.instance = instance
+        self.context = context or dict()
+        self.request = self.context.get('request')
+
+    @classmethod
+    def project(cls, queryset):
+        """:queryset as row dict, prefetch dropped (made by prepare)"""
+        return queryset.prefetch_related(None).values(*cls.values)
+
+    def absolute_url(self, path):
+        return absolute_url(self.request, path)
+
+    def hyperlink(self, path):
+        # as HyperlinkedIdentityField, ?format= of the request kept
+        return preserve_builtin_query_params(absolute_url(self.request, path), self.request)
+
+    def prepare(self, rows):
+        pass
+
+    def represent(self, row):
+        raise NotImplementedError('`represent()` must be implemented.')
+
+    @property
+    def data(self):
+        if not hasattr(self, '_data'):
+            rows = list(self.instance)
+            if rows:
+                self.prepare(rows)
+            self._data = [self.represent(row) for row in rows]
+        return self._data
@@ -0,0 +1,44 @@
+"""
+JSON renderer on orjson, same output as DRF JSONRenderer (compact, UTF-8,
+datetime UTC as 'Z', U+2028 / U+2029 escaped)
+- UUID, date, datetime, time native in orjson
+- Decimal, lazy gettext string, queryset etc by DRF encoder `default`
+- indent asked (application/json; indent=4 or browsable API), ASCII or
+  not compact JSON setting, or a value orjson not take (int over 64 bit)
+  rendered by DRF JSONRenderer
+- float NaN / Infinity rendered null, DRF (STRICT_JSON) raise
+
+Without orjson installed it's the DRF JSONRenderer.
+"""
+
+from rest_framework import renderers
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+LINE_SEPARATOR = '\u2028'.encode()
+PARAGRAPH_SEPARATOR = '\u2029'.encode()
+
+
+class JSONRenderer(renderers.JSONRenderer):
+    def __init__(self):
+        self.default = self.encoder_class().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii or not self.compact \
+                or self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type=accepted_media_type,
+                                  renderer_context=renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.default, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type=accepted_media_type,
+                                  renderer_context=renderer_context)
+
+        # strict javascript subset, as DRF
+        if LINE_SEPARATOR in ret or PARAGRAPH_SEPARATOR in ret:
+            ret = ret.replace(LINE_SEPARATOR, b'\\u2028').replace(PARAGRAPH_SEPARATOR, b'\\u2029')
+        return ret
@@ -0,0 +1,355 @@
+"""
+Full text search over model text fields, ranked, with highlight snippet
+- MySQL: FULLTEXT index on the fields (created after migrate when
+  missing, rebuilt by rebuild_search_index), MATCH AGAINST in natural
+  language mode, kept by MySQL itself
+- other database (SQLite): local inverted index in process, BM25 ranked,
+  field weighted. Built on first search, kept on commit of save / delete
+  in this process, other process follow the index version in django cache
+  and re-read changed row by `update_date`, rebuilt fully each
+  SEARCH_INDEX_REBUILD_INTERVAL (delete from other process)
+
+Result always scoped by the given queryset, index never decide permission.
+"""
+
+import re
+import html
+import math
+import time
+import datetime
+import threading
+import collections
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+from django.db.models import FloatField
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+
+from utils.cache import TieredCache
+from utils.generals import get_model
+
+TOKEN = re.compile(r'\w+')
+
+# name -> SearchIndex, for rebuild_search_index
+registry = dict()
+
+
+def tokenize(text):
+    return TOKEN.findall((text or '').casefold())
+
+
+def snippet(text, terms, size=None):
+    """:text around the first matched term, term wrapped by <mark>, HTML escaped"""
+    size = size or settings.SEARCH_SNIPPET_SIZE
+    text = text or ''
+    matches = [match for match in TOKEN.finditer(text) if match.group().casefold() in terms]
+
+    start = 0
+    if matches and matches[0].end() > size:
+        start = max(0, matches[0].start() - size // 4)
+    end = min(len(text), start + size)
+
+    pieces = ['&hellip;'] if start > 0 else []
+    position = start
+    for match in matches:
+        if match.start() < start:
+            continue
+        if match.end() > end:
+            break
+
+        pieces.append(html.escape(text[position:match.start()]))
+        pieces.append('<mark>%s</mark>' % html.escape(match.group()))
+        position = match.end()
+
+    pieces.append(html.escape(text[position:end]))
+    if end < len(text):
+        pieces.append('&hellip;')
+    return ''.join(pieces)
+
+
+class RankedResult:
+    """
+    Rows of :queryset in :ids order, count and slice as a queryset
+    so paginator take it, each page read in one query
+    """
+
+    def __init__(self, queryset, ids, scores):
+        self.queryset = queryset
+        self.ids = ids
+        self.scores = scores
+
+    def count(self):
+        return len(self.ids)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        return iter(self[:])
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key:key + 1][0]
+
+        ids = self.ids[key]
+        rows = self.queryset.in_bulk(ids)
+
+        result = list()
+        for pk in ids:
+            if pk in rows:
+                rows[pk].search_rank = self.scores[pk]
+                result.append(rows[pk])
+        return result
+
+
+class MySQLBackend:
+    def __init__(self, index, using=DEFAULT_DB_ALIAS):
+        self.index = index
+        self.using = using
+
+    @property
+    def connection(self):
+        return connections[self.using]
+
+    @property
+    def index_name(self):
+        return '%s_search_idx' % self.index.model._meta.db_table
+
+    def match_sql(self):
+        qn = self.connection.ops.quote_name
+        table = self.index.model._meta.db_table
+        columns = ', '.join('%s.%s' % (qn(table), qn(self.index.model._meta.get_field(field).column))
+                            for field in self.index.fields)
+        return 'MATCH (%s) AGAINST (%%s IN NATURAL LANGUAGE MODE)' % columns
+
+    def annotate(self, queryset, query):
+        return queryset.annotate(search_rank=RawSQL(self.match_sql(), [query], output_field=FloatField())) \
+            .filter(search_rank__gt=0)
+
+    def rank(self, queryset, query):
+        ordering = queryset.query.order_by or self.index.model._meta.ordering
+        return self.annotate(queryset, query).order_by('-search_rank', *ordering)
+
+    def matching(self, query):
+        return self.annotate(self.index.model.objects.all(), query).values('pk')
+
+    def index_exists(self):
+        qn = self.connection.ops.quote_name
+        with self.connection.cursor() as cursor:
+            cursor.execute('SHOW INDEX FROM %s WHERE Key_name = %%s' % qn(self.index.model._meta.db_table),
+                           [self.index_name])
+            return bool(cursor.fetchall())
+
+    def rebuild(self):
+        qn = self.connection.ops.quote_name
+        table = self.index.model._meta.db_table
+        columns = ', '.join(qn(self.index.model._meta.get_field(field).column) for field in self.index.fields)
+
+        exists = self.index_exists()
+        with self.connection.cursor() as cursor:
+            if exists:
+                cursor.execute('ALTER TABLE %s DROP INDEX %s' % (qn(table), qn(self.index_name)))
+            cursor.execute('ALTER TABLE %s ADD FULLTEXT INDEX %s (%s)' % (qn(table), qn(self.index_name), columns))
+
+    def update(self, instance):
+        pass
+
+    def discard(self, pk):
+        pass
+
+
+class LocalBackend:
+    # BM25
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self, index):
+        self.index = index
+        self.lock = threading.RLock()
+        self.versions = TieredCache('search_%s' % index.name, maxsize=0,
+                                    version_timeout=settings.SEARCH_INDEX_VERSION_TIMEOUT)
+        self.clear()
+
+    def clear(self):
+        self.postings = collections.defaultdict(dict)
+        self.lengths = dict()
+        self.terms = dict()
+        self.total_length = 0
+
+        self.version = None
+        self.built_at = None
+        self.synced_at = None
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def add(self, pk, values):
+        """:values text of each field, same order as index.fields"""
+        with self.lock:
+            self.discard(pk)
+
+            frequencies = collections.Counter()
+            for field, text in zip(self.index.fields, values):
+                weight = self.index.weights.get(field, 1)
+                for term in tokenize(text):
+                    frequencies[term] += weight
+
+            if not frequencies:
+                return
+
+            for term, frequency in frequencies.items():
+                self.postings[term][pk] = frequency
+            self.terms[pk] = tuple(frequencies)
+            self.lengths[pk] = sum(frequencies.values())
+            self.total_length += self.lengths[pk]
+
+    def discard(self, pk):
+        with self.lock:
+            for term in self.terms.pop(pk, ()):
+                posting = self.postings[term]
+                posting.pop(pk, None)
+                if not posting:
+                    del self.postings[term]
+            self.total_length -= self.lengths.pop(pk, 0)
+
+    def update(self, instance):
+        # not built yet, read from database on first search
+        if self.built_at is not None:
+            self.add(instance.pk, [getattr(instance, field) for field in self.index.fields])
+        self.versions.invalidate()
+
+    # database
+    def rows(self, queryset):
+        return queryset.values_list('pk', *self.index.fields)
+
+    def rebuild(self):
+        with self.lock:
+            version, now = self.versions.get_version(), timezone.now()
+            self.clear()
+            for pk, *values in self.rows(self.index.model.objects.all()).iterator():
+                self.add(pk, values)
+            self.version, self.built_at, self.synced_at = version, time.monotonic(), now
+
+    def sync(self):
+        with self.lock:
+            version, now = self.versions.get_version(), timezone.now()
+
+            # a save committed a bit after it's update_date not missed
+            since = self.synced_at - datetime.timedelta(seconds=settings.SEARCH_INDEX_VERSION_TIMEOUT)
+            changed = self.index.model.objects.filter(**{'%s__gte' % self.index.updated_field: since})
+            for pk, *values in self.rows(changed):
+                self.add(pk, values)
+            self.version, self.synced_at = version, now
+
+    def ensure(self):
+        with self.lock:
+            if self.built_at is None \
+                    or time.monotonic() - self.built_at > settings.SEARCH_INDEX_REBUILD_INTERVAL:
+                self.rebuild()
+            elif self.version != self.versions.get_version():
+                self.sync()
+
+    # query
+    def score(self, query):
+        """pk -> BM25 score, any term matched (as MySQL natural language mode)"""
+        self.ensure()
+
+        with self.lock:
+            count = len(self.lengths)
+            if not count:
+                return dict()
+
+            average = self.total_length / count
+            scores = collections.defaultdict(float)
+            for term in set(tokenize(query)):
+                posting = self.postings.get(term)
+                if not posting:
+                    continue
+
+                idf = math.log(1 + (count - len(posting) + 0.5) / (len(posting) + 0.5))
+                for pk, frequency in posting.items():
+                    norm = self.k1 * (1 - self.b + self.b * self.lengths[pk] / average)
+                    scores[pk] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+            return scores
+
+    def rank(self, queryset, query):
+        scores = self.score(query)
+        if not scores:
+            return RankedResult(queryset, list(), scores)
+
+        # scope by the queryset, then best first, newest first on the same score
+        allowed = set(queryset.values_list('pk', flat=True))
+        ids = sorted((pk for pk in scores if pk in allowed), key=lambda pk: (-scores[pk], -pk))
+        return RankedResult(queryset, ids, scores)
+
+    def matching(self, query):
+        return list(self.score(query))
+
+
+class SearchIndex:
+    """
+    Full text search of :fields of the model, ex;
+
+        issue_search = SearchIndex('helpdesk', 'Issue', fields=('label', 'description'),
+                                   weights={'label': 2})
+        issue_search.rank(queryset, 'django deploy')
+
+    :weights used by the local index only, MySQL rank by it's own relevance
+    """
+
+    def __init__(self, app_label, model_name, fields, weights=None, updated_field='update_date'):
+        self.app_label = app_label
+        self.model_name = model_name
+        self.fields = tuple(fields)
+        self.weights = weights or dict()
+        self.updated_field = updated_field
+        self.name = '%s_%s' % (app_label, model_name.lower())
+
+        self._backends = dict()
+        registry[self.name] = self
+
+    @property
+    def model(self):
+        return get_model(self.app_label, self.model_name)
+
+    @property
+    def backend(self):
+        vendor = connection.vendor
+        if vendor not in self._backends:
+            self._backends[vendor] = (MySQLBackend if vendor == 'mysql' else LocalBackend)(self)
+        return self._backends[vendor]
+
+    def rank(self, queryset, query):
+        """Rows of :queryset matched :query, most relevant first, each has `search_rank`"""
+        return self.backend.rank(queryset, query)
+
+    def matching(self, query):
+        """Matched pk, for `pk__in` filter, not ranked"""
+        return self.backend.matching(query)
+
+    def highlight(self, instance, query):
+        terms = set(tokenize(query))
+        return {field: snippet(getattr(instance, field), terms) for field in self.fields}
+
+    def rebuild(self):
+        self.backend.rebuild()
+
+    def update(self, instance):
+        transaction.on_commit(lambda: self.backend.update(instance))
+
+    def discard(self, instance):
+        pk = instance.pk
+        transaction.on_commit(lambda: self.backend.discard(pk))
+
+
+def search_index_migrate_handler(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    """post_migrate of the app, MySQL FULLTEXT index of its SearchIndex created when missing"""
+    if connections[using].vendor != 'mysql':
+        return
+
+    for index in registry.values():
+        if index.app_label == sender.label:
+            backend = MySQLBackend(index, using=using)
+            if not backend.index_exists():
+                backend.rebuild()
@@ -0,0 +1,17 @@
+"""
+Signal of many rows saved at once (bulk_create / bulk_update), post_save
+not sent for each of them, ex: utils.mixin.api.ListSerializerUpdateMappingField
+
+    bulk_saved.connect(handler, sender=Model, dispatch_uid='...')
+
+    def handler(sender, created, updated, fields, **kwargs):
+        ...
+
+created: new rows, pk set
+updated: changed rows
+fields: field names updated (changed fields, auto_now and bulk_prepare ones)
+"""
+
+from django.dispatch import Signal
+
+bulk_saved = Signal()
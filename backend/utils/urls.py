@@ -0,0 +1,83 @@
+"""
+Named route resolved once to a format string, each object url made by
+string substitution, no URL resolver walk (and no versioning fallback
+of DRF reverse) each object
+
+    url_template('helpdesk_api:client:issue-detail').path(issue.uuid)
+    absolute_url(request, issue.permalink)
+
+Every template registered when first asked (serializer field and model
+permalink at import), all resolved at startup by url_templates.resolve()
+(setup/wsgi.py, setup/asgi.py), one not resolved yet on it's first use.
+Template carry the script prefix of that time, set FORCE_SCRIPT_NAME
+when served under a sub path.
+"""
+
+import threading
+
+from django.urls import get_resolver, reverse
+
+# match uuid path converter, never a real uuid (version 0)
+PLACEHOLDER = '00000000-0000-0000-0000-000000000000'
+
+
+class URLTemplate:
+    def __init__(self, viewname, kwarg='uuid'):
+        self.viewname = viewname
+        self.kwarg = kwarg
+        self._template = None
+
+    @property
+    def template(self):
+        if self._template is None:
+            path = reverse(self.viewname, kwargs={self.kwarg: PLACEHOLDER})
+            self._template = path.replace('{', '{{').replace('}', '}}').replace(PLACEHOLDER, '{0}')
+        return self._template
+
+    def path(self, value):
+        return self.template.format(value)
+
+
+class URLTemplateRegistry:
+    def __init__(self):
+        self.templates = dict()
+        self.lock = threading.Lock()
+
+    def get(self, viewname, kwarg='uuid'):
+        key = (viewname, kwarg)
+        template = self.templates.get(key)
+        if template is None:
+            with self.lock:
+                template = self.templates.setdefault(key, URLTemplate(viewname, kwarg=kwarg))
+        return template
+
+    def resolve(self):
+        # URLconf import every serializer, so every template registered
+        get_resolver().url_patterns
+        for template in list(self.templates.values()):
+            template.template
+        return len(self.templates)
+
+    def clear(self):
+        """Resolve again on next use, ex: URLconf changed"""
+        for template in list(self.templates.values()):
+            template._template = None
+
+
+url_templates = URLTemplateRegistry()
+
+
+def url_template(viewname, kwarg='uuid'):
+    return url_templates.get(viewname, kwarg=kwarg)
+
+
+def absolute_url(request, path):
+    """Same as request.build_absolute_uri(:path), scheme and host read once each request"""
+    if not path.startswith('/') or path.startswith('//'):
+        return request.build_absolute_uri(path)
+
+    base = getattr(request, '_absolute_url_base', None)
+    if base is None:
+        base = request.build_absolute_uri('/')[:-1]
+        request._absolute_url_base = base
+    return base + path